@@ -43,23 +43,45 @@ To search for species, see the info() funciton's other features
 __version__ = "2.2.4"
 
 
+# The startup profile (see utility.PMProfile) measures from here
+import time as _time
+_start = _time.perf_counter()
+
 # loading the PYroMat utility functions
 from . import utility
+# The environment variable starts the profile before the config is read
+if utility.os.environ.get('PYROMAT_PROFILE', '').lower() not in ('', '0', 'false', 'no'):
+    utility._profile = utility.PMProfile(_start)
 # load the configuration
-config = utility.PMConfig()
+with utility.profile('phase', 'config'):
+    config = utility.PMConfig()
+if config['startup_profile'] and utility._profile is None:
+    utility._profile = utility.PMProfile(_start)
+startup_profile = utility._profile
 
-# import the dataclass registry
-from . import reg
-# import the module for handling data
-from . import dat
-# import the units module
-from . import units
-# By default, do not import the module for handling special applications
-# This module has requirements beyond the base pyromat installation
-#from . import aps
+with utility.profile('phase', 'modules'):
+    # import the dataclass registry
+    from . import reg
+    # import the module for handling data
+    from . import dat
+    # import the units module
+    from . import units
+    # import the solver statistics module
+    from . import stats
+    # import the variable-composition mixture module
+    from . import mixture
+    # import the chemical equilibrium module
+    from . import equilibrium
+    # By default, do not import the module for handling special applications
+    # This module has requirements beyond the base pyromat installation
+    #from . import aps
 
-reg.regload()
-dat.load()
+with utility.profile('phase', 'regload'):
+    reg.regload()
+with utility.profile('phase', 'load'):
+    dat.load()
+if startup_profile is not None:
+    startup_profile.finish()
 
 
 
@@ -83,6 +105,12 @@ Returns a substance data class for the substance named.
     
 
 
+# Mixtures and batches of species may be built at run time; see the 
+# mixture module
+mix = mixture.mix
+batch = mixture.batch
+
+
 def search(name=None, contains=None, collection=None, pmclass=None, cas=None, inchi=None, members=None):
     """Returns a set of substance instances that match a set of search criteria
     members = search( ... )
@@ -149,87 +177,95 @@ The InChI and CAS identifiers are strings that uniquely identify a
 substance, but the same substance may be modeled in multiple collections.
 For example, water inchi='InChI=1S/H2O/h1H2' or cas='7732-18-5' is 
 listed in both multi-phase and ideal gas collections.
+
+Searches are answered from inverted indexes that are built the first 
+time search() is called and are updated when data are added or removed
+(see dat.PMSearchIndex).  Only the substances that match are loaded.
 """
-    # If the members are not specified, build a working set
+    # Condition the contents argument into an atoms dictionary
+    if isinstance(contains, str):
+        atoms = {contains:None}
+    elif isinstance(contains, dict):
+        atoms = contains
+    elif hasattr(contains,'__iter__'):
+        atoms = {}
+        for aa in contains:
+            atoms[aa] = None
+    else:
+        atoms = None
+
+    # The data's inverted indexes find the matching ID strings
+    ids = dat.data.search_index().find(name=name, atoms=atoms, 
+            collection=collection, pmclass=pmclass, cas=cas, inchi=inchi)
+
+    # If the members are not specified, the IDs are the result
     if members is None:
-        members = dat.data.values()
-    
+        newmembers = {dat.data.get(idstr) for idstr in ids}
+        newmembers.discard(None)
+        return newmembers
+
+    # Otherwise, keep the members that were found.  Members that are not
+    # the instances in the data have to be tested one-by-one.
     newmembers = set()
-    
-    # Also define a case-adjusted name for all-lower-case
-    name_lower = None
-    if name is not None:
-        name_lower = name.lower()
-    
     for candidate in members:
-        match = True
-        # Start by reducing the set size with the simplest comparisons
-        # The class is easy
-        if match and pmclass is not None and pmclass != candidate.data['class']:
-            match = False
-            
-        # The collection is also easy
-        if match and collection is not None and not candidate.data['id'].startswith(collection):
-            match = False
-            
-        # Inchi and cas identifiers
-        if match and cas is not None and ('cas' not in candidate.data or cas != candidate.data['cas']):
-            match = False
-            
-        if match and inchi is not None and ('inchi' not in candidate.data or inchi != candidate.data['inchi']):
-            match = False
-            
-        # Next, move on to the name.  It is more complicated, but it is 
-        # likely to whittle down the search quickly
-        if match and name is not None:
-            # If the name is contained in the id string, match right away
-            if name in candidate.data['id']:
-                pass
-            # If the candidate has names, check there too
-            elif 'names' in candidate.data:
-                # We'll assume there was no match until we find one
-                match = False
-                for cname in candidate.data['names']:
-                    if name_lower in cname.lower():
-                        match = True
-                        break
-            # This is not the substance you're looking for
-            else:
-                match = False
+        idstr = candidate.data['id']
+        if dat.data.get(idstr) is candidate:
+            if idstr in ids:
+                newmembers.add(candidate)
+        elif _match(candidate, name, atoms, collection, pmclass, cas, inchi):
+            newmembers.add(candidate)
+    return newmembers
+
+
+def _match(candidate, name, atoms, collection, pmclass, cas, inchi):
+    """Test a single substance against the search() criteria (inner routine)"""
+    # Start with the simplest comparisons
+    # The class is easy
+    if pmclass is not None and pmclass != candidate.data['class']:
+        return False
         
-        # Condition the contents argument into an atoms dictionary
-        if isinstance(contains, str):
-            atoms = {contains:None}
-        elif isinstance(contains, dict):
-            atoms = contains
-        elif hasattr(contains,'__iter__'):
-            atoms = {}
-            for aa in contains:
-                atoms[aa] = None
-        else:
-            atoms = None
+    # The collection is also easy
+    if collection is not None and not candidate.data['id'].startswith(collection):
+        return False
+        
+    # Inchi and cas identifiers
+    if cas is not None and ('cas' not in candidate.data or cas != candidate.data['cas']):
+        return False
+        
+    if inchi is not None and ('inchi' not in candidate.data or inchi != candidate.data['inchi']):
+        return False
         
-        # Finally, deal with the contents
-        if match and atoms is not None:
-            if hasattr(candidate, 'atoms'):
-                catoms = candidate.atoms()
-                # Check the atomic contents one-by-one
-                # and verify that they are in the correct quantity
-                for atm,qty in atoms.items():
-                    cqty = catoms.get(atm)
-                    if cqty is None or (qty is not None and cqty != qty):
-                        match = False
-                        break
-            # If atoms were specified, but the class doesn't support it,
-            # fail the search
+    # Next, move on to the name.  
+    if name is not None:
+        # If the name is contained in the id string, match right away
+        if name in candidate.data['id']:
+            pass
+        # If the candidate has names, check there too
+        elif 'names' in candidate.data:
+            name_lower = name.lower()
+            for cname in candidate.data['names']:
+                if name_lower in cname.lower():
+                    break
             else:
-                match = False
-            
-        # If the candidate was matched, add it to the set
-        if match:
-            newmembers.add(candidate)
-                
-    return newmembers
+                return False
+        # This is not the substance you're looking for
+        else:
+            return False
+    
+    # Finally, deal with the contents
+    if atoms is not None:
+        # If atoms were specified, but the class doesn't support it,
+        # fail the search
+        if not hasattr(candidate, 'atoms'):
+            return False
+        catoms = candidate.atoms()
+        # Check the atomic contents one-by-one
+        # and verify that they are in the correct quantity
+        for atm,qty in atoms.items():
+            cqty = catoms.get(atm)
+            if cqty is None or (qty is not None and cqty != qty):
+                return False
+    return True
                     
 
 
@@ -72,6 +72,14 @@
 config_verbose = False
 
 
+# Should PYroMat record the time and memory spent loading its configuration,
+# registry, and data in pm.startup_profile?  See pm.utility.PMProfile.  To 
+# include the configuration files in the profile, set the PYROMAT_PROFILE
+# environment variable instead.
+#
+#> startup_profile = False
+
+
 #** Data directories **
 # The data directory list contains "install_dir/data" by default.  Users
 # can add data from their own directories as well.  It is not possible
@@ -107,6 +115,26 @@ dat_exist_fatal = False
 # this setting locally.  PYroMat's recursion is an all-or-none.
 dat_recursive = True
 
+# Should the data files only be indexed when they are found and parsed the
+# first time each substance is requested?  This makes importing PYroMat much
+# faster when only a few substances are used.  If you would rather find 
+# problems with the data files at import, set this to False.
+#> dat_lazy = True
+
+# Should each data directory be read from a single cache file?  This makes
+# importing PYroMat faster, but it WRITES files: a pickle file for each data
+# directory is kept in dat_cache_dir, and it is rebuilt automatically when 
+# any of the data files are changed.  The cache files are only read if they
+# belong to the current user and no one else can write to them.
+#> dat_cache = False
+#> dat_cache_dir = '~/.cache/pyromat'
+
+# Should the data of each substance be stored compactly?  Coefficients are
+# kept in arrays, repeated strings are shared, and reference tables are 
+# read from the data files only when they are needed.  This helps when 
+# many processes load PYroMat at once.
+#> dat_compact = False
+
 
 #** Registry behavior **
 # By default, the registry will consist of class definitions found in 
@@ -127,6 +155,8 @@ dat_recursive = True
 #> reg_dir = ['/usr/share/pyromat/reg', '/home/bestuserever/.pyromat/reg']
 
 # Should the pyromat.reg.regload() function print its activity to stdout?
+# When reg_lazy is True, each file's messages are printed when it is 
+# first imported instead.
 reg_verbose = False
 
 # If redundant class definitions are discovered, should we overwrite the
@@ -138,12 +168,21 @@ reg_overwrite = True
 # serves the same function as the dat_exist_fatal directive
 reg_exist_fatal = False
 
+# Should each registry file only be imported when one of its classes is 
+# first needed?  If you would rather find problems with your own registry 
+# files at import, set this to False.
+#> reg_lazy = True
+
 # What is the default temperature and pressure that property functions
 # should use when entries are omitted?  These must be in the same units
 # specified by unit_pressure and unit_temperature
 #> def_T = 298.15
 #> def_p = 1.01325
 
+# How many mixtures built by pyromat.mix() should be kept so that 
+# repeated requests for the same composition are not rebuilt?
+#> mix_cache_size = 32
+
 
 # In what units should functions accept and return values?  A list of 
 # the accepted units appears below each directive
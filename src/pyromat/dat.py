@@ -9,6 +9,10 @@ and diagnostics.
 
 # load the root of the module
 import pyromat as pm
+import re
+import threading
+import pickle
+import hashlib
 utility = pm.utility
 reg = pm.reg
 
@@ -22,7 +26,673 @@ reg = pm.reg
 ##  The master data dictionary
 ##
 ######################################
-data = {}
+def _grams(text):
+    """Return the set of three-character substrings of a string"""
+    return {text[ii:ii+3] for ii in range(len(text)-2)}
+
+
+class PMSearchIndex:
+    """Inverted indexes for searching the data
+    
+The attributes are dictionaries that map a search term to the IDs of 
+the substances that match it:
+
+atoms       atom symbol -> {idstr: quantity}
+idgrams     three-character substring of the ID -> set of IDs
+namegrams   three-character substring of a lower case name -> set of IDs
+cas         CAS number -> set of IDs
+inchi       InChI string -> set of IDs
+pmclass     class name -> set of IDs
+collection  collection name -> set of IDs
+
+Searches for substrings of IDs and names (e.g. for auto-completion) 
+intersect the sets of each three-character substring of the search 
+string and then check the few candidates that remain.  See find().
+"""
+    def __init__(self):
+        self.ids = set()
+        # The lower case names of each substance that has them
+        self.names = {}
+        self.atoms = {}
+        self.idgrams = {}
+        self.namegrams = {}
+        self.cas = {}
+        self.inchi = {}
+        self.pmclass = {}
+        self.collection = {}
+        # What was recorded for each ID, so that it can be removed
+        self._entries = {}
+
+    def add(self, idstr, temp, atoms):
+        """Add a substance to the indexes
+    add(idstr, temp, atoms)
+
+temp is the substance's data dictionary, and atoms is the dictionary
+returned by its atoms() method.
+"""
+        self.remove(idstr)
+        names = [nn.lower() for nn in temp.get('names', [])]
+        keys = [(self.pmclass, temp.get('class')),
+                (self.collection, idstr.split('.',1)[0] if '.' in idstr else ''),
+                (self.cas, temp.get('cas')),
+                (self.inchi, temp.get('inchi'))]
+        keys = [(index,key) for index,key in keys if key is not None]
+        keys += [(self.idgrams, gg) for gg in _grams(idstr)]
+        if 'names' in temp:
+            self.names[idstr] = names
+            for nn in names:
+                keys += [(self.namegrams, gg) for gg in _grams(nn)]
+        for index,key in keys:
+            index.setdefault(key, set()).add(idstr)
+        for atom,qty in atoms.items():
+            self.atoms.setdefault(atom, {})[idstr] = qty
+        self.ids.add(idstr)
+        self._entries[idstr] = (keys, list(atoms.keys()))
+
+    def remove(self, idstr):
+        """Remove a substance from the indexes
+    remove(idstr)
+"""
+        entry = self._entries.pop(idstr, None)
+        if entry is None:
+            return
+        keys,atoms = entry
+        for index,key in keys:
+            found = index.get(key)
+            if found is not None:
+                found.discard(idstr)
+                if not found:
+                    del index[key]
+        for atom in atoms:
+            del self.atoms[atom][idstr]
+            if not self.atoms[atom]:
+                del self.atoms[atom]
+        self.names.pop(idstr, None)
+        self.ids.discard(idstr)
+
+    def _substring(self, text, grams, universe):
+        """Return candidate IDs whose strings may contain text (inner routine)"""
+        if len(text) < 3:
+            return set(universe)
+        found = None
+        for gg in _grams(text):
+            these = grams.get(gg)
+            if not these:
+                return set()
+            found = these.copy() if found is None else found.intersection(these)
+        return found
+
+    def find(self, name=None, atoms=None, collection=None, pmclass=None, cas=None, inchi=None):
+        """Return the set of IDs that match the search criteria
+    ids = find(name=None, atoms=None, collection=None, pmclass=None, 
+            cas=None, inchi=None)
+
+The criteria are the same as those of pm.search(), except that atoms
+must be a dictionary of atom symbols and quantities (or None).
+"""
+        # Start with the exact matches, since they are the smallest
+        found = self.ids
+        for index,key in [(self.pmclass, pmclass), (self.cas, cas), (self.inchi, inchi)]:
+            if key is not None:
+                found = found.intersection(index.get(key, ()))
+        if collection is not None:
+            prefix,_,rest = collection.partition('.')
+            these = set()
+            for cc,ids in self.collection.items():
+                if cc.startswith(prefix) and (not rest or cc == prefix):
+                    these.update(ids)
+            if rest:
+                these = {idstr for idstr in these if idstr.startswith(collection)}
+            found = found.intersection(these)
+        if atoms is not None:
+            for atom,qty in atoms.items():
+                these = self.atoms.get(atom, {})
+                if qty is None:
+                    found = found.intersection(these)
+                else:
+                    found = {idstr for idstr in found if these.get(idstr) == qty}
+        if name is not None:
+            # IDs are matched case-sensitively
+            these = {idstr for idstr in 
+                    self._substring(name, self.idgrams, found) & found
+                    if name in idstr}
+            # names are not
+            name_lower = name.lower()
+            these.update(idstr for idstr in 
+                    self._substring(name_lower, self.namegrams, self.names) & found
+                    if any(name_lower in nn for nn in self.names[idstr]))
+            found = these
+        return set(found)
+
+
+
+class PMData(dict):
+    """PYroMat Data Dictionary
+
+This is the dictionary that houses the loaded data instances, keyed by
+their ID strings.  When pm.config['dat_lazy'] is True, load() does not
+parse the files it finds.  Instead, it only reads the ID string from 
+each file and records the file in the index attribute,
+
+    data.index = {'ig.N2':'/path/to/data/ig2/N2.hpd', ...}
+
+The first time an indexed substance is requested, its file is parsed,
+the instance is created, and it is moved from the index to the 
+dictionary.  Reading an item, get(), and the in operator only load the
+substance requested.  Iteration, keys(), values(), items(), and len() 
+behave as if all substances were loaded, so they load everything that
+is still in the index first (see resolve()).  The ids() method lists 
+the ID strings without loading anything.
+
+The search_index() method returns a PMSearchIndex for pm.search().  It
+is built the first time it is needed, and substances that are added or
+removed afterwards are updated before it is returned again.
+"""
+    def __init__(self, *varg, **kwarg):
+        dict.__init__(self, *varg, **kwarg)
+        self.index = {}
+        # Data dictionaries from a cache bundle that have not been used 
+        # to create instances yet, keyed by their file names
+        self._pending = {}
+        # The search index and the IDs that have changed since it was
+        # updated
+        self._search = None
+        self._stale = set()
+        # Loading a substance may request others (e.g. igmix 
+        # constituents), so the lock must be re-entrant.
+        self._lock = threading.RLock()
+
+    def _fetch(self, idstr):
+        """Load an indexed substance (inner routine)
+    found = _fetch(idstr)
+
+Returns True if idstr was loaded by this call or by another thread, and
+False if it is not in the index or its file failed to load.
+"""
+        with self._lock:
+            if dict.__contains__(self, idstr):
+                return True
+            filename = self.index.pop(idstr, None)
+            if filename is None:
+                return False
+            # The record includes the time to parse the file
+            with utility.profile('class', idstr) as entry:
+                temp = self._pending.pop(filename, None)
+                if temp is None:
+                    try:
+                        temp = utility.load_file(filename)
+                    except:
+                        utility.print_warning('Failed to load ' + repr(idstr) + 
+                                ' from file: ' + filename)
+                        return False
+                    temp['fromfile'] = filename
+                if temp['class'] not in reg.registry:
+                    utility.print_error('Species ' + repr(temp['id']) + ' called for data class ' + repr(temp['class']) + '.  That class does not exist in the registry.  The data file is corrupt or out of date.')
+                    raise utility.PMDataError()
+                if entry is not None:
+                    entry['class'] = temp['class']
+                dict.__setitem__(self, temp['id'], _instance(reg.registry[temp['class']], temp))
+            return dict.__contains__(self, idstr)
+
+    def __missing__(self, idstr):
+        if self._fetch(idstr):
+            return dict.__getitem__(self, idstr)
+        raise KeyError(idstr)
+
+    def __contains__(self, idstr):
+        return dict.__contains__(self, idstr) or idstr in self.index
+
+    def __setitem__(self, idstr, value):
+        self.index.pop(idstr, None)
+        dict.__setitem__(self, idstr, value)
+        self._touch(idstr)
+
+    def __delitem__(self, idstr):
+        if self.index.pop(idstr, None) is None:
+            dict.__delitem__(self, idstr)
+        else:
+            dict.pop(self, idstr, None)
+        self._touch(idstr)
+
+    def __len__(self):
+        return dict.__len__(self) + len(self.index)
+
+    def __iter__(self):
+        self.resolve()
+        return dict.__iter__(self)
+
+    def get(self, idstr, default=None):
+        if dict.__contains__(self, idstr) or self._fetch(idstr):
+            return dict.__getitem__(self, idstr)
+        return default
+
+    def keys(self):
+        self.resolve()
+        return dict.keys(self)
+
+    def values(self):
+        self.resolve()
+        return dict.values(self)
+
+    def items(self):
+        self.resolve()
+        return dict.items(self)
+
+    def pop(self, idstr, *default):
+        self._fetch(idstr)
+        self._touch(idstr)
+        return dict.pop(self, idstr, *default)
+
+    def clear(self):
+        self.index.clear()
+        self._pending.clear()
+        self._search = None
+        self._stale = set()
+        dict.clear(self)
+
+    def _touch(self, idstr):
+        """Note that a substance was added, replaced, or removed"""
+        if self._search is not None:
+            self._stale.add(idstr)
+
+    def search_index(self):
+        """Return the search index for the data
+    index = data.search_index()
+
+The first call builds a PMSearchIndex from every loaded and indexed 
+substance.  Substances that are only indexed are parsed, but instances
+are only created for classes that override the atoms() method (like
+igmix).  Their data are kept so that they are not parsed again when 
+they are requested.  Later calls only update the substances that have
+changed.
+"""
+        with self._lock:
+            if self._search is None:
+                self._search = PMSearchIndex()
+                stale = self.ids()
+            else:
+                stale = self._stale
+            self._stale = set()
+            for idstr in stale:
+                self._search.remove(idstr)
+                entry = self._search_entry(idstr)
+                if entry is not None:
+                    self._search.add(idstr, *entry)
+            return self._search
+
+    def _search_entry(self, idstr):
+        """Return the data and atoms of a substance (inner routine)
+    temp, atoms = _search_entry(idstr)
+
+Returns None if the substance is not in the data or cannot be loaded.
+"""
+        inst = dict.get(self, idstr)
+        if inst is not None:
+            temp = inst.data
+            dataclass = inst.__class__
+        elif idstr in self.index:
+            filename = self.index[idstr]
+            temp = self._pending.get(filename)
+            if temp is None:
+                try:
+                    temp = utility.load_file(filename, verbose=False)
+                except:
+                    return None
+                temp['fromfile'] = filename
+                if not pm.config['dat_compact']:
+                    self._pending[filename] = temp
+            dataclass = reg.registry.get(temp.get('class'))
+        else:
+            return None
+        if dataclass is None or dataclass.atoms is reg.__basedata__.atoms:
+            atoms = temp.get('atoms', {})
+        else:
+            try:
+                atoms = self[idstr].atoms()
+            except:
+                atoms = {}
+        return temp, atoms
+
+    def ids(self):
+        """List the ID strings of all loaded and indexed substances
+    idlist = data.ids()
+
+Unlike keys(), ids() does not load the indexed substances.
+"""
+        return list(dict.keys(self)) + list(self.index.keys())
+
+    def resolve(self, ids=None):
+        """Load substances that are still in the index
+    data.resolve()
+        or
+    data.resolve(ids)
+
+When ids is an iterable of ID strings, only those are loaded.  
+Otherwise, every indexed substance is loaded.
+"""
+        if ids is None:
+            ids = list(self.index.keys())
+        for idstr in ids:
+            self._fetch(idstr)
+
+data = PMData()
+
+
+def _scan_id(filename):
+    """Read the ID string from a data file without parsing it
+    idstr = _scan_id(filename)
+
+The ID is found by a pattern search for the "id" entry at the 
+indentation of the first entry in the file.  Data files are written by
+json.dump() with indentation, so the search is unambiguous.  If the 
+file cannot be read or the entry is not found exactly once, None is 
+returned, and the file should be parsed instead.
+"""
+    try:
+        with open(filename, 'r') as ff:
+            text = ff.read()
+    except:
+        return None
+    indent = _indentpattern.match(text)
+    if indent is None:
+        return None
+    found = re.findall('^' + indent.group(1) + _idpattern, text, re.MULTILINE)
+    if len(found) != 1:
+        return None
+    return found[0]
+
+_indentpattern = re.compile(r'\{[ \t]*\r?\n([ \t]+)"')
+_idpattern = r'"id"[ \t]*:[ \t]*"([^"\\]*)"'
+
+
+# Increment this when the contents of the cache bundles change
+_bundle_format = 3
+
+def _walk(directory, recursive, files):
+    """List the data files in a directory in the order load() reads them"""
+    contents = utility.os.listdir(directory)
+    contents.sort()
+    for this in contents:
+        this_long = utility.os.path.join(directory, this)
+        if recursive and utility.os.path.isdir(this_long):
+            _walk(this_long, recursive, files)
+        elif len(this)>4 and this[-4:]=='.hpd':
+            files.append(this_long)
+
+
+def _bundle_file(directory):
+    """Return the path to the cache bundle for a data directory or None
+    
+Returns None if the cache directory does not exist and cannot be 
+created or if it is not writable.
+"""
+    cache_dir = utility.os.path.expandvars(
+            utility.os.path.expanduser(pm.config['dat_cache_dir']))
+    try:
+        utility.os.makedirs(cache_dir, exist_ok=True)
+    except:
+        return None
+    if not utility.os.access(cache_dir, utility.os.W_OK):
+        return None
+    name = hashlib.sha1(directory.encode('utf-8')).hexdigest()[:16]
+    return utility.os.path.join(cache_dir, 'dat-' + name + '.pkl')
+
+
+def _bundle_trusted(bundlefile):
+    """Test whether a cache bundle may be read (inner routine)
+
+Bundles are only read if they belong to the current user and cannot be
+written by anyone else.  The test is skipped on systems without user
+IDs.
+"""
+    try:
+        stat = utility.os.stat(bundlefile)
+    except OSError:
+        return False
+    if hasattr(utility.os, 'getuid'):
+        if stat.st_uid != utility.os.getuid() or stat.st_mode & 0o022:
+            return False
+    return True
+
+
+def _bundle(directory, recursive, rebuild=False, verbose=False, full=True):
+    """Read the data files in a directory from its cache bundle
+    contents = _bundle(directory, recursive)
+
+Returns a list of (filename, idstr, temp) tuples in the order that load()
+would read the files, where temp is the file's data dictionary 
+(including its 'fromfile' entry).  If the file failed to load, idstr 
+and temp are None.  If full is False, only the ID strings are read from
+the bundle, and temp is always None.
+
+The bundle is a pickle file in pm.config['dat_cache_dir'] that contains
+the data from every file in the directory (and its sub-directories if
+recursive is True).  It also records each file's modification time and
+size.  If any file has been added, removed, or modified since the bundle
+was written, if the bundle was written by a different version of 
+PYroMat, if it cannot be read or does not belong to the current user, 
+or if rebuild is True, the files are parsed and the bundle is 
+rewritten.  Returns None if the bundle cannot be written.
+"""
+    lead = 'load-> '
+    bundlefile = _bundle_file(directory)
+    if bundlefile is None:
+        return None
+    files = []
+    _walk(directory, recursive, files)
+    stamps = []
+    for fil in files:
+        stat = utility.os.stat(fil)
+        stamps.append((fil, stat.st_mtime_ns, stat.st_size))
+    header = {'format':_bundle_format, 'version':pm.config['version'],
+            'directory':directory, 'recursive':recursive, 'files':stamps}
+
+    # The bundle starts with a plain text line that identifies the format
+    # and the PYroMat version, so that nothing is unpickled from a file
+    # that was not written by this version.  That is followed by three 
+    # pickles: the header, the ID strings, and the data, so the data need
+    # not be read when only the IDs are needed.  Any error while reading
+    # is treated as a missing bundle.
+    magic = ('PYroMat data cache %d %s\n'%(_bundle_format, 
+            pm.config['version'])).encode('utf-8')
+    if not rebuild and _bundle_trusted(bundlefile):
+        try:
+            with open(bundlefile, 'rb') as ff:
+                if ff.readline() == magic and pickle.load(ff) == header:
+                    ids = pickle.load(ff)
+                    if not full:
+                        return [(fil, idstr, None) for fil,idstr in ids]
+                    contents = pickle.load(ff)
+                    return [(fil, idstr, temp) for (fil,idstr),temp in 
+                            zip(ids, contents)]
+        except:
+            pass
+
+    if verbose:
+        utility.print_line('Building data cache ' + repr(bundlefile) + 
+                ' for directory ' + repr(directory), lead)
+    ids = []
+    contents = []
+    for fil in files:
+        try:
+            temp = utility.load_file(fil)
+            temp['fromfile'] = fil
+            ids.append((fil, temp['id']))
+        except:
+            temp = None
+            ids.append((fil, None))
+        contents.append(temp)
+    # Write to a temporary file first so that a concurrent load() never 
+    # reads a partial bundle
+    tempfile = bundlefile + '.' + str(utility.os.getpid())
+    try:
+        with open(tempfile, 'wb') as ff:
+            ff.write(magic)
+            for this in (header, ids, contents):
+                pickle.dump(this, ff, protocol=pickle.HIGHEST_PROTOCOL)
+        # Only the owner may write to the bundle (see _bundle_trusted())
+        utility.os.chmod(tempfile, 0o644)
+        utility.os.replace(tempfile, bundlefile)
+    except:
+        if verbose:
+            utility.print_warning('Failed to write the data cache: ' + repr(bundlefile))
+        try:
+            utility.os.remove(tempfile)
+        except:
+            pass
+    return [(fil, idstr, temp if full else None) for (fil,idstr),temp in 
+            zip(ids, contents)]
+
+
+def _load_bundle(datasource, recursive, lazy, verbose):
+    """Load the data in a directory from its cache bundle (inner routine)
+    found = _load_bundle(datasource, recursive, lazy, verbose)
+
+Returns False if the directory has no usable bundle, in which case the
+files should be read one-by-one by _load_dir().  Files that could not
+be parsed when the bundle was built are reported every time.
+"""
+    lead = 'load-> '
+    with utility.profile('dir', datasource, cached=True) as entry:
+        # In lazy compact mode, only the IDs are needed
+        contents = _bundle(datasource, recursive, verbose=verbose, 
+                full=not (lazy and pm.config['dat_compact']))
+        if contents is None:
+            if entry is not None:
+                entry['cached'] = False
+            return False
+        out='In directory ' + repr(datasource) + ' found cached files: '
+        for this, idstr, temp in contents:
+            if idstr is None:
+                utility.print_warning('Failed to load data file: ' + repr(this))
+                continue
+            _insert(idstr, this, temp, lazy, verbose)
+            if verbose:
+                out += (utility.os.path.basename(this) + ', ')
+        if verbose:
+            utility.print_line('',lead)
+            utility.print_line(out,lead)
+    return True
+
+
+def _load_dir(datasource, check, verbose, lazy, recursive):
+    """Load the data files in a directory one-by-one (inner routine)
+    _load_dir(datasource, check, verbose, lazy, recursive)
+
+Calls load() on each data file and sub-directory.  In check mode, the
+suppressed files are added to check['suppressed'].
+"""
+    lead = 'load-> '
+    with utility.profile('dir', datasource, cached=False):
+        # list the contents of the directory
+        contents = utility.os.listdir(datasource)
+        contents.sort()
+        out='In directory ' + repr(datasource) + ' found files: '
+        for this in contents:
+            this_long = utility.os.path.join(datasource,this)
+            # if recursion is enabled, and we come across a directory
+            if recursive and utility.os.path.isdir(this_long):
+                #
+                # recurse into sub-directories
+                load(this_long,check=check,verbose=verbose,lazy=lazy,cache=False)
+            # if this is a file and it has the .hpd extension
+            elif len(this)>4 and this[-4:]=='.hpd':
+                #
+                # recurse with the actual file name
+                load(this_long,check=check,verbose=verbose,lazy=lazy,cache=False)
+
+                # assemble an output string
+                if verbose:
+                    out += (this+', ')
+
+            elif check and len(this)>5 and this[-5:]=='.hpd~':
+                #
+                # note if there are suppressed files
+                check['suppressed'].append(this_long)
+
+        if verbose:
+            utility.print_line('',lead)
+            utility.print_line(out,lead)
+
+
+def _instance(dataclass, temp):
+    """Create an instance of a data class (inner routine)
+    substance = _instance(dataclass, temp)
+
+When the dat_compact configuration parameter is True, the instance's 
+data are compacted (see reg.__basedata__.compact()).
+"""
+    out = dataclass(temp)
+    if pm.config['dat_compact']:
+        out.compact()
+    return out
+
+
+def _insert(idstr, filename, temp, lazy, verbose):
+    """Add a substance to the data dictionary (inner routine)
+    _insert(idstr, filename, temp, lazy, verbose)
+
+Applies the dat_exist_fatal and dat_overwrite rules.  In lazy mode, the
+file is added to data.index, and temp (if it is not None) is kept until
+the substance is requested.  Otherwise, the instance is created from 
+temp immediately.
+"""
+    if idstr in data:
+        if pm.config['dat_exist_fatal']:
+            utility.print_error('Found an existing entry for ' + repr(idstr))
+            raise utility.PMDataError()
+        elif not pm.config['dat_overwrite']:
+            if verbose:
+                utility.print_warning('Found an existing entry for ' + repr(idstr) 
+                    + '. Ignoring.')
+            return
+        elif verbose:
+            utility.print_warning('Found an existing entry for ' + repr(idstr) 
+                + '. Overwriting.')
+        # Discard the old instance if it was already loaded
+        dict.pop(data, idstr, None)
+        data._pending.pop(data.index.get(idstr), None)
+    if lazy:
+        data.index[idstr] = filename
+        data._touch(idstr)
+        # In compact mode, the file is parsed again when it is requested
+        # instead of holding every substance's data until then.
+        if temp is not None and not pm.config['dat_compact']:
+            data._pending[filename] = temp
+    elif temp['class'] in reg.registry:
+        with utility.profile('class', idstr, **{'class':temp['class']}):
+            data[idstr] = _instance(reg.registry[temp['class']], temp)
+    else:
+        utility.print_error('Species ' + repr(idstr) + ' called for data class ' + repr(temp['class']) + '.  That class does not exist in the registry.  The data file is corrupt or out of date.')
+        raise utility.PMDataError()
+
+
+def build_cache(datasource=None, verbose=None):
+    """Rebuild the data cache bundles
+    build_cache()
+        or
+    build_cache('/path/to/data/dir')
+
+By default, the bundles for all of the directories in pm.config['dat_dir']
+are rebuilt.  load() rebuilds a bundle automatically when it finds that
+the files have changed, so this is only needed to prepare the cache 
+ahead of time (e.g. when building a container image).  Returns a list 
+of the directories that could not be cached.
+"""
+    if verbose is None:
+        verbose = pm.config['dat_verbose']
+    if datasource is None:
+        datasource = pm.config['dat_dir']
+    elif isinstance(datasource, str):
+        datasource = [datasource]
+    failed = []
+    for dd in datasource:
+        dd = utility.os.path.abspath(utility.os.path.expandvars(
+                utility.os.path.expanduser(dd)))
+        if not utility.os.path.isdir(dd) or _bundle(dd, 
+                pm.config['dat_recursive'], rebuild=True, verbose=verbose) is None:
+            failed.append(dd)
+    return failed
 
 
 
@@ -34,7 +704,7 @@ data = {}
 ##  Data manipulation methods
 ##
 #############################
-def load(datasource=None, check=None, verbose=None):
+def load(datasource=None, check=None, verbose=None, lazy=None, cache=None):
     """Import all *.hpd files in a directory
     load()
         or
@@ -60,6 +730,34 @@ The pm.config parameters that affect load() are:
     Overwrite existing data? (default=True)
 'dat_recursive'
     Recurse into subdirectories? (default=True)
+'dat_lazy'
+    Only index the files instead of loading them?
+    Override by setting the 'lazy' keyword argument.
+    (default=True)
+
+In lazy mode, load() only reads the ID string from each file and 
+records the file in data.index.  The file is parsed and its instance 
+is created the first time the substance is requested (see PMData).  
+The rules for redundant IDs are applied to the index exactly as they
+would be to the loaded data, but files that fail to parse are only 
+reported when they are requested.
+'dat_cache'
+    Read directories from their cache bundles?
+    Override by setting the 'cache' keyword argument.
+    (default=False)
+
+When the cache is enabled, each directory is read from a single pickle
+file in pm.config['dat_cache_dir'] instead of opening and parsing its
+files one-by-one.  The bundle records the modification time and size of
+every file it contains, and it is rebuilt automatically when any file 
+in the directory is added, removed, or modified (see build_cache()).
+If the cache directory is not writable, the files are read directly.
+'dat_compact'
+    Compact the data of each new instance?  (default=False)
+
+In compact mode, coefficient lists are stored as read-only arrays, 
+repeated strings are shared, and large reference tables are read back 
+from their files only when they are used (see reg.PMCompactData).
 
 The separate optional keyword argument, 'check' prompts load() to run a 
 data test instead of actually loading data if it is True.
@@ -100,6 +798,10 @@ data
     exist_fatal = pm.config['dat_exist_fatal']
     exist_overwrite = pm.config['dat_overwrite']
     recursive = pm.config['dat_recursive']
+    if lazy is None:
+        lazy = pm.config['dat_lazy']
+    if cache is None:
+        cache = pm.config['dat_cache']
 
     # If the load function is called with check=True, then it's time to 
     # make a few changes to the typical operation.  All recursive calls
@@ -119,6 +821,8 @@ data
     else:
         # if this is real, load the data into the data dictionary
         loadto = data
+        # Mixtures built from the old data are no longer valid
+        pm.mixture.clear_cache()
 
 
     # load is recursive. Unless load is called explicitly
@@ -132,37 +836,12 @@ data
         datasource = pm.utility.os.path.expanduser(datasource)
         datasource = pm.utility.os.path.expandvars(datasource)
         datasource=utility.os.path.abspath(datasource)
-        # if the data source is a directory
+        # if the data source is a directory, try its cache bundle first,
+        # and read its files one-by-one if there is no usable bundle
         if utility.os.path.isdir(datasource):
-            # list the contents of the directory
-            contents = utility.os.listdir(datasource)
-            contents.sort()
-            out='In directory ' + repr(datasource) + ' found files: '
-            for this in contents:
-                this_long = utility.os.path.join(datasource,this)
-                # if recursion is enabled, and we come across a directory
-                if recursive and utility.os.path.isdir(this_long):
-                    #
-                    # recurse into sub-directories
-                    load(this_long,check=check,verbose=verbose)
-                # if this is a file and it has the .hpd extension
-                elif len(this)>4 and this[-4:]=='.hpd':
-                    #
-                    # recurse with the actual file name
-                    load(this_long,check=check,verbose=verbose)
-
-                    # assemble an output string
-                    if verbose:
-                        out += (this+', ')
-
-                elif check and len(this)>5 and this[-5:]=='.hpd~':
-                    #
-                    # note if there are suppressed files
-                    SUP.append(this_long)
-
-            if verbose:
-                utility.print_line('',lead)
-                utility.print_line(out,lead)
+            if not (cache and not check and 
+                    _load_bundle(datasource, recursive, lazy, verbose)):
+                _load_dir(datasource, check, verbose, lazy, recursive)
 
         # if the data source is a file
         elif utility.os.path.isfile(datasource):
@@ -173,6 +852,14 @@ data
             # All recursive calls end here.
             #
             
+            # In lazy mode, only the ID is read, and the file is indexed
+            idstr = None
+            if lazy and not check:
+                idstr = _scan_id(datasource)
+            if idstr is not None:
+                _insert(idstr, datasource, None, True, verbose)
+                return
+
             # If running in check mode, test to see if the load fails
             if check:
                 try:
@@ -242,7 +929,8 @@ data
                 utility.print_error('Species ' + repr(temp['id']) + ' called for data class ' + repr(temp['class']) + '.  That class does not exist in the registry.  The data file is corrupt or out of date.')
                 raise utility.PMDataError()
             # write the data
-            loadto[temp['id']] = dataclass(temp)
+            with utility.profile('class', temp['id'], **{'class':temp['class']}):
+                loadto[temp['id']] = _instance(dataclass, temp)
 
         else:
             # does not exist
@@ -252,7 +940,7 @@ data
     else:        
 
         for dd in pm.config['dat_dir']:
-            load(dd, check=check, verbose=verbose)
+            load(dd, check=check, verbose=verbose, lazy=lazy, cache=cache)
 
 
     if check and root:
@@ -313,7 +1001,7 @@ data
 
 def clear():
     """Empty the data dictionary."""
-    pm.dat.data = {}
+    data.clear()
 
 
 
@@ -344,7 +1032,7 @@ function.
     lead = 'new-> '
     if ('id' in newdata) and ('class' in newdata):
         if newdata['class'] in reg.registry:
-            data[newdata['id']] = reg.registry[newdata['class']]( newdata )
+            data[newdata['id']] = _instance(reg.registry[newdata['class']], newdata)
         else:
             utility.print_error(
 'Could not find the class "' + newdata['class'] + '" in the registry.', lead)
@@ -487,7 +1175,7 @@ for a decision.
         FIL = None
         try:
             FIL = open(fil,'w')
-            pm.utility.json.dump(this.data,FIL,sort_keys=True,indent=4)
+            pm.utility.json.dump(this.data.copy(),FIL,sort_keys=True,indent=4)
             FIL.close()
         except:
             pm.utility.print_warning(
@@ -528,7 +1216,7 @@ for a decision.
 
         try:
             FIL = open(fil,'w')
-            pm.utility.json.dump(this.data,FIL,sort_keys=True,indent=4)
+            pm.utility.json.dump(this.data.copy(),FIL,sort_keys=True,indent=4)
             FIL.close()
             if verbose:
                 pm.utility.print_line('Updated file: ' + fil, lead)
@@ -0,0 +1,439 @@
+"""PYroMat chemical equilibrium module
+
+A PMEquilibrium object finds the composition of an ideal gas mixture
+that minimizes its Gibbs energy while conserving the elements in its
+reactants.  It is built from a list of ideal gas species (ig or ig2
+classes) that may appear in the products, and every solution method
+accepts arrays of states.
+
+    >>> import pyromat as pm
+    >>> eq = pm.equilibrium.PMEquilibrium(['ig.N2', 'ig.O2', 'ig.H2',
+    ...         'ig.H2O', 'ig.HO', 'ig.H', 'ig.O', 'ig.NO'])
+    >>> X0 = [0.79, 0.21, 0.42, 0., 0., 0., 0., 0.]
+    >>> X = eq.Tp(T=[1500., 2000., 2500.], p=1.01325, X0=X0)
+    >>> T,X = eq.hp(p=1.01325, X0=X0, T0=298.15)
+
+The reactants are given by mole fractions, X0, or mass fractions, Y0,
+of the same species, in arrays whose last dimension has one element per
+species.  Their other dimensions are broadcast against the state arrays
+(see PMVarMix).  The reactant species do not need to be present in the
+products, but every element of the reactants must appear in at least
+one product species.  Species whose elements are absent from the
+reactants of a state are excluded from its products.  Charge is
+conserved like an element (the 'e' entry of atoms()), so ions are only
+included when the species list can keep the mixture neutral.
+
+** Solution Methods **
+  Tp()  composition at a temperature and pressure
+  hp()  temperature and composition at an enthalpy and pressure
+
+** Implementation **
+The solver follows the reduced Newton iteration of Gordon and McBride
+(NASA RP-1311, 1994).  The unknowns are the logarithms of the number of
+moles of each species per unit mass and of the total moles (and of the
+temperature for hp()), and the element conservation constraints are
+enforced with Lagrange multipliers.  Every iteration forms the reduced
+(E+1) or (E+2) linear system for all of the states at once and solves
+them with a single batched call to numpy.linalg.solve().  The standard
+state properties of all species are evaluated together by a PMBatch
+object.  States leave the iteration as they converge.
+
+States are treated as a sweep in the order of their flattened arrays.
+When warm is True (the default), the first state is solved from the
+usual uniform initial composition, and the rest are solved in passes
+that fill in the states half way between the ones already solved, so
+that each one starts from the solution of its neighbor.  Neighbors
+usually differ little, so a warm start converges in a few iterations.
+"""
+
+import numpy as np
+import pyromat as pm
+
+
+class PMEquilibrium:
+    """Chemical equilibrium of an ideal gas mixture
+    eq = PMEquilibrium(species)
+
+species is a list of ig or ig2 substance id strings.  They are the
+species that may be present in the products.  The element matrix is
+built from their atoms() methods.
+
+  Tp(T, p, X0=None, Y0=None, warm=True)
+        Returns the mole fractions of the products
+  hp(h=None, p=None, X0=None, Y0=None, T0=None, warm=True)
+        Returns the temperature and the mole fractions of the products
+
+All states must lie within the temperature limits shared by every
+species (see Tlim()).
+"""
+    def __init__(self, species):
+        self.species = tuple(species)
+        self._batch = pm.mixture.PMBatch(self.species)
+        self._mix = pm.mixture.PMVarMix(self.species)
+        atoms = []
+        for ss in self.species:
+            aa = pm.get(ss).atoms()
+            if not aa:
+                raise pm.utility.PMParamError('PMEquilibrium: The species ' + ss +
+                        ' does not have atomic data.')
+            atoms.append(aa)
+        self.elements = tuple(sorted(set().union(*atoms)))
+        # The element matrix, A[i,j], is the number of atoms of element i
+        # in species j.
+        self._A = np.zeros((len(self.elements), len(self.species)), dtype=float)
+        for jj,aa in enumerate(atoms):
+            for ee,count in aa.items():
+                self._A[self.elements.index(ee),jj] = count
+        # Charge is not a material element; the rest are
+        self._charge = self._A[self.elements.index('e')] \
+                if 'e' in self.elements else None
+        self._material = np.array([ee != 'e' for ee in self.elements])
+        self._lnTlim = np.log(self._mix._Tlim)
+
+
+    def __repr__(self):
+        return '<PMEquilibrium with {:d} species>'.format(len(self.species))
+
+
+    def Tlim(self):
+        """Temperature limits
+    Tmin, Tmax = Tlim()
+
+The limits are the highest minimum and the lowest maximum of all of the
+species.
+
+Returns unit_temperature
+"""
+        return self._mix.Tlim()
+
+
+    def _reactants(self, X0, Y0, *arg):
+        """Prepare the reactants and states (inner routine)
+    b, x0, mw, allow, shape, a1, a2, ... = _reactants(X0, Y0, a1, a2, ...)
+
+The reactant composition is broadcast against the state arrays (see
+PMVarMix._broadcast()).  b is an (N,E) array of the kmol of each element
+per kg of reactants, x0 is the (N,K) array of reactant mole fractions,
+mw is the molecular weight of the reactants at each point, and allow is
+an (N,K) boolean array that is True for the species that may be present
+at each point.
+"""
+        x0 = self._mix._composition(X0, Y0)
+        out = self._mix._broadcast(x0, *arg)
+        x0,mw = out[0],out[1]
+        b = np.dot(x0, self._A.T) / mw[:,np.newaxis]
+        # A species is allowed when all of its material elements are
+        # present in the reactants
+        absent = np.logical_and(b <= 0., self._material)
+        allow = np.logical_not(np.dot(absent, self._A != 0))
+        # Ions are allowed when there are both positive and negative ones
+        if self._charge is not None:
+            pos = np.logical_and(allow, self._charge < 0).any(axis=1)
+            neg = np.logical_and(allow, self._charge > 0).any(axis=1)
+            noions = np.logical_not(np.logical_and(pos, neg))
+            allow[noions] = np.logical_and(allow[noions], self._charge == 0)
+        # Every material element must be able to appear in the products
+        I = np.logical_and(b > 0.,
+                np.logical_not(np.dot(allow, self._A.T != 0)))
+        if I.any():
+            missing = [self.elements[ii] for ii in np.flatnonzero(I.any(axis=0))]
+            raise pm.utility.PMParamError('PMEquilibrium: None of the product species can hold the reactant element(s): ' +
+                    ', '.join(missing))
+        b[:,np.logical_not(self._material)] = 0.
+        return [b, x0, mw, allow] + out[2:]
+
+
+    def _props(self, T):
+        """Dimensionless standard state properties (inner routine)
+    H, S, CP = _props(T)
+
+T is a 1-D array of N temperatures in Kelvin.  Returns (N,K) arrays of
+h/RT, s0/R, and cp/R for every species at every temperature.  The
+entropies are at each species' reference pressure.
+"""
+        Ru = pm.units.const_Ru
+        H = self._batch._h(T).T / (Ru * T[:,np.newaxis])
+        S = self._batch._s(T).T / Ru
+        CP = self._batch._cp(T).T / Ru
+        return H, S, CP
+
+
+    def _newton(self, b, lnp, allow, lnn, lnN, lnT, h=None,
+            ep=1e-9, epmu=1e-6, Nmax=100):
+        """Solve for equilibrium by Newton iteration (inner routine)
+    lnn, lnN, lnT, conv = _newton(b, lnp, allow, lnn, lnN, lnT, h=None)
+
+b       (N,E) kmol of each element per kg of reactants
+lnp     (N,) natural log of the pressure in Pa
+allow   (N,K) True for the species allowed at each point
+lnn     (N,K) initial natural log of kmol of each species per kg
+lnN     (N,) initial natural log of the total kmol per kg
+lnT     (N,) natural log of the temperature in Kelvin
+h       (N,) enthalpy in kJ/kg or None
+
+When h is None, the temperature is held fixed.  Otherwise, it is also
+an unknown.  The updated values are returned with conv, a boolean array
+that is True for the points that converged.  A point has converged when
+the change in the total moles scaled by the total moles and the change
+in ln(T) are less than ep, the elements balance to within ep, and the
+chemical potential residual (in units of RT) of every species is less
+than epmu.  Trace species, whose mole fractions are smaller than 1e-8
+both before and after a full step, are exempt from the last test.
+
+The step is limited as recommended by Gordon and McBride; species whose
+mole fractions are smaller than 1e-8 are not allowed to grow beyond
+1e-4 in one step, and the other unknowns are not allowed to change by
+more than a factor of e**0.4 in one step.
+"""
+        Ru = pm.units.const_Ru
+        A = self._A
+        nelem = A.shape[0]
+        hp = h is not None
+        m = nelem + 2 if hp else nelem + 1
+
+        N = lnN.size
+        lnn = lnn.copy()
+        lnN = lnN.copy()
+        lnT = lnT.copy()
+        conv = np.zeros(N, dtype=bool)
+        lnpref = self._batch._lnpref
+        bmax = b.max(axis=1)
+        # Elements that no allowed species contains are removed from the
+        # system by replacing their rows with the identity
+        idle = np.logical_not(np.dot(allow, A.T != 0))
+
+        I = np.arange(N)
+        # The (N,K) properties only change with temperature
+        H,S,CP = self._props(np.exp(lnT))
+        probe = pm.stats.probe(self, '_newton', self._batch._g, None, N)
+        count = 0
+        while I.size and count < Nmax:
+            if hp and count:
+                H,S,CP = self._props(np.exp(lnT[I]))
+            elif count:
+                H,S,CP = H[Iwork],S[Iwork],CP[Iwork]
+            if probe:
+                probe.eval(I.size)
+            al = allow[I]
+            bb = b[I]
+            nn = lnN[I]
+            w = np.where(al, np.exp(lnn[I]), 0.)
+            # Dimensionless chemical potentials
+            mu = H - S + lnn[I] - nn[:,np.newaxis] + \
+                    lnp[I,np.newaxis] - lnpref
+            mu[np.logical_not(al)] = 0.
+
+            Aw = w[:,np.newaxis,:] * A
+            bnow = Aw.sum(axis=2)
+            wsum = w.sum(axis=1)
+            M = np.zeros((I.size, m, m), dtype=float)
+            r = np.zeros((I.size, m), dtype=float)
+            M[:,:nelem,:nelem] = np.matmul(Aw, A.T)
+            M[:,:nelem,nelem] = bnow
+            M[:,nelem,:nelem] = bnow
+            M[:,nelem,nelem] = wsum - np.exp(nn)
+            r[:,:nelem] = bb - bnow + np.einsum('nek,nk->ne', Aw, mu)
+            r[:,nelem] = np.exp(nn) - wsum + (w*mu).sum(axis=1)
+            if hp:
+                wH = w*H
+                AwH = np.dot(wH, A.T)
+                M[:,:nelem,nelem+1] = AwH
+                M[:,nelem+1,:nelem] = AwH
+                M[:,nelem,nelem+1] = M[:,nelem+1,nelem] = wH.sum(axis=1)
+                M[:,nelem+1,nelem+1] = (w*(CP + H*H)).sum(axis=1)
+                r[:,nelem+1] = h[I] / (Ru*np.exp(lnT[I])) - wH.sum(axis=1) + \
+                        (wH*mu).sum(axis=1)
+            Ii,Ie = np.nonzero(idle[I])
+            M[Ii,Ie,:] = 0.
+            M[Ii,:,Ie] = 0.
+            M[Ii,Ie,Ie] = 1.
+            r[Ii,Ie] = 0.
+
+            x = np.linalg.solve(M, r[:,:,np.newaxis])[:,:,0]
+            dlnN = x[:,nelem]
+            dlnT = x[:,nelem+1] if hp else np.zeros_like(dlnN)
+            dlnn = np.dot(x[:,:nelem], A) - mu + dlnN[:,np.newaxis] + \
+                    H * dlnT[:,np.newaxis]
+            dlnn[np.logical_not(al)] = 0.
+
+            # Limit the step
+            lnx = lnn[I] - nn[:,np.newaxis]
+            major = lnx > -18.420681
+            grow = np.logical_and(al, dlnn > 0.)
+            d1 = np.maximum(5.*np.abs(dlnT), 5.*np.abs(dlnN))
+            d1 = np.maximum(d1,
+                    np.where(np.logical_and(grow, major), dlnn, 0.).max(axis=1))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                lam = np.where(d1 > 0., 2./d1, 1.)
+                d2 = np.abs((-lnx - 9.2103404) /
+                        (dlnn - dlnN[:,np.newaxis]))
+            d2[np.logical_not(np.logical_and(grow, np.logical_not(major)))] = np.inf
+            lam = np.minimum(np.minimum(lam, 1.), d2.min(axis=1))
+            lam = lam[:,np.newaxis]
+
+            lnn[I] += lam * dlnn
+            lnN[I] += lam[:,0] * dlnN
+            if hp:
+                lnT[I] = np.clip(lnT[I] + lam[:,0]*dlnT,
+                        self._lnTlim[0], self._lnTlim[1])
+            # Keep trace species from underflowing
+            lnn[I] = np.maximum(lnn[I], lnN[I,np.newaxis] - 300.)
+
+            # Test for convergence
+            with np.errstate(divide='ignore', invalid='ignore'):
+                error = np.exp(nn)*np.abs(dlnN) / wsum
+            error = np.maximum(error, np.abs(dlnT))
+            # The chemical potential residual of every species that is, or
+            # would be after a full step, larger than a trace
+            rmu = np.abs(dlnn - dlnN[:,np.newaxis] - H*dlnT[:,np.newaxis])
+            trace = np.logical_and(lnx < -18.420681, 
+                    lnx + dlnn - dlnN[:,np.newaxis] < -18.420681)
+            rmu[np.logical_or(trace, np.logical_not(al))] = 0.
+            error = np.maximum(error, np.abs(bb - bnow).max(axis=1) / bmax[I])
+            Iwork = np.logical_not(np.logical_and(error < ep, 
+                    rmu.max(axis=1) < epmu))
+            conv[I[np.logical_not(Iwork)]] = True
+            I = I[Iwork]
+            count += 1
+        if probe:
+            probe.done(count, I.size)
+        return lnn, lnN, lnT, conv
+
+
+    def _solve(self, b, lnp, allow, lnT, h=None, warm=True):
+        """Solve for equilibrium at every point (inner routine)
+    lnn, lnT = _solve(b, lnp, allow, lnT, h=None, warm=True)
+
+The arguments are the same as _newton(), but the initial composition is
+built here.  When warm is True, the points are solved in passes; each
+pass solves the points half way between those already solved, and each
+point starts from the solution of its neighbor at a lower index.
+Points that fail to converge are set to config['def_oob'] with a
+warning.
+"""
+        N = lnp.size
+        K = len(self.species)
+        # The uniform initial estimate of Gordon and McBride
+        cold_n = np.full((N,K), np.log(0.1/K))
+        cold_N = np.full(N, np.log(0.1))
+        cold_T = lnT.copy()
+        lnn = cold_n.copy()
+        lnN = cold_N.copy()
+        conv = np.zeros(N, dtype=bool)
+
+        if warm and N > 1:
+            stride = 1
+            while stride < N:
+                stride *= 2
+            passes = [(np.array([0]), None)]
+            while stride > 1:
+                stride //= 2
+                J = np.arange(stride, N, 2*stride)
+                passes.append((J, J - stride))
+        else:
+            passes = [(np.arange(N), None)]
+
+        for J,src in passes:
+            if src is not None:
+                # Start from the neighbor when it converged
+                good = conv[src]
+                Jg = J[good]
+                lnn[Jg] = lnn[src[good]]
+                lnN[Jg] = lnN[src[good]]
+                if h is not None:
+                    lnT[Jg] = lnT[src[good]]
+                # Species that the neighbor did not allow begin as traces
+                new = np.logical_and(allow[Jg], np.logical_not(allow[src[good]]))
+                lnn[Jg] = np.where(new, lnN[Jg,np.newaxis] - 18.420681, lnn[Jg])
+            lnn[J],lnN[J],lnT[J],conv[J] = self._newton(b[J], lnp[J],
+                    allow[J], lnn[J], lnN[J], lnT[J],
+                    h=None if h is None else h[J])
+            # Retry failed warm starts from the uniform estimate
+            if src is not None and not conv[J].all():
+                Jf = J[np.logical_not(conv[J])]
+                lnn[Jf],lnN[Jf],lnT[Jf],conv[Jf] = self._newton(b[Jf],
+                        lnp[Jf], allow[Jf], cold_n[Jf], cold_N[Jf],
+                        cold_T[Jf], h=None if h is None else h[Jf])
+
+        if not conv.all():
+            pm.utility.print_warning('PMEquilibrium: {:d} of {:d} states did not converge - setting to config[\'def_oob\'].'.format(
+                    N - np.count_nonzero(conv), N))
+        lnn[np.logical_not(allow)] = -np.inf
+        lnn[np.logical_not(conv)] = pm.config['def_oob']
+        lnT[np.logical_not(conv)] = pm.config['def_oob']
+        return lnn, lnT
+
+
+    def _result(self, lnn, shape):
+        """Convert the log moles to mole fractions (inner routine)"""
+        n = np.exp(lnn - lnn.max(axis=1)[:,np.newaxis])
+        return (n / n.sum(axis=1)[:,np.newaxis]).reshape(shape + (len(self.species),))
+
+
+    def _pressure(self, p):
+        """Convert pressure to Pa (inner routine)"""
+        if p is None:
+            p = pm.config['def_p']
+        return pm.units.pressure(np.asarray(p, dtype=float), to_units='Pa')
+
+
+    def Tp(self, T=None, p=None, X0=None, Y0=None, warm=True):
+        """Equilibrium composition at a temperature and pressure
+    X = Tp(T=None, p=None, X0=None, Y0=None, warm=True)
+
+Accepts:    Temperature [unit_temperature]
+            Pressure    [unit_pressure]
+            X0 or Y0    Reactant mole or mass fractions
+            warm        Warm-start each state from its neighbor
+Returns:    Product mole fractions
+
+The last dimension of X has one element per species.  Its other
+dimensions are the broadcast shape of the states and the reactants.
+"""
+        if T is None:
+            T = pm.config['def_T']
+        T = pm.units.temperature_scale(np.asarray(T, dtype=float), to_units='K')
+        p = self._pressure(p)
+        b,_,_,allow,shape,T,p = self._reactants(X0, Y0, T, p)
+        I = np.logical_or(T < self._mix._Tlim[0], T > self._mix._Tlim[1])
+        if I.any():
+            raise pm.utility.PMParamError('PMEquilibrium: Temperatures must be between {} and {} Kelvin.'.format(
+                    self._mix._Tlim[0], self._mix._Tlim[1]))
+        lnn,_ = self._solve(b, np.log(p), allow, np.log(T), warm=warm)
+        return self._result(lnn, shape)
+
+
+    def hp(self, h=None, p=None, X0=None, Y0=None, T0=None, warm=True):
+        """Equilibrium temperature and composition at an enthalpy and pressure
+    T, X = hp(h=None, p=None, X0=None, Y0=None, T0=None, warm=True)
+
+Accepts:    Enthalpy    [unit_energy / unit_matter]
+            Pressure    [unit_pressure]
+            X0 or Y0    Reactant mole or mass fractions
+            T0          Reactant temperature [unit_temperature]
+            warm        Warm-start each state from its neighbor
+Returns:    Temperature [unit_temperature]
+            Product mole fractions
+
+The enthalpy is per unit matter of the reactants.  When h is not given,
+it is the enthalpy of the reactants at T0 (or config['def_T']), so T is
+the adiabatic flame temperature.  The last dimension of X has one
+element per species.  Its other dimensions are the broadcast shape of
+the states and the reactants.
+"""
+        p = self._pressure(p)
+        if h is None:
+            if T0 is None:
+                T0 = pm.config['def_T']
+            T0 = pm.units.temperature_scale(np.asarray(T0, dtype=float), to_units='K')
+            b,x0,mw,allow,shape,p,T0 = self._reactants(X0, Y0, p, T0)
+            T0 = self._mix._Tcheck(T0)
+            h = self._mix._h(T0, x0)[0] / mw
+        else:
+            b,_,mw,allow,shape,p,h = self._reactants(X0, Y0, p, h)
+            h = np.divide(h, pm.units.plan(mw, energy='kJ', matter=('kg',-1)))
+        # Start from the upper limit or 3800K like Gordon and McBride
+        lnT = np.full(p.shape, np.log(min(3800., self._mix._Tlim[1])))
+        lnn,lnT = self._solve(b, np.log(p), allow, lnT, h=h, warm=warm)
+        T = pm.units.temperature_scale(np.exp(lnT).reshape(shape), from_units='K')
+        return T, self._result(lnn, shape)
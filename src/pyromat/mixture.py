@@ -0,0 +1,970 @@
+"""PYroMat variable-composition mixture module
+
+The igmix class models a mixture with a fixed composition that is set
+by its data file.  When the composition changes from point to point (as
+it does in every cell of a combustion simulation), a PMVarMix object
+evaluates the properties of all of the points at once.  It is built
+from a list of ideal gas species (ig or ig2 classes), and every property
+method accepts an array of compositions.
+
+    >>> import pyromat as pm
+    >>> mix = pm.mixture.PMVarMix(['ig.N2', 'ig.O2', 'ig.CO2', 'ig.H2O'])
+    >>> X = [[0.79, 0.21, 0., 0.], [0.73, 0.05, 0.08, 0.14]]
+    >>> h = mix.h(T=[300., 1800.], X=X)
+    >>> T = mix.T(h=h, X=X)
+
+Compositions are given by mole fractions, X, or mass fractions, Y, in
+arrays whose last dimension has one element per species.  The other
+dimensions are broadcast against the state arrays.  Fractions that do
+not sum to one are normalized.
+
+** Available Property Methods **
+  T()  temperature from enthalpy or internal energy (unit_temperature)
+  cp() spec. heat       (unit_energy / unit_temperature / unit_matter)
+  cv() spec. heat       (unit_energy / unit_temperature / unit_matter)
+  gam()  spec. heat ratio (dless)
+  e()  internal energy  (unit_energy / unit_matter)
+  h()  enthalpy         (unit_energy / unit_matter)
+  s()  entropy          (unit_energy / unit_temperature / unit_matter)
+  mw() molecular weight (unit_mass / unit_molar)
+  R()  gas constant     (unit_energy / unit_temperature / unit_matter)
+  Tlim()  temperature limits  (unit_temperature)
+
+Like igmix, entropy is calculated for a pseudo-pure gas that has a
+log-mean reference pressure, so it does not include the entropy of
+mixing unless s() is called with mixing=True.
+
+** Fixed-composition mixtures **
+The mix() function builds igmix objects at run time without a data file.
+    >>> air = pm.mix({'ig.N2':0.78, 'ig.O2':0.21, 'ig.Ar':0.01})
+    >>> air.h(T=500.)
+The bootstrapped mixtures are kept in a least-recently-used cache, so 
+repeated requests for the same composition return the same object 
+without rebuilding its merged polynomial.  The number of mixtures kept
+is set by config['mix_cache_size'].  The cache is cleared when data are
+loaded by pm.dat.load() or by calling clear_cache().
+
+** Batches of species **
+The batch() function builds a PMBatch object that evaluates the 
+properties of many pure species at the same temperatures.
+    >>> b = pm.batch(['ig.N2', 'ig.O2', 'ig.H2O', 'ig.CO2'])
+    >>> h = b.h(T=[300., 1000.])      # one row per species
+The result has one row per species, so it is the matrix of properties
+that an equilibrium or kinetics calculation needs, and it is built 
+without calling each species' methods in turn.
+
+** Implementation **
+The specific heats of the ig and ig2 species are both linear in their
+coefficients.  When the mixture is created, the coefficients of every
+species are expressed in a common polynomial form (see the _tpoly()
+methods of the ig and ig2 classes) and stacked on the union of the
+species' temperature segments.  Each property call finds the segment of
+every point once, and the coefficients of the mixture at each point are
+the matrix product of its mole fractions with the stacked coefficients
+of its segment.  PMBatch uses the same stacked coefficients; the 
+properties of all species in a segment are the matrix product of the
+coefficients with the powers of the temperatures in that segment.
+"""
+
+import numpy as np
+import pyromat as pm
+from collections import OrderedDict
+from math import fsum
+
+
+# The mixtures built by mix(), in order from least to most recently used
+_cache = OrderedDict()
+
+
+def mix(contents, bymass=False):
+    """Build an ideal gas mixture object
+    mixobj = mix(contents, bymass=False)
+
+contents is a dictionary with ig or ig2 substance id strings as its keys
+and the quantity of each as its values.  When bymass is False, they are
+treated as moles, and when it is True, they are treated as masses.  They
+do not need to sum to one.  Species with zero quantity are ignored.
+
+    >>> air = pm.mix({'ig.N2':0.78, 'ig.O2':0.21, 'ig.Ar':0.01})
+
+The result is an igmix object that has already been bootstrapped.  Its 
+id is built from its composition.  Identical compositions return the 
+same object from a least-recently-used cache (see config['mix_cache_size']),
+so the object should not be modified.
+"""
+    if not isinstance(contents, dict) or not contents:
+        raise pm.utility.PMParamError('MIX: contents must be a non-empty dictionary of species and quantities.')
+    qtys = {}
+    for ss,qty in contents.items():
+        if not isinstance(pm.dat.data.get(ss), 
+                (pm.reg.registry['ig'], pm.reg.registry['ig2'])):
+            raise pm.utility.PMParamError('MIX: Only loaded ig and ig2 species may be mixed: ' + repr(ss))
+        qty = float(qty)
+        if not qty >= 0.:
+            raise pm.utility.PMParamError('MIX: Species quantities must be non-negative: ' + repr(ss))
+        if qty > 0.:
+            qtys[ss] = qty
+    # fsum() is exact, so the total does not depend on the order
+    total = fsum(qtys.values())
+    if not total > 0.:
+        raise pm.utility.PMParamError('MIX: At least one species quantity must be positive.')
+
+    # The key is the normalized composition in a fixed order
+    bymass = bool(bymass)
+    key = (bymass,) + tuple(sorted(
+            (ss, qty/total) for ss,qty in qtys.items()))
+    mixobj = _cache.get(key)
+    if mixobj is not None:
+        _cache.move_to_end(key)
+        return mixobj
+
+    idstr = 'mix(' + ', '.join(
+            '{:s}:{:.6g}'.format(ss,qty) for ss,qty in key[1:]) + ')'
+    data = {'id':idstr,
+            'class':'igmix',
+            'doc':'Built at run time by pyromat.mix() with the composition ' +
+                ('by mass' if bymass else 'by mole') + ' in its id.',
+            'fromfile':'',
+            'bymass':bymass,
+            'contents':dict(key[1:])}
+    mixobj = pm.reg.registry['igmix'](data)
+    mixobj._bootstrap()
+
+    _cache[key] = mixobj
+    while len(_cache) > max(pm.config['mix_cache_size'], 0):
+        _cache.popitem(last=False)
+    return mixobj
+
+
+def clear_cache():
+    """Discard the mixtures kept by mix()"""
+    _cache.clear()
+
+
+def _stack(species, caller):
+    """Stack the coefficients of ig and ig2 species (primative routine)
+    mw, lnpref, Tlim, Tseg, Ptab, valid = _stack(species, caller)
+
+species is a sequence of substance id strings, and caller is a name to
+use in error messages.  For K species,
+mw      (K,) molecular weights in kg/kmol
+lnpref  (K,) natural logarithms of the reference pressures in Pa
+Tlim    (K,2) temperature limits in Kelvin
+Tseg    The union of all of the species' Tlim values
+Ptab    Ptab[seg,k,:] are the coefficients of species k in segment seg
+        in the form returned by the species' _tpoly() methods
+valid   valid[seg,k] is True when segment seg is in the range of 
+        species k.  Otherwise, Ptab[seg,k,:] is zero.
+"""
+    nspec = len(species)
+    mw = np.zeros(nspec, dtype=float)
+    lnpref = np.zeros(nspec, dtype=float)
+    Tlim = np.zeros((nspec,2), dtype=float)
+    Tseg = []
+    tpoly = []
+    for index,ss in enumerate(species):
+        spec = pm.dat.data.get(ss)
+        if spec is None:
+            raise pm.utility.PMParamError(caller + ': No substance named "' + str(ss) + '" was found in the loaded data.')
+        # IG stores reference pressure as a member
+        elif isinstance(spec, pm.reg.registry['ig']):
+            spec_pref = spec._pref_pa
+        # IG2 stores reference pressure in the data dictionary
+        elif isinstance(spec, pm.reg.registry['ig2']):
+            spec_pref = spec.data['pref']
+        else:
+            raise pm.utility.PMParamError(caller + ': Only ig and ig2 species are supported: ' + repr(spec))
+
+        mw[index] = spec.data['mw']
+        lnpref[index] = np.log(spec_pref)
+        Tlim[index] = spec.data['Tlim'][0], spec.data['Tlim'][-1]
+        Tseg += list(spec.data['Tlim'])
+        tpoly.append(spec._tpoly())
+
+    Tseg = np.unique(Tseg)
+    Tmid = 0.5*(Tseg[:-1] + Tseg[1:])
+    Ptab = np.zeros((Tmid.size, nspec, 8), dtype=float)
+    valid = np.logical_and(Tmid[:,np.newaxis] > Tlim[:,0], 
+            Tmid[:,np.newaxis] < Tlim[:,1])
+    for index,(spec_Tseg, spec_P) in enumerate(tpoly):
+        seg = np.searchsorted(spec_Tseg[1:-1], Tmid, side='right')
+        Ptab[:,index,:] = spec_P[:,seg].T
+    Ptab[np.logical_not(valid)] = 0.
+    return mw, lnpref, Tlim, Tseg, Ptab, valid
+
+
+class PMVarMix:
+    """A variable-composition ideal gas mixture
+    mix = PMVarMix(species)
+
+species is a list of substance id strings for ig or ig2 species.  Their
+order sets the order of the last dimension of the composition arrays.
+
+    mix.h(T=T, X=X)
+    mix.s(T=T, p=p, Y=Y)
+    mix.T(h=h, X=X)
+
+See the pyromat.mixture module documentation for more information.
+"""
+    def __init__(self, species):
+        self.species = tuple(species)
+        if not self.species:
+            raise pm.utility.PMParamError('PMVarMix: At least one species is required.')
+
+        self._mw, self._lnpref, Tlim, Tseg, Ptab, valid = \
+                _stack(self.species, 'PMVarMix')
+        self._Tlim = [Tlim[:,0].max(), Tlim[:,1].min()]
+        if self._Tlim[0] >= self._Tlim[1]:
+            raise pm.utility.PMParamError('PMVarMix: The species do not share a common temperature range.')
+
+        # Keep only the segments where all of the species are valid.
+        # _Ptab[segment, species, coefficient]
+        I = np.flatnonzero(valid.all(axis=1))
+        self._Tseg = Tseg[I[0]:I[-1]+2]
+        self._Ptab = Ptab[I]
+
+
+    def __repr__(self):
+        return '<PMVarMix, ' + ', '.join(self.species) + '>'
+
+
+    def _composition(self, X=None, Y=None):
+        """Normalize the composition (inner routine)
+    x = _composition(X=None, Y=None)
+
+Exactly one of the mole fractions, X, or the mass fractions, Y, must be
+given.  Returns an array of mole fractions with the same shape.
+"""
+        if (X is None) == (Y is None):
+            raise pm.utility.PMParamError('PMVarMix: Exactly one of X or Y must be specified.')
+        if X is None:
+            x = np.asarray(Y, dtype=float) / self._mw
+        else:
+            x = np.asarray(X, dtype=float)
+
+        if x.ndim == 0 or x.shape[-1] != len(self.species):
+            raise pm.utility.PMParamError('PMVarMix: The last dimension of the composition must have one element for each of the {:d} species.'.format(len(self.species)))
+        total = x.sum(axis=-1)
+        if (x < 0).any() or not (total > 0).all():
+            raise pm.utility.PMParamError('PMVarMix: Mole and mass fractions must be non-negative, and they may not all be zero.')
+        return x / total[...,np.newaxis]
+
+
+    def _broadcast(self, x, *arg):
+        """Broadcast the composition against state arrays (inner routine)
+    x, mw, shape, a1, a2, ... = _broadcast(x, a1, a2, ...)
+
+The returned mole fractions, x, are flattened into a 2-D array with one
+row per point, the state arrays are flattened to match, and mw is the
+molecular weight of each point.  The original shape of the points is
+returned so that the results may be reshaped.
+"""
+        arg = [np.asarray(a, dtype=float) for a in arg]
+        shape = np.broadcast_shapes(x.shape[:-1], *[a.shape for a in arg])
+        if not shape:
+            shape = (1,)
+        x = np.broadcast_to(x, shape + x.shape[-1:]).reshape(-1, x.shape[-1])
+        arg = [np.broadcast_to(a, shape).reshape(-1) for a in arg]
+        return [x, np.dot(x, self._mw), shape] + arg
+
+
+    def _Tcheck(self, T):
+        """Apply the temperature limits (inner routine)
+    T = _Tcheck(T)
+
+Temperatures out of bounds are replaced with config['def_oob'] with a
+warning.  If all are out of bounds, a PMParamError is raised.
+"""
+        I = np.logical_or(T < self._Tlim[0], T > self._Tlim[1])
+        if I.all():
+            raise pm.utility.PMParamError('All of the specified states were out-of-bounds.  '
+                    'Legal temperatures are between {} and {} Kelvin.'.format(self._Tlim[0], self._Tlim[1]))
+        elif I.any():
+            T = T.copy()
+            T[I] = pm.config['def_oob']
+            pm.utility.print_warning('Some of the states were out of bounds - setting to config[\'def_oob\'].  '
+                    'Legal temperatures are between {} and {} Kelvin.'.format(self._Tlim[0], self._Tlim[1]))
+        return T
+
+
+    def _state(self, T, X, Y, *arg):
+        """Prepare the arguments of a property method (inner routine)
+    x, mw, shape, T, a1, ... = _state(T, X, Y, a1, ...)
+
+T is converted to Kelvin (or set to the default) and checked against
+the limits, and everything is broadcast (see _broadcast).
+"""
+        if T is None:
+            T = pm.config['def_T']
+        T = pm.units.temperature_scale(np.asarray(T, dtype=float), to_units='K')
+        out = self._broadcast(self._composition(X, Y), T, *arg)
+        out[3] = self._Tcheck(out[3])
+        return out
+
+
+    def _coef(self, T, x):
+        """Calculate the mixture coefficients at each point (primative routine)
+    C,I = _coef(T, x)
+
+T is a 1-D array of temperatures in Kelvin, and x is a 2-D array of
+mole fractions with one row per temperature.  I selects the
+temperatures that are in-bounds, and C[k] is the k-th coefficient of
+the mixture at each of the temperatures, T[I] (see the ig._tpoly()
+documentation).  When all temperatures are in-bounds, I is Ellipsis.
+
+The points are grouped by segment, and the coefficients of each group
+are the matrix product of its mole fractions and the stacked species
+coefficients of the segment.
+"""
+        Tseg = self._Tseg
+        I = np.logical_and(T >= Tseg[0], T <= Tseg[-1])
+        if I.all():
+            I = Ellipsis
+        index = np.searchsorted(Tseg[1:-1], T[I], side='right')
+        x = x[I]
+        C = np.empty((index.size, 8), dtype=float)
+        # Sort the points by segment so each group is contiguous
+        order = np.argsort(index, kind='stable')
+        bounds = np.searchsorted(index[order], np.arange(len(Tseg)))
+        for seg in range(len(Tseg)-1):
+            J = order[bounds[seg]:bounds[seg+1]]
+            if J.size:
+                C[J] = np.dot(x[J], self._Ptab[seg])
+        return C.T, I
+
+
+    def _cp(self, T, x):
+        """Specific heat in kJ/kmol/K (inner routine)
+    cp = _cp(T, x)
+"""
+        out = np.full_like(T, pm.config['def_oob'], dtype=float)
+        C,I = self._coef(T, x)
+        t = T[I]
+        out[I] = C[0] + t*(C[1] + t*(C[2] + t*(C[3] + t*C[4]))) + C[5]/(t*t)
+        return out
+
+
+    def _h(self, T, x, diff=False):
+        """Enthalpy in kJ/kmol (inner routine)
+    h,hT = _h(T, x, diff=False)
+
+When diff is True, the derivative with respect to temperature is also
+returned.  Otherwise, it is None.
+"""
+        h = np.full_like(T, pm.config['def_oob'], dtype=float)
+        hT = None
+        if diff:
+            hT = np.full_like(T, pm.config['def_oob'], dtype=float)
+        C,I = self._coef(T, x)
+        t = T[I]
+        h[I] = C[6] - C[5]/t + \
+                t*(C[0] + t*(C[1]/2. + t*(C[2]/3. + t*(C[3]/4. + t*C[4]/5.))))
+        if diff:
+            hT[I] = C[0] + t*(C[1] + t*(C[2] + t*(C[3] + t*C[4]))) + C[5]/(t*t)
+        return h,hT
+
+
+    def _e(self, T, x, diff=False):
+        """Internal energy in kJ/kmol (inner routine)
+    e,eT = _e(T, x, diff=False)
+"""
+        e,eT = self._h(T, x, diff)
+        e -= pm.units.const_Ru * T
+        if diff:
+            eT -= pm.units.const_Ru
+        return e,eT
+
+
+    def _s(self, T, x, diff=False):
+        """Entropy at the reference pressure in kJ/kmol/K (inner routine)
+    s0,sT = _s(T, x, diff=False)
+
+Like igmix, s0 is evaluated at each species' reference pressure.  The
+log-mean reference pressure of the mixture accounts for the difference.
+"""
+        s0 = np.full_like(T, pm.config['def_oob'], dtype=float)
+        sT = None
+        if diff:
+            sT = np.full_like(T, pm.config['def_oob'], dtype=float)
+        C,I = self._coef(T, x)
+        t = T[I]
+        t2 = t*t
+        s0[I] = C[7] + C[0]*np.log(t) - C[5]/(2*t2) + \
+                t*(C[1] + t*(C[2]/2. + t*(C[3]/3. + t*C[4]/4.)))
+        if diff:
+            sT[I] = C[0]/t + C[5]/(t2*t) + \
+                    C[1] + t*(C[2] + t*(C[3] + t*C[4]))
+        return s0,sT
+
+
+    def _T(self, y, x, fn, ep=1e-9, Nmax=50):
+        """Calculate temperature from enthalpy or energy (inner routine)
+    T = _T(y, x, fn)
+
+y is a 1-D array of enthalpy or internal energy in kJ/kmol, x is the
+2-D array of mole fractions, and fn is the corresponding inner routine
+(self._h or self._e).
+
+Enthalpy and energy increase monotonically with temperature, so each
+point is bracketed by the temperature limits.  The iteration starts 
+from a linear interpolation between the limits, and it uses Newton's 
+method unless a step leaves the bracket, in which case the bracket is 
+divided by linear interpolation instead.  A point has converged when its
+fractional change in temperature is less than ep.  Points that are out 
+of bounds or that do not converge after Nmax iterations are set to 
+config['def_oob'].
+"""
+        Tmin,Tmax = self._Tlim
+        T = np.full_like(y, pm.config['def_oob'], dtype=float)
+        ya = fn(np.full_like(y, Tmin), x)[0]
+        yb = fn(np.full_like(y, Tmax), x)[0]
+        # Points outside the limits have no solution.  Allow for round-off
+        # in values that were calculated at the limits.
+        I = np.flatnonzero(np.logical_and(
+                y >= ya - ep*np.abs(ya), y <= yb + ep*np.abs(yb)))
+        oob = y.size - I.size
+        yt = y[I]
+        x = x[I]
+        ya = ya[I]
+        yb = yb[I]
+        Ta = np.full_like(yt, Tmin)
+        Tb = np.full_like(yt, Tmax)
+        TT = Ta + (Tb - Ta) * np.clip((yt - ya) / (yb - ya), 0., 1.)
+        probe = pm.stats.probe(self, '_T', fn, None, I.size)
+        count = 0
+        while I.size and count < Nmax:
+            yy,yyT = fn(TT, x, diff=True)
+            if probe:
+                probe.eval(TT.size)
+            error = yt - yy
+            # Tighten the bracket
+            Ilow = error > 0
+            Ta[Ilow] = TT[Ilow]
+            ya[Ilow] = yy[Ilow]
+            Ihigh = np.logical_not(Ilow)
+            Tb[Ihigh] = TT[Ihigh]
+            yb[Ihigh] = yy[Ihigh]
+            # Newton's method unless it leaves the bracket
+            Tnew = TT + error / yyT
+            Iout = np.logical_not(np.logical_and(Tnew >= Ta, Tnew <= Tb))
+            if Iout.any():
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    frac = (yt[Iout] - ya[Iout]) / (yb[Iout] - ya[Iout])
+                frac = np.where(np.isfinite(frac), np.clip(frac, 0., 1.), 0.5)
+                Tnew[Iout] = Ta[Iout] + (Tb[Iout] - Ta[Iout]) * frac
+
+            Iwork = np.abs(Tnew - TT) > ep*TT
+            TT = Tnew
+            if not Iwork.all():
+                Idone = np.logical_not(Iwork)
+                T[I[Idone]] = TT[Idone]
+                I = I[Iwork]
+                TT = TT[Iwork]
+                yt = yt[Iwork]
+                x = x[Iwork]
+                Ta = Ta[Iwork]
+                Tb = Tb[Iwork]
+                ya = ya[Iwork]
+                yb = yb[Iwork]
+            count += 1
+        if probe:
+            probe.done(count, I.size)
+        if I.size:
+            pm.utility.print_warning('PMVarMix._T: Failed to converge for {:d} elements.'.format(I.size))
+        if oob:
+            pm.utility.print_warning('PMVarMix._T: {:d} values were out of bounds - setting to config[\'def_oob\'].'.format(oob))
+        return T
+
+
+    def Tlim(self):
+        """Temperature limits
+    (Tmin, Tmax) = Tlim()
+
+Returns the intersection of the temperature limits of the species.
+
+Returns unit_temperature
+"""
+        Tmin = pm.units.temperature_scale(self._Tlim[0], from_units='K')
+        Tmax = pm.units.temperature_scale(self._Tlim[1], from_units='K')
+        return (Tmin,Tmax)
+
+
+    def mw(self, X=None, Y=None):
+        """Molecular weight (more correctly mass)
+    mw(X=X)
+        OR
+    mw(Y=Y)
+
+Returns the mole-weighted mean molecular mass of each composition.
+
+Returns:    Molecular mass [unit_mass / unit_molar]
+"""
+        x = self._composition(X, Y)
+        out = np.dot(x, self._mw)
+        out = np.multiply(out, pm.units.plan(mass='kg', molar=('kmol',-1)))
+        return out
+
+
+    def R(self, X=None, Y=None):
+        """Ideal gas constant
+    R(X=X)
+        OR
+    R(Y=Y)
+
+Returns:    Gas constant [unit_energy / unit_temperature / unit_matter]
+"""
+        x = self._composition(X, Y)
+        mw = np.dot(x, self._mw)
+        out = np.full_like(mw, pm.units.const_Ru)
+        np.multiply(out, pm.units.plan(mw, energy='kJ', matter=('kmol',-1), temperature=('K',-1)), out=out)
+        return out
+
+
+    def cp(self, T=None, X=None, Y=None):
+        """Constant-pressure specific heat
+    cp(T, X=X)
+        OR
+    cp(T, Y=Y)
+
+Accepts:    Temperature [unit_temperature]
+Returns:    Spec. Heat  [unit_energy / unit_temperature / unit_matter]
+"""
+        x,mw,shape,T = self._state(T, X, Y)
+        out = self._cp(T, x)
+        np.multiply(out, pm.units.plan(mw, energy='kJ', matter=('kmol',-1), temperature=('K',-1)), out=out)
+        return out.reshape(shape)
+
+
+    def cv(self, T=None, X=None, Y=None):
+        """Constant-volume specific heat
+    cv(T, X=X)
+        OR
+    cv(T, Y=Y)
+
+Accepts:    Temperature [unit_temperature]
+Returns:    Spec. Heat  [unit_energy / unit_temperature / unit_matter]
+"""
+        x,mw,shape,T = self._state(T, X, Y)
+        out = self._cp(T, x) - pm.units.const_Ru
+        np.multiply(out, pm.units.plan(mw, energy='kJ', matter=('kmol',-1), temperature=('K',-1)), out=out)
+        return out.reshape(shape)
+
+
+    def gam(self, T=None, X=None, Y=None):
+        """Specific heat ratio (gamma)
+    gam(T, X=X)
+        OR
+    gam(T, Y=Y)
+
+Accepts:    Temperature [unit_temperature]
+Returns:    Spec. Heat Ratio [dless]
+"""
+        x,mw,shape,T = self._state(T, X, Y)
+        out = self._cp(T, x)
+        return (out / (out - pm.units.const_Ru)).reshape(shape)
+
+
+    def h(self, T=None, X=None, Y=None):
+        """Enthalpy
+    h(T, X=X)
+        OR
+    h(T, Y=Y)
+
+Accepts:    Temperature [unit_temperature]
+Returns:    Enthalpy    [unit_energy / unit_matter]
+"""
+        x,mw,shape,T = self._state(T, X, Y)
+        out = self._h(T, x)[0]
+        np.multiply(out, pm.units.plan(mw, energy='kJ', matter=('kmol',-1)), out=out)
+        return out.reshape(shape)
+
+
+    def e(self, T=None, X=None, Y=None):
+        """Internal energy
+    e(T, X=X)
+        OR
+    e(T, Y=Y)
+
+Accepts:    Temperature [unit_temperature]
+Returns:    Int. Energy [unit_energy / unit_matter]
+"""
+        x,mw,shape,T = self._state(T, X, Y)
+        out = self._e(T, x)[0]
+        np.multiply(out, pm.units.plan(mw, energy='kJ', matter=('kmol',-1)), out=out)
+        return out.reshape(shape)
+
+
+    def s(self, T=None, p=None, X=None, Y=None, mixing=False):
+        """Entropy
+    s(T, p, X=X)
+        OR
+    s(T, p, Y=Y)
+
+Like igmix, the mixture is treated as a pseudo-pure gas with a log-mean
+reference pressure.  If mixing is True, the ideal entropy of mixing,
+-R*sum(x*ln(x)), is added.
+
+Accepts:    Temperature [unit_temperature]
+            Pressure    [unit_pressure]
+Returns:    Entropy     [unit_energy / unit_matter / unit_temperature]
+"""
+        if p is None:
+            p = pm.config['def_p']
+        p = np.divide(np.asarray(p, dtype=float), pm.units.plan(pressure='Pa'))
+        x,mw,shape,T,p = self._state(T, X, Y, p)
+        Ru = pm.units.const_Ru
+        out = self._s(T, x)[0] - Ru * (np.log(p) - np.dot(x, self._lnpref))
+        if mixing:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                out -= Ru * np.where(x > 0, x*np.log(x), 0.).sum(axis=-1)
+        np.multiply(out, pm.units.plan(mw, energy='kJ', matter=('kmol',-1), temperature=('K',-1)), out=out)
+        return out.reshape(shape)
+
+
+    def T(self, h=None, e=None, X=None, Y=None):
+        """Temperature from enthalpy or internal energy
+    T(h=h, X=X)
+        OR
+    T(e=e, Y=Y)
+
+Exactly one of h or e must be given.
+
+Accepts:    Enthalpy    [unit_energy / unit_matter]
+            Int. Energy [unit_energy / unit_matter]
+Returns:    Temperature [unit_temperature]
+"""
+        if (h is None) == (e is None):
+            raise pm.utility.PMParamError('PMVarMix.T: Exactly one of h or e must be specified.')
+        if h is None:
+            y,fn = e,self._e
+        else:
+            y,fn = h,self._h
+        x,mw,shape,y = self._broadcast(self._composition(X, Y), y)
+        y = np.divide(y, pm.units.plan(mw, energy='kJ', matter=('kmol',-1)))
+        T = self._T(y, x, fn)
+        pm.units.temperature_scale(T, from_units='K', inplace=True)
+        return T.reshape(shape)
+
+
+def batch(species):
+    """Build an evaluator for many species at once
+    b = batch(species)
+
+species is a list of ig or ig2 substance id strings.  Returns a PMBatch
+object; see its documentation.
+
+    >>> b = pm.batch(['ig.N2', 'ig.O2', 'ig.H2O'])
+    >>> h = b.h(T=[300., 500., 1000., 2000.])     # shape (3,4)
+"""
+    return PMBatch(species)
+
+
+class PMBatch:
+    """Evaluate the properties of many ideal gas species at once
+    b = PMBatch(species)
+        or
+    b = pm.batch(species)
+
+species is a list of ig or ig2 substance id strings.  The property 
+methods accept a temperature array with any shape, and they return an
+array with one row per species, so its shape is (len(species),) + the
+shape of the temperature array.
+
+  cp() spec. heat       (unit_energy / unit_temperature / unit_matter)
+  cv() spec. heat       (unit_energy / unit_temperature / unit_matter)
+  gam()  spec. heat ratio (dless)
+  e()  internal energy  (unit_energy / unit_matter)
+  h()  enthalpy         (unit_energy / unit_matter)
+  s()  entropy          (unit_energy / unit_temperature / unit_matter)
+  g()  Gibbs energy     (unit_energy / unit_matter)
+  mw() molecular weight (unit_mass / unit_molar)
+
+The coefficients of every species are stacked on the union of their 
+temperature segments when the object is created.  Each call finds the
+segment of every temperature once, and the properties of all species 
+at the temperatures in a segment are a single matrix product.  Species
+that are out of bounds at a temperature are set to config['def_oob'].
+"""
+    def __init__(self, species):
+        self.species = tuple(species)
+        if not self.species:
+            raise pm.utility.PMParamError('PMBatch: At least one species is required.')
+        self._mw, self._lnpref, self._Tlim, self._Tseg, self._Ptab, \
+                self._valid = _stack(self.species, 'PMBatch')
+
+
+    def __repr__(self):
+        return '<PMBatch with {:d} species>'.format(len(self.species))
+
+
+    def _eval(self, T, basis):
+        """Evaluate a property for all species (primative routine)
+    out = _eval(T, basis)
+
+T is a 1-D array of temperatures in Kelvin.  basis(t) must return an 
+(8,N) array of the functions of the temperatures, t, that multiply 
+each of the coefficients (see the ig._tpoly() documentation).  The 
+result has shape (K,N) for K species.
+"""
+        out = np.full((len(self.species), T.size), pm.config['def_oob'], dtype=float)
+        Tseg = self._Tseg
+        cols = np.flatnonzero(np.logical_and(T >= Tseg[0], T <= Tseg[-1]))
+        t = T[cols]
+        B = basis(t)
+        index = np.searchsorted(Tseg[1:-1], t, side='right')
+        # Temperatures on a segment boundary belong to the segment above,
+        # but they are also valid for species whose range ends there.
+        # They are evaluated a second time with the segment below.
+        below = np.searchsorted(Tseg[1:-1], t, side='left')
+        edge = np.flatnonzero(below != index)
+        for index,J in ((index, None), (below[edge], edge)):
+            # Sort the points by segment so each group is contiguous
+            order = np.argsort(index, kind='stable')
+            bounds = np.searchsorted(index[order], np.arange(len(Tseg)))
+            for seg in range(len(Tseg)-1):
+                K = order[bounds[seg]:bounds[seg+1]]
+                if not K.size:
+                    continue
+                if J is None:
+                    value = np.dot(self._Ptab[seg], B[:,K])
+                    I = np.flatnonzero(np.logical_not(self._valid[seg]))
+                    out[:,cols[K]] = value
+                    if I.size:
+                        out[np.ix_(I,cols[K])] = pm.config['def_oob']
+                else:
+                    # Only fill the species that are valid below the edge
+                    # and invalid above it
+                    K = J[K]
+                    I = np.flatnonzero(np.logical_and(self._valid[seg], 
+                            np.logical_not(self._valid[seg+1])))
+                    if I.size:
+                        out[np.ix_(I,cols[K])] = np.dot(
+                                self._Ptab[seg][I], B[:,K])
+        return out
+
+
+    @staticmethod
+    def _cp_basis(t):
+        B = np.zeros((8, t.size), dtype=float)
+        B[0] = 1.
+        B[1] = t
+        B[2] = t*t
+        B[3] = B[2]*t
+        B[4] = B[3]*t
+        B[5] = 1./B[2]
+        return B
+
+
+    @staticmethod
+    def _h_basis(t):
+        B = np.zeros((8, t.size), dtype=float)
+        B[0] = t
+        B[1] = t*t
+        B[2] = B[1]*t
+        B[3] = B[2]*t
+        B[4] = B[3]*t
+        B[1] /= 2.
+        B[2] /= 3.
+        B[3] /= 4.
+        B[4] /= 5.
+        B[5] = -1./t
+        B[6] = 1.
+        return B
+
+
+    @staticmethod
+    def _s_basis(t):
+        B = np.zeros((8, t.size), dtype=float)
+        B[0] = np.log(t)
+        B[1] = t
+        B[2] = t*t
+        B[3] = B[2]*t
+        B[4] = B[3]*t
+        B[5] = -0.5/B[2]
+        B[2] /= 2.
+        B[3] /= 3.
+        B[4] /= 4.
+        B[7] = 1.
+        return B
+
+
+    def _cp(self, T):
+        """Specific heats in kJ/kmol/K (inner routine)
+    cp = _cp(T)
+
+T must be a 1-D array in Kelvin.  Returns an array with shape (K,N).
+"""
+        return self._eval(T, self._cp_basis)
+
+
+    def _h(self, T):
+        """Enthalpies in kJ/kmol (inner routine)
+    h = _h(T)
+
+T must be a 1-D array in Kelvin.  Returns an array with shape (K,N).
+"""
+        return self._eval(T, self._h_basis)
+
+
+    def _s(self, T):
+        """Entropies at the reference pressure in kJ/kmol/K (inner routine)
+    s0 = _s(T)
+
+T must be a 1-D array in Kelvin.  Returns an array with shape (K,N).
+Each species is evaluated at its own reference pressure (see _lnpref).
+"""
+        return self._eval(T, self._s_basis)
+
+
+    def _g(self, T, p):
+        """Gibbs energies in kJ/kmol (inner routine)
+    g = _g(T, p)
+
+T and p must be 1-D arrays of the same size in Kelvin and Pa.  Returns
+an array with shape (K,N).
+"""
+        s = self._s(T) - pm.units.const_Ru * \
+                (np.log(p) - self._lnpref[:,np.newaxis])
+        return self._h(T) - T * s
+
+
+    def _state(self, T, p=None):
+        """Prepare the arguments of a property method (inner routine)
+    T, p, shape = _state(T, p=None)
+
+T and p are converted to Kelvin and Pa (or set to their defaults), 
+broadcast together, and flattened.  If p is None, it is not returned.
+"""
+        if T is None:
+            T = pm.config['def_T']
+        T = pm.units.temperature_scale(np.asarray(T, dtype=float), to_units='K')
+        if p is not None:
+            p = np.divide(np.asarray(p, dtype=float), pm.units.plan(pressure='Pa'))
+            T,p = np.broadcast_arrays(T,p)
+            p = p.reshape(-1)
+        shape = T.shape
+        T = T.reshape(-1)
+        I = np.logical_or(T < self._Tseg[0], T > self._Tseg[-1])
+        if I.all():
+            raise pm.utility.PMParamError('All of the specified states were out-of-bounds.  '
+                    'Legal temperatures are between {} and {} Kelvin.'.format(self._Tseg[0], self._Tseg[-1]))
+        return T, p, shape
+
+
+    def _out(self, out, shape, tunits=False):
+        """Convert the units of a result and reshape it (inner routine)"""
+        np.multiply(out, pm.units.plan(self._mw[:,np.newaxis], energy='kJ', matter=('kmol',-1)), out=out)
+        if tunits:
+            np.multiply(out, pm.units.plan(temperature=('K',-1)), out=out)
+        return out.reshape((len(self.species),) + shape)
+
+
+    def mw(self):
+        """Molecular weights
+    mw()
+
+Returns:    Molecular mass [unit_mass / unit_molar]
+"""
+        out = np.multiply(self._mw, pm.units.plan(mass='kg', molar=('kmol',-1)))
+        return out
+
+
+    def Tlim(self):
+        """Temperature limits
+    Tlim = Tlim()
+
+Returns a (K,2) array with the minimum and maximum temperature of each
+species.
+
+Returns unit_temperature
+"""
+        return pm.units.temperature_scale(self._Tlim, from_units='K')
+
+
+    def cp(self, T=None):
+        """Constant-pressure specific heats
+    cp(T)
+
+Accepts:    Temperature [unit_temperature]
+Returns:    Spec. Heat  [unit_energy / unit_temperature / unit_matter]
+"""
+        T,_,shape = self._state(T)
+        return self._out(self._cp(T), shape, True)
+
+
+    def cv(self, T=None):
+        """Constant-volume specific heats
+    cv(T)
+
+Accepts:    Temperature [unit_temperature]
+Returns:    Spec. Heat  [unit_energy / unit_temperature / unit_matter]
+"""
+        T,_,shape = self._state(T)
+        return self._out(self._cp(T) - pm.units.const_Ru, shape, True)
+
+
+    def gam(self, T=None):
+        """Specific heat ratios
+    gam(T)
+
+Accepts:    Temperature [unit_temperature]
+Returns:    Spec. Heat Ratio [dless]
+"""
+        T,_,shape = self._state(T)
+        out = self._cp(T)
+        out /= (out - pm.units.const_Ru)
+        return out.reshape((len(self.species),) + shape)
+
+
+    def h(self, T=None):
+        """Enthalpies
+    h(T)
+
+Accepts:    Temperature [unit_temperature]
+Returns:    Enthalpy    [unit_energy / unit_matter]
+"""
+        T,_,shape = self._state(T)
+        return self._out(self._h(T), shape)
+
+
+    def e(self, T=None):
+        """Internal energies
+    e(T)
+
+Accepts:    Temperature [unit_temperature]
+Returns:    Int. Energy [unit_energy / unit_matter]
+"""
+        T,_,shape = self._state(T)
+        return self._out(self._h(T) - pm.units.const_Ru*T, shape)
+
+
+    def s(self, T=None, p=None):
+        """Entropies
+    s(T, p)
+
+Accepts:    Temperature [unit_temperature]
+            Pressure    [unit_pressure]
+Returns:    Entropy     [unit_energy / unit_matter / unit_temperature]
+"""
+        if p is None:
+            p = pm.config['def_p']
+        T,p,shape = self._state(T, p)
+        out = self._s(T) - pm.units.const_Ru * \
+                (np.log(p) - self._lnpref[:,np.newaxis])
+        return self._out(out, shape, True)
+
+
+    def g(self, T=None, p=None):
+        """Gibbs energies
+    g(T, p)
+
+g = h - T*s
+
+Accepts:    Temperature [unit_temperature]
+            Pressure    [unit_pressure]
+Returns:    Gibbs energy [unit_energy / unit_matter]
+"""
+        if p is None:
+            p = pm.config['def_p']
+        T,p,shape = self._state(T, p)
+        return self._out(self._g(T, p), shape)
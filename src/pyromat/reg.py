@@ -7,8 +7,11 @@ data.  When data is loaded, each file is required to contain a
 object intended to be used with the data. 
 
 When the PYroMat package is loaded, all *.py files in the 'reg' 
-directory are run, and the definitions in them are incorporated
-into the registry dictionary.
+directory are imported, and the definitions in them are incorporated
+into the registry dictionary.  The files are imported as modules with
+the standard importlib machinery, so their bytecode is cached.  When 
+pm.config['reg_lazy'] is True, a file is not imported until one of its
+classes is needed (see PMRegistry).
 
 The __basedata__ class is the only truely 'built-in' class.  In 
 addition to defining the constructor responsible for incorporating
@@ -22,9 +25,13 @@ Chris Martin (c) 2015,2017,2021,2022
 
 # bring in the root package
 import pyromat as pm
+import importlib.util
+import hashlib
+import threading
 
 
 # initialize the registry dicitonary
+# regload() replaces this with a PMRegistry instance
 registry = {}
 
 
@@ -82,6 +89,10 @@ dioxide and "Co2" represents diatomic cobalt.
 
 
     mandatory = []
+    # Entries that compact() stores as read-only float arrays
+    _packed = ()
+    # Entries that compact() leaves in the data file until they are used
+    _lazydata = ()
 
 
     def __init__(self,data):
@@ -98,6 +109,26 @@ dioxide and "Co2" represents diatomic cobalt.
     def __repr__(self):
         return '<' + self.data['class'] + ', ' + self.data['id'] + '>'
 
+
+    def compact(self):
+        """Reduce the memory used by the substance's data
+    subst.compact()
+
+Replaces the data dictionary with a PMCompactData dictionary.  The 
+entries named by the class' _packed attribute are stored as read-only
+float arrays, strings are interned so that identical names and 
+documentation are only stored once, and the entries named by the 
+class' _lazydata attribute are read back from the data file only when
+they are needed.  The instance must have finished initializing, so 
+entries that the initializer compiled into other forms are unaffected.
+
+load() calls compact() on every new instance when the dat_compact 
+configuration parameter is True.
+"""
+        if not isinstance(self.data, PMCompactData):
+            self.data = PMCompactData(self.data, self._packed, self._lazydata)
+            self.__doc__ = self.data['doc']
+
         
     def __basetest__(self):
         """Test the data struct for basic Pyro requirements
@@ -205,10 +236,313 @@ is returned instead.
             return self.data['atoms'].copy()
         return {}
 
+def _compact(value, pack=False):
+    """Return a compact copy of a data entry (inner routine)"""
+    if isinstance(value, str):
+        return pm.utility.sys.intern(value)
+    elif isinstance(value, dict):
+        return {_compact(kk):_compact(vv) for kk,vv in value.items()}
+    elif isinstance(value, list):
+        if pack:
+            try:
+                out = pm.utility.np.array(value, dtype=float)
+                out.setflags(write=False)
+                return out
+            except (ValueError, TypeError):
+                pass
+        return [_compact(vv) for vv in value]
+    return value
+
+
+def _expand(value):
+    """Return a copy of a compact data entry as lists (inner routine)"""
+    if isinstance(value, pm.utility.np.ndarray):
+        return value.tolist()
+    elif isinstance(value, dict):
+        return {kk:_expand(vv) for kk,vv in value.items()}
+    elif isinstance(value, list):
+        return [_expand(vv) for vv in value]
+    return value
+
+
+class PMCompactData(dict):
+    """PYroMat compact data dictionary
+
+A __basedata__ instance's data are replaced by a PMCompactData dictionary
+when its compact() method is called.  It behaves like the original 
+dictionary with three differences:
+
+- The packed entries are read-only float arrays instead of nested lists.
+- The lazy entries (listed in the lazy attribute) are not kept in 
+  memory.  They are read from the 'fromfile' data file the first time 
+  any of them is requested.  Entries are only deferred when the file 
+  exists.
+- The copy() method returns an ordinary dictionary with lists in place
+  of the arrays, so it can be written to a data file or passed to 
+  dat.new().  Comparisons use the same conversion.
+
+Iterating over the keys and testing for them does not read the file, 
+but values(), items(), copy(), and comparisons do.
+"""
+    def __init__(self, data, packed=(), lazy=()):
+        dict.__init__(self)
+        self.lazy = set()
+        fromfile = data.get('fromfile')
+        for key,value in data.items():
+            if key in lazy and fromfile and pm.utility.os.path.isfile(fromfile):
+                self.lazy.add(key)
+            else:
+                dict.__setitem__(self, pm.utility.sys.intern(key), 
+                        _compact(value, key in packed))
+        self.packed = tuple(packed)
+
+    def _restore(self):
+        """Read the lazy entries from the data file (inner routine)"""
+        if not self.lazy:
+            return
+        filename = dict.__getitem__(self, 'fromfile')
+        try:
+            temp = pm.utility.load_file(filename)
+        except:
+            pm.utility.print_error('Failed to read entries ' + 
+                    repr(sorted(self.lazy)) + ' from file: ' + filename)
+            raise pm.utility.PMDataError()
+        for key in self.lazy:
+            if key in temp:
+                dict.__setitem__(self, key, _compact(temp[key], key in self.packed))
+        self.lazy = set()
+
+    def __missing__(self, key):
+        if key in self.lazy:
+            self._restore()
+            if dict.__contains__(self, key):
+                return dict.__getitem__(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or key in self.lazy
+
+    def __len__(self):
+        return dict.__len__(self) + len(self.lazy)
+
+    def __iter__(self):
+        yield from dict.__iter__(self)
+        yield from sorted(self.lazy)
+
+    def __eq__(self, other):
+        if isinstance(other, dict):
+            return self.copy() == _expand(dict(other))
+        return NotImplemented
+
+    def __ne__(self, other):
+        out = self.__eq__(other)
+        return out if out is NotImplemented else not out
+
+    def __reduce__(self):
+        # Pickles hold the ordinary dictionary
+        return (PMCompactData, (self.copy(), self.packed, ()))
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def pop(self, key, *default):
+        self._restore()
+        return dict.pop(self, key, *default)
+
+    def keys(self):
+        self._restore()
+        return dict.keys(self)
+
+    def values(self):
+        self._restore()
+        return dict.values(self)
+
+    def items(self):
+        self._restore()
+        return dict.items(self)
+
+    def copy(self):
+        """Return an ordinary dictionary with lists in place of arrays"""
+        return _expand(dict(self.items()))
+
+
+class PMRegistry(dict):
+    """PYroMat Class Registry
+
+This is the dictionary that holds the data classes, keyed by their 
+names.  When pm.config['reg_lazy'] is True, regload() only lists the 
+registry files, and they are recorded in the pending attribute,
+
+    registry.pending = [('ig', '/path/to/registry/ig.py'), ...]
+
+Each entry is the file's name without its extension and the path to 
+the file.  By convention, each registry file defines a single class
+with the same name as the file, so the first time a class is requested,
+the pending files with that name are imported.  If the class is still
+not found, the rest of the pending files are imported in order.  
+Reading an item, get(), and the in operator load only what is 
+necessary.  Iteration, keys(), values(), items(), and len() import 
+every pending file first.
+"""
+    def __init__(self, *varg, **kwarg):
+        dict.__init__(self, *varg, **kwarg)
+        self.pending = []
+        self._lock = threading.RLock()
+
+    def _fetch(self, name):
+        """Import pending files until a class is found (inner routine)
+    found = _fetch(name)
+"""
+        with self._lock:
+            if not dict.__contains__(self, name):
+                for stem,thisfile in [pp for pp in self.pending if pp[0] == name]:
+                    self.pending.remove((stem,thisfile))
+                    _regfile(thisfile, self)
+            if not dict.__contains__(self, name):
+                self.resolve()
+            return dict.__contains__(self, name)
+
+    def resolve(self):
+        """Import all pending registry files
+    registry.resolve()
+"""
+        with self._lock:
+            while self.pending:
+                _regfile(self.pending.pop(0)[1], self)
+
+    def __missing__(self, name):
+        if self._fetch(name):
+            return dict.__getitem__(self, name)
+        raise KeyError(name)
+
+    def __contains__(self, name):
+        return dict.__contains__(self, name) or self._fetch(name)
+
+    def __len__(self):
+        self.resolve()
+        return dict.__len__(self)
+
+    def __iter__(self):
+        self.resolve()
+        return dict.__iter__(self)
+
+    def get(self, name, default=None):
+        if self.__contains__(name):
+            return dict.__getitem__(self, name)
+        return default
+
+    def keys(self):
+        self.resolve()
+        return dict.keys(self)
+
+    def values(self):
+        self.resolve()
+        return dict.values(self)
+
+    def items(self):
+        self.resolve()
+        return dict.items(self)
+
+
+
+# The names of the modules that _regfile() has imported
+_regmodules = set()
+
+def _regfile(thisfile, target, verbose=None):
+    """Import a registry file and register its classes (inner routine)
+    _regfile(thisfile, target)
+
+The file is imported as a module named pyromat.registry.<name> (with a
+suffix to distinguish files in directories other than the default) and 
+is added to sys.modules, so its classes can be pickled.  All of the
+__basedata__ subclasses it defines are added to the target registry
+according to the reg_overwrite and reg_exist_fatal rules.
+
+If the module was already imported from the same file by some other
+means (e.g. by unpickling one of its instances before the registry 
+needed it), it is registered as it is instead of being executed again.
+Otherwise, its classes would not be the registry classes.  Modules that
+were imported by _regfile() are executed again, so regload() still 
+picks up changes to the files.
+"""
+    lead = 'regload->'
+    if verbose is None:
+        verbose = pm.config['reg_verbose']
+    exist_fatal = pm.config['reg_exist_fatal']
+    exist_overwrite = pm.config['reg_overwrite']
+
+    loc,fil = pm.utility.os.path.split(thisfile)
+    modname = 'pyromat.registry.' + fil[:-3]
+    if loc != pm.utility.os.path.join(pm.config['install_dir'], 'registry'):
+        modname += '_' + hashlib.sha1(loc.encode('utf-8')).hexdigest()[:8]
+
+    if verbose:
+        pm.utility.print_line('Examining file "' + thisfile + '"', lead)
+    temp = {}
+    module = pm.utility.sys.modules.get(modname)
+    try:
+        if module is not None and modname not in _regmodules and \
+                pm.utility.os.path.realpath(getattr(module, '__file__', None) or '') == \
+                pm.utility.os.path.realpath(thisfile):
+            if verbose:
+                pm.utility.print_line('Using the module already imported', lead)
+        else:
+            with pm.utility.profile('file', thisfile):
+                spec = importlib.util.spec_from_file_location(modname, thisfile)
+                module = importlib.util.module_from_spec(spec)
+                pm.utility.sys.modules[modname] = module
+                _regmodules.add(modname)
+                spec.loader.exec_module(module)
+        temp = module.__dict__
+    except:
+        pm.utility.sys.modules.pop(modname, None)
+        _regmodules.discard(modname)
+        pm.utility.print_warning(
+'Failed to execute file: ' + thisfile +
+'.  Encountered exception: ' + repr(pm.utility.sys.exc_info()[1]))
+
+    # loop through all variables created in the file
+    valid = False
+    for new in temp:
+        if isinstance(temp[new],type) and issubclass(temp[new],__basedata__):
+            valid = True
+            # if the class is already registered, either raise 
+            # an exception, or throw a warning
+            if dict.__contains__(target, new):
+                if exist_fatal:
+                    pm.utility.print_error(
+'Encountered a redundant definition for data class "' + new + '" in file "' + 
+thisfile + '"')
+                    raise pm.utility.PMFileError()
+                elif exist_overwrite:
+                    pm.utility.print_warning(
+'Overwriting a redundant definition for data class "' + new + 
+'" with the definition in file "' + thisfile + '"')
+                    dict.__setitem__(target, new, temp[new])
+                else:
+                    pm.utility.print_warning(
+'Ignoring a redundant definition for data class "' + new + '" in file "' + 
+thisfile + '"')
+
+            # if everything is fine, add the class to the registry
+            else:
+                dict.__setitem__(target, new, temp[new])
+                if verbose:
+                    pm.utility.print_line(
+'Found class "' + new + '"', lead)
+    if not valid:
+        pm.utility.print_warning(
+'File "' + thisfile + 
+'" was found in a registry directory, but contained no data class definition.')
+
+
+
 #
 #   Go load the contents of the reg directory
 #
-def regload(verbose = None):
+def regload(verbose = None, lazy = None):
     """regload - reloads the data class registry
 
 regload() is automatically executed when PYroMat is first imported,
@@ -225,18 +559,25 @@ pm.config parameters that affect the behavior of regload() are
     overwrite existing classes with redundant ones?
 'reg_exist_fatal'
     exit with an error when a redundant class is discovered?
+'reg_lazy'
+    wait to import each file until its class is needed?
+    Override by setting the 'lazy' keyword argument.
+
+The files in each directory are imported in alphabetical order.  When
+lazy loading is used, the files are only listed here, so the verbose
+messages about each file and its classes are printed when the file is
+imported, the first time one of its classes is needed.
 """
 
     # initialize the registry
     global registry 
-    registry = {}
-    lead = 'regload->'
+    registry = PMRegistry()
 
     # fetch the configuration parameters
     if verbose == None:
         verbose = pm.config['reg_verbose']
-    exist_fatal = pm.config['reg_exist_fatal']
-    exist_overwrite = pm.config['reg_overwrite']
+    if lazy is None:
+        lazy = pm.config['reg_lazy']
 
     # search each directory in the registry search path
     for loc in pm.config['reg_dir']:
@@ -246,65 +587,19 @@ pm.config parameters that affect the behavior of regload() are
         loc = pm.utility.os.path.expandvars(loc)
         loc = pm.utility.os.path.abspath(loc)
 
-        cont = pm.utility.os.listdir(loc)
-        # modules to load should not begin with an underscore or period
-        # modules to load should end with .py
-        # modules should contain a single class matching the name of the file
-        for fil in cont:
-            f_go = fil[0]!='_' and fil[0]!='.'
-            f_go = f_go & (len(fil)>3) & (fil[-3:]=='.py')
-            # if the filename qualifies.
-            if f_go:
-                temp = {}
-                thisfile = pm.utility.os.path.join(loc,fil)
-                if verbose:
-                    pm.utility.print_line('Examining file "' + thisfile + '"', lead)
-                try:
-                    with open(thisfile,'r') as ff:
-                        exec(compile(ff.read(),thisfile,'exec'),temp)
-                    # In Python 2.7, this used to work
-                    # Use exec() for 3.4 compatibility
-                    # execfile(thisfile,globals(),temp)
-                except:
-                    pm.utility.print_warning(
-'Failed to execute file: ' + pm.utility.os.path.join(loc,fil) +
-'.  Encountered exception: ' + repr(pm.utility.sys.exc_info()[1]))
-
-                # loop through all variables created in the file
-                valid = False
-                for new in temp:
-                    if isinstance(temp[new],type) and issubclass(temp[new],__basedata__):
-                        valid = True
-                        # if the class is already registered, either raise 
-                        # an exception, or throw a warning
-                        if new in registry:
-                            fullfile = pm.utility.os.path.abspath( thisfile )
-                            if exist_fatal:
-                                pm.utility.print_error(
-'Encountered a redundant definition for data class "' + new + '" in file "' + 
-fullfile + '"')
-                                raise pm.utility.PMFileError()
-                            elif exist_overwrite:
-                                pm.utility.print_warning(
-'Overwriting a redundant definition for data class "' + new + 
-'" with the definition in file "' + fullfile + '"')
-                                registry[new] = temp[new]
-                            else:
-                                pm.utility.print_warning(
-'Ignoring a redundant definition for data class "' + new + '" in file "' + 
-fullfile + '"')
-
-                        # if everything is fine, add the class to the registry
-                        else:
-                            registry[new] = temp[new]
-                            if verbose:
-                                pm.utility.print_line(
-'Found class "' + new + '"', lead)
-                if not valid:
-                    pm.utility.print_warning(
-'File "' + pm.utility.os.path.abspath(thisfile) + 
-'" was found in a registry directory, but contained no data class definition.')
-
-
-
-
+        with pm.utility.profile('dir', loc):
+            cont = pm.utility.os.listdir(loc)
+            cont.sort()
+            # modules to load should not begin with an underscore or period
+            # modules to load should end with .py
+            # modules should contain a single class matching the name of the file
+            for fil in cont:
+                f_go = fil[0]!='_' and fil[0]!='.'
+                f_go = f_go & (len(fil)>3) & (fil[-3:]=='.py')
+                # if the filename qualifies.
+                if f_go:
+                    thisfile = pm.utility.os.path.join(loc,fil)
+                    if lazy:
+                        registry.pending.append((fil[:-3], thisfile))
+                    else:
+                        _regfile(thisfile, registry, verbose)
@@ -343,42 +343,171 @@ enthalpy and pressure.
         return T
 
 
-    def _f3(self,T,p,order=2):
-        """Helmholtz free energy for region 3
-    f,fx,fy,fxx,fxy,fyy,delta = _d3(T,p,order=2)
+    def _t3b(self,key,p):
+        """Region 3 subregion boundary temperature
+    T = _t3b(key,p)
+
+key is the name of the boundary between two subregions of region 3 
+(e.g. 'ab' is the boundary between 3a and 3b).  Uses the boundary 
+equations 2 and 3 from the IAPWS supplementary release (SR5-05) with
+the coefficients in _R3BOUND.
 
+Accepts bar
+Returns K
+"""
+        pi = 0.1*np.asarray(p,dtype=float)
+        if key == 'ef':
+            return 3.727888004*(pi - 22.064) + 647.096
+        islog,terms = _R3BOUND[key]
+        if islog:
+            pi = np.log(pi)
+        T = 0.
+        for I,n in terms:
+            T = T + n*pi**I
+        return T
+
+
+    def _v3sub(self,T,p):
+        """Region 3 subregion
+    sub = _v3sub(T,p)
+
+T and p may be arrays, and they will be broadcast against one another.
+Returns an array of single characters, 'a' through 'z', naming the 
+subregion of region 3 in which each point lies, as given by Tables 2 
+and 10 of the IAPWS supplementary release (SR5-05).  The points are 
+assumed to be in region 3.
+
+Accepts K, bar
+"""
+        T,p = np.broadcast_arrays(
+                np.asarray(T,dtype=float), np.asarray(p,dtype=float))
+        pm = 0.1*p
+        sub = np.full(T.shape, 't', dtype='U1')
+
+        # Assign the points in I to subregions by temperature.  names[k] 
+        # is used below boundary bounds[k], and names[-1] is used above
+        # the last of them.  'sat' is the saturation line.
+        def _assign(I, bounds, names):
+            if not I.any():
+                return
+            TT = T[I]
+            pp = p[I]
+            this = np.full(TT.shape, names[-1], dtype='U1')
+            done = np.zeros(TT.shape, dtype=bool)
+            for key,name in zip(bounds, names):
+                if key == 'sat':
+                    Tb = self._Ts(pp)
+                else:
+                    Tb = self._t3b(key, pp)
+                J = np.logical_and(np.logical_not(done), TT <= Tb)
+                this[J] = name
+                done[J] = True
+            sub[I] = this
+
+        # Table 2
+        psat = 0.1*self._ps(643.15)
+        _assign(pm>40., ('ab',), 'ab')
+        _assign((pm>25.) & (pm<=40.), ('cd','ab','ef'), 'cdef')
+        _assign((pm>23.5) & (pm<=25.), 
+                ('cd','gh','ef','ij','jk'), 'cghijk')
+        _assign((pm>23.) & (pm<=23.5), 
+                ('cd','gh','ef','ij','jk'), 'clhijk')
+        _assign((pm>22.5) & (pm<=23.), 
+                ('cd','gh','mn','ef','op','ij','jk'), 'clmnopjk')
+        # '*' marks the near-critical points handled below
+        _assign((pm>psat) & (pm<=22.5), ('cd','qu','rx','jk'), 'cq*rk')
+        _assign((pm>20.5) & (pm<=psat), ('cd','sat','jk'), 'csrk')
+        _assign((pm>19.00881189173929) & (pm<=20.5), ('cd','sat'), 'cst')
+        _assign(pm<=19.00881189173929, ('sat',), 'ct')
+
+        # Table 10, the subregions near the critical point
+        I = sub=='*'
+        if I.any():
+            Tsat = np.full(T.shape, np.inf)
+            Tsat[I] = self._Ts(p[I])
+            _assign(I & (pm>22.11), ('uv','ef','wx'), 'uvwx')
+            _assign(I & (pm>22.064) & (pm<=22.11), 
+                    ('uv','ef','wx'), 'uyzx')
+            J = I & (pm<=22.064) & (T>Tsat)
+            _assign(J & (pm<=21.90096265), (), 'x')
+            _assign(J & (pm>21.90096265), ('wx',), 'zx')
+            J = I & (pm<=22.064) & (T<=Tsat)
+            _assign(J & (pm<=21.93161551), (), 'u')
+            _assign(J & (pm>21.93161551), ('uv',), 'uy')
+        return sub
+
+
+    def _v3(self,T,p):
+        """Specific volume in region 3 from the backward equations
+    v = _v3(T,p)
+
+T and p may be arrays, and they will be broadcast against one another.
+Uses the backward equations v(T,p) from the IAPWS supplementary release
+(SR5-05) with the coefficients in _R3V.  They are consistent with the 
+region 3 fundamental equation to within about 1e-6 in most of the 
+region, but the error is as large as 1e-3 very close to the critical 
+point.
+
+Accepts K, bar
+Returns m3/kg
+"""
+        T,p = np.broadcast_arrays(
+                np.asarray(T,dtype=float), np.asarray(p,dtype=float))
+        sub = self._v3sub(T,p)
+        v = np.full(T.shape, np.nan)
+        for key in np.unique(sub):
+            I = sub==key
+            vs,ps,Ts,a,b,c,d,e,terms = _R3V[key]
+            terms = np.asarray(terms)
+            x = (0.1*p[I]/ps - a)[...,np.newaxis]
+            y = (T[I]/Ts - b)[...,np.newaxis]
+            if key == 'n':
+                v[I] = vs * np.exp(
+                        np.dot(x**terms[:,0] * y**terms[:,1], terms[:,2]))
+            else:
+                v[I] = vs * np.dot(x**(c*terms[:,0]) * y**(d*terms[:,1]), 
+                        terms[:,2])**e
+        return v
+
+
+    def _f3(self,T,p,order=2,polish=True):
+        """Helmholtz free energy for region 3
+    n,t,f,fx,fy,fxx,fxy,fyy = _f3(T,p,order=2,polish=True)
+
+T and p may be arrays, and they will be broadcast against one another.
+The dimensionless density, n, is calculated directly from the backward
+equations v(T,p) of the IAPWS supplementary release (SR5-05) by _v3().
+
+When polish is True, n is refined by Newton iteration on the 
+dimensionless pressure until it is consistent with the fundamental
+equation to machine precision.  Only points that have not converged are
+re-evaluated.  A step is only accepted if it reduces the pressure error,
+so very near the critical point, where the pressure derivative 
+vanishes, a point may keep the backward estimate.  When polish is 
+False, the backward values are used as they are.
 """
-        if T.ndim>0:
-            n = np.zeros(T.shape)
-            t = np.zeros(T.shape)
-            f = np.zeros(T.shape)
-            fx = np.zeros(T.shape)
-            fy = np.zeros(T.shape)
-            fxx = np.zeros(T.shape)
-            fxy = np.zeros(T.shape)
-            fyy = np.zeros(T.shape)
-            for index in range(T.size):
-                (n[index], t[index], f[index],fx[index],fy[index],fxx[index],
-                 fxy[index], fyy[index]) = self._f3(T[index],p[index])
-            return n,t,f,fx,fy,fxx,fxy,fyy
-            
         # static configuration parameters
         R = self.data['R']      # ideal gas constant
         dc = self.data['dc']    # critical density
         Tc = self.data['Tc']    # critical temperature
         r3 = self.data['r3']
         A = self.data['r3ln']   # natural log coefficient
-        
-        # initialization        
-        N = 14
+
+        # initialization
+        Nnewton = 20
+        epsilon = 1e-12
+        T,p = np.broadcast_arrays(
+                np.asarray(T,dtype=float), np.asarray(p,dtype=float))
+        shape = T.shape
+        T = T.ravel()
+        p = p.ravel()
         # nondimensionalize parameters
         pp = p * 1e2 / (dc * R * T)   # dimensionless target pressure
         t = Tc / T              # dimensionless temperature inverse
         # create a helper funciton to calculate the pressure
-        # _pfromd() quietly updates N, pt, dpt, and enew
         # it is also responsible for evaluating the curve fit
         # and its derivatives in the third region
-        def _pfromd(nnew):
+        def _pfromd(nnew, t):
             # Evaluate the curve fit polynomial terms
             f,fx,fy,fxx,fxy,fyy = self._peval(nnew,t,r3)
             # Modify the function and its derivatives to include the
@@ -393,34 +522,51 @@ enthalpy and pressure.
             values = (f,fx,fy,fxx,fxy,fyy)
             return pc, values
 
-        # use bisection to find dimensionless density
-        na = 0.10       # minimum dimensionless density
-        nb = 2.4        # maximum dimensionless density
-        # continue until we exceed the iteration limit
-        for index in range(N):
-            nc = 0.5*(na+nb)
-            pc,values = _pfromd(nc)
-            if pc>pp:
-                nb = nc
-            else:
-                na = nc
-            
-        return (nc,t) + tuple(values)
-
-
-
-    def _th3(self,h,p,Tinit=None,dinit=500.):
+        # The backward equations give the initial density
+        nc = 1. / (self._v3(T,p) * dc)
+        pc,values = _pfromd(nc, t)
+        values = [np.broadcast_to(vv, nc.shape).copy() for vv in values]
+
+        if polish:
+            pc = np.broadcast_to(pc, nc.shape).copy()
+            # Indices of the points that are still moving
+            I = np.arange(nc.size)
+            for index in range(Nnewton):
+                if not I.size:
+                    break
+                n = nc[I]
+                error = pc[I] - pp[I]
+                # Newton step on dimensionless pressure
+                nnew = n - error / (n * (2.*values[1][I] + n*values[3][I]))
+                pc_,values_ = _pfromd(nnew, t[I])
+                # Only keep the steps that reduce the error
+                J = np.abs(pc_ - pp[I]) < np.abs(error)
+                K = I[J]
+                nc[K] = nnew[J]
+                pc[K] = pc_[J]
+                for vv,vv_ in zip(values,values_):
+                    vv[K] = np.broadcast_to(vv_, nnew.shape)[J]
+                # Continue with the points that are still moving
+                I = K[np.abs(nnew[J] - n[J]) > epsilon*nnew[J]]
+
+        return (nc.reshape(shape),t.reshape(shape)) + \
+                tuple(vv.reshape(shape) for vv in values)
+
+
+
+    def _th3(self,h,p,Tinit,dinit=500.):
         """Temperature from enthalpy and pressure in region 3
     T = _th3(h,p,Tinit,dinit)
 
-Unlike the other region evaluation functions, _th3 does NOT accept 
-arrays.  It requires initial values for temperature (Tinit) and 
-density (dinit).
+_th3 requires initial values for temperature (Tinit) and density
+(dinit).  h, p, Tinit, and dinit may be arrays, and they will be
+broadcast against one another.  Each point is iterated independently,
+so a point that converges early is left alone while the others finish.
 
-The IF-97 document does not supply inverse relationships in regime 3.  
+The IF-97 document does not supply inverse relationships in regime 3.
 Instead, _th3 uses Newton iteration to match enthalpy and pressure.
-In order to know that the point lies in region 3, the controlling 
-algorithm will already need to have evaluated the enthalpy at the 
+In order to know that the point lies in region 3, the controlling
+algorithm will already need to have evaluated the enthalpy at the
 region 3 boundary with region 1 and region 2 with pressure p.
 """
         # Define some important constants
@@ -434,20 +580,24 @@ region 3 boundary with region 1 and region 2 with pressure p.
         # Computing the square of error saves the square root
         threshold = epsilon*epsilon
 
+        h,p,Tinit,dinit = np.broadcast_arrays(
+                np.asarray(h,dtype=float), np.asarray(p,dtype=float),
+                np.asarray(Tinit,dtype=float), np.asarray(dinit,dtype=float))
         # nondimensionalize parameters
         pp = p * 1e2 / (dc * R * Tc)   # dimensionless target pressure
         hh = h / (R * Tc)   # dimensionless target enthalpy (sortof)
-        n = dinit/dc        # dimensionless density (delta)
-        t = Tc/Tinit        # dimensionless temperature (tau)
-
-        n_old = n
-        t_old = t
-        error_old = float('inf')
-        dx = np.array([0.,0.])
+        n = np.array(dinit/dc)      # dimensionless density (delta)
+        t = np.array(Tc/Tinit)      # dimensionless temperature (tau)
+
+        n_old = n.copy()
+        t_old = t.copy()
+        error_old = np.full(n.shape, np.inf)
+        dn = np.zeros(n.shape)
+        dt = np.zeros(n.shape)
         for count in range(maxiter):
             f,fx,fy,fxx,fxy,fyy = self._peval(n,t,self.data['r3'])
             # Modify the function and its derivatives to include the
-            # logarithmic terms.  
+            # logarithmic terms.
             f += A*np.log(n)
             DLN = A/n
             fx += DLN
@@ -461,33 +611,37 @@ region 3 boundary with region 1 and region 2 with pressure p.
             error = ptest*ptest + htest*htest
 
             # Test for convergence
-            if error < threshold:
+            Idone = error < threshold
+            if Idone.all():
                 return Tc/t
             # If the error in both variables is not reduced, cut the step size
-            # in half and repeat: this is back-tracking along the line of 
+            # in half and repeat: this is back-tracking along the line of
             # descent to look for a valley.
-            elif error >= error_old:
-                #print t,n,htest,ptest,'*'
-                dx /= 2.
-                n = n_old + dx[0]
-                t = t_old + dx[1]
+            Iback = np.logical_and(~Idone, error >= error_old)
+            dn[Iback] /= 2.
+            dt[Iback] /= 2.
             # Otherwise, use the typical Newton algorithm
-            else:
-                #print t,n,htest,ptest
-                # Retire the current error and n,t values
-                error_old = error
-                n_old = n
-                t_old = t
-
-                dpdn = n/t * (2.*fx + n*fxx)
-                dpdt = n*n/t * (fxy - fx/t)
-                dhdn = fxy + (fx + n*fxx)/t
-                dhdt = fyy + n/t*(fxy - fx/t)
-                dx = np.linalg.solve(
-                    [[dpdn, dpdt],[dhdn, dhdt]], [-ptest, -htest])
-                n += dx[0]
-                t += dx[1]
-        raise pyro.utility.PMAnalysisError('Steam _th3 failed to converge. h=%f, p=%f'%(h,p))
+            I = np.logical_and(~Idone, ~Iback)
+            # Retire the current error and n,t values
+            error_old[I] = error[I]
+            n_old[I] = n[I]
+            t_old[I] = t[I]
+
+            dpdn = n/t * (2.*fx + n*fxx)
+            dpdt = n*n/t * (fxy - fx/t)
+            dhdn = fxy + (fx + n*fxx)/t
+            dhdt = fyy + n/t*(fxy - fx/t)
+            # Solve the 2x2 system by Cramer's rule
+            det = dpdn*dhdt - dpdt*dhdn
+            dn[I] = ((dpdt*htest - dhdt*ptest)/det)[I]
+            dt[I] = ((dhdn*ptest - dpdn*htest)/det)[I]
+            # Points that have already converged are left alone
+            I = ~Idone
+            n[I] = n_old[I] + dn[I]
+            t[I] = t_old[I] + dt[I]
+
+        I = np.argmax(~Idone)
+        raise pyro.utility.PMAnalysisError('Steam _th3 failed to converge. h=%f, p=%f'%(h.flat[I],p.flat[I]))
 
 
 
@@ -495,14 +649,14 @@ region 3 boundary with region 1 and region 2 with pressure p.
         """Temperature from entropy and pressure in region 3
     T = _ts3(h,p,Tinit,dinit)
 
-Unlike the other region evaluation functions, _ts3 does NOT accept 
-arrays.  It requires initial values for temperature (Tinit) and 
-density (dinit).
+_ts3 requires initial values for temperature (Tinit) and density
+(dinit).  s, p, Tinit, and dinit may be arrays, and they will be
+broadcast against one another.
 
-The IF-97 document does not supply inverse relationships in regime 3.  
+The IF-97 document does not supply inverse relationships in regime 3.
 Instead, _th3 uses Newton iteration to match enthalpy and pressure.
-In order to know that the point lies in region 3, the controlling 
-algorithm will already need to have evaluated the enthalpy at the 
+In order to know that the point lies in region 3, the controlling
+algorithm will already need to have evaluated the enthalpy at the
 region 3 boundary with region 1 and region 2 with pressure p.
 """
 
@@ -517,20 +671,24 @@ region 3 boundary with region 1 and region 2 with pressure p.
         # Computing the square of error saves the square root
         threshold = epsilon*epsilon
 
+        s,p,Tinit,dinit = np.broadcast_arrays(
+                np.asarray(s,dtype=float), np.asarray(p,dtype=float),
+                np.asarray(Tinit,dtype=float), np.asarray(dinit,dtype=float))
         # nondimensionalize parameters
         pp = p * 1e2 / (dc * R * Tc)   # dimensionless target pressure
         ss = s / R          # dimensionless target enthalpy
-        n = dinit/dc        # dimensionless density (delta)
-        t = Tc/Tinit        # dimensionless temperature (tau)
-
-        n_old = n
-        t_old = t
-        error_old = float('inf')
-        dx = np.array([0.,0.])
+        n = np.array(dinit/dc)      # dimensionless density (delta)
+        t = np.array(Tc/Tinit)      # dimensionless temperature (tau)
+
+        n_old = n.copy()
+        t_old = t.copy()
+        error_old = np.full(n.shape, np.inf)
+        dn = np.zeros(n.shape)
+        dt = np.zeros(n.shape)
         for count in range(maxiter):
             f,fx,fy,fxx,fxy,fyy = self._peval(n,t,self.data['r3'])
             # Modify the function and its derivatives to include the
-            # logarithmic terms.  
+            # logarithmic terms.
             f += A*np.log(n)
             DLN = A/n
             fx += DLN
@@ -544,33 +702,37 @@ region 3 boundary with region 1 and region 2 with pressure p.
             error = ptest*ptest + stest*stest
 
             # Test for convergence
-            if error < threshold:
+            Idone = error < threshold
+            if Idone.all():
                 return Tc/t
             # If the error in both variables is not reduced, cut the step size
-            # in half and repeat: this is back-tracking along the line of 
+            # in half and repeat: this is back-tracking along the line of
             # descent to look for a valley.
-            elif error >= error_old:
-                #print t,n,htest,ptest,'*'
-                dx /= 2.
-                n = n_old + dx[0]
-                t = t_old + dx[1]
+            Iback = np.logical_and(~Idone, error >= error_old)
+            dn[Iback] /= 2.
+            dt[Iback] /= 2.
             # Otherwise, use the typical Newton algorithm
-            else:
-                #print t,n,htest,ptest
-                # Retire the current error and n,t values
-                error_old = error
-                n_old = n
-                t_old = t
-
-                dpdn = n/t * (2.*fx + n*fxx)
-                dpdt = n*n/t * (fxy - fx/t)
-                dsdn = t*fxy - fx
-                dsdt = t*fyy
-                dx = np.linalg.solve(
-                    [[dpdn, dpdt],[dsdn, dsdt]], [-ptest, -stest])
-                n += dx[0]
-                t += dx[1]
-        raise pyro.utility.PMAnalysisError('Steam _ts3 failed to converge. s=%f, p=%f'%(s,p))
+            I = np.logical_and(~Idone, ~Iback)
+            # Retire the current error and n,t values
+            error_old[I] = error[I]
+            n_old[I] = n[I]
+            t_old[I] = t[I]
+
+            dpdn = n/t * (2.*fx + n*fxx)
+            dpdt = n*n/t * (fxy - fx/t)
+            dsdn = t*fxy - fx
+            dsdt = t*fyy
+            # Solve the 2x2 system by Cramer's rule
+            det = dpdn*dsdt - dpdt*dsdn
+            dn[I] = ((dpdt*stest - dsdt*ptest)/det)[I]
+            dt[I] = ((dsdn*ptest - dpdn*stest)/det)[I]
+            # Points that have already converged are left alone
+            I = ~Idone
+            n[I] = n_old[I] + dn[I]
+            t[I] = t_old[I] + dt[I]
+
+        I = np.argmax(~Idone)
+        raise pyro.utility.PMAnalysisError('Steam _ts3 failed to converge. s=%f, p=%f'%(s.flat[I],p.flat[I]))
 
 
     def _g5(self,T,p,order=2):
@@ -604,13 +766,13 @@ calculate.
         """Temperature from enthalpy and pressure in region 5
     T = _th5(h,p,Tinit)
 
-Unlike the other region evaluation functions, _th5 does NOT accept 
-arrays.  It requires an initial value for temperature (Tinit).
+_th5 requires an initial value for temperature (Tinit).  h, p, and
+Tinit may be arrays, and they will be broadcast against one another.
 
-The IF-97 document does not supply inverse relationships in regime 5.  
+The IF-97 document does not supply inverse relationships in regime 5.
 Instead, _th5 uses Newton iteration to match enthalpy and pressure.
-In order to know that the point lies in region 5, the controlling 
-algorithm will already need to have evaluated the enthalpy at the 
+In order to know that the point lies in region 5, the controlling
+algorithm will already need to have evaluated the enthalpy at the
 region 5 boundary with region 2 with pressure p.
 """
         # Define some important constants
@@ -619,17 +781,21 @@ region 5 boundary with region 2 with pressure p.
         Ts = 1000.      # temperature scale
         maxiter = 30    # maximum iterations
         epsilon = 1e-6
+        h,p,Tinit = np.broadcast_arrays(
+                np.asarray(h,dtype=float), np.asarray(p,dtype=float),
+                np.asarray(Tinit,dtype=float))
         # nondimensional terms
-        t = Ts/Tinit
+        t = np.array(Ts/Tinit)
         hh = h/R/Ts
 
         for count in range(maxiter):
             _,_,g,gp,gt,gpp,gpt,gtt = self._g5(T=Ts/t, p=p, order=2)
             htest = gt - hh
-            if abs(htest)<epsilon*hh:
+            I = np.abs(htest)>=epsilon*hh
+            if not I.any():
                 return Ts/t
             dhdt = gtt
-            t -= htest/dhdt
+            t[I] -= (htest/dhdt)[I]
         raise pyro.utility.PMAnalysisError('Steam _th5() failed to converge.')
 
 
@@ -637,13 +803,13 @@ region 5 boundary with region 2 with pressure p.
         """Temperature from entropy and pressure in region 5
     T = _ts5(s,p,Tinit)
 
-Unlike the other region evaluation functions, _ts5 does NOT accept 
-arrays.  It requires an initial value for temperature (Tinit).
+_ts5 requires an initial value for temperature (Tinit).  s, p, and
+Tinit may be arrays, and they will be broadcast against one another.
 
-The IF-97 document does not supply inverse relationships in regime 5.  
+The IF-97 document does not supply inverse relationships in regime 5.
 Instead, _th5 uses Newton iteration to match entropy and pressure.
-In order to know that the point lies in region 5, the controlling 
-algorithm will already need to have evaluated the enthalpy at the 
+In order to know that the point lies in region 5, the controlling
+algorithm will already need to have evaluated the enthalpy at the
 region 5 boundary with region 2 with pressure p.
 """
         # Define some important constants
@@ -652,17 +818,21 @@ region 5 boundary with region 2 with pressure p.
         Ts = 1000.      # temperature scale
         maxiter = 30    # maximum iterations
         epsilon = 1e-6
+        s,p,Tinit = np.broadcast_arrays(
+                np.asarray(s,dtype=float), np.asarray(p,dtype=float),
+                np.asarray(Tinit,dtype=float))
         # nondimensional terms
-        t = Ts/Tinit
+        t = np.array(Ts/Tinit)
         ss = s/R
 
         for count in range(maxiter):
             _,_,g,gp,gt,gpp,gpt,gtt = self._g5(T=Ts/t, p=p, order=2)
             stest = t*gt - g - ss
-            if abs(stest)<epsilon*ss:
+            I = np.abs(stest)>=epsilon*ss
+            if not I.any():
                 return Ts/t
             dsdt = t*gtt
-            t -= stest/dsdt
+            t[I] -= (stest/dsdt)[I]
         raise pyro.utility.PMAnalysisError('Steam _ts5() failed to converge.')
 
 
@@ -705,15 +875,17 @@ equations 20 and 21 modified for pressure in bar.
     def _region(self,T,p):
         """Identify the region in the IF97 model
     r = mps._region(T,p)
-    
-For a scalar T and p, returns the IF-97 region index.  If a valid region
-is not found, _region() returns -1.
+
+Returns the IF-97 region index for each T,p pair.  T and p may be
+arrays, in which case they are broadcast against one another, and r
+is an integer array with the same shape.  Where a valid region is not
+found, _region() returns -1.
 
 Accepts K, bar
 Returns dimensionless
 """
         nan = -1
-        
+
         T13 = 623.15
         T32 = 863.15
         T25 = 1073.15
@@ -722,33 +894,28 @@ Returns dimensionless
         pmax = 1000.
         p5max = 500.
 
-        pc = self.data['pc']
-        Tc = self.data['Tc']
-        
-        if p<0. or p>pmax:
-            return nan
-        elif T>Tmax:
-            return nan
-        elif T>T25:
-            if p>p5max:
-                return nan
-            else:
-                return 5
-        elif T>T32:
-            return 2
-        elif T>T13:
-            # Test pressure against the 2-3 boundary
-            if p<self._b23(T=T):
-                return 2
-            else:
-                # we're in region 3.
-                return 3
-        else:
-            if p<self._ps(T):
-                return 2
-            else:
-                return 1
-        raise Exception('Unhandled exception in IF97 _region()')
+        T,p = np.broadcast_arrays(
+                np.asarray(T,dtype=float), np.asarray(p,dtype=float))
+        r = np.full(T.shape, nan, dtype=int)
+
+        # Points outside of the pressure and temperature maximums are
+        # left with the nan region index.
+        Ivalid = np.logical_and(np.logical_and(p>=0., p<=pmax), T<=Tmax)
+        # Region 5 is bounded by a lower maximum pressure
+        I = np.logical_and(Ivalid, T>T25)
+        r[np.logical_and(I, p<=p5max)] = 5
+        # Between T32 and T25, only region 2 is possible
+        I = np.logical_and(Ivalid, np.logical_and(T>T32, T<=T25))
+        r[I] = 2
+        # Test pressure against the 2-3 boundary
+        I = np.logical_and(Ivalid, np.logical_and(T>T13, T<=T32))
+        if I.any():
+            r[I] = np.where(p[I]<self._b23(T=T[I]), 2, 3)
+        # Test pressure against the saturation curve
+        I = np.logical_and(Ivalid, T<=T13)
+        if I.any():
+            r[I] = np.where(p[I]<self._ps(T[I]), 2, 1)
+        return r
 
 
     def _ps(self, T):
@@ -1259,6 +1426,203 @@ Returns (unit_temperature)
         
 
 
+    def _tpxparse(self, T=None, p=None, x=None):
+        """Parse temperature, pressure, and quality arguments
+    TT, pp, xx, def_T, def_p = _tpxparse(T=None, p=None, x=None)
+
+Applies the 'def_T' and 'def_p' defaults, converts temperature and
+pressure to K and bar, and broadcasts T, p, and x against one another.
+When x is omitted, it is set to -1; quality values less than zero
+indicate points that are not saturated.  The def_T and def_p flags
+indicate whether the respective default was used.
+
+Accepts unit_temperature
+        unit_pressure
+        dimensionless
+Returns K
+        bar
+        dimensionless
+"""
+        def_T = T is None
+        if def_T:
+            T = pyro.config['def_T']
+        def_p = p is None
+        if def_p:
+            p = pyro.config['def_p']
+        if x is None:
+            x = -1.
+
+        T = pyro.units.temperature_scale(np.asarray(T,dtype=float), to_units='K')
+        p = pyro.units.pressure(np.asarray(p,dtype=float), to_units='bar')
+        TT,pp,xx = np.broadcast_arrays(T, p, np.asarray(x,dtype=float))
+        return TT,pp,xx,def_T,def_p
+
+
+    def _gprops(self, T, p, G, props):
+        """Properties from the Gibbs regions (1, 2, and 5)
+    values = _gprops(T, p, G, props)
+
+G is the tuple returned by _g1(), _g2(), or _g5() evaluated at T,p.
+Returns a dictionary with an entry for each of the properties listed
+in props.
+
+Accepts K, bar
+Returns kJ/kg, kJ/kg/K, kg/m3
+"""
+        R = self.data['R']
+        pi,t,g,gp,gt,gpp,gpt,gtt = G
+        out = {}
+        for prop in props:
+            if prop == 'h':
+                out[prop] = R * T * t * gt
+            elif prop == 's':
+                out[prop] = R * (t*gt - g)
+            elif prop == 'd':
+                out[prop] = p * 100 / (R * T * pi * gp)
+            elif prop == 'e':
+                out[prop] = T * R * (t*gt - pi*gp)
+            elif prop == 'cp':
+                out[prop] = -R * t*t*gtt
+            elif prop == 'cv':
+                temp = gp - t*gpt
+                temp = temp*temp/gpp
+                out[prop] = R * (temp - t*t*gtt)
+        return out
+
+
+    def _fprops(self, T, F, props):
+        """Properties from the Helmholtz region (3)
+    values = _fprops(T, F, props)
+
+F is the tuple returned by _f3() evaluated at T.  Returns a dictionary
+with an entry for each of the properties listed in props.
+
+Accepts K
+Returns kJ/kg, kJ/kg/K, kg/m3
+"""
+        R = self.data['R']
+        n,t,f,fn,ft,fnn,fnt,ftt = F
+        out = {}
+        for prop in props:
+            if prop == 'h':
+                out[prop] = R * T * (n*fn + t*ft)
+            elif prop == 's':
+                out[prop] = R * (t*ft - f)
+            elif prop == 'd':
+                out[prop] = self.data['dc'] * n
+            elif prop == 'e':
+                out[prop] = T * R * t*ft
+            elif prop == 'cp':
+                temp = n*fn - n*t*fnt
+                temp = temp*temp/(2*n*fn + n*n*fnn)
+                out[prop] = R * (-t*t*ftt + temp)
+            elif prop == 'cv':
+                out[prop] = -R * t*t*ftt
+        return out
+
+
+    def _tpxeval(self, TT, pp, xx, def_T, def_p, props):
+        """Evaluate properties from parsed T, p, and x arrays
+    values = _tpxeval(TT, pp, xx, def_T, def_p, props)
+
+TT, pp, xx, def_T, and def_p are the outputs of _tpxparse().  props is
+an iterable of property strings; 'T', 'p', 'h', 's', 'd', 'e', 'cp', and
+'cv' are supported.  Returns a dictionary with an array for each 
+property.  T and p are only different from TT and pp where the 
+saturation temperature or pressure replaced a default value.
+
+Rather than visiting each point in turn, all points are sorted into
+their regions with boolean masks first.  Each region's Gibbs or
+Helmholtz function is then evaluated once on all of its points, and the
+results are scattered back into the output arrays.  Points with a
+non-negative quality are treated as saturated (IF-97 region 4).
+
+Accepts K, bar, dimensionless
+Returns kJ/kg, kJ/kg/K, kg/m3
+"""
+        # Only the specific heats need second derivatives
+        order = 1
+        if 'cp' in props or 'cv' in props:
+            order = 2
+
+        out = {}
+        for prop in props:
+            if prop == 'T':
+                out[prop] = TT.copy()
+            elif prop == 'p':
+                out[prop] = pp.copy()
+            else:
+                out[prop] = np.zeros(TT.shape)
+        # T and p are not calculated by the regions
+        props = [prop for prop in props if prop not in ('T','p')]
+
+        # Classify all points by region
+        Isat = xx>=0.
+        r = np.full(TT.shape, 4, dtype=int)
+        I = ~Isat
+        if I.any():
+            r[I] = self._region(TT[I], pp[I])
+            I = r<0
+            if I.any():
+                k = np.argmax(I)
+                raise pyro.utility.PMParamError('Invalid property combination T=%f K, p=%f bar'%(TT.flat[k],pp.flat[k]))
+
+        # Evaluate the Gibbs regions
+        # If only T and p were requested, none of the regions (nor the 
+        # region 3 density iteration) needs to be evaluated.
+        for rr,gfn in ((1,self._g1), (2,self._g2), (5,self._g5)):
+            I = r==rr
+            if props and I.any():
+                T = TT[I]
+                p = pp[I]
+                values = self._gprops(T, p, gfn(T,p,order=order), props)
+                for prop in props:
+                    out[prop][I] = values[prop]
+
+        # Evaluate the Helmholtz region
+        I = r==3
+        if props and I.any():
+            T = TT[I]
+            p = pp[I]
+            values = self._fprops(T, self._f3(T,p), props)
+            for prop in props:
+                out[prop][I] = values[prop]
+
+        # Saturated mixtures
+        if Isat.any():
+            T = TT[Isat]
+            p = pp[Isat]
+            x = xx[Isat]
+            # If T was unspecified
+            if def_T:
+                # Override the default T with the saturation T
+                T = self._Ts(p)
+            # If pressure was unspecified, but temperature WAS
+            elif def_p:
+                # Override the default p with the saturation p
+                p = self._ps(T)
+            if 'T' in out:
+                out['T'][Isat] = T
+            if 'p' in out:
+                out['p'][Isat] = p
+            if not props:
+                return out
+            valuesL = self._gprops(T, p, self._g1(T,p,order=order), props)
+            valuesV = self._gprops(T, p, self._g2(T,p,order=order), props)
+            for prop in props:
+                L = valuesL[prop]
+                V = valuesV[prop]
+                # Density mixes by specific volume
+                if prop == 'd':
+                    L = 1./L
+                    V = 1./V
+                    out[prop][Isat] = 1./(L + (V-L)*x)
+                else:
+                    out[prop][Isat] = L + (V-L)*x
+        return out
+
+
+
     def hsd(self, T=None, p=None, x=None):
         """Calculate enthalpy entropy and density
     (h,s,d) = hsd(T,p)
@@ -1280,84 +1644,8 @@ Returns unit_energy / unit_matter
         unit_energy / unit_matter / unit_temperature
         unit_matter / unit_volume
 """
-        def_T = False
-        if T is None:
-            T = pyro.config['def_T']
-            def_T = True
-
-        def_p = False
-        if p is None:
-            p = pyro.config['def_p']
-            def_p = True
-        pscale = pyro.units.pressure(to_units='bar')
-
-        if x is None:
-            x = -1.
-
-        R = self.data['R']
-
-        it = np.nditer((None,None,None,T,p,x), 
-				op_flags=[['readwrite','allocate'],['readwrite','allocate'],['readwrite','allocate'],
-					['readonly','copy'],['readonly','copy'],['readonly','copy']], 
-					op_dtypes='float')
-
-        for h_,s_,d_,T_,p_,x_ in it:
-            TT = pyro.units.temperature_scale(T_, to_units='K')
-            pp = p_ * pscale
-
-            # If x is unspecified
-            if x_<0.:
-
-                # Detect the region
-                r = self._region(TT,pp)
-                # Case out the region indices
-                if r==1:
-                    pi,t,g,gp,gt,_,_,_ = self._g1(TT,pp,order=1)
-                    h_[...] = R * TT * t * gt
-                    s_[...] = R * (t*gt - g)
-                    d_[...] = pp * 100 / (R * TT * pi * gp)
-                elif r==2:
-                    pi,t,g,gp,gt,_,_,_ = self._g2(TT,pp,order=1)
-                    h_[...] = R*TT * t * gt
-                    s_[...] = R * (t*gt - g)
-                    d_[...] = pp * 100 / (R * TT * pi * gp)
-                elif r==3:
-                    n,t,f,fn,ft,_,_,_ = self._f3(TT,pp)
-                    h_[...] = R*TT * (n*fn + t*ft)
-                    s_[...] = R * (t*ft - f)
-                    d_[...] = self.data['dc'] * n
-                elif r==5:
-                    pi,t,g,gp,gt,_,_,_ = self._g5(TT,pp,order=1)
-                    h_[...] = R*TT * t * gt
-                    s_[...] = R * (t*gt - g)
-                    d_[...] = pp * 100 / (R * TT * pi * gp)
-                else:
-                    raise pyro.utility.PMParamError('Invalid property combination T=%f K, p=%f bar'%(TT,pp))
-
-            else:
-                # If T was unspecified
-                if def_T:
-                    # Override the default T with the saturation T
-                    TT = self._Ts(pp)
-                # If pressure was unspecified, but temperature WAS
-                elif pp<0.:
-                    # Override the default p with the saturation p
-                    pp = self._ps(TT)
-
-                pi,t,g,gp,gt,_,_,_ = self._g1(TT,pp,order=1)
-                hL = R * TT * t * gt
-                sL = R * (t*gt - g)
-                vL = (R * TT * pi * gp) / (pp * 100)
-                pi,t,g,gp,gt,_,_,_ = self._g2(TT,pp,order=1)
-                hV = R * TT * t * gt
-                sV = R * (t*gt - g)
-                vV = (R * TT * pi * gp) / (pp * 100)
-
-                h_[...] = hL + (hV-hL)*x_
-                s_[...] = sL + (sV-sL)*x_
-                d_[...] = 1./(vL + (vV-vL)*x_)
-
-        h,s,d = it.operands[0:3]
+        TT,pp,xx,def_T,def_p = self._tpxparse(T,p,x)
+        values = self._tpxeval(TT,pp,xx,def_T,def_p,('h','s','d'))
 
         # Convert the results
         hscale = pyro.units.energy(from_units='kJ')
@@ -1366,8 +1654,83 @@ Returns unit_energy / unit_matter
         sscale = pyro.units.temperature(sscale,from_units='K')
         dscale = pyro.units.volume(from_units='m3',exponent=-1)
         dscale = pyro.units.matter(dscale, self.data['mw'], from_units='kg')
-        
-        return hscale*h, sscale*s, dscale*d
+
+        return hscale*values['h'], sscale*values['s'], dscale*values['d']
+
+
+    def state(self, T=None, p=None, x=None, props=None):
+        """Calculate all properties at a state
+    sd = state(T=None, p=None, x=None)
+
+The properties are returned in a dictionary with keys:
+    T   temperature         unit_temperature
+    p   pressure            unit_pressure
+    d   density             unit_matter / unit_volume
+    v   specific volume     unit_volume / unit_matter
+    x   quality             dimensionless
+    e   internal energy     unit_energy / unit_matter
+    h   enthalpy            unit_energy / unit_matter
+    s   entropy             unit_energy / unit_matter / unit_temperature
+    cp  const. p sp. ht.    unit_energy / unit_matter / unit_temperature
+    cv  const. v sp. ht.    unit_energy / unit_matter / unit_temperature
+    gam spec. heat ratio    dimensionless
+
+The temperature, pressure, and quality are accepted in the same 
+combinations as the other property methods.  Quality is -1 for points 
+that are not saturated.
+
+The optional props keyword limits the calculation to a sequence of the
+above keys.  Each region is only evaluated once for all of the 
+requested properties, and properties that are not requested are not 
+calculated.
+    sd = state(T, p, props=('h','s','d'))
+"""
+        allprops = ('T','p','d','v','x','e','h','s','cp','cv','gam')
+        if props is None:
+            props = allprops
+        elif isinstance(props, str):
+            props = (props,)
+        for prop in props:
+            if prop not in allprops:
+                raise pyro.utility.PMParamError(
+                        'Unrecognized state property: ' + repr(prop))
+
+        TT,pp,xx,def_T,def_p = self._tpxparse(T,p,x)
+        need = []
+        for prop in props:
+            if prop in ('T','p','d','e','h','s','cp','cv'):
+                need.append(prop)
+            elif prop == 'v':
+                need.append('d')
+            elif prop == 'gam':
+                need += ['cp','cv']
+        values = self._tpxeval(TT,pp,xx,def_T,def_p,need)
+
+        # Convert the results
+        out = {}
+        for prop in props:
+            if prop == 'T':
+                out[prop] = pyro.units.temperature_scale(values['T'], from_units='K')
+            elif prop == 'p':
+                out[prop] = pyro.units.pressure(values['p'], from_units='bar')
+            elif prop == 'x':
+                out[prop] = xx.copy()
+            elif prop == 'gam':
+                out[prop] = values['cp'] / values['cv']
+            elif prop == 'd' or prop == 'v':
+                dscale = pyro.units.volume(from_units='m3',exponent=-1)
+                dscale = pyro.units.matter(dscale, self.data['mw'], from_units='kg')
+                if prop == 'd':
+                    out[prop] = dscale*values['d']
+                else:
+                    out[prop] = 1./(dscale*values['d'])
+            else:
+                scale = pyro.units.energy(from_units='kJ')
+                scale = pyro.units.matter(scale,self.data['mw'],from_units='kg',exponent=-1)
+                if prop in ('s','cp','cv'):
+                    scale = pyro.units.temperature(scale,from_units='K',exponent=-1)
+                out[prop] = scale*values[prop]
+        return out
 
 
     def h(self,T=None,p=None,x=None):
@@ -1389,70 +1752,8 @@ Accepts unit_temperature
         dimensionless
 Returns unit_energy / unit_matter
 """
-        def_T = False
-        if T is None:
-            T = pyro.config['def_T']
-            def_T = True
-
-        def_p = False
-        if p is None:
-            p = pyro.config['def_p']
-            def_p = True
-        pscale = pyro.units.pressure(to_units='bar')
-
-        if x is None:
-            x = -1.
-
-        R = self.data['R']
-
-        it = np.nditer((None,T,p,x), 
-                op_flags=[['readwrite','allocate'],['readonly','copy'],
-                    ['readonly','copy'],['readonly','copy']], op_dtypes='float')
-
-        for h_,T_,p_,x_ in it:
-            TT = pyro.units.temperature_scale(T_, to_units='K')
-            pp = p_ * pscale
-
-            # If x is unspecified
-            if x_<0.:
-
-                # Detect the region
-                r = self._region(TT,pp)
-                # Case out the region indices
-                if r==1:
-                    pi,t,g,gp,gt,_,_,_ = self._g1(TT,pp,order=1)
-                    h_[...] = R * TT * t * gt
-                elif r==2:
-                    pi,t,g,gp,gt,_,_,_ = self._g2(TT,pp,order=1)
-                    h_[...] = R*TT * t * gt
-                elif r==3:
-                    n,t,f,fn,ft,_,_,_ = self._f3(TT,pp)
-                    h_[...] = R*TT * (n*fn + t*ft)
-                elif r==5:
-                    pi,t,g,gp,gt,_,_,_ = self._g5(TT,pp,order=1)
-                    h_[...] = R*TT * t * gt
-                else:
-                    raise pyro.utility.PMParamError('Invalid property combination T=%f K, p=%f bar'%(TT,pp))
-
-
-            else:
-                # If T was unspecified
-                if def_T:
-                    # Override the default T with the saturation T
-                    TT = self._Ts(pp)
-                # If pressure was unspecified, but temperature WAS
-                elif def_p:
-                    # Override the default p with the saturation p
-                    pp = self._ps(TT)
-
-                pi,t,g,gp,gt,_,_,_ = self._g1(TT,pp,order=1)
-                hL = R * TT * t * gt
-                pi,t,g,gp,gt,_,_,_ = self._g2(TT,pp,order=1)
-                hV = R * TT * t * gt
-
-                h_[...] = hL + (hV-hL)*x_
-
-        h = it.operands[0]
+        TT,pp,xx,def_T,def_p = self._tpxparse(T,p,x)
+        h = self._tpxeval(TT,pp,xx,def_T,def_p,('h',))['h']
 
         # Convert the results
         hscale = pyro.units.energy(from_units='kJ')
@@ -1481,75 +1782,13 @@ Accepts unit_temperature
         dimensionless
 Returns unit_matter / unit_volume
 """
-        def_T = False
-        if T is None:
-            T = pyro.config['def_T']
-            def_T = True
-
-        def_p = False
-        if p is None:
-            p = pyro.config['def_p']
-            def_p = True
-        pscale = pyro.units.pressure(to_units='bar')
-
-        if x is None:
-            x = -1.
-
-        R = self.data['R']
-
-        it = np.nditer((None,T,p,x), 
-                op_flags=[['readwrite','allocate'],['readonly','copy'],
-                    ['readonly','copy'],['readonly','copy']], op_dtypes='float')
-
-        for d_,T_,p_,x_ in it:
-            TT = pyro.units.temperature_scale(T_, to_units='K')
-            pp = p_ * pscale
-
-            # If x is unspecified
-            if x_<0.:
-
-                # Detect the region
-                r = self._region(TT,pp)
-                # Case out the region indices
-                if r==1:
-                    pi,t,g,gp,gt,_,_,_ = self._g1(TT,pp,order=1)
-                    d_[...] = pp * 100 / (R * TT * pi * gp)
-                elif r==2:
-                    pi,t,g,gp,gt,_,_,_ = self._g2(TT,pp,order=1)
-                    d_[...] = pp * 100 / (R * TT * pi * gp)
-                elif r==3:
-                    n,t,f,fn,ft,_,_,_ = self._f3(TT,pp)
-                    d_[...] = self.data['dc'] * n
-                elif r==5:
-                    pi,t,g,gp,gt,_,_,_ = self._g5(TT,pp,order=1)
-                    d_[...] = pp * 100 / (R * TT * pi * gp)
-                else:
-                    raise pyro.utility.PMParamError('Invalid property combination T=%f K, p=%f bar'%(TT,pp))
-
-
-            else:
-                # If T was unspecified
-                if def_T:
-                    # Override the default T with the saturation T
-                    TT = self._Ts(pp)
-                # If pressure was unspecified, but temperature WAS
-                elif def_p:
-                    # Override the default p with the saturation p
-                    pp = self._ps(TT)
-
-                pi,t,g,gp,gt,_,_,_ = self._g1(TT,pp,order=1)
-                vL = (R * TT * pi * gp) / (pp * 100)
-                pi,t,g,gp,gt,_,_,_ = self._g2(TT,pp,order=1)
-                vV = (R * TT * pi * gp) / (pp * 100)
-
-                d_[...] = 1./(vL + (vV-vL)*x_)
-
-        d = it.operands[0]
+        TT,pp,xx,def_T,def_p = self._tpxparse(T,p,x)
+        d = self._tpxeval(TT,pp,xx,def_T,def_p,('d',))['d']
 
         # Convert the results
         dscale = pyro.units.volume(from_units='m3',exponent=-1)
         dscale = pyro.units.matter(dscale, self.data['mw'], from_units='kg')
-        
+
         return dscale*d
 
 
@@ -1573,76 +1812,14 @@ Accepts unit_temperature
         dimensionless
 Returns unit_energy / unit_matter / unit_temperature
 """
-        def_T = False
-        if T is None:
-            T = pyro.config['def_T']
-            def_T = True
-
-        def_p = False
-        if p is None:
-            p = pyro.config['def_p']
-            def_p = True
-        pscale = pyro.units.pressure(to_units='bar')
-
-        if x is None:
-            x = -1.
-
-        R = self.data['R']
-
-        it = np.nditer((None,T,p,x), 
-                op_flags=[['readwrite','allocate'],['readonly','copy'],
-                    ['readonly','copy'],['readonly','copy']], op_dtypes='float')
-
-        for s_,T_,p_,x_ in it:
-            TT = pyro.units.temperature_scale(T_, to_units='K')
-            pp = p_ * pscale
-
-            # If x is unspecified
-            if x_<0.:
-
-                # Detect the region
-                r = self._region(TT,pp)
-                # Case out the region indices
-                if r==1:
-                    pi,t,g,gp,gt,_,_,_ = self._g1(TT,pp,order=1)
-                    s_[...] = R * (t*gt - g)
-                elif r==2:
-                    pi,t,g,gp,gt,_,_,_ = self._g2(TT,pp,order=1)
-                    s_[...] = R * (t*gt - g)
-                elif r==3:
-                    n,t,f,fn,ft,_,_,_ = self._f3(TT,pp)
-                    s_[...] = R * (t*ft - f)
-                elif r==5:
-                    pi,t,g,gp,gt,_,_,_ = self._g5(TT,pp,order=1)
-                    s_[...] = R * (t*gt - g)
-                else:
-                    raise pyro.utility.PMParamError('Invalid property combination T=%f K, p=%f bar'%(TT,pp))
-
-
-            else:
-                # If T was unspecified
-                if def_T:
-                    # Override the default T with the saturation T
-                    TT = self._Ts(pp)
-                # If pressure was unspecified, but temperature WAS
-                elif def_p:
-                    # Override the default p with the saturation p
-                    pp = self._ps(TT)
-
-                pi,t,g,gp,gt,_,_,_ = self._g1(TT,pp,order=1)
-                sL = R * (t*gt - g)
-                pi,t,g,gp,gt,_,_,_ = self._g2(TT,pp,order=1)
-                sV = R * (t*gt - g)
-
-                s_[...] = sL + (sV-sL)*x_
-
-        s = it.operands[0]
+        TT,pp,xx,def_T,def_p = self._tpxparse(T,p,x)
+        s = self._tpxeval(TT,pp,xx,def_T,def_p,('s',))['s']
 
         # Convert the results
         sscale = pyro.units.energy(from_units='kJ')
         sscale = pyro.units.matter(sscale,self.data['mw'],from_units='kg',exponent=-1)
         sscale = pyro.units.temperature(sscale,from_units='K')
-        
+
         return sscale*s
 
 
@@ -1666,70 +1843,8 @@ Accepts unit_temperature
         dimensionless
 Returns unit_energy / unit_matter
 """
-        def_T = False
-        if T is None:
-            T = pyro.config['def_T']
-            def_T = True
-
-        def_p = False
-        if p is None:
-            p = pyro.config['def_p']
-            def_p = True
-        pscale = pyro.units.pressure(to_units='bar')
-
-        if x is None:
-            x = -1.
-
-        R = self.data['R']
-
-        it = np.nditer((None,T,p,x), 
-                op_flags=[['readwrite','allocate'],['readonly','copy'],
-                    ['readonly','copy'],['readonly','copy']], op_dtypes='float')
-
-        for e_,T_,p_,x_ in it:
-            TT = pyro.units.temperature_scale(T_,to_units='K')
-            pp = p_ * pscale
-
-            # If x is unspecified
-            if x_<0.:
-
-                # Detect the region
-                r = self._region(TT,pp)
-                # Case out the region indices
-                if r==1:
-                    pi,t,_,gp,gt,_,_,_ = self._g1(TT,pp,order=1)
-                    e_[...] = TT * R * (t*gt - pi*gp)
-                elif r==2:
-                    pi,t,_,gp,gt,_,_,_ = self._g2(TT,pp,order=1)
-                    e_[...] = TT * R * (t*gt - pi*gp)
-                elif r==3:
-                    n,t,_,_,ft,_,_,_ = self._f3(TT,pp)
-                    e_[...] = TT * R * t*ft
-                elif r==5:
-                    pi,t,_,gp,gt,_,_,_ = self._g5(TT,pp,order=1)
-                    e_[...] = TT * R * (t*gt - pi*gp)
-                else:
-                    raise pyro.utility.PMParamError('Invalid property combination T=%f K, p=%f bar'%(TT,pp))
-
-
-            else:
-                # If T was unspecified
-                if def_T:
-                    # Override the default T with the saturation T
-                    TT = self._Ts(pp)
-                # If pressure was unspecified, but temperature WAS
-                elif def_p:
-                    # Override the default p with the saturation p
-                    pp = self._ps(TT)
-
-                pi,t,_,gp,gt,_,_,_ = self._g1(TT,pp,order=1)
-                eL = TT * R * (t*gt - pi*gp)
-                pi,t,g,gp,gt,_,_,_ = self._g2(TT,pp,order=1)
-                eV = TT * R * (t*gt - pi*gp)
-
-                e_[...] = eL + (eV-eL)*x_
-
-        e = it.operands[0]
+        TT,pp,xx,def_T,def_p = self._tpxparse(T,p,x)
+        e = self._tpxeval(TT,pp,xx,def_T,def_p,('e',))['e']
 
         # Convert the results
         scale = pyro.units.energy(from_units='kJ')
@@ -1758,71 +1873,8 @@ Accepts unit_temperature
         dimensionless
 Returns unit_energy / unit_matter / unit_temperature
 """
-        def_T = False
-        if T is None:
-            T = pyro.config['def_T']
-            def_T = True
-
-        def_p = False
-        if p is None:
-            p = pyro.config['def_p']
-            def_p = True
-        pscale = pyro.units.pressure(to_units='bar')
-
-        if x is None:
-            x = -1.
-
-        R = self.data['R']
-
-        it = np.nditer((None,T,p,x), 
-                op_flags=[['readwrite','allocate'],['readonly','copy'],
-                    ['readonly','copy'],['readonly','copy']], op_dtypes='float')
-
-        for cp_,T_,p_,x_ in it:
-            TT = pyro.units.temperature_scale(T_, to_units='K')
-            pp = p_ * pscale
-            # If x is unspecified
-            if x_<0.:
-
-                # Detect the region
-                r = self._region(TT,pp)
-                # Case out the region indices
-                if r==1:
-                    pi,t,_,_,_,_,_,gtt = self._g1(TT,pp,order=2)
-                    cp_[...] = -R * t*t*gtt
-                elif r==2:
-                    pi,t,_,_,_,_,_,gtt = self._g2(TT,pp,order=2)
-                    cp_[...] = -R * t*t*gtt
-                elif r==3:
-                    n,t,_,fp,ft,fpp,fpt,ftt = self._f3(TT,pp)
-                    temp = n*fp - n*t*fpt
-                    temp = temp*temp/(2*n*fp + n*n*fpp)
-                    cp_[...] = R * (-t*t*ftt + temp)
-                elif r==5:
-                    pi,t,_,_,_,_,_,gtt = self._g5(TT,pp,order=2)
-                    cp_[...] = -R * t*t*gtt
-                else:
-                    raise pyro.utility.PMParamError('Invalid property combination T=%f K, p=%f bar'%(T_,pp))
-
-
-            else:
-                # If T was unspecified
-                if def_T:
-                    # Override the default T with the saturation T
-                    TT = self._Ts(pp)
-                # If pressure was unspecified, but temperature WAS
-                elif def_p:
-                    # Override the default p with the saturation p
-                    pp = self._ps(TT)
-
-                pi,t,_,_,_,_,_,gtt = self._g1(TT,pp,order=2)
-                cpL = -R * t*t*gtt
-                pi,t,_,_,_,_,_,gtt = self._g2(TT,pp,order=2)
-                cpV = -R * t*t*gtt
-
-                cp_[...] = cpL + (cpV-cpL)*x_
-
-        cp = it.operands[0]
+        TT,pp,xx,def_T,def_p = self._tpxparse(T,p,x)
+        cp = self._tpxeval(TT,pp,xx,def_T,def_p,('cp',))['cp']
 
         # Convert the results
         scale = pyro.units.energy(from_units='kJ')
@@ -1831,8 +1883,8 @@ Returns unit_energy / unit_matter / unit_temperature
 
         return cp * scale
 
-        
-        
+
+
     def cv(self,T=None,p=None,x=None):
         """Constant volume specific heat (kJ/kg)
         cv(T=None,p=None,x=None)
@@ -1852,80 +1904,8 @@ Accepts unit_temperature
         dimensionless
 Returns unit_energy / unit_matter / unit_temperature
 """
-        def_T = False
-        if T is None:
-            T = pyro.config['def_T']
-            def_T = True
-
-        def_p = False
-        if p is None:
-            p = pyro.config['def_p']
-            def_p = True
-        pscale = pyro.units.pressure(to_units='bar')
-
-        if x is None:
-            x = -1.
-
-        R = self.data['R']
-
-        it = np.nditer((None,T,p,x), 
-                op_flags=[['readwrite','allocate'],['readonly','copy'],
-                    ['readonly','copy'],['readonly','copy']], op_dtypes='float')
-
-        for cv_,T_,p_,x_ in it:
-            TT = pyro.units.temperature_scale(T_,to_units='K')
-            pp = p_ * pscale
-
-            # If x is unspecified
-            if x_<0.:
-
-                # Detect the region
-                r = self._region(TT,pp)
-                # Case out the region indices
-                if r==1:
-                    pi,t,_,gp,gt,gpp,gpt,gtt = self._g1(TT,pp,order=2)
-                    temp = gp - t*gpt
-                    temp = temp*temp/gpp
-                    cv_[...] = R * (temp - t*t*gtt)
-                elif r==2:
-                    pi,t,_,gp,gt,gpp,gpt,gtt = self._g2(TT,pp,order=2)
-                    temp = gp - t*gpt
-                    temp = temp*temp/gpp
-                    cv_[...] = R * (temp - t*t*gtt)
-                elif r==3:
-                    n,t,_,_,_,_,_,ftt = self._f3(TT,pp)
-                    cv_[...] = -R * t*t*ftt
-                elif r==5:
-                    pi,t,_,gp,gt,gpp,gpt,gtt = self._g5(TT,pp,order=2)
-                    temp = gp - t*gpt
-                    temp = temp*temp/gpp
-                    cv_[...] = R * (temp - t*t*gtt)
-                else:
-                    raise pyro.utility.PMParamError('Invalid property combination T=%f K, p=%f bar'%(T_,pp))
-
-
-            else:
-                # If T was unspecified
-                if def_T:
-                    # Override the default T with the saturation T
-                    TT = self._Ts(pp)
-                # If pressure was unspecified, but temperature WAS
-                elif def_p:
-                    # Override the default p with the saturation p
-                    pp = self._ps(TT)
-
-                pi,t,_,gp,gt,gpp,gpt,gtt = self._g1(TT,pp,order=2)
-                temp = gp - t*gpt
-                temp = temp*temp/gpp
-                cvL = R * (temp - t*t*gtt)
-                pi,t,_,gp,gt,gpp,gpt,gtt = self._g2(TT,pp,order=2)
-                temp = gp - t*gpt
-                temp = temp*temp/gpp
-                cvV = R * (temp - t*t*gtt)
-
-                cv_[...] = cvL + (cvV-cvL)*x_
-
-        cv = it.operands[0]
+        TT,pp,xx,def_T,def_p = self._tpxparse(T,p,x)
+        cv = self._tpxeval(TT,pp,xx,def_T,def_p,('cv',))['cv']
 
         # Convert the results
         scale = pyro.units.energy(from_units='kJ')
@@ -1954,7 +1934,9 @@ Accepts unit_temperature
         dimensionless
 Returns unit_energy / unit_matter / unit_temperature
 """
-        return cp(T,p,x) / cv(T,p,x)
+        TT,pp,xx,def_T,def_p = self._tpxparse(T,p,x)
+        values = self._tpxeval(TT,pp,xx,def_T,def_p,('cp','cv'))
+        return values['cp'] / values['cv']
 
 
     def mw(self,T=None,p=None,x=None):
@@ -1999,9 +1981,9 @@ Returns unit_temperature
         (dimensionless)
 """
 
-        # First, figure out what region we're in.  We need to use a custom 
+        # First, figure out what region we're in.  We need to use a custom
         # region-finding routine since we're in h,p coordinates and not T,p
-        # Comments describe the process relative to the inverse region diagram 
+        # Comments describe the process relative to the inverse region diagram
         # in the IF-97 report on page 21 (Figure 2)
         T13 = 623.15    # vertical boundary between regions 1 and 3
         p2ab = 40.      # horizontal boundary between regions 2a and 2b
@@ -2016,125 +1998,138 @@ Returns unit_temperature
         # Prepare h and p
         if p is None:
             p = pyro.config['def_p']
-        if not isinstance(p,np.ndarray):
-            p = np.array(p)
-        pscale = pyro.units.pressure(to_units='bar')
+        p = pyro.units.pressure(np.asarray(p,dtype=float), to_units='bar')
 
         scale = pyro.units.energy(to_units='kJ')
         scale = pyro.units.matter(scale,self.data['mw'],to_units='kg')
-		
-        it = np.nditer((None,None,h,p),
-                op_flags=[['readwrite','allocate'],['readwrite','allocate'],
-					['readonly','copy'], ['readonly','copy']],
-					op_dtypes='float')
-
-        for T_,x_,h_,p_ in it:
-            T_[...] = -1.
-            x_[...] = -1.
-            pp = p_ * pscale
-            # Scale the enthalpy to kJ/kg
-            hh = h_ * scale
-            if p_ < p3:
-                # Calculate the saturation temperature and enthalpies
-                Ts = self._Ts(p_)
-                pi,t,_,_,gt,_,_,_ = self._g1(Ts,p_,order=1)
-                hL = R * Ts * t * gt
-                pi,t,_,_,gt,_,_,_ = self._g2(Ts,p_,order=1)
-                hV = R * Ts * t * gt
-                # If h is below the liquid enthalpy, use region 1
-                if hh<hL:
-                    T_[...] = self._th1(h=hh,p=p_)
-                # If h is below the vapor enthalpy, this is a saturated mixture
-                elif hh<hV:
-                    T_[...] = Ts
-                    x_[...] = (hh-hL)/(hV-hL)
-                # If p is below the a-b boundary
-                elif p_<p2ab:
-                    # Calculate the enthalpy at the 2-5 boarder
-                    pi,t,g,gp,gt,_,_,_ = self._g5(T25,p_,order=1)
-                    h25 = R*T25 * t * gt
-                    # If h is below the 2-5 boundary, this is region 2a
-                    if hh<h25:
-                        T_[...] = self._th2a(h=hh,p=p_)
-                    else:
-                        # Calculate the enthalpy at the upper bound of r5
-                        pi,t,g,gp,gt,_,_,_ = self._g5(T5max,p_,order=1)
-                        h5 = R*T5max * t * gt
-                        if hh>h5:
-                            raise pyro.utility.PMParamError(
-                            'Steam T_h(): the state is not in the IF-97 domain.')
-                        Tinit = T25 + (T5max-T25)*(hh-h25)/(h5-h25)
-                        T_[...] = self._th5(h=hh, p=p_, Tinit=Tinit)
-                # If h is below (left of) the b-c boarder
-                elif p_>p2c and hh<self._b2bc(p=p_):
-                    # Region 2c
-                    T_[...] = self._th2c(h=hh, p=p_)
-                else:
-                    # Calculate the enthalpy at the 2-5 boarder
-                    pi,t,g,gp,gt,_,_,_ = self._g5(T25,p_,order=1)
-                    h25 = R*T25 * t * gt
-                    # All that's left is either 2b or 5
-                    if hh<h25:
-                        # Region 2b
-                        T_[...] = self._th2b(h=hh, p=p_)
-                    else:
-                        # Calculate the enthalpy at the upper bound of r5
-                        pi,t,g,gp,gt,_,_,_ = self._g5(T5max,p_,order=1)
-                        h5 = R*T5max * t * gt
-                        if hh>h5:
-                            raise pyro.utility.PMParamError(
-                            'Steam T_h(): the state is not in the IF-97 domain.')
-                        Tinit = T25 + (T5max-T25)*(hh-h25)/(h5-h25)
-                        T_[...] = self._th5(h=hh, p=p_, Tinit=Tinit)
-            elif p_ <= pmax:
-                # Calculate the enthalpy at the 1-3 boarder
-                pi,t,g,gp,gt,_,_,_ = self._g1(T13,p_,order=1)
-                h13 = R*T13 * t * gt
-                if hh<h13:
-                    # Region 1
-                    T_[...] = self._th1(h=hh,p=p_)
-                else:
-                    # Calculate T and h at the 2-3 boarder
-                    T23 = self._b23(p=p_)
-                    h23 = self.h(T=T23,p=p_)
-                    pi,t,g,gp,gt,_,_,_ = self._g2(T23,p_,order=1)
-                    h23 = R*T23 * t * gt
-                    if hh<h23:
-                        # Region 3
-                        Tinit = T13 + (T23-T13)*(hh-h13)/(h23-h13)
-                        T_[...] = self._th3(h=hh, p=p_, Tinit=Tinit)
-                    elif hh<self._b2bc(p=p_):
-                        # Region 2c
-                        T_[...] = self._th2c(h=hh,p=p_)
-                    else:
-                        # Calculate the enthalpy at the 2-5 boarder
-                        pi,t,g,gp,gt,_,_,_ = self._g5(T25,p_,order=1)
-                        h25 = R*T25 * t * gt
-                        if hh<h25:
-                            # Region 2b
-                            T_[...] = self._th2b(h=hh,p=p_)
-                        elif p_<p5max:
-                            # Calculate the enthalpy at the upper bound of r5
-                            pi,t,g,gp,gt,_,_,_ = self._g5(T5max,p_,order=1)
-                            h5 = R*T5max * t * gt
-                            if hh>h5:
-                                raise pyro.utility.PMParamError(
-                                'Steam T_h(): the state is not in the IF-97 ' +
-                                'domain.')
-                            Tinit = T25 + (T5max-T25)*(hh-h25)/(h5-h25)
-                            T_[...] = self._th5(h=hh, p=p_, Tinit=Tinit)
-                        else:
-                            raise pyro.utility.PMParamError(
-                            'Steam T_h(): the state is not in the IF-97 domain.')
-            else:
+        # Scale the enthalpy to kJ/kg
+        hh,pp = np.broadcast_arrays(np.asarray(h,dtype=float)*scale, p)
+
+        if (pp > pmax).any():
+            raise pyro.utility.PMParamError(
+            'Steam T_h(): pressure is above the IF-97 maximum (1000bar)')
+
+        T = np.full(hh.shape, -1.)
+        x = np.full(hh.shape, -1.)
+        # The region each point belongs to
+        r = np.zeros(hh.shape, dtype=int)
+        # Enthalpy on the 2-5 boundary; used to initialize region 5
+        h25 = np.zeros(hh.shape)
+
+        # Below region 3, the first test is against the saturation curve
+        Ilow = pp < p3
+        if Ilow.any():
+            h_ = hh[Ilow]
+            p_ = pp[Ilow]
+            r_ = np.zeros(h_.shape, dtype=int)
+            # Calculate the saturation temperature and enthalpies
+            Ts = self._Ts(p_)
+            pi,t,_,_,gt,_,_,_ = self._g1(Ts,p_,order=1)
+            hL = R * Ts * t * gt
+            pi,t,_,_,gt,_,_,_ = self._g2(Ts,p_,order=1)
+            hV = R * Ts * t * gt
+            # If h is below the liquid enthalpy, use region 1
+            r_[h_<hL] = 1
+            # If h is below the vapor enthalpy, this is a saturated mixture
+            I = np.logical_and(h_>=hL, h_<hV)
+            r_[I] = 4
+            T_ = np.full(h_.shape, -1.)
+            x_ = np.full(h_.shape, -1.)
+            T_[I] = Ts[I]
+            x_[I] = (h_[I]-hL[I])/(hV[I]-hL[I])
+            T[Ilow] = T_
+            x[Ilow] = x_
+            # Calculate the enthalpy at the 2-5 boarder
+            pi,t,g,gp,gt,_,_,_ = self._g5(T25,p_,order=1)
+            h25_ = R*T25 * t * gt
+            h25[Ilow] = h25_
+            # All that remains is superheated vapor
+            Ivap = h_>=hV
+            # If p is below the a-b boundary, this is region 2a or 5
+            I = np.logical_and(Ivap, p_<p2ab)
+            r_[np.logical_and(I, h_<h25_)] = 20
+            r_[np.logical_and(I, h_>=h25_)] = 5
+            # If h is below (left of) the b-c boarder, this is region 2c
+            Ivap = np.logical_and(Ivap, p_>=p2ab)
+            I = np.logical_and(Ivap, p_>p2c)
+            if I.any():
+                I[I] = h_[I] < self._b2bc(p=p_[I])
+                r_[I] = 22
+            # All that's left is either 2b or 5
+            Ivap = np.logical_and(Ivap, ~I)
+            r_[np.logical_and(Ivap, h_<h25_)] = 21
+            r_[np.logical_and(Ivap, h_>=h25_)] = 5
+            r[Ilow] = r_
+
+        # Above the bottom of region 3
+        Ihigh = ~Ilow
+        if Ihigh.any():
+            h_ = hh[Ihigh]
+            p_ = pp[Ihigh]
+            r_ = np.zeros(h_.shape, dtype=int)
+            # Calculate the enthalpy at the 1-3 boarder
+            pi,t,g,gp,gt,_,_,_ = self._g1(T13,p_,order=1)
+            h13 = R*T13 * t * gt
+            # Region 1
+            r_[h_<h13] = 1
+            # Calculate T and h at the 2-3 boarder
+            T23 = self._b23(p=p_)
+            pi,t,g,gp,gt,_,_,_ = self._g2(T23,p_,order=1)
+            h23 = R*T23 * t * gt
+            # Region 3
+            I = np.logical_and(h_>=h13, h_<h23)
+            r_[I] = 3
+            # Initialize the region 3 temperature by interpolation
+            T_ = np.full(h_.shape, -1.)
+            T_[I] = T13 + ((T23-T13)*(h_-h13)/(h23-h13))[I]
+            T[Ihigh] = T_
+            # Region 2c
+            Ivap = h_>=h23
+            I = Ivap.copy()
+            I[Ivap] = h_[Ivap] < self._b2bc(p=p_[Ivap])
+            r_[I] = 22
+            # Calculate the enthalpy at the 2-5 boarder
+            pi,t,g,gp,gt,_,_,_ = self._g5(T25,p_,order=1)
+            h25_ = R*T25 * t * gt
+            h25[Ihigh] = h25_
+            # Region 2b
+            Ivap = np.logical_and(Ivap, ~I)
+            r_[np.logical_and(Ivap, h_<h25_)] = 21
+            # Region 5 only extends to p5max
+            Ivap = np.logical_and(Ivap, h_>=h25_)
+            r_[np.logical_and(Ivap, p_<p5max)] = 5
+            if np.logical_and(Ivap, p_>=p5max).any():
+                raise pyro.utility.PMParamError(
+                'Steam T_h(): the state is not in the IF-97 domain.')
+            r[Ihigh] = r_
+
+        # Evaluate the inverse relations in each region
+        I = r==1
+        if I.any():
+            T[I] = self._th1(h=hh[I],p=pp[I])
+        for rr,thfn in ((20,self._th2a), (21,self._th2b), (22,self._th2c)):
+            I = r==rr
+            if I.any():
+                T[I] = thfn(h=hh[I],p=pp[I])
+        I = r==3
+        if I.any():
+            T[I] = self._th3(h=hh[I], p=pp[I], Tinit=T[I])
+        I = r==5
+        if I.any():
+            # Calculate the enthalpy at the upper bound of r5
+            pi,t,g,gp,gt,_,_,_ = self._g5(T5max,pp[I],order=1)
+            h5 = R*T5max * t * gt
+            if (hh[I]>h5).any():
                 raise pyro.utility.PMParamError(
-                'Steam T_h(): pressure is above the IF-97 maximum (1000bar)')
+                'Steam T_h(): the state is not in the IF-97 domain.')
+            Tinit = T25 + (T5max-T25)*(hh[I]-h25[I])/(h5-h25[I])
+            T[I] = self._th5(h=hh[I], p=pp[I], Tinit=Tinit)
+
+        T = pyro.units.temperature_scale(T,from_units='K')
 
-            T_[...] = pyro.units.temperature_scale(T_,from_units='K')
-  
         if quality:
-            return it.operands[0:2]
-        return it.operands[0]
+            return T,x
+        return T
 
 
 
@@ -2157,9 +2152,9 @@ Accepts unit_energy / unit_matter / unit_temperature
 Returns unit_temperature
         (dimensionless)
 """
-        # First, figure out what region we're in.  We need to use a custom 
+        # First, figure out what region we're in.  We need to use a custom
         # region-finding routine since we're in s,p coordinates and not T,p
-        # Comments describe the process relative to the inverse region diagram 
+        # Comments describe the process relative to the inverse region diagram
         # in the IF-97 report on page 21 (Figure 2)
         T13 = 623.15    # vertical boundary between regions 2 and 3
         p2ab = 40.      # horizontal boundary between regions 2a and 2b
@@ -2175,104 +2170,507 @@ Returns unit_temperature
         # Prepare s and p
         if p is None:
             p = pyro.config['def_p']
-        if not isinstance(p,np.ndarray):
-            p = np.array(p)
-        p = pyro.units.pressure(p, to_units='bar')
+        p = pyro.units.pressure(np.asarray(p,dtype=float), to_units='bar')
 
         scale = pyro.units.energy(to_units='kJ')
         scale = pyro.units.matter(scale,self.data['mw'],to_units='kg')
         scale = pyro.units.temperature(scale,to_units='K')
+        # Scale the entropy to kJ/kg/K
+        ss,pp = np.broadcast_arrays(np.asarray(s,dtype=float)*scale, p)
 
-        it = np.nditer((None,None,s,p),
-		            op_flags=[['readwrite','allocate'],['readwrite','allocate'],
-					['readonly','copy'], ['readonly','copy']],
-					op_dtypes='float')
-
-        for T_,x_,s_,p_ in it:
-            T_[...] = -1.
-            x_[...] = -1.
-            # Scale the entropy to kJ/kg/K
-            ss = s_ * scale
-            if p_ < p3:
-                Ts = self.Ts(p=p_)
-                pi,t,g,_,gt,_,_,_ = self._g1(Ts,p_,order=1)
-                sL = R * (t*gt - g)
-                pi,t,g,_,gt,_,_,_ = self._g2(Ts,p_,order=1)
-                sV = R * (t*gt - g)
-                if ss<sL:
-                    # Region 1
-                    T_[...] = self._ts1(s=ss,p=p_)
-                elif ss<sV:
-                    # Saturation
-                    T_[...] = Ts
-                    x_[...] = (ss-sL)/(sV-sL)
-                elif p_<p2ab:
-                    s25 = self.s(T=T25,p=p_)
-                    if ss<s25:
-                        # Region 2a
-                        T_[...] = self._ts2a(s=ss,p=p_)
-                    else:
-                        # Region 5
-                        s5 = self.s(T=T5max,p=p_)
-                        if ss>s5:
-                            raise pyro.utility.PMParamError(
-                            'Steam T_h(): the state is not in the IF-97 domain.')
-                        Tinit = T25 + (T5max-T25)*(ss-s25)/(s5-s25)
-                        T_[...] = self._ts5(s=ss, p=p_, Tinit=Tinit)
-                elif ss<s2bc:
-                    # Region 2c
-                    T_[...] = self._ts2c(s=ss, p=p_)
-                else:
-                    s25 = self.s(T=T25,p=p_)
-                    if ss<s25:
-                        # Region 2b
-                        T_[...] = self._ts2b(s=ss, p=p_)
-                    else:
-                        # Region 5
-                        s5 = self.s(T=T5max,p=p_)
-                        if ss>s5:
-                            raise pyro.utility.PMParamError(
-                            'Steam T_h(): the state is not in the IF-97 domain.')
-                        Tinit = T25 + (T5max-T25)*(ss-s25)/(s5-s25)
-                        T_[...] = self._ts5(s=ss, p=p_, Tinit=Tinit)
-            elif p_ <= pmax:
-                s13 = self.s(T=T13, p=p_)
-                if ss<s13:
-                    # Region 1
-                    T_[...] = self._ts1(s=ss,p=p_)
-                else:
-                    T23 = self._b23(p=p_)
-                    s23 = self.s(T=T23,p=p_)
-                    if ss<s23:
-                        # Region 3
-                        Tinit = T13 + (T23-T13)*(ss-s13)/(s23-s13)
-                        T_[...] = self._ts3(s=ss, p=p_, Tinit=Tinit)
-                    elif ss<s2bc:
-                        # Region 2c
-                        T_[...] = self._ts2c(s=ss,p=p_)
-                    else:
-                        s25 = self.s(T=T25,p=p_)
-                        if ss<s25:
-                            # Region 2b
-                            T_[...] = self._ts2b(s=ss,p=p_)
-                        elif p_<=p5max:
-                            # Region 5
-                            s5 = self.s(T=T5max,p=p_)
-                            if ss>s5:
-                                raise pyro.utility.PMParamError(
-                                'Steam T_s(): the state is not in the IF-97 ' +
-                                'domain.')
-                            Tinit = T25 + (T5max-T25)*(ss-s25)/(s5-s25)
-                            T_[...] = self._ts5(s=ss, p=p_, Tinit=Tinit)
-                        else:
-                            raise pyro.utility.PMParamError(
-                            '*Steam T_s(): the state is not in the IF-97 domain.')
-            else:
+        if (pp > pmax).any():
+            raise pyro.utility.PMParamError(
+            'Steam T_h(): pressure is above the IF-97 maximum (1000bar)')
+
+        T = np.full(ss.shape, -1.)
+        x = np.full(ss.shape, -1.)
+        # The region each point belongs to
+        r = np.zeros(ss.shape, dtype=int)
+        # Entropy on the 2-5 boundary; used to initialize region 5
+        s25 = np.zeros(ss.shape)
+
+        # Below region 3, the first test is against the saturation curve
+        Ilow = pp < p3
+        if Ilow.any():
+            s_ = ss[Ilow]
+            p_ = pp[Ilow]
+            r_ = np.zeros(s_.shape, dtype=int)
+            Ts = self._Ts(p_)
+            pi,t,g,_,gt,_,_,_ = self._g1(Ts,p_,order=1)
+            sL = R * (t*gt - g)
+            pi,t,g,_,gt,_,_,_ = self._g2(Ts,p_,order=1)
+            sV = R * (t*gt - g)
+            # Region 1
+            r_[s_<sL] = 1
+            # Saturation
+            I = np.logical_and(s_>=sL, s_<sV)
+            r_[I] = 4
+            T_ = np.full(s_.shape, -1.)
+            x_ = np.full(s_.shape, -1.)
+            T_[I] = Ts[I]
+            x_[I] = (s_[I]-sL[I])/(sV[I]-sL[I])
+            T[Ilow] = T_
+            x[Ilow] = x_
+            # Calculate the entropy at the 2-5 boarder
+            pi,t,g,_,gt,_,_,_ = self._g2(T25,p_,order=1)
+            s25_ = R * (t*gt - g)
+            s25[Ilow] = s25_
+            # All that remains is superheated vapor
+            Ivap = s_>=sV
+            # Region 2a or 5
+            I = np.logical_and(Ivap, p_<p2ab)
+            r_[np.logical_and(I, s_<s25_)] = 20
+            r_[np.logical_and(I, s_>=s25_)] = 5
+            # Region 2c
+            Ivap = np.logical_and(Ivap, p_>=p2ab)
+            r_[np.logical_and(Ivap, s_<s2bc)] = 22
+            # Region 2b or 5
+            Ivap = np.logical_and(Ivap, s_>=s2bc)
+            r_[np.logical_and(Ivap, s_<s25_)] = 21
+            r_[np.logical_and(Ivap, s_>=s25_)] = 5
+            r[Ilow] = r_
+
+        # Above the bottom of region 3
+        Ihigh = ~Ilow
+        if Ihigh.any():
+            s_ = ss[Ihigh]
+            p_ = pp[Ihigh]
+            r_ = np.zeros(s_.shape, dtype=int)
+            # Calculate the entropy at the 1-3 boarder
+            pi,t,g,_,gt,_,_,_ = self._g1(T13,p_,order=1)
+            s13 = R * (t*gt - g)
+            # Region 1
+            r_[s_<s13] = 1
+            # Calculate T and s at the 2-3 boarder
+            T23 = self._b23(p=p_)
+            pi,t,g,_,gt,_,_,_ = self._g2(T23,p_,order=1)
+            s23 = R * (t*gt - g)
+            # Region 3
+            I = np.logical_and(s_>=s13, s_<s23)
+            r_[I] = 3
+            # Initialize the region 3 temperature by interpolation
+            T_ = np.full(s_.shape, -1.)
+            T_[I] = T13 + ((T23-T13)*(s_-s13)/(s23-s13))[I]
+            T[Ihigh] = T_
+            # Region 2c
+            Ivap = s_>=s23
+            r_[np.logical_and(Ivap, s_<s2bc)] = 22
+            # Calculate the entropy at the 2-5 boarder
+            pi,t,g,_,gt,_,_,_ = self._g2(T25,p_,order=1)
+            s25_ = R * (t*gt - g)
+            s25[Ihigh] = s25_
+            # Region 2b
+            Ivap = np.logical_and(Ivap, s_>=s2bc)
+            r_[np.logical_and(Ivap, s_<s25_)] = 21
+            # Region 5 only extends to p5max
+            Ivap = np.logical_and(Ivap, s_>=s25_)
+            r_[np.logical_and(Ivap, p_<=p5max)] = 5
+            if np.logical_and(Ivap, p_>p5max).any():
+                raise pyro.utility.PMParamError(
+                '*Steam T_s(): the state is not in the IF-97 domain.')
+            r[Ihigh] = r_
+
+        # Evaluate the inverse relations in each region
+        I = r==1
+        if I.any():
+            T[I] = self._ts1(s=ss[I],p=pp[I])
+        for rr,tsfn in ((20,self._ts2a), (21,self._ts2b), (22,self._ts2c)):
+            I = r==rr
+            if I.any():
+                T[I] = tsfn(s=ss[I],p=pp[I])
+        I = r==3
+        if I.any():
+            T[I] = self._ts3(s=ss[I], p=pp[I], Tinit=T[I])
+        I = r==5
+        if I.any():
+            # Calculate the entropy at the upper bound of r5
+            pi,t,g,_,gt,_,_,_ = self._g5(T5max,pp[I],order=1)
+            s5 = R * (t*gt - g)
+            if (ss[I]>s5).any():
                 raise pyro.utility.PMParamError(
-                'Steam T_h(): pressure is above the IF-97 maximum (1000bar)')
+                'Steam T_s(): the state is not in the IF-97 domain.')
+            Tinit = T25 + (T5max-T25)*(ss[I]-s25[I])/(s5-s25[I])
+            T[I] = self._ts5(s=ss[I], p=pp[I], Tinit=Tinit)
+
+        T = pyro.units.temperature_scale(T,from_units='K')
 
-            T_[...] = pyro.units.temperature_scale(T_,from_units='K')
-  
         if quality:
-            return it.operands[0:2]
-        return it.operands[0]
+            return T,x
+        return T
+
+
+# Region 3 backward equations v(T,p) from the IAPWS Supplementary Release
+# on Backward Equations for Specific Volume as a Function of Pressure and
+# Temperature v(p,T) for Region 3 of the IAPWS-IF97 (SR5-05, 2016).
+#
+# _R3BOUND holds the subregion boundary equations (eqns. 2 and 3).  Each
+# entry is (islog, [[I, n], ...]), and the boundary temperature is
+#   T(p) = sum n * x**I  (K)
+# where x = p (MPa), or x = ln(p) when islog is True.  The 3ef boundary
+# (eqn. 3) is a straight line, so it is coded in _t3b() directly.
+_R3BOUND = {
+    'ab': (True, [[0, 1547.93642129415], [1, -187.661219490113], [2, 21.3144632222113], [-1, -1918.87498864292], [-2, 918.419702359447]]),
+    'cd': (False, [[0, 585.276966696349], [1, 2.78233532206915], [2, -0.0127283549295878], [3, 0.000159090746562729]]),
+    'gh': (False, [[0, -24928.4240900418], [1, 4281.43584791546], [2, -269.02917314013], [3, 7.51608051114157], [4, -0.0787105249910383]]),
+    'ij': (False, [[0, 584.814781649163], [1, -0.616179320924617], [2, 0.260763050899562], [3, -0.00587071076864459], [4, 5.15308185433082e-05]]),
+    'jk': (False, [[0, 617.229772068439], [1, -7.70600270141675], [2, 0.697072596851896], [3, -0.0157391839848015], [4, 0.000137897492684194]]),
+    'mn': (False, [[0, 535.339483742384], [1, 7.61978122720128], [2, -0.158365725441648], [3, 0.00192871054508108]]),
+    'op': (True, [[0, 969.461372400213], [1, -332.500170441278], [2, 64.2859598466067], [-1, 773.845935768222], [-2, -1523.13732937084]]),
+    'qu': (False, [[0, 565.603648239126], [1, 5.29062258221222], [2, -0.102020639611016], [3, 0.00122240301070145]]),
+    'rx': (False, [[0, 584.561202520006], [1, -1.02961025163669], [2, 0.243293362700452], [3, -0.00294905044740799]]),
+    'uv': (False, [[0, 528.199646263062], [1, 8.90579602135307], [2, -0.222814134903755], [3, 0.00286791682263697]]),
+    'wx': (True, [[0, 7.2805260914538], [1, 97.3505869861952], [2, 14.7370491183191], [-1, 329.196213998375], [-2, 873.371668682417]]),
+}
+
+# _R3V holds the backward equations for each of the subregions 3a-3z
+# (eqn. 4).  Each entry is (v*, p*, T*, a, b, c, d, e, [[I, J, n], ...])
+# with v* in m3/kg, p* in MPa, and T* in K, and
+#   v/v* = [sum n * (p/p* - a)**(c*I) * (T/T* - b)**(d*J)]**e
+# Subregion 3n uses the exponential form (eqn. 5) instead
+#   v/v* = exp(sum n * (p/p* - a)**I * (T/T* - b)**J)
+# and its c, d, and e are not used.
+_R3V = {
+    'a': (0.0024, 100.0, 760.0, 0.085, 0.817, 1.0, 1.0, 1.0, [
+            [-12, 5, 0.00110879558823853], [-12, 10, 572.616740810616], [-12, 12, -76705.1948380852],
+            [-10, 5, -0.0253321069529674], [-10, 10, 6280.08049345689], [-10, 12, 234105.654131876],
+            [-8, 5, 0.216867826045856], [-8, 8, -156.237904341963], [-8, 10, -26989.3956176613],
+            [-6, 1, -0.000180407100085505], [-5, 1, 0.00116732227668261], [-5, 5, 26.698704085604],
+            [-5, 10, 28277.6617243286], [-4, 8, -2424.31520029523], [-3, 0, 0.000435217323022733],
+            [-3, 1, -0.0122494831387441], [-3, 3, 1.79357604019989], [-3, 6, 44.2729521058314],
+            [-2, 0, -0.00593223489018342], [-2, 2, 0.453186261685774], [-2, 3, 1.3582570312914],
+            [-1, 0, 0.0408748415856745], [-1, 1, 0.474686397863312], [-1, 2, 1.18646814997915],
+            [0, 0, 0.546987265727549], [0, 1, 0.195266770452643], [1, 0, -0.0502268790869663],
+            [1, 2, -0.369645308193377], [2, 0, 0.0063382803752842], [2, 2, 0.0797441793901017]
+            ]),
+    'b': (0.0041, 100.0, 860.0, 0.28, 0.779, 1.0, 1.0, 1.0, [
+            [-12, 10, -0.0827670470003621], [-12, 12, 41.6887126010565], [-10, 8, 0.0483651982197059],
+            [-10, 14, -29103.2084950276], [-8, 8, -111.422582236948], [-6, 5, -0.0202300083904014],
+            [-6, 6, 294.002509338515], [-6, 8, 140.244997609658], [-5, 5, -344.384158811459],
+            [-5, 8, 361.182452612149], [-5, 10, -1406.99677420738], [-4, 2, -0.00202023902676481],
+            [-4, 4, 171.346792457471], [-4, 5, -4.25597804058632], [-3, 0, 6.91346085000334e-06],
+            [-3, 1, 0.00151140509678925], [-3, 2, -0.0416375290166236], [-3, 3, -41.3754957011042],
+            [-3, 5, -50.6673295721637], [-2, 0, -0.000572212965569023], [-2, 2, 6.08817368401785],
+            [-2, 5, 23.9600660256161], [-1, 0, 0.0122261479925384], [-1, 2, 2.16356057692938],
+            [0, 0, 0.398198903368642], [0, 1, -0.116892827834085], [1, 0, -0.102845919373532],
+            [1, 2, -0.492676637589284], [2, 0, 0.065554045640679], [3, 2, -0.24046253507853],
+            [4, 0, -0.0269798180310075], [4, 1, 0.128369435967012]
+            ]),
+    'c': (0.0022, 40.0, 690.0, 0.259, 0.903, 1.0, 1.0, 1.0, [
+            [-12, 6, 3.1196778876303], [-12, 8, 27671.3458847564], [-12, 10, 32258310.3403269],
+            [-10, 6, -342.416065095363], [-10, 8, -899732.529907377], [-10, 10, -79389204.9821251],
+            [-8, 5, 95.3193003217388], [-8, 6, 2297.84742345072], [-8, 7, 175336.675322499],
+            [-6, 8, 7912143.65222792], [-5, 1, 3.19933345844209e-05], [-5, 4, -65.9508863555767],
+            [-5, 7, -833426.563212851], [-4, 2, 0.0645734680583292], [-4, 8, -3820310.20570813],
+            [-3, 0, 4.06398848470079e-05], [-3, 3, 31.0327498492008], [-2, 0, -0.000892996718483724],
+            [-2, 4, 234.604891591616], [-2, 5, 3775.15668966951], [-1, 0, 0.0158646812591361],
+            [-1, 1, 0.707906336241843], [-1, 2, 12.601622514657], [0, 0, 0.736143655772152],
+            [0, 1, 0.676544268999101], [0, 2, -17.8100588189137], [1, 0, -0.156531975531713],
+            [1, 2, 11.7707430048158], [2, 0, 0.0840143653860447], [2, 1, -0.186442467471949],
+            [2, 3, -44.0170203949645], [2, 7, 1232904.23502494], [3, 0, -0.0240650039730845],
+            [3, 7, -1070777.16660869], [8, 1, 0.0438319858566475]
+            ]),
+    'd': (0.0029, 40.0, 690.0, 0.559, 0.939, 1.0, 1.0, 4.0, [
+            [-12, 4, -4.52484847171645e-10], [-12, 6, 3.15210389538801e-05], [-12, 7, -0.00214991352047545],
+            [-12, 10, 508.058874808345], [-12, 12, -12712303.6845932], [-12, 16, 1153711331204.97],
+            [-10, 0, -1.97805728776273e-16], [-10, 2, 2.41554806033972e-11], [-10, 4, -1.56481703640525e-06],
+            [-10, 6, 0.00277211346836625], [-10, 8, -20.3578994462286], [-10, 10, 1443694.89909053],
+            [-10, 14, -41125421794.6539], [-8, 3, 6.23449786243773e-06], [-8, 7, -22.1774281146038],
+            [-8, 8, -68931.5087933158], [-8, 10, -19541952.5060713], [-6, 6, 3163.73510564015],
+            [-6, 8, 2240407.54426988], [-5, 1, -4.36701347922356e-06], [-5, 2, -0.000404213852833996],
+            [-5, 5, -348.153203414663], [-5, 7, -385294.213555289], [-4, 0, 1.35203700099403e-07],
+            [-4, 1, 0.000134648383271089], [-4, 7, 125031.835351736], [-3, 2, 0.0968123678455841],
+            [-3, 4, 225.660517512438], [-2, 0, -0.000190102435341872], [-2, 1, -0.0299628410819229],
+            [-1, 0, 0.00500833915372121], [-1, 1, 0.387842482998411], [-1, 5, -1385.35367777182],
+            [0, 0, 0.870745245971773], [0, 2, 1.71946252068742], [1, 0, -0.0326650121426383],
+            [1, 6, 4980.44171727877], [3, 0, 0.00551478022765087]
+            ]),
+    'e': (0.0032, 40.0, 710.0, 0.587, 0.918, 1.0, 1.0, 1.0, [
+            [-12, 14, 715815808.404721], [-12, 16, -114328360753.449], [-10, 3, 3.7653100201572e-12],
+            [-10, 6, -9.03983668691157e-05], [-10, 10, 665695.908836252], [-10, 14, 5353641749.60127],
+            [-10, 16, 79497740233.5603], [-8, 7, 92.2230563421437], [-8, 8, -142586.073991215],
+            [-8, 10, -1117963.81424162], [-6, 6, 8961.2162964076], [-5, 6, -6699.89239070491],
+            [-4, 2, 0.00451242538486834], [-4, 4, -33.9731325977713], [-3, 2, -1.20523111552278],
+            [-3, 6, 47599.2667717124], [-3, 7, -266627.750390341], [-2, 0, -0.000153314954386524],
+            [-2, 1, 0.305638404828265], [-2, 3, 123.654999499486], [-2, 4, -1043.90794213011],
+            [-1, 0, -0.0157496516174308], [0, 0, 0.685331118940253], [0, 1, 1.78373462873903],
+            [1, 0, -0.54467412487891], [1, 4, 2045.29931318843], [1, 6, -22834.2359328752],
+            [2, 0, 0.413197481515899], [2, 2, -34.1931835910405]
+            ]),
+    'f': (0.0064, 40.0, 730.0, 0.587, 0.891, 0.5, 1.0, 4.0, [
+            [0, -3, -2.51756547792325e-08], [0, -2, 6.01307193668763e-06], [0, -1, -0.00100615977450049],
+            [0, 0, 0.999969140252192], [0, 1, 2.14107759236486], [0, 2, -16.5175571959086],
+            [1, -1, -0.00141987303638727], [1, 1, 2.69251915156554], [1, 2, 34.9741815858722],
+            [1, 3, -30.0208695771783], [2, 0, -1.31546288252539], [2, 1, -8.39091277286169],
+            [3, -5, 1.81545608337015e-10], [3, -2, -0.000591099206478909], [3, 0, 1.52115067087106],
+            [4, -3, 2.52956470663225e-05], [5, -8, 1.00726265203786e-15], [5, 1, -1.4977453386065],
+            [6, -6, -7.93940970562969e-10], [7, -4, -0.000150290891264717], [7, 1, 1.51205531275133],
+            [10, -6, 4.70942606221652e-06], [12, -10, 1.95049710391712e-13], [12, -8, -9.11627886266077e-09],
+            [12, -4, 0.000604374640201265], [14, -12, -2.25132933900136e-16], [14, -10, 6.10916973582981e-12],
+            [14, -8, -3.03063908043404e-07], [14, -6, -1.37796070798409e-05], [14, -4, -0.000919296736666106],
+            [16, -10, 6.39288223132545e-10], [16, -8, 7.53259479898699e-07], [18, -12, -4.00321478682929e-13],
+            [18, -10, 7.56140294351614e-09], [20, -12, -9.12082054034891e-12], [20, -10, -2.37612381140539e-08],
+            [20, -6, 2.69586010591874e-05], [22, -12, -7.32828135157839e-11], [24, -12, 2.4199557830666e-10],
+            [24, -4, -0.000405735532730322], [28, -12, 1.89424143498011e-10], [32, -12, -4.86632965074563e-10]
+            ]),
+    'g': (0.0027, 25.0, 660.0, 0.872, 0.971, 1.0, 1.0, 4.0, [
+            [-12, 7, 4.12209020652996e-05], [-12, 12, -1149872.38280587], [-12, 14, 9481808850.3208],
+            [-12, 18, -1.95788865718971e+17], [-12, 22, 4.962507048713e+24], [-12, 24, -1.05549884548496e+28],
+            [-10, 14, -758642165988.278], [-10, 20, -9.22172769596101e+22], [-10, 24, 7.25379072059348e+29],
+            [-8, 7, -61.7718249205859], [-8, 8, 10755.5033344858], [-8, 10, -37954580.2336487],
+            [-8, 12, 228646846221.831], [-6, 8, -4997410.93010619], [-6, 22, -2.80214310054101e+30],
+            [-5, 7, 1049154.06769586], [-5, 20, 6.13754229168619e+27], [-4, 22, 8.02056715528378e+31],
+            [-3, 7, -29861781.9828065], [-2, 3, -91.0782540134681], [-2, 5, 135033.227281565],
+            [-2, 14, -7.12949383408211e+18], [-2, 24, -1.04578785289542e+36], [-1, 2, 30.4331584444093],
+            [-1, 8, 5932507979.59445], [-1, 18, -3.64174062110798e+27], [0, 0, 0.921791403532461],
+            [0, 1, -0.337693609657471], [0, 2, -72.4644143758508], [1, 0, -0.110480239272601],
+            [1, 1, 5.36516031875059], [1, 3, -2914.41872156205], [3, 24, 6.16338176535305e+39],
+            [5, 22, -1.2088917586118e+38], [6, 12, 8.18396024524612e+22], [8, 3, 940781944.835829],
+            [10, 0, -36727.9669545448], [10, 6, -8375139317986550.0]
+            ]),
+    'h': (0.0032, 25.0, 660.0, 0.898, 0.983, 1.0, 1.0, 4.0, [
+            [-12, 8, 0.0561379678887577], [-12, 12, 7741354215.87083], [-10, 4, 1.11482975877938e-09],
+            [-10, 6, -0.00143987128208183], [-10, 8, 1936.9655876492], [-10, 10, -605971823.585005],
+            [-10, 14, 17195156812433.7], [-10, 16, -1.85461154985145e+16], [-8, 0, 3.8785116807801e-17],
+            [-8, 1, -3.95464327846105e-14], [-8, 6, -170.875935679023], [-8, 7, -2120.1062070122],
+            [-8, 8, 17768333.7348191], [-6, 4, 11.0177443629575], [-6, 6, -234396.091693313],
+            [-6, 8, -6561744.21999594], [-5, 2, 1.56362212977396e-05], [-5, 3, -2.129462570214],
+            [-5, 4, 13.5249306374858], [-4, 2, 0.177189164145813], [-4, 4, 1394.99167345464],
+            [-3, 1, -0.00703670932036388], [-3, 2, -0.152011044389648], [-2, 0, 9.81916922991113e-05],
+            [-1, 0, 0.00147199658618076], [-1, 2, 20.2618487025578], [0, 0, 0.89934551894424],
+            [1, 0, -0.211346402240858], [1, 2, 24.9971752957491]
+            ]),
+    'i': (0.0041, 25.0, 660.0, 0.91, 0.984, 0.5, 1.0, 4.0, [
+            [0, 0, 1.06905684359136], [0, 1, -1.48620857922333], [0, 10, 259862256980408.0],
+            [1, -4, -4.46352055678749e-12], [1, -2, -5.66620757170032e-07], [1, -1, -0.00235302885736849],
+            [1, 0, -0.269226321968839], [2, 0, 9.22024992944392], [3, -5, 3.57633505503772e-12],
+            [3, 0, -17.3942565562222], [4, -3, 7.00681785556229e-06], [4, -2, -0.000267050351075768],
+            [4, -1, -2.31779669675624], [5, -6, -7.53533046979752e-13], [5, -1, 4.81337131452891],
+            [5, 12, -2.23286270422356e+21], [7, -4, -1.18746004987383e-05], [7, -3, 0.00646412934136496],
+            [8, -6, -4.10588536330937e-10], [8, 10, 4.22739537057241e+19], [10, -8, 3.13698180473812e-13],
+            [12, -12, 1.6439533434504e-24], [12, -6, -3.39823323754373e-06], [12, -4, -0.0135268639905021],
+            [14, -10, -7.23252514211625e-15], [14, -8, 1.84386437538366e-09], [14, -4, -0.0463959533752385],
+            [14, 5, -99226310037675.0], [18, -12, 6.88169154439335e-17], [18, -10, -2.22620998452197e-11],
+            [18, -8, -5.40843018624083e-08], [18, -6, 0.00345570606200257], [18, 2, 42227580030.4086],
+            [20, -12, -1.26974478770487e-15], [20, -10, 9.27237985153679e-10], [22, -12, 6.12670812016489e-14],
+            [24, -12, -7.22693924063497e-12], [24, -8, -0.000383669502636822], [32, -10, 0.000374684572410204],
+            [32, -5, -93197.6897511086], [36, -10, -0.0247690616026922], [36, -8, 65.8110546759474]
+            ]),
+    'j': (0.0054, 25.0, 670.0, 0.875, 0.964, 0.5, 1.0, 4.0, [
+            [0, -1, -0.00011137131739554], [0, 0, 1.00342892423685], [0, 1, 5.30615581928979],
+            [1, -2, 1.79058760078792e-06], [1, -1, -0.000728541958464774], [1, 1, -18.7576133371704],
+            [2, -1, 0.00199060874071849], [2, 1, 24.357475537729], [3, -2, -0.000177040785499444],
+            [4, -2, -0.0025968038522713], [4, 2, -198.704578406823], [5, -3, 7.38627790224287e-05],
+            [5, -2, -0.00236264692844138], [5, 0, -1.61023121314333], [6, 3, 6223.22971786473],
+            [10, -6, -9.60754116701669e-09], [12, -8, -5.10572269720488e-11], [12, -3, 0.00767373781404211],
+            [14, -10, 6.63855469485254e-15], [14, -8, -7.17590735526745e-10], [14, -5, 1.46564542926508e-05],
+            [16, -10, 3.09029474277013e-12], [18, -12, -4.64216300971708e-16], [20, -12, -3.90499637961161e-14],
+            [20, -10, -2.36716126781431e-10], [24, -12, 4.54652854268717e-12], [24, -6, -0.00422271787482497],
+            [28, -12, 2.83911742354706e-11], [28, -5, 2.70929002720228]
+            ]),
+    'k': (0.0077, 25.0, 680.0, 0.802, 0.935, 1.0, 1.0, 1.0, [
+            [-2, 10, -401215699.576099], [-2, 12, 48450147831.8406], [-1, -5, 3.94721471363678e-15],
+            [-1, 6, 37262.9967374147], [0, -12, -3.69794374168666e-30], [0, -6, -3.80436407012452e-15],
+            [0, -2, 4.75361629970233e-07], [0, -1, -0.000879148916140706], [0, 0, 0.844317863844331],
+            [0, 1, 12.24331626566], [0, 2, -104.529634830279], [0, 3, 589.702771277429],
+            [0, 14, -29102685116444.4], [1, -3, 1.7034307284185e-06], [1, -2, -0.000277617606975748],
+            [1, 0, -3.44709605486686], [1, 1, 22.1333862447095], [1, 2, -194.646110037079],
+            [2, -8, 8.08354639772825e-16], [2, -6, -1.8084520914547e-11], [2, -3, -6.96664158132412e-06],
+            [2, -2, -0.00181057560300994], [2, 0, 2.55830298579027], [2, 4, 3289.13873658481],
+            [5, -12, -1.73270241249904e-19], [5, -6, -6.61876792558034e-07], [5, -3, -0.0039568892342125],
+            [6, -12, 6.04203299819132e-18], [6, -10, -4.00879935920517e-14], [6, -8, 1.60751107464958e-09],
+            [6, -5, 3.83719409025556e-05], [8, -12, -6.49565446702457e-15], [10, -12, -1.49095328506e-12],
+            [12, -10, 5.41449377329581e-09]
+            ]),
+    'l': (0.0026, 24.0, 650.0, 0.908, 0.989, 1.0, 1.0, 4.0, [
+            [-12, 14, 2607020586.47537], [-12, 16, -188277213604704.0], [-12, 18, 5.54923870289667e+18],
+            [-12, 20, -7.58966946387758e+22], [-12, 22, 4.13865186848908e+26], [-10, 14, -815038000738.06],
+            [-10, 24, -3.81458260489955e+32], [-8, 6, -0.0123239564600519], [-8, 10, 22609563.1437174],
+            [-8, 12, -495017809506.72], [-8, 14, 5294829964228630.0], [-8, 18, -4.44359478746295e+22],
+            [-8, 24, 5.21635864527315e+34], [-8, 36, -4.87095672740742e+54], [-6, 8, -714430.209937547],
+            [-5, 4, 0.127868634615495], [-5, 5, -10.0752127917598], [-4, 7, 7774514.3796099],
+            [-4, 16, -1.08105480796471e+24], [-3, 1, -3.57578581169659e-06], [-3, 3, -2.12857169423484],
+            [-3, 18, 2.70706111085238e+29], [-3, 20, -6.95953622348829e+32], [-2, 2, 0.11060902747228],
+            [-2, 3, 72.1559163361354], [-2, 10, -306367307532219.0], [-1, 0, 2.6583961888553e-05],
+            [-1, 1, 0.0253392392889754], [-1, 3, -214.443041836579], [0, 0, 0.937846601489667],
+            [0, 1, 2.231840431017], [0, 2, 33.8401222509191], [0, 12, 4.94237237179718e+20],
+            [1, 0, -0.198068404154428], [1, 16, -1.4141534988114e+30], [2, 1, -99.3862421613651],
+            [4, 0, 125.070534142731], [5, 0, -996.473529004439], [5, 1, 47313.7909872765],
+            [6, 14, 1.16662121219322e+32], [10, 4, -3158749762715330.0], [10, 12, -4.45703369196945e+32],
+            [14, 10, 6.42794932373694e+32]
+            ]),
+    'm': (0.0028, 23.0, 650.0, 1.0, 0.997, 1.0, 0.25, 1.0, [
+            [0, 0, 0.811384363481847], [3, 0, -5681.99310990094], [8, 0, -17865719817.2556],
+            [20, 2, 7.95537657613427e+31], [1, 5, -81456.8209346872], [3, 5, -65977456.7602874],
+            [4, 5, -15286114865.9302], [5, 5, -560165667510.446], [1, 6, 458384.828593949],
+            [6, 6, -38575400038384.8], [2, 7, 45373580.0004273], [4, 8, 939454935735.563],
+            [14, 8, 2.66572856432938e+27], [2, 10, -5475783138.99097], [5, 10, 200725701112386.0],
+            [3, 12, 1850072455632.39], [0, 14, 185135446.828337], [1, 14, -170451090076.385],
+            [1, 18, 157890366037614.0], [1, 20, -2025305097487740.0], [28, 20, 3.6819392618357e+59],
+            [2, 22, 1.70215539458936e+17], [16, 22, 6.39234909918741e+41], [0, 24, -821698160721956.0],
+            [5, 24, -7.95260241872306e+23], [0, 28, 2.3341586947851e+17], [3, 28, -6.00079934586803e+22],
+            [4, 28, 5.94584382273384e+24], [12, 28, 1.89461279349492e+39], [16, 28, -8.10093428842645e+45],
+            [1, 32, 1.88813911076809e+21], [8, 32, 1.11052244098768e+35], [14, 32, 2.91133958602503e+45],
+            [0, 36, -3.2942192395146e+21], [2, 36, -1.37570282536696e+25], [3, 36, 1.81508996303902e+27],
+            [4, 36, -3.46865122768353e+29], [8, 36, -2.1196114877426e+37], [14, 36, -1.28617899887675e+48],
+            [24, 36, 4.79817895699239e+64]
+            ]),
+    'n': (0.0031, 23.0, 650.0, 0.976, 0.997, 0.0, 0.0, 0.0, [
+            [0, -12, 2.80967799943151e-39], [3, -12, 6.14869006573609e-31], [4, -12, 5.82238667048942e-28],
+            [6, -12, 3.90628369238462e-23], [7, -12, 8.21445758255119e-21], [10, -12, 4.02137961842776e-15],
+            [12, -12, 6.51718171878301e-13], [14, -12, -2.11773355803058e-08], [18, -12, 0.00264953354380072],
+            [0, -10, -1.35031446451331e-32], [3, -10, -6.07246643970893e-24], [5, -10, -4.02352115234494e-19],
+            [6, -10, -7.44938506925544e-17], [8, -10, 1.89917206526237e-13], [12, -10, 3.64975183508473e-06],
+            [0, -8, 1.77274872361946e-26], [3, -8, -3.34952758812999e-19], [7, -8, -4.21537726098389e-09],
+            [12, -8, -0.0391048167929649], [2, -6, 5.41276911564176e-14], [3, -6, 7.05412100773699e-12],
+            [4, -6, 2.58585887897486e-09], [2, -5, -4.93111362030162e-11], [4, -5, -1.58649699894543e-06],
+            [7, -5, -0.5250374278861], [4, -4, 0.00220019901729615], [3, -3, -0.00643064132636925],
+            [5, -3, 62.9154149015048], [6, -3, 135.147318617061], [0, -2, 2.40560808321713e-07],
+            [0, -1, -0.000890763306701305], [3, -1, -4402.09599407714], [1, 0, -302.807107747776],
+            [0, 1, 1591.58748314599], [1, 1, 232534.272709876], [0, 2, -792681.2071326],
+            [1, 4, -86987136466.2769], [0, 5, 354542769185.671], [1, 6, 400849240129329.0]
+            ]),
+    'o': (0.0034, 23.0, 650.0, 0.974, 0.996, 0.5, 1.0, 1.0, [
+            [0, -12, 1.28746023979718e-35], [0, -4, -7.35234770382342e-12], [0, -1, 0.0028907869214915],
+            [2, -1, 0.244482731907223], [3, -10, 1.41733492030985e-24], [4, -12, -3.54533853059476e-29],
+            [4, -8, -5.94539202901431e-18], [4, -5, -5.85188401782779e-09], [4, -4, 2.01377325411803e-06],
+            [4, -1, 1.38647388209306], [5, -4, -1.73959365084772e-05], [5, -3, 0.00137680878349369],
+            [6, -8, 8.14897605805513e-15], [7, -12, 4.25596631351839e-26], [8, -10, -3.87449113787755e-18],
+            [8, -8, 1.3981474793024e-13], [8, -4, -0.00171849638951521], [10, -12, 6.41890529513296e-22],
+            [10, -8, 1.18960578072018e-11], [14, -12, -1.55282762571611e-18], [14, -8, 2.33907907347507e-08],
+            [20, -12, -1.74093247766213e-13], [20, -10, 3.77682649089149e-09], [24, -12, -5.16720236575302e-11]
+            ]),
+    'p': (0.0041, 23.0, 650.0, 0.972, 0.997, 0.5, 1.0, 1.0, [
+            [0, -1, -9.82825342010366e-05], [0, 0, 1.05145700850612], [0, 1, 116.033094095084],
+            [0, 2, 3246.64750281543], [1, 1, -1235.92348610137], [2, -1, -0.0561403450013495],
+            [3, -3, 8.56677401640869e-08], [3, 0, 236.313425393924], [4, -2, 0.00972503292350109],
+            [6, -2, -1.03001994531927], [7, -5, -1.49653706199162e-09], [7, -4, -2.15743778861592e-05],
+            [8, -2, -8.34452198291445], [10, -3, 0.586602660564988], [12, -12, 3.43480022104968e-26],
+            [12, -6, 8.16256095947021e-06], [12, -5, 0.00294985697916798], [14, -10, 7.11730466276584e-17],
+            [14, -8, 4.00954763806941e-10], [14, -3, 10.7766027032853], [16, -8, -4.09449599138182e-07],
+            [18, -8, -7.29121307758902e-06], [20, -10, 6.77107970938909e-09], [22, -10, 6.02745973022975e-08],
+            [24, -12, -3.82323011855257e-11], [24, -8, 0.00179946628317437], [36, -12, -0.000345042834640005]
+            ]),
+    'q': (0.0022, 23.0, 650.0, 0.848, 0.983, 1.0, 1.0, 4.0, [
+            [-12, 10, -82043.384325995], [-12, 12, 47327151846.1586], [-10, 6, -0.0805950021005413],
+            [-10, 7, 32.860002543598], [-10, 8, -3566.1702998249], [-10, 10, -1729857814.33335],
+            [-8, 8, 35176923.2729192], [-6, 6, -775489.259985144], [-5, 2, 7.10346691966018e-05],
+            [-5, 5, 99349.9883820274], [-4, 3, -0.64209417190457], [-4, 4, -6128.42816820083],
+            [-3, 3, 232.808472983776], [-2, 0, -1.42808220416837e-05], [-2, 1, -0.00643596060678456],
+            [-2, 2, -4.28577227475614], [-2, 4, 2256.89939161918], [-1, 0, 0.0010035565172151],
+            [-1, 1, 0.333491455143516], [-1, 2, 1.09697576888873], [0, 0, 0.961917379376452],
+            [1, 0, -0.0838165632204598], [1, 1, 2.47795908411492], [1, 3, -3191.14969006533]
+            ]),
+    'r': (0.0054, 23.0, 650.0, 0.874, 0.982, 1.0, 1.0, 1.0, [
+            [-8, 6, 0.00144165955660863], [-8, 14, -7014385996282.58], [-3, -3, -8.30946716459219e-17],
+            [-3, 3, 0.261975135368109], [-3, 4, 393.097214706245], [-3, 5, -10433.4030654021],
+            [-3, 8, 490112654.154211], [0, -1, -0.000147104222772069], [0, 0, 1.03602748043408],
+            [0, 1, 3.05308890065089], [0, 5, -3997452.76971264], [3, -6, 5.6923371959375e-12],
+            [3, -2, -0.0464923504407778], [8, -12, -5.35400396512906e-18], [8, -10, 3.99988795693162e-13],
+            [8, -8, -5.36479560201811e-07], [8, -5, 0.0159536722411202], [10, -12, 2.70303248860217e-15],
+            [10, -10, 2.44247453858506e-08], [10, -8, -9.83430636716454e-06], [10, -6, 0.0663513144224454],
+            [10, -5, -9.93456957845006], [10, -4, 546.491323528491], [10, -3, -14336.5406393758],
+            [10, -2, 150764.974125511], [12, -12, -3.37209709340105e-10], [14, -12, 3.77501980025469e-09]
+            ]),
+    's': (0.0022, 21.0, 640.0, 0.886, 0.99, 1.0, 1.0, 4.0, [
+            [-12, 20, -5.32466612140254e+22], [-12, 24, 1.00415480000824e+31], [-10, 22, -1.91540001821367e+29],
+            [-8, 14, 1.05618377808847e+16], [-6, 36, 2.02281884477061e+58], [-5, 8, 88458547.2596134],
+            [-5, 16, 1.66540181638363e+22], [-4, 6, -313563.197669111], [-4, 32, -1.85662327545324e+53],
+            [-3, 3, -0.0624942093918942], [-3, 8, -5041607241.3259], [-2, 4, 18751.4491833092],
+            [-1, 1, 0.00121399979993217], [-1, 2, 1.88317043049455], [-1, 3, -1670.7350396206],
+            [0, 0, 0.965961650599775], [0, 1, 2.94885696802488], [0, 4, -65391.5627346115],
+            [0, 28, 6.04012200163444e+49], [1, 0, -0.198339358557937], [1, 32, -1.75984090163501e+57],
+            [3, 0, 3.56314881403987], [3, 1, -575.991255144384], [3, 2, 45621.3415338071],
+            [4, 3, -10917404.4987829], [4, 18, 4.37796099975134e+33], [4, 24, -6.16552611135792e+45],
+            [5, 4, 1935687689.17797], [14, 24, 9.50898170425042e+53]
+            ]),
+    't': (0.0088, 20.0, 650.0, 0.803, 1.02, 1.0, 1.0, 1.0, [
+            [0, 0, 1.55287249586268], [0, 1, 6.64235115009031], [0, 4, -2893.6623672721],
+            [0, 12, -3859232023098.48], [1, 0, -2.91002915783761], [1, 10, -829088246858.083],
+            [2, 0, 1.76814899675218], [2, 6, -534686695.713469], [2, 14, 1.60464608687834e+17],
+            [3, 3, 196435.366560186], [3, 8, 1566374275417.29], [4, 0, -1.78154560260006],
+            [4, 10, -2297462376236920.0], [7, 3, 38565900.1648006], [7, 4, 1105544467.90543],
+            [7, 7, -67707383068734.9], [7, 20, -3.27910592086523e+30], [7, 36, -3.41552040860644e+50],
+            [10, 10, -5.27251339709047e+20], [10, 12, 2.45375640937055e+23], [10, 14, -1.68776617209269e+26],
+            [10, 16, 3.58958955867578e+28], [10, 22, -6.56475280339411e+35], [18, 18, 3.55286045512301e+38],
+            [20, 32, 5.6902145441327e+57], [22, 22, -7.00584546433113e+47], [22, 36, -7.05772623326374e+64],
+            [24, 24, 1.66861176200148e+52], [28, 28, -3.00475129680486e+60], [32, 22, -6.68481295196808e+50],
+            [32, 32, 4.28432338620678e+68], [32, 36, -4.44227367758304e+71], [36, 36, -2.81396013562745e+76]
+            ]),
+    'u': (0.0026, 23.0, 650.0, 0.902, 0.988, 1.0, 1.0, 1.0, [
+            [-12, 14, 1.22088349258355e+17], [-10, 10, 1042164686.08488], [-10, 12, -8826669315646520.0],
+            [-10, 14, 2.59929510849499e+19], [-8, 10, 222612779142211.0], [-8, 12, -8.78473585050085e+17],
+            [-8, 14, -3.14432577551552e+21], [-6, 8, -2169349169962.85], [-6, 12, 1.59079648196849e+20],
+            [-5, 4, -339.567617303423], [-5, 8, 8843876513378.36], [-5, 12, -8.43405926846418e+20],
+            [-3, 2, 11.4178193518022], [-1, -1, -0.000122708229235641], [-1, 1, -106.201671767107],
+            [-1, 12, 9.03443213959313e+24], [-1, 14, -6.93996270370852e+27], [0, -3, 6.48916718965575e-09],
+            [0, 1, 7189.57567127851], [1, -2, 0.00105581745346187], [2, 5, -651903203602581.0],
+            [2, 10, -1.60116813274676e+24], [3, -5, -5.10254294237837e-09], [5, -4, -0.152355388953402],
+            [5, 2, 677143292290.144], [5, 3, 276378438378930.0], [6, -5, 0.0116862983141686],
+            [6, 2, -30142694798017.1], [8, -8, 1.6971981388484e-08], [8, 8, 1.04674840020929e+26],
+            [10, -4, -10801.690456014], [12, -12, -9.90623601934295e-13], [12, -4, 5361164.83602738],
+            [12, 4, 2.26145963747881e+21], [14, -12, -4.8873156577621e-10], [14, -10, 1.5100154888067e-05],
+            [14, -6, -22770.046464392], [14, 6, -7.81754507698846e+27]
+            ]),
+    'v': (0.0031, 23.0, 650.0, 0.96, 0.995, 1.0, 1.0, 1.0, [
+            [-10, -8, -4.15652812061591e-55], [-8, -12, 1.77441742924043e-61], [-6, -12, -3.57078668203377e-55],
+            [-6, -3, 3.59252213604114e-26], [-6, 5, -25.9123736380269], [-6, 6, 59461.976619346],
+            [-6, 8, -62418400710.3158], [-6, 10, 3.13080299915944e+16], [-5, 1, 1.05006446192036e-09],
+            [-5, 2, -1.92824336984852e-06], [-5, 6, 654144.373749937], [-5, 8, 5131174628650.44],
+            [-5, 10, -6.97595750347391e+18], [-5, 14, -1.03977184454767e+28], [-4, -12, 1.19563135540666e-48],
+            [-4, -10, -4.36677034051655e-42], [-4, -6, 9.26990036530639e-30], [-4, 10, 5.87793105620748e+20],
+            [-3, -3, 2.80375725094731e-18], [-3, 10, -1.92359972440634e+22], [-3, 12, 7.42705723302738e+26],
+            [-2, 2, -51.7429682450605], [-2, 4, 8206120.48645469], [-1, -2, -1.88214882341448e-09],
+            [-1, 0, 0.0184587261114837], [0, -2, -1.35830407782663e-06], [0, 6, -7.23681885626348e+16],
+            [0, 10, -2.23449194054124e+26], [1, -12, -1.11526741826431e-35], [1, -10, 2.76032601145151e-29],
+            [3, 3, 134856491567853.0], [4, -6, 6.5244029334586e-10], [4, 3, 5.1065511977436e+16],
+            [4, 10, -4.68138358908732e+31], [5, 2, -7606674911832790.0], [8, -12, -4.17247986986821e-19],
+            [10, -2, 31254567775610.4], [12, -3, -100375333864186.0], [14, 1, 2.47761392329058e+26]
+            ]),
+    'w': (0.0039, 23.0, 650.0, 0.959, 0.995, 1.0, 1.0, 4.0, [
+            [-12, 8, -5.86219133817016e-08], [-12, 14, -89446035500.5526], [-10, -1, 5.31168037519774e-31],
+            [-10, 8, 0.109892402329239], [-8, 6, -0.0575368389425212], [-8, 8, 22827.6853990249],
+            [-8, 14, -1.58548609655002e+18], [-6, -4, 3.29865748576503e-28], [-6, -3, -6.34987981190669e-25],
+            [-6, 2, 6.15762068640611e-09], [-6, 8, -96110924.0985747], [-5, -10, -4.06274286652625e-45],
+            [-4, -1, -4.71103725498077e-13], [-4, 3, 0.725937724828145], [-3, -10, 1.87768525763682e-39],
+            [-3, 3, -1033.08436323771], [-2, 1, -0.0662552816342168], [-2, 2, 579.51404176571],
+            [-1, -8, 2.37416732616644e-27], [-1, -4, 2.71700235739893e-15], [-1, 1, -90.78862134836],
+            [0, -12, -1.71242509570207e-37], [0, 1, 156.792067854621], [1, -1, 0.92326135790147],
+            [2, -1, -5.97865988422577], [2, 2, 3219887.67636389], [3, -12, -3.99441390042203e-30],
+            [3, -5, 4.93429086046981e-08], [5, -10, 8.12036983370565e-20], [5, -8, -2.07610284654137e-12],
+            [5, -6, -3.40821291419719e-07], [8, -12, 5.42000573372233e-18], [8, -10, -8.56711586510214e-13],
+            [10, -12, 2.66170454405981e-14], [10, -8, 8.58133791857099e-06]
+            ]),
+    'x': (0.0049, 23.0, 650.0, 0.91, 0.988, 1.0, 1.0, 1.0, [
+            [-8, 14, 3.77373741298151e+18], [-6, 10, -5071008837229.13], [-5, 10, -1033632255988600.0],
+            [-4, 1, 1.84790814320773e-06], [-4, 2, -0.000924729378390945], [-4, 14, -4.25999562292738e+23],
+            [-3, -2, -4.62307771873973e-13], [-3, 12, 1.07319065855767e+21], [-1, 5, 64866249228.0682],
+            [0, 0, 2.44200600688281], [0, 4, -8515357334.84258], [0, 10, 1.69894481433592e+21],
+            [1, -10, 2.1578022250902e-27], [1, -1, -0.320850551367334], [2, 6, -3.8264244845861e+16],
+            [3, -12, -2.75386077674421e-29], [3, 0, -563199.253391666], [3, 8, -3.26068646279314e+20],
+            [4, 3, 39794900155318.4], [5, -6, 1.00824008584757e-07], [5, -2, 16223.4569738433],
+            [5, 1, -43235522531.9745], [6, 1, -592874245598.61], [8, -6, 1.33061647281106],
+            [8, -3, 1573381.97797544], [8, 1, 25818961427085.3], [8, 8, 2.62413209706358e+24],
+            [10, -8, -0.0920011937431142], [12, -10, 0.00220213765905426], [12, -8, -11.0433759109547],
+            [12, -5, 8470048.70612087], [12, -4, -592910695.762536], [14, -12, -1.8302717326966e-05],
+            [14, -10, 0.181339603516302], [14, -8, -1192.28759669889], [14, -6, 4308676.58061468]
+            ]),
+    'y': (0.0031, 22.0, 650.0, 0.996, 0.994, 1.0, 1.0, 4.0, [
+            [0, -3, -5.25597995024633e-10], [0, 1, 5834.41305228407], [0, 5, -1.34778968457925e+16],
+            [0, 8, 1.18973500934212e+25], [1, 8, -1.59096490904708e+26], [2, -4, -3.15839902302021e-07],
+            [2, -1, 496.212197158239], [2, 4, 3.27777227273171e+18], [2, 5, -5.27114657850696e+21],
+            [3, -8, 2.10017506281863e-17], [3, 4, 7.05106224399834e+20], [3, 8, -2.66713136106469e+30],
+            [4, -6, -1.45370512554562e-08], [4, 6, 1.4933391705313e+27], [5, -2, -14979562.0287641],
+            [5, 1, -3818819062711000.0], [8, -8, 7.24660165585797e-05], [8, -2, -93780816955019.3],
+            [10, -5, 5144114683.76383], [12, -8, -82819.8594040141]
+            ]),
+    'z': (0.0038, 22.0, 650.0, 0.993, 0.994, 1.0, 1.0, 4.0, [
+            [-8, 3, 2.4400789229065e-11], [-6, 6, -4630574.30331242], [-5, 6, 7288032747.77712],
+            [-5, 8, 3277763028588560.0], [-4, 5, -1105981701.18409], [-4, 6, -3238999157299.57],
+            [-4, 8, 9238140070232450.0], [-3, -2, 8.42250080413712e-13], [-3, 5, 663221436245.506],
+            [-3, 6, -167170186672139.0], [-2, 2, 2537.49358701391], [-1, -6, -8.19731559610523e-21],
+            [0, 3, 328380587890.663], [1, 1, -62500479.1171543], [2, 6, 8.03197957462023e+20],
+            [3, -6, -2.04397011338353e-11], [3, -2, -3783.91047055938], [6, -6, 0.0097287654593862],
+            [6, -5, 15.4355721681459], [6, -4, -3739.62862928643], [6, -1, -68285901137.4572],
+            [8, -8, -0.000248488015614543], [8, -4, 3945360.49497068]
+            ]),
+}
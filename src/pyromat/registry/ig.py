@@ -56,6 +56,14 @@ For more information on any of these methods, access the in-line
 documentation using Python's built-in "help()" function.
 """
 
+    # The attributes that the property methods use most
+    __slots__ = ('_pref_pa', '_contents', '_Tseg', '_Ctab', '_invtab')
+    # The coefficients are packed and the reference tables are only read
+    # when they are needed in compact mode (see __basedata__.compact())
+    _packed = ('C',)
+    _lazydata = ('TAB',)
+
+
     def __init__(self,*arg,**kwarg):
         super(self.__class__,self).__init__(*arg,**kwarg)
 
@@ -63,6 +71,11 @@ documentation using Python's built-in "help()" function.
         self._pref_pa = 1e5
         # Initialize the species contents dictionary
         self._contents = None
+        # Stack the piece-wise coefficients.  See _segments().
+        self._Tseg, self._Ctab = self._coef_compile()
+        # Tables for inverting _h, _e, and _s are built when they are 
+        # first needed.  See _Tinv().
+        self._invtab = {}
 
 
     def _argparse(self, *varg, **kwarg):
@@ -193,14 +206,13 @@ _argparse decides which to populate based on what is most efficient.
         if 'T' in kwarg:
             kwarg['T'] = pm.units.temperature_scale(kwarg['T'], to_units='K')
         if 'p' in kwarg:
-            kwarg['p'] = pm.units.pressure(kwarg['p'], to_units='Pa')
+            kwarg['p'] = np.divide(kwarg['p'], pm.units.plan(pressure='Pa'))
         if 'd' in kwarg:
-            value = pm.units.volume(kwarg['d'], to_units='m3', exponent=-1)
-            kwarg['d'] = pm.units.matter(value, self.data['mw'], to_units='kmol')
+            kwarg['d'] = np.divide(kwarg['d'], pm.units.plan(self.data['mw'], volume=('m3',-1), matter='kmol'))
         if 'v' in kwarg:
             # Convert and replace with d at the same time
-            value = pm.units.volume(kwarg['v'], to_units='m3')
-            kwarg['d'] = 1./pm.units.matter(value, self.data['mw'], to_units='kmol', exponent=-1)
+            kwarg['d'] = np.divide(pm.units.plan(self.data['mw'], volume='m3', matter=('kmol',-1)),
+                    np.asarray(kwarg['v'], dtype=float))
             args.add('d')
             basic_args.add('d')
             del kwarg['v']
@@ -208,19 +220,15 @@ _argparse decides which to populate based on what is most efficient.
             basic_args.remove('v')
         if 'h' in kwarg:
             value = kwarg['h']
-            value = pm.units.energy(value, to_units='kJ')
-            value = pm.units.matter(value, self.data['mw'], to_units='kmol', exponent=-1)
+            value = np.divide(value, pm.units.plan(self.data['mw'], energy='kJ', matter=('kmol',-1)))
             kwarg['h'] = value
         if 'e'  in kwarg:
             value = kwarg['e']
-            value = pm.units.energy(value, to_units='kJ')
-            value = pm.units.matter(value, self.data['mw'], to_units='kmol', exponent=-1)
+            value = np.divide(value, pm.units.plan(self.data['mw'], energy='kJ', matter=('kmol',-1)))
             kwarg['e'] = value
         if 's' in kwarg:
             value = kwarg['s']
-            value = pm.units.energy(value, to_units='kJ')
-            value = pm.units.matter(value, self.data['mw'], to_units='kmol', exponent=-1)
-            value = pm.units.temperature(value, to_units='K', exponent=-1)
+            value = np.divide(value, pm.units.plan(self.data['mw'], energy='kJ', matter=('kmol',-1), temperature=('K',-1)))
             kwarg['s'] = value
 
         # Convert R into J/kmol/K - use this for p = dRT
@@ -234,7 +242,6 @@ _argparse decides which to populate based on what is most efficient.
         if inverse_args:
             # There can only be one, see rule 2.3
             invp = inverse_args.pop()
-            invfn = inverse_methods[invp]
             
             # what else do we have?
             # There can only be one, see rule 2.1
@@ -244,22 +251,21 @@ _argparse decides which to populate based on what is most efficient.
             if basp == 'd':
                 y,d = np.broadcast_arrays(kwarg[invp], kwarg[basp])
                 p = None
-                T = np.full_like(y, 0.5*(self.data['Tlim'][0] + self.data['Tlim'][-1]))
-                I = np.ones_like(y,dtype=bool)
                 # density and entropy are specified, special iteration is required
                 if invp == 's':
+                    T = np.full_like(y, 0.5*(self.data['Tlim'][0] + self.data['Tlim'][-1]))
+                    I = np.ones_like(y,dtype=bool)
                     self._iter1(self._sditer, 'T', y, T, I, self.data['Tlim'][0], self.data['Tlim'][-1], param={'d':d})
+                # Enthalpy and energy are only functions of temperature
                 else:
-                    self._iter1(invfn, 'T', y, T, I, self.data['Tlim'][0], self.data['Tlim'][-1])
+                    T = self._Tinv(invp, y)
             # If pressure is specified
             elif basp == 'p':
                 y,p = np.broadcast_arrays(kwarg[invp], kwarg[basp])
                 # If the property is entropy, adjust it for pressure
                 if invp == 's':
                     y = y + pm.units.const_Ru * np.log(p / self._pref_pa)
-                T = np.full_like(y, 0.5*(self.data['Tlim'][0] + self.data['Tlim'][-1]))
-                I = np.ones_like(y,dtype=bool)
-                self._iter1(invfn, 'T', y, T, I, self.data['Tlim'][0], self.data['Tlim'][-1])
+                T = self._Tinv(invp, y)
             # If temperature is specified
             elif basp == 'T':
                 y,T = np.broadcast_arrays(kwarg[invp], kwarg[basp])
@@ -335,6 +341,170 @@ I will be returned such that Tlim[index] <= T[I] < Tlim[index]
                     T < self.data['Tlim'][index+1])
 
 
+    def _coef_compile(self):
+        """Stack the piece-wise coefficients into arrays (primative routine)
+    Tseg, Ctab = _coef_compile()
+
+Tseg is the Tlim array, and Ctab is a 2-D array whose columns are the 
+coefficient sets in C, so that Ctab[k,index] is the k-th coefficient 
+of segment "index".  They are stored in the _Tseg and _Ctab attributes
+when the instance is created.
+"""
+        Tseg = np.asarray(self.data['Tlim'], dtype=float)
+        Ctab = np.asarray(self.data['C'], dtype=float).T.copy()
+        return Tseg, Ctab
+
+
+    def _segments(self, T):
+        """Iterate over the temperature segments (primative routine)
+    for C,I in _segments(T):
+        ...
+
+C is the array of coefficients of a segment, and I selects the 
+temperatures, T[I], that lie in it.  As with _crange(), each segment 
+includes its lower limit, and the last segment also includes its upper
+limit.  Temperatures that are out-of-bounds are not in any segment.
+
+The Shomate expressions are cheap, so gathering the coefficients for 
+every point costs more than evaluating them once per segment.  When all
+of the temperatures lie in the same segment, only it is yielded, and I
+is Ellipsis, so T[I] is T itself.
+"""
+        Tseg = self._Tseg
+        if T.size:
+            Tmin = T.min()
+            Tmax = T.max()
+            if Tmin >= Tseg[0] and Tmax <= Tseg[-1]:
+                index = np.searchsorted(Tseg[1:-1], [Tmin, Tmax], side='right')
+                if index[0] == index[1]:
+                    yield self._Ctab[:,index[0]], Ellipsis
+                    return
+        for index in range(len(Tseg)-1):
+            yield self._Ctab[:,index], self._crange(T, index)
+
+
+    def _tpoly(self):
+        """Express the coefficients as polynomials in T (primative routine)
+    Tseg, P = _tpoly()
+
+Returns the Tlim array and a 2-D array whose columns are the 
+coefficients of each segment in a form that is shared by the ig and ig2
+classes, so that mixtures of either may be summed (see igmix).  In 
+molar units (kJ, kmol, K),
+    cp = P0 + P1*T + P2*T**2 + P3*T**3 + P4*T**4 + P5/T**2
+    h = P6 + P0*T + P1*T**2/2 + P2*T**3/3 + P3*T**4/4 + P4*T**5/5 - P5/T
+    s = P7 + P0*ln(T) + P1*T + P2*T**2/2 + P3*T**3/3 + P4*T**4/4 
+            - P5/(2*T**2)
+where s is evaluated at the reference pressure.
+"""
+        C = self._Ctab
+        P = np.zeros((8, C.shape[1]), dtype=float)
+        # Shomate polynomials are in t = T/1000 with h in MJ
+        P[0] = C[0]
+        P[1] = C[1] * 1e-3
+        P[2] = C[2] * 1e-6
+        P[3] = C[3] * 1e-9
+        P[5] = C[4] * 1e6
+        P[6] = C[5] * 1e3
+        P[7] = C[6] - C[0]*np.log(1000.)
+        return self._Tseg, P
+
+
+    def _inv_compile(self, prop, tol=1e-6, N=8, Nmax=20):
+        """Build a table for calculating temperature from a property
+    tab = _inv_compile(prop, tol=1e-6, N=8, Nmax=20)
+
+prop is 'h', 'e', or 's'.  The table is a piece-wise cubic Hermite
+interpolant of temperature in terms of the property.  It begins with N
+intervals in each of the temperature segments, and intervals are halved
+until the temperature error at their quarter points is less than tol
+times the temperature (or until they have been halved Nmax times).  
+The table is a tuple of arrays with the property, the temperature, and
+the derivative of temperature with respect to the property at the lower
+(a) and upper (b) end of each interval;
+    (Ya, Ta, Da, Yb, Tb, Db)
+Both ends of an interval are evaluated in its own segment, so the table
+is exact at the nodes even where the property is not continuous between
+segments.  See _Tinv().
+"""
+        fn = getattr(self, '_' + prop)
+        Tseg = self._Tseg
+        T = np.concatenate([np.linspace(Tseg[ii], Tseg[ii+1], N+1)[:-1] 
+                for ii in range(len(Tseg)-1)] + [Tseg[-1:]])
+        Ta = T[:-1]
+        Tb = T[1:]
+        frac = np.array([[0.25], [0.5], [0.75]])
+        for count in range(Nmax+1):
+            Ya,Da = fn(Ta, diff=True)[:2]
+            # Step off of the upper node into the interval's segment
+            Yb,Db = fn(np.append(np.nextafter(Tb[:-1], Ta[:-1]), Tb[-1]), 
+                    diff=True)[:2]
+            Da = 1./Da
+            Db = 1./Db
+            if count == Nmax:
+                break
+            # Test the interpolant at the quarter points
+            y = Ya + frac*(Yb - Ya)
+            t = frac
+            hy = Yb - Ya
+            Tt = (1.+2.*t)*(1.-t)*(1.-t)*Ta + t*(1.-t)*(1.-t)*hy*Da + \
+                    t*t*(3.-2.*t)*Tb + t*t*(t-1.)*hy*Db
+            yy,yyT = fn(Tt.reshape(-1), diff=True)[:2]
+            error = np.abs((yy.reshape(Tt.shape) - y) / yyT.reshape(Tt.shape))
+            I = (error > tol*Tt).any(axis=0)
+            if not I.any():
+                break
+            Tm = 0.5*(Ta + Tb)
+            Ta,Tb = np.concatenate((Ta, Tm[I])), \
+                    np.concatenate((np.where(I, Tm, Tb), Tb[I]))
+            index = np.argsort(Ta)
+            Ta = Ta[index]
+            Tb = Tb[index]
+        return Ya, Ta, Da, Yb, Tb, Db
+
+
+    def _Tinv(self, prop, y):
+        """Calculate temperature from enthalpy, energy, or entropy
+    T = _Tinv(prop, y)
+
+prop is 'h', 'e', or 's', and y is an array of the property in the 
+units of the corresponding inner routine (entropy is at the reference
+pressure).  The temperature is interpolated from a table that is built
+by _inv_compile() the first time it is needed, and it is refined by a 
+single Newton step.  Values of y beyond the limits are extrapolated 
+linearly, so they return temperatures that are out of bounds.
+"""
+        tab = self._invtab.get(prop)
+        if tab is None:
+            tab = self._inv_compile(prop)
+            self._invtab[prop] = tab
+        Ya,Ta,Da,Yb,Tb,Db = tab
+        y = np.asarray(y, dtype=float)
+        shape = y.shape
+        y = y.reshape(-1)
+        ii = np.searchsorted(Ya[1:], y, side='right')
+        hy = Yb[ii] - Ya[ii]
+        t = np.clip((y - Ya[ii]) / hy, 0., 1.)
+        hy *= (1.-t)*t
+        T = (1.+2.*t)*(1.-t)*(1.-t)*Ta[ii] + (1.-t)*hy*Da[ii] + \
+                t*t*(3.-2.*t)*Tb[ii] - t*hy*Db[ii]
+        Iin = np.logical_and(y >= Ya[0], y <= Yb[-1])
+        if not Iin.all():
+            T = np.where(y < Ya[0], Ta[0] + (y - Ya[0])*Da[0], T)
+            T = np.where(y > Yb[-1], Tb[-1] + (y - Yb[-1])*Db[-1], T)
+            # Allow for round-off in values calculated at the limits
+            Iin = np.logical_and(T >= Ta[0]*(1.-1e-9), T <= Tb[-1]*(1.+1e-9))
+        # One Newton step
+        probe = pm.stats.probe(self, '_Tinv', getattr(self, '_' + prop), None, y.size)
+        Tin = np.clip(T[Iin], Ta[0], Tb[-1])
+        yy,yyT = getattr(self, '_' + prop)(Tin, diff=True)[:2]
+        T[Iin] = np.clip(Tin + (y[Iin] - yy) / yyT, Ta[0], Tb[-1])
+        if probe:
+            probe.eval(yy.size)
+            probe.done(1)
+        return T.reshape(shape)
+
+
     def _iter1(self, fn, prop, y, x, Ids, xmin, xmax,
                 ep=1e-6, Nmax=20, fx_index=1, verbose=False,
                 param={}):
@@ -374,63 +544,88 @@ param       A dicitonary of keyword arguments are passed directly to the
             inner routine being inverted.
 
 """
-        # As the iteration progresses, the number of True elements in 
-        # Ids will decrease until they are all false
-        # There are some important intermediate values that will also
-        # require indexable arrays
-        dx = np.zeros_like(y, dtype=float)
-        error = np.zeros_like(dx, dtype=float)
-        IooB = np.zeros_like(Ids, dtype=bool)
-
+        # The points under iteration are compacted into contiguous 
+        # arrays.  As points converge, they are written back to x and 
+        # removed from the working arrays, so each iteration only 
+        # indexes the points that remain.  I holds their flat indices.
+        # xf and If are flat views of x and Ids (or flat iterators if
+        # they are not contiguous) for scattering the results.
+        I = np.flatnonzero(Ids)
+        xf = x.reshape(-1) if x.flags.c_contiguous else x.flat
+        If = Ids.reshape(-1) if Ids.flags.c_contiguous else Ids.flat
+        xx = xf[I]
+        yt = np.broadcast_to(y, Ids.shape).reshape(-1)[I]
+        xa = np.broadcast_to(xmin, Ids.shape).reshape(-1)[I]
+        xb = np.broadcast_to(xmax, Ids.shape).reshape(-1)[I]
         arg = param.copy()
+        for k,v in param.items():
+            # For any array arguments, compact them along with x
+            if isinstance(v,np.ndarray):
+                arg[k] = np.broadcast_to(v, Ids.shape).reshape(-1)[I]
+        # Solver statistics are only recorded when a collector is active
+        probe = pm.stats.probe(self, '_iter1', fn, param, I.size)
         count = 0
 
         if verbose:
-            print('x, yy, yyx, dx, Ids')
-        while Ids.any():
-            # Build the new argument list
-            for k,v in param.items():
-                # For any array arguments, shrink them along with Ids
-                if isinstance(v,np.ndarray):
-                    arg[k] = v[Ids]
-            # Shrink the primary property array
-            arg[prop] = x[Ids]
+            print('x, yy, yyx, dx, I')
+        while I.size:
             # Evaluate the funciton and isolate its derivative
+            arg[prop] = xx
             FF = fn( diff=True, **arg)
             yy = FF[0]
             yyx = FF[fx_index]
-            # note that x[Ids], yy, yyx, and all the other floating 
-            # intermediates are now in m-space; the sub-set of values
-            # still under iteration.
+            if probe:
+                probe.eval(xx.size)
             # Calculate the error, the linear change in x, and the new x
-            error[Ids] = y[Ids] - yy
-            dx[Ids] = error[Ids] / yyx
+            error = yt - yy
+            dx = error / yyx
             if verbose:
-                print(x, yy, yyx, dx, Ids)
-            x[Ids] += dx[Ids]
+                print(xx, yy, yyx, dx, I)
+            xx = xx + dx
             # An out-of-bounds index
-            IooB = np.logical_or( x < xmin, x > xmax)
+            IooB = np.logical_or( xx < xa, xx > xb)
             count_oob = 0
             while IooB.any():
                 dx[IooB] /= 2.
-                x[IooB] -= dx[IooB]
-                IooB = np.logical_or( x < xmin, x > xmax)
+                xx[IooB] -= dx[IooB]
+                IooB = np.logical_or( xx < xa, xx > xb)
                 # Prevent a while-loop-trap
                 count_oob += 1
                 if count_oob>Nmax:
+                    xf[I] = xx
+                    if probe:
+                        probe.done(count+1, I.size)
                     raise pm.utility.PMAnalysisError(
                         'iter1_() failed to produce a guess that was in-bounds')
             
             # Check the iteration convergence
-            Ids[Ids] = abs(error[Ids]) > abs(ep*y[Ids])
+            Iwork = abs(error) > abs(ep*yt)
+            if not Iwork.all():
+                # Scatter the converged points and compact the rest
+                Idone = np.logical_not(Iwork)
+                xf[I[Idone]] = xx[Idone]
+                If[I[Idone]] = False
+                I = I[Iwork]
+                xx = xx[Iwork]
+                yt = yt[Iwork]
+                xa = xa[Iwork]
+                xb = xb[Iwork]
+                for k,v in param.items():
+                    if isinstance(v,np.ndarray):
+                        arg[k] = arg[k][Iwork]
             # Prevent a while-loop-trap
             count += 1
-            if count>Nmax:                
+            if count>Nmax:
+                xf[I] = xx
                 pm.utility.print_warning(\
                     'iter1_() failed to converge for %d elements after %d attempts'%(\
-                    Ids.sum(), Nmax))
+                    I.size, Nmax))
+                if probe:
+                    probe.done(count, I.size)
                 return
-                
+        if probe:
+            probe.done(count)
+
     def _sditer(self, T, d, diff=1):
         s,sT = self._s(T, diff)
         R = 1000 * pm.units.const_Ru
@@ -450,12 +645,8 @@ param       A dicitonary of keyword arguments are passed directly to the
 Expects temperature in Kelvin and returns cp in kJ/kmol/K"""
 
         out = np.full_like(T,pm.config['def_oob'],dtype=float)
-        # Loop through the available piece-wise temperature ranges
-        # Use the _crange() method to identify the elements appropriate
-        # for each.
-        for ii in range(len(self.data['Tlim'])-1):
-            C = self.data['C'][ii]
-            I = self._crange(T, ii)
+        # Loop through the piece-wise temperature ranges
+        for C,I in self._segments(T):
             t = T[I] / 1000.
             out[I] = C[0] + t*(C[1] + t*(C[2] + t*C[3])) + C[4] / (t*t)
         return out
@@ -474,12 +665,8 @@ temperature with constant pressure is also returned.
         hT = None
         if diff:
             hT = np.full_like(T,pm.config['def_oob'],dtype=float)
-        # Loop through the available piece-wise temperature ranges
-        # Use the _crange() method to identify the elements appropriate
-        # for each.
-        for ii in range(len(self.data['Tlim'])-1):
-            C = self.data['C'][ii]
-            I = self._crange(T, ii)
+        # Loop through the piece-wise temperature ranges
+        for C,I in self._segments(T):
             t = T[I] / 1000.
             out[I] = C[5] + t*(C[0] + t*(C[1]/2. + t*(C[2]/3. + t*C[3]/4.))) - C[4]/t
             if diff:
@@ -499,7 +686,9 @@ When diff=True, the partial derivative of energy with respect to
 temperature with constant pressure is also returned.
 """
         h,hT = self._h(T,diff)
-        return h-pm.units.const_Ru*T, hT-pm.units.const_Ru
+        if diff:
+            hT = hT - pm.units.const_Ru
+        return h-pm.units.const_Ru*T, hT
         
     def _s(self, T, diff=False):
         """Entropy at reference pressure
@@ -514,18 +703,13 @@ temperature is also returned.  Otherwise it is returned as None.
         sT = None
         if diff:
             sT = np.full_like(T,pm.config['def_oob'],dtype=float)
-        # Loop through the available piece-wise temperature ranges
-        # Use the _crange() method to identify the elements appropriate
-        # for each.
-        for ii in range(len(self.data['Tlim'])-1):
-            C = self.data['C'][ii]
-            I = self._crange(T, ii)
+        # Loop through the piece-wise temperature ranges
+        for C,I in self._segments(T):
             t = T[I] / 1000.
             out[I] = C[6] + C[0]*np.log(t) + t*(C[1] + t*(C[2]/2. + t*C[3]/3.)) - C[4] / (2*t*t)
             if diff:
-                sT[I] = C[0]/t + C[1] + t*(C[2] + t*C[3]) + C[4]/(t*t*t)
                 # Rescale for temperature derivative
-                sT[I] /= 1000
+                sT[I] = (C[0]/t + C[1] + t*(C[2] + t*C[3]) + C[4]/(t*t*t)) / 1000.
         return out, sT
 
 
@@ -1425,8 +1609,7 @@ Returns density in unit_matter / unit_volume
         T,p,d = self._argparse(*varg, **kwarg)
         if d is None:
             d = p / (1000*pm.units.const_Ru * T)
-        scale = pm.units.matter(1., self.data['mw'], from_units='kmol')
-        scale = pm.units.volume(scale, from_units='m3', exponent=-1)
+        scale = pm.units.plan(self.data['mw'], matter='kmol', volume=('m3',-1))
         np.multiply(d, scale, out=d)
         return d
         
@@ -1508,7 +1691,7 @@ Returns pressure in unit_pressure
         T,p,d = self._argparse(*varg, **kwarg)
         if p is None:
             p = d * 1000*pm.units.const_Ru * T
-        pm.units.pressure(p, from_units='Pa', inplace=True)
+        np.multiply(p, pm.units.plan(pressure='Pa'), out=p)
         return p
 
     def mw(self, *varg, **kwarg):
@@ -1518,8 +1701,7 @@ Returns pressure in unit_pressure
 Ignores the arguments are returns molecular weight as 
 unit_mass / unit_molar
 """
-        mw = pm.units.mass(self.data['mw'],from_units='g')
-        mw = pm.units.molar(mw,from_units='mol',exponent=-1)
+        mw = np.multiply(self.data['mw'], pm.units.plan(mass='g', molar=('mol',-1)))
         return mw
 
     def R(self,*varg, **kwarg):
@@ -1529,9 +1711,7 @@ unit_mass / unit_molar
 Ignores the arguments are returns the gas constant as
 unit_energy / unit_matter / unit_temperature
 """
-        R = pm.units.energy(pm.units.const_Ru, from_units='J')
-        R = pm.units.temperature(R, from_units='K', exponent=-1)
-        R = pm.units.matter(R, self.data['mw'], from_units='mol', exponent=-1)
+        R = np.multiply(pm.units.const_Ru, pm.units.plan(self.data['mw'], energy='J', temperature=('K',-1), matter=('mol',-1)))
         return R
 
     def gam(self,*varg, **kwarg):
@@ -1585,9 +1765,7 @@ Returns specific heat in unit_energy / unit_matter / unit_temperature
         # Apply the model
         out = self._cp(T)
         # calculate a conversion factor
-        scale = pm.units.energy(1, from_units='kJ')
-        scale = pm.units.temperature(scale, from_units='K', exponent=-1)
-        scale = pm.units.matter(scale, self.data['mw'], from_units='kmol', exponent=-1)
+        scale = pm.units.plan(self.data['mw'], energy='kJ', temperature=('K',-1), matter=('kmol',-1))
         # Apply the conversion factor in-place and return
         np.multiply(out, scale, out=out)
         return out
@@ -1617,9 +1795,7 @@ Returns specific heat in unit_energy / unit_matter / unit_temperature
         # Apply the model
         out = self._cp(T) - pm.units.const_Ru
         # calculate a conversion factor
-        scale = pm.units.energy(1, from_units='kJ')
-        scale = pm.units.temperature(scale, from_units='K', exponent=-1)
-        scale = pm.units.matter(scale, self.data['mw'], from_units='kmol', exponent=-1)
+        scale = pm.units.plan(self.data['mw'], energy='kJ', temperature=('K',-1), matter=('kmol',-1))
         # Apply the conversion factor in-place and return
         np.multiply(out, scale, out=out)
         return out
@@ -1649,8 +1825,7 @@ Returns enthalpy in unit_energy / unit_matter
         # Apply the model
         out = self._h(T)[0]
         # calculate a conversion factor
-        scale = pm.units.energy(1, from_units='kJ')
-        scale = pm.units.matter(scale, self.data['mw'], from_units='kmol', exponent=-1)
+        scale = pm.units.plan(self.data['mw'], energy='kJ', matter=('kmol',-1))
         # Apply the conversion factor in-place and return
         np.multiply(out, scale, out=out)
         return out
@@ -1682,9 +1857,7 @@ Returns entropy in unit_energy / unit_matter / unit_temperature
         # Apply the model
         out = self._s(T)[0] - pm.units.const_Ru * np.log(p/self._pref_pa)
         # calculate a conversion factor
-        scale = pm.units.energy(1, from_units='kJ')
-        scale = pm.units.temperature(scale, from_units='K', exponent=-1)
-        scale = pm.units.matter(scale, self.data['mw'], from_units='kmol', exponent=-1)
+        scale = pm.units.plan(self.data['mw'], energy='kJ', temperature=('K',-1), matter=('kmol',-1))
         # Apply the conversion factor in-place and return
         np.multiply(out, scale, out=out)
         return out
@@ -1714,13 +1887,12 @@ Returns internal energy in unit_energy / unit_matter
         # Apply the model
         out = self._h(T)[0] - pm.units.const_Ru*T
         # calculate a conversion factor
-        scale = pm.units.energy(1, from_units='J')
-        scale = pm.units.matter(scale, self.data['mw'], from_units='mol', exponent=-1)
+        scale = pm.units.plan(self.data['mw'], energy='J', matter=('mol',-1))
         # Apply the conversion factor in-place and return
         np.multiply(out, scale, out=out)
         return out
 
-    def state(self, *varg, **kwarg):
+    def state(self, *varg, props=None, **kwarg):
         """Calculate all properties at a state
     sd = state(...)
 
@@ -1737,7 +1909,22 @@ The properties are returned in a dictionary with keys:
     
 Like all of the other property functions, arguments may be any two of
 T, p, d, v, e, h, and s.  
+
+The optional props keyword limits the calculation to a sequence of the
+above keys.  The arguments are parsed (and inverted) only once, and 
+properties that are not requested are not calculated.
+    sd = state(..., props=('h','s','d'))
 """
+        allprops = ('T','p','d','v','e','h','s','cp','cv','gam')
+        if props is None:
+            props = allprops
+        elif isinstance(props, str):
+            props = (props,)
+        for prop in props:
+            if prop not in allprops:
+                raise pm.utility.PMParamError(
+                        'Unrecognized state property: ' + repr(prop))
+
         Ru = pm.units.const_Ru
         T,p,d = self._argparse(*varg, **kwarg)
         # Make sure we have both pressure and density
@@ -1746,32 +1933,45 @@ T, p, d, v, e, h, and s.
         elif p is None:
             p = 1000 * d * Ru * T
 
-        # Now entropy
-        s = self._s(T,False)[0] - Ru * np.log(p / self._pref_pa)
-
-        # Enthalpy and specific heat at once
-        h,cp = self._h(T,True)
-        cv = cp - Ru
-        gam = cp/cv
-        e = h - Ru*T
+        # Only calculate the properties that were requested
+        wants_h = 'h' in props or 'e' in props
+        wants_cp = 'cp' in props or 'cv' in props or 'gam' in props
+        if wants_h:
+            # Enthalpy and specific heat at once
+            h,cp = self._h(T,wants_cp)
+        elif wants_cp:
+            cp = self._cp(T)
         
         # Finally build the output
         out = {}
-        out['T'] = pm.units.temperature_scale(T, from_units='K')
-        out['p'] = pm.units.pressure(p, from_units='Pa')
-        scale = pm.units.matter(1., self.data['mw'], from_units='kmol')
-        scale = pm.units.volume(scale, from_units='m3', exponent=-1)
-        out['d'] = scale * d
-        out['v'] = 1./out['d']
-        scale = pm.units.energy(1., from_units='kJ')
-        scale = pm.units.matter(scale, self.data['mw'], from_units='kmol', exponent=-1)
-        out['h'] = h * scale
-        out['e'] = e * scale
-        out['gam'] = gam
-        scale = pm.units.temperature(scale, from_units='K', exponent=-1)
-        out['s'] = s * scale
-        out['cp'] = cp * scale
-        out['cv'] = cv * scale
+        for prop in props:
+            if prop == 'T':
+                out['T'] = pm.units.temperature_scale(T, from_units='K')
+            elif prop == 'p':
+                out['p'] = np.multiply(p, pm.units.plan(pressure='Pa'))
+            elif prop == 'd' or prop == 'v':
+                scale = pm.units.plan(self.data['mw'], matter='kmol', volume=('m3',-1))
+                if prop == 'd':
+                    out['d'] = scale * d
+                else:
+                    out['v'] = 1. / (scale * d)
+            elif prop == 'gam':
+                out['gam'] = cp / (cp - Ru)
+            else:
+                scale = pm.units.plan(self.data['mw'], energy='kJ', matter=('kmol',-1))
+                if prop == 'h':
+                    out['h'] = h * scale
+                elif prop == 'e':
+                    out['e'] = (h - Ru*T) * scale
+                else:
+                    scale *= pm.units.plan(temperature=('K',-1))
+                    if prop == 's':
+                        out['s'] = scale * \
+                                (self._s(T,False)[0] - Ru * np.log(p / self._pref_pa))
+                    elif prop == 'cp':
+                        out['cp'] = cp * scale
+                    else:
+                        out['cv'] = (cp - Ru) * scale
         return out
 
 
@@ -59,6 +59,11 @@ For more information on any of these methods, access the in-line
 documentation using Python's built-in "help()" function.
 """
 
+    # The attributes that the property methods use most
+    __slots__ = ('_x', '_y', '_mw', '_bs', '_pref_pa', '_Tlim', '_Tseg', 
+            '_Ctab', '_invtab')
+
+
     def __init__(self,*arg,**kwarg):
         # Call the basedata class
         super(igmix,self).__init__(*arg,**kwarg)
@@ -82,6 +87,9 @@ documentation using Python's built-in "help()" function.
         self._pref_pa = 0.
         # Initialize temperature limits
         self._Tlim = [float('-inf'), float('inf')]
+        # Initialize the merged mixture polynomial (see _coef_compile)
+        self._Tseg = None
+        self._Ctab = None
         
         
     def _bootstrap(self):
@@ -100,6 +108,9 @@ _mw         Effective mean molecular mass (weight) in kg/kmol
 _pref_bar   Effective log-mean reference pressure in bar
 _Tlim       Lower and upper temperature limits of the most restrictive
             constintuent gas data in Kelvin
+_Tseg       The temperature segments of the merged mixture polynomial
+_Ctab       The coefficients of the merged mixture polynomial (see
+            _coef_compile)
 """
         if self._bs:
             return
@@ -166,7 +177,63 @@ _Tlim       Lower and upper temperature limits of the most restrictive
             self._x[ss] /= total_x
             self._y[ss] /= total_y
             
+        # Merge the constituent polynomials into one
+        self._Tseg, self._Ctab = self._coef_compile()
+        # The inverse tables are built by _Tinv() when they are needed
+        self._invtab = {}
+
+        
+
+
+    def _coef_compile(self):
+        """Merge the constituent polynomials into one (primative routine)
+    Tseg, Ctab = _coef_compile()
+
+The specific heats of both the ig (Shomate) and ig2 (NASA) species are 
+linear in their coefficients, so the mole-weighted sum of the 
+constituents' fits is a single piece-wise polynomial.  Its segments, 
+Tseg, are the union of the constituents' Tlim values inside of the 
+mixture's _Tlim.  Each column of Ctab holds the coefficients of one 
+segment in the form returned by the constituents' _tpoly() methods.
+
+Like the constituents' entropy, s is evaluated at each constituent's 
+reference pressure; the mixture's log-mean reference pressure, _pref_pa,
+accounts for the difference.
+
+This is called by _bootstrap(), and the results are stored in the _Tseg
+and _Ctab attributes.
+"""
+        Tmin,Tmax = self._Tlim
+        Tseg = [Tmin, Tmax]
+        for ss in self._x:
+            Tseg += [T for T in pm.dat.data[ss].data['Tlim'] 
+                    if Tmin < T < Tmax]
+        Tseg = np.unique(Tseg)
+        Tmid = 0.5*(Tseg[:-1] + Tseg[1:])
+        
+        Ctab = np.zeros((8, Tmid.size), dtype=float)
+        for ss,x in self._x.items():
+            spec_Tseg, spec_P = pm.dat.data[ss]._tpoly()
+            index = np.searchsorted(spec_Tseg[1:-1], Tmid, side='right')
+            Ctab += x * spec_P[:,index]
+        return Tseg, Ctab
         
+        
+    def _coef(self, T):
+        """Gather the coefficients for each temperature (primative routine)
+    C,I = _coef(T)
+
+I selects the temperatures that are in-bounds, and C[k] is the k-th 
+coefficient of the merged mixture polynomial (see _coef_compile) for 
+each of the temperatures, T[I].  When all temperatures are in-bounds, I
+is Ellipsis, so T[I] is T itself.
+"""
+        Tseg = self._Tseg
+        I = np.logical_and(T >= Tseg[0], T <= Tseg[-1])
+        if I.all():
+            I = Ellipsis
+        index = np.searchsorted(Tseg[1:-1], T[I], side='right')
+        return self._Ctab[:,index], I
 
 
     def _argparse(self, *varg, **kwarg):
@@ -297,14 +364,13 @@ _argparse decides which to populate based on what is most efficient.
         if 'T' in kwarg:
             kwarg['T'] = pm.units.temperature_scale(kwarg['T'], to_units='K')
         if 'p' in kwarg:
-            kwarg['p'] = pm.units.pressure(kwarg['p'], to_units='Pa')
+            kwarg['p'] = np.divide(kwarg['p'], pm.units.plan(pressure='Pa'))
         if 'd' in kwarg:
-            value = pm.units.volume(kwarg['d'], to_units='m3', exponent=-1)
-            kwarg['d'] = pm.units.matter(value, self._mw, to_units='kmol')
+            kwarg['d'] = np.divide(kwarg['d'], pm.units.plan(self._mw, volume=('m3',-1), matter='kmol'))
         if 'v' in kwarg:
             # Convert and replace with d at the same time
-            value = pm.units.volume(kwarg['v'], to_units='m3')
-            kwarg['d'] = 1./pm.units.matter(value, self._mw, to_units='kmol', exponent=-1)
+            kwarg['d'] = np.divide(pm.units.plan(self._mw, volume='m3', matter=('kmol',-1)),
+                    np.asarray(kwarg['v'], dtype=float))
             args.add('d')
             basic_args.add('d')
             del kwarg['v']
@@ -312,19 +378,15 @@ _argparse decides which to populate based on what is most efficient.
             basic_args.remove('v')
         if 'h' in kwarg:
             value = kwarg['h']
-            value = pm.units.energy(value, to_units='kJ')
-            value = pm.units.matter(value, self._mw, to_units='kmol', exponent=-1)
+            value = np.divide(value, pm.units.plan(self._mw, energy='kJ', matter=('kmol',-1)))
             kwarg['h'] = value
         if 'e'  in kwarg:
             value = kwarg['e']
-            value = pm.units.energy(value, to_units='kJ')
-            value = pm.units.matter(value, self._mw, to_units='kmol', exponent=-1)
+            value = np.divide(value, pm.units.plan(self._mw, energy='kJ', matter=('kmol',-1)))
             kwarg['e'] = value
         if 's' in kwarg:
             value = kwarg['s']
-            value = pm.units.energy(value, to_units='kJ')
-            value = pm.units.matter(value, self._mw, to_units='kmol', exponent=-1)
-            value = pm.units.temperature(value, to_units='K', exponent=-1)
+            value = np.divide(value, pm.units.plan(self._mw, energy='kJ', matter=('kmol',-1), temperature=('K',-1)))
             kwarg['s'] = value
 
         # Convert R into J/kmol/K - use this for p = dRT
@@ -338,7 +400,6 @@ _argparse decides which to populate based on what is most efficient.
         if inverse_args:
             # There can only be one, see rule 2.3
             invp = inverse_args.pop()
-            invfn = inverse_methods[invp]
             
             # what else do we have?
             # There can only be one, see rule 2.1
@@ -348,22 +409,21 @@ _argparse decides which to populate based on what is most efficient.
             if basp == 'd':
                 y,d = np.broadcast_arrays(kwarg[invp], kwarg[basp])
                 p = None
-                T = np.full_like(y, 0.5*(self._Tlim[0] + self._Tlim[-1]))
-                I = np.ones_like(y,dtype=bool)
                 # density and entropy are specified, special iteration is required
                 if invp == 's':
+                    T = np.full_like(y, 0.5*(self._Tlim[0] + self._Tlim[-1]))
+                    I = np.ones_like(y,dtype=bool)
                     self._iter1(self._sditer, 'T', y, T, I, self._Tlim[0], self._Tlim[1], param={'d':d})
+                # Enthalpy and energy are only functions of temperature
                 else:
-                    self._iter1(invfn, 'T', y, T, I, self._Tlim[0], self._Tlim[1])
+                    T = self._Tinv(invp, y)
             # If pressure is specified
             elif basp == 'p':
                 y,p = np.broadcast_arrays(kwarg[invp], kwarg[basp])
                 # If the property is entropy, adjust it for pressure
                 if invp == 's':
                     y = y + pm.units.const_Ru * np.log(p / self._pref_pa)
-                T = np.full_like(y, 0.5*(self._Tlim[0] + self._Tlim[-1]))
-                I = np.ones_like(y,dtype=bool)
-                self._iter1(invfn, 'T', y, T, I, self._Tlim[0], self._Tlim[-1])
+                T = self._Tinv(invp, y)
             # If temperature is specified
             elif basp == 'T':
                 y, T = np.broadcast_arrays(kwarg[invp], kwarg[basp])
@@ -421,6 +481,101 @@ _argparse decides which to populate based on what is most efficient.
         return T,p,d
 
     
+    def _inv_compile(self, prop, tol=1e-6, N=8, Nmax=20):
+        """Build a table for calculating temperature from a property
+    tab = _inv_compile(prop, tol=1e-6, N=8, Nmax=20)
+
+prop is 'h', 'e', or 's'.  The table is a piece-wise cubic Hermite
+interpolant of temperature in terms of the property.  It begins with N
+intervals in each of the temperature segments, and intervals are halved
+until the temperature error at their quarter points is less than tol
+times the temperature (or until they have been halved Nmax times).  
+The table is a tuple of arrays with the property, the temperature, and
+the derivative of temperature with respect to the property at the lower
+(a) and upper (b) end of each interval;
+    (Ya, Ta, Da, Yb, Tb, Db)
+Both ends of an interval are evaluated in its own segment, so the table
+is exact at the nodes even where the property is not continuous between
+segments.  See _Tinv().
+"""
+        fn = getattr(self, '_' + prop)
+        Tseg = self._Tseg
+        T = np.concatenate([np.linspace(Tseg[ii], Tseg[ii+1], N+1)[:-1] 
+                for ii in range(len(Tseg)-1)] + [Tseg[-1:]])
+        Ta = T[:-1]
+        Tb = T[1:]
+        frac = np.array([[0.25], [0.5], [0.75]])
+        for count in range(Nmax+1):
+            Ya,Da = fn(Ta, diff=True)[:2]
+            # Step off of the upper node into the interval's segment
+            Yb,Db = fn(np.append(np.nextafter(Tb[:-1], Ta[:-1]), Tb[-1]), 
+                    diff=True)[:2]
+            Da = 1./Da
+            Db = 1./Db
+            if count == Nmax:
+                break
+            # Test the interpolant at the quarter points
+            y = Ya + frac*(Yb - Ya)
+            t = frac
+            hy = Yb - Ya
+            Tt = (1.+2.*t)*(1.-t)*(1.-t)*Ta + t*(1.-t)*(1.-t)*hy*Da + \
+                    t*t*(3.-2.*t)*Tb + t*t*(t-1.)*hy*Db
+            yy,yyT = fn(Tt.reshape(-1), diff=True)[:2]
+            error = np.abs((yy.reshape(Tt.shape) - y) / yyT.reshape(Tt.shape))
+            I = (error > tol*Tt).any(axis=0)
+            if not I.any():
+                break
+            Tm = 0.5*(Ta + Tb)
+            Ta,Tb = np.concatenate((Ta, Tm[I])), \
+                    np.concatenate((np.where(I, Tm, Tb), Tb[I]))
+            index = np.argsort(Ta)
+            Ta = Ta[index]
+            Tb = Tb[index]
+        return Ya, Ta, Da, Yb, Tb, Db
+
+
+    def _Tinv(self, prop, y):
+        """Calculate temperature from enthalpy, energy, or entropy
+    T = _Tinv(prop, y)
+
+prop is 'h', 'e', or 's', and y is an array of the property in the 
+units of the corresponding inner routine (entropy is at the reference
+pressure).  The temperature is interpolated from a table that is built
+by _inv_compile() the first time it is needed, and it is refined by a 
+single Newton step.  Values of y beyond the limits are extrapolated 
+linearly, so they return temperatures that are out of bounds.
+"""
+        tab = self._invtab.get(prop)
+        if tab is None:
+            tab = self._inv_compile(prop)
+            self._invtab[prop] = tab
+        Ya,Ta,Da,Yb,Tb,Db = tab
+        y = np.asarray(y, dtype=float)
+        shape = y.shape
+        y = y.reshape(-1)
+        ii = np.searchsorted(Ya[1:], y, side='right')
+        hy = Yb[ii] - Ya[ii]
+        t = np.clip((y - Ya[ii]) / hy, 0., 1.)
+        hy *= (1.-t)*t
+        T = (1.+2.*t)*(1.-t)*(1.-t)*Ta[ii] + (1.-t)*hy*Da[ii] + \
+                t*t*(3.-2.*t)*Tb[ii] - t*hy*Db[ii]
+        Iin = np.logical_and(y >= Ya[0], y <= Yb[-1])
+        if not Iin.all():
+            T = np.where(y < Ya[0], Ta[0] + (y - Ya[0])*Da[0], T)
+            T = np.where(y > Yb[-1], Tb[-1] + (y - Yb[-1])*Db[-1], T)
+            # Allow for round-off in values calculated at the limits
+            Iin = np.logical_and(T >= Ta[0]*(1.-1e-9), T <= Tb[-1]*(1.+1e-9))
+        # One Newton step
+        probe = pm.stats.probe(self, '_Tinv', getattr(self, '_' + prop), None, y.size)
+        Tin = np.clip(T[Iin], Ta[0], Tb[-1])
+        yy,yyT = getattr(self, '_' + prop)(Tin, diff=True)[:2]
+        T[Iin] = np.clip(Tin + (y[Iin] - yy) / yyT, Ta[0], Tb[-1])
+        if probe:
+            probe.eval(yy.size)
+            probe.done(1)
+        return T.reshape(shape)
+
+
     def _iter1(self, fn, prop, y, x, Ids, xmin, xmax,
                 ep=1e-6, Nmax=20, fx_index=1, verbose=False,
                 param={}):
@@ -460,59 +615,87 @@ param       A dicitonary of keyword arguments are passed directly to the
             inner routine being inverted.
 
 """
-        # As the iteration progresses, the number of True elements in 
-        # Ids will decrease until they are all false
-        # There are some important intermediate values that will also
-        # require indexable arrays
-        dx = np.zeros_like(y, dtype=float)
-        error = np.zeros_like(dx, dtype=float)
-        IooB = np.zeros_like(Ids, dtype=bool)
-
+        # The points under iteration are compacted into contiguous 
+        # arrays.  As points converge, they are written back to x and 
+        # removed from the working arrays, so each iteration only 
+        # indexes the points that remain.  I holds their flat indices.
+        # xf and If are flat views of x and Ids (or flat iterators if
+        # they are not contiguous) for scattering the results.
+        I = np.flatnonzero(Ids)
+        xf = x.reshape(-1) if x.flags.c_contiguous else x.flat
+        If = Ids.reshape(-1) if Ids.flags.c_contiguous else Ids.flat
+        xx = xf[I]
+        yt = np.broadcast_to(y, Ids.shape).reshape(-1)[I]
+        xa = np.broadcast_to(xmin, Ids.shape).reshape(-1)[I]
+        xb = np.broadcast_to(xmax, Ids.shape).reshape(-1)[I]
         arg = param.copy()
+        for k,v in param.items():
+            # For any array arguments, compact them along with x
+            if isinstance(v,np.ndarray):
+                arg[k] = np.broadcast_to(v, Ids.shape).reshape(-1)[I]
+        # Solver statistics are only recorded when a collector is active
+        probe = pm.stats.probe(self, '_iter1', fn, param, I.size)
         count = 0
-        while Ids.any():
-            # Build the new argument list
-            for k,v in param.items():
-                # For any array arguments, shrink them along with Ids
-                if isinstance(v,np.ndarray):
-                    arg[k] = v[Ids]
-            # Shrink the primary property array
-            arg[prop] = x[Ids]
+
+        if verbose:
+            print('x, yy, yyx, dx, I')
+        while I.size:
             # Evaluate the funciton and isolate its derivative
+            arg[prop] = xx
             FF = fn( diff=True, **arg)
             yy = FF[0]
             yyx = FF[fx_index]
-            # note that x[Ids], yy, yyx, and all the other floating 
-            # intermediates are now in m-space; the sub-set of values
-            # still under iteration.
+            if probe:
+                probe.eval(xx.size)
             # Calculate the error, the linear change in x, and the new x
-            error[Ids] = y[Ids] - yy
-            dx[Ids] = error[Ids] / yyx
+            error = yt - yy
+            dx = error / yyx
             if verbose:
-                print(x, yy, yyx, dx, Ids)
-            x[Ids] += dx[Ids]
+                print(xx, yy, yyx, dx, I)
+            xx = xx + dx
             # An out-of-bounds index
-            IooB = np.logical_or( x < xmin, x > xmax)
+            IooB = np.logical_or( xx < xa, xx > xb)
             count_oob = 0
             while IooB.any():
                 dx[IooB] /= 2.
-                x[IooB] -= dx[IooB]
-                IooB = np.logical_or( x < xmin, x > xmax)
+                xx[IooB] -= dx[IooB]
+                IooB = np.logical_or( xx < xa, xx > xb)
                 # Prevent a while-loop-trap
                 count_oob += 1
                 if count_oob>Nmax:
+                    xf[I] = xx
+                    if probe:
+                        probe.done(count+1, I.size)
                     raise pm.utility.PMAnalysisError(
                         'iter1_() failed to produce a guess that was in-bounds')
             
             # Check the iteration convergence
-            Ids[Ids] = abs(error[Ids]) > abs(ep*y[Ids])
+            Iwork = abs(error) > abs(ep*yt)
+            if not Iwork.all():
+                # Scatter the converged points and compact the rest
+                Idone = np.logical_not(Iwork)
+                xf[I[Idone]] = xx[Idone]
+                If[I[Idone]] = False
+                I = I[Iwork]
+                xx = xx[Iwork]
+                yt = yt[Iwork]
+                xa = xa[Iwork]
+                xb = xb[Iwork]
+                for k,v in param.items():
+                    if isinstance(v,np.ndarray):
+                        arg[k] = arg[k][Iwork]
             # Prevent a while-loop-trap
             count += 1
-            if count>Nmax:                
+            if count>Nmax:
+                xf[I] = xx
                 pm.utility.print_warning(\
                     'iter1_() failed to converge for %d elements after %d attempts'%(\
-                    Ids.sum(), Nmax))
+                    I.size, Nmax))
+                if probe:
+                    probe.done(count, I.size)
                 return
+        if probe:
+            probe.done(count)
 
     def _sditer(self, T, d, diff=1):
         s,sT = self._s(T, diff)
@@ -531,14 +714,12 @@ param       A dicitonary of keyword arguments are passed directly to the
 T must be a numpy array in Kelvin
 """
         # Initialize a result array
-        out = np.zeros_like(T,dtype=float)
+        out = np.full_like(T,pm.config['def_oob'],dtype=float)
         
-        # Calculate the property directly from the subordinate inner 
-        # routines.  They use molar units by default.
-        for ss,x in self._x.items():
-            # Retrieve the species
-            out += x * pm.dat.data[ss]._cp(T)
-            
+        # Evaluate the merged mixture polynomial.  It uses molar units.
+        C,I = self._coef(T)
+        t = T[I]
+        out[I] = C[0] + t*(C[1] + t*(C[2] + t*(C[3] + t*C[4]))) + C[5]/(t*t)
         return out
         
         
@@ -551,20 +732,20 @@ sT is the derivative of s0 with respect to temperature.
 T must be a numpy array in Kelvin.
 """
         # Initialize a result array
-        s0 = np.zeros_like(T,dtype=float)
+        s0 = np.full_like(T,pm.config['def_oob'],dtype=float)
         sT = None
         if diff:
-            sT = np.zeros_like(T,dtype=float)
+            sT = np.full_like(T,pm.config['def_oob'],dtype=float)
         
-        # Calculate the property directly from the subordinate inner 
-        # routines.  They use molar units by default.
-        for ss,x in self._x.items():
-            # Retrieve the species data
-            spec_s0,spec_sT = pm.dat.data[ss]._s(T, diff=diff)
-            
-            s0 += x * spec_s0
-            if diff:
-                sT += x * spec_sT
+        # Evaluate the merged mixture polynomial.  It uses molar units.
+        C,I = self._coef(T)
+        t = T[I]
+        t2 = t*t
+        s0[I] = C[7] + C[0]*np.log(t) - C[5]/(2*t2) + \
+                t*(C[1] + t*(C[2]/2. + t*(C[3]/3. + t*C[4]/4.)))
+        if diff:
+            sT[I] = C[0]/t + C[5]/(t2*t) + \
+                    C[1] + t*(C[2] + t*(C[3] + t*C[4]))
             
         return s0,sT
         
@@ -578,21 +759,18 @@ h is in kJ/kmol
 hT is in kJ/kmol/K
 """
         # Initialize a result array
-        h = np.zeros_like(T,dtype=float)
+        h = np.full_like(T,pm.config['def_oob'],dtype=float)
         hT = None
         if diff:
-            hT = np.zeros_like(T,dtype=float)
-        
+            hT = np.full_like(T,pm.config['def_oob'],dtype=float)
         
-        # Calculate the property directly from the subordinate inner 
-        # routines.  They use molar units by default.
-        for ss,x in self._x.items():
-            # Retrieve the species data
-            spec_h,spec_hT = pm.dat.data[ss]._h(T, diff=diff)
-            
-            h += x * spec_h
-            if diff:
-                hT += x * spec_hT
+        # Evaluate the merged mixture polynomial.  It uses molar units.
+        C,I = self._coef(T)
+        t = T[I]
+        h[I] = C[6] - C[5]/t + \
+                t*(C[0] + t*(C[1]/2. + t*(C[2]/3. + t*(C[3]/4. + t*C[4]/5.))))
+        if diff:
+            hT[I] = C[0] + t*(C[1] + t*(C[2] + t*(C[3] + t*C[4]))) + C[5]/(t*t)
             
         return h,hT
         
@@ -673,8 +851,7 @@ Returns     Density     [unit_matter / unit_volume]
         # Make sure we have both pressure and density
         if d is None:
             d = p / (1000 * Ru * T)
-        pm.units.matter(d, self._mw, from_units='kmol', inplace=True)
-        pm.units.volume(d, from_units='m3', inplace=True, exponent=-1)
+        np.multiply(d, pm.units.plan(self._mw, matter='kmol', volume=('m3',-1)), out=d)
         return d
 
     def v(self, *varg, **kwarg):
@@ -720,7 +897,7 @@ Returns     Pressure     [unit_pressure]
         T,p,d = self._argparse(*varg, **kwarg)
         if p is None:
             p = 1000 * d * Ru * T
-        pm.units.pressure(p, from_units='Pa', inplace=True)
+        np.multiply(p, pm.units.plan(pressure='Pa'), out=p)
         return p
         
         
@@ -752,7 +929,7 @@ Returns     Temperature  [unit_temperature]
     # Class property functions
     #
     
-    def state(self, *varg, **kwarg):
+    def state(self, *varg, props=None, **kwarg):
         """Calculate all properties at a state
     sd = state(...)
 
@@ -769,8 +946,23 @@ The properties are returned in a dictionary with keys:
     
 Like all of the other property functions, arguments may be any two of
 T, p, d, v, e, h, and s.  
+
+The optional props keyword limits the calculation to a sequence of the
+above keys.  The arguments are parsed (and inverted) only once, and 
+properties that are not requested are not calculated.
+    sd = state(..., props=('h','s','d'))
 """
         self._bootstrap()
+        allprops = ('T','p','d','v','e','h','s','cp','cv','gam')
+        if props is None:
+            props = allprops
+        elif isinstance(props, str):
+            props = (props,)
+        for prop in props:
+            if prop not in allprops:
+                raise pm.utility.PMParamError(
+                        'Unrecognized state property: ' + repr(prop))
+
         Ru = pm.units.const_Ru
         T,p,d = self._argparse(*varg, **kwarg)
         # Make sure we have both pressure and density
@@ -779,32 +971,45 @@ T, p, d, v, e, h, and s.
         elif p is None:
             p = 1000 * d * Ru * T
 
-        # Now entropy
-        s = self._s(T,False)[0] - Ru * np.log(p / self._pref_pa)
-
-        # Enthalpy and specific heat at once
-        h,cp = self._h(T,True)
-        cv = cp - Ru
-        gam = cp/cv
-        e = h - Ru*T
+        # Only calculate the properties that were requested
+        wants_h = 'h' in props or 'e' in props
+        wants_cp = 'cp' in props or 'cv' in props or 'gam' in props
+        if wants_h:
+            # Enthalpy and specific heat at once
+            h,cp = self._h(T,wants_cp)
+        elif wants_cp:
+            cp = self._cp(T)
         
         # Finally build the output
         out = {}
-        out['T'] = pm.units.temperature_scale(T, from_units='K')
-        out['p'] = pm.units.pressure(p, from_units='Pa')
-        scale = pm.units.matter(1., self._mw, from_units='kmol')
-        scale = pm.units.volume(scale, from_units='m3', exponent=-1)
-        out['d'] = scale * d
-        out['v'] = 1./out['d']
-        scale = pm.units.energy(1., from_units='kJ')
-        scale = pm.units.matter(scale, self._mw, from_units='kmol', exponent=-1)
-        out['h'] = h * scale
-        out['e'] = e * scale
-        out['gam'] = gam
-        scale = pm.units.temperature(scale, from_units='K', exponent=-1)
-        out['s'] = s * scale
-        out['cp'] = cp * scale
-        out['cv'] = cv * scale
+        for prop in props:
+            if prop == 'T':
+                out['T'] = pm.units.temperature_scale(T, from_units='K')
+            elif prop == 'p':
+                out['p'] = np.multiply(p, pm.units.plan(pressure='Pa'))
+            elif prop == 'd' or prop == 'v':
+                scale = pm.units.plan(self._mw, matter='kmol', volume=('m3',-1))
+                if prop == 'd':
+                    out['d'] = scale * d
+                else:
+                    out['v'] = 1. / (scale * d)
+            elif prop == 'gam':
+                out['gam'] = cp / (cp - Ru)
+            else:
+                scale = pm.units.plan(self._mw, energy='kJ', matter=('kmol',-1))
+                if prop == 'h':
+                    out['h'] = h * scale
+                elif prop == 'e':
+                    out['e'] = (h - Ru*T) * scale
+                else:
+                    scale *= pm.units.plan(temperature=('K',-1))
+                    if prop == 's':
+                        out['s'] = scale * \
+                                (self._s(T,False)[0] - Ru * np.log(p / self._pref_pa))
+                    elif prop == 'cp':
+                        out['cp'] = cp * scale
+                    else:
+                        out['cv'] = (cp - Ru) * scale
         return out
 
     
@@ -831,9 +1036,7 @@ Returns:    Spec. Heat  [unit_energy / unit_temperature / unit_matter]
         out = self._cp(T)
         
         # Convert output
-        pm.units.energy(out, from_units='kJ', inplace=True)
-        pm.units.matter(out, self._mw, from_units='kmol', inplace=True, exponent=-1)
-        pm.units.temperature(out, from_units='K', inplace=True, exponent=-1)
+        np.multiply(out, pm.units.plan(self._mw, energy='kJ', matter=('kmol',-1), temperature=('K',-1)), out=out)
         return out
 
 
@@ -860,9 +1063,7 @@ Returns:    Spec. Heat  [unit_energy / unit_temperature / unit_matter]
         out = self._cp(T) - pm.units.const_Ru
         
         # Convert output
-        pm.units.energy(out, from_units='kJ', inplace=True)
-        pm.units.matter(out, self._mw, from_units='kmol', inplace=True, exponent=-1)
-        pm.units.temperature(out, from_units='K', inplace=True, exponent=-1)
+        np.multiply(out, pm.units.plan(self._mw, energy='kJ', matter=('kmol',-1), temperature=('K',-1)), out=out)
         return out
 
 
@@ -885,12 +1086,9 @@ Returns:    Enthalpy    [unit_energy / unit_matter]
 """
         self._bootstrap()
         T,_,_ = self._argparse(*varg, **kwarg)
-        out = np.zeros_like(T,dtype=float)
-        for ss,x in self._x.items():
-            out += x*self._h(T)[0]
+        out = self._h(T)[0]
         
-        pm.units.energy(out, from_units='kJ', inplace=True)
-        pm.units.matter(out, self._mw, from_units='kmol', inplace=True, exponent=-1)
+        np.multiply(out, pm.units.plan(self._mw, energy='kJ', matter=('kmol',-1)), out=out)
         return out
         
 
@@ -913,13 +1111,9 @@ Returns:    Int. Energy [unit_energy / unit_matter]
 """
         self._bootstrap()
         T,_,_ = self._argparse(*varg, **kwarg)
-        out = np.zeros_like(T,dtype=float)
-        for ss,x in self._x.items():
-            out += x*self._h(T)[0]
-        out -= T * pm.units.const_Ru
+        out = self._e(T)[0]
         
-        pm.units.energy(out, from_units='kJ', inplace=True)
-        pm.units.matter(out, self._mw, from_units='kmol', inplace=True, exponent=-1)
+        np.multiply(out, pm.units.plan(self._mw, energy='kJ', matter=('kmol',-1)), out=out)
         return out
 
 
@@ -936,8 +1130,7 @@ Accepts:    -
 Returns:    Molecular mass [unit_mass / unit_molar]
 """
         self._bootstrap()
-        out = pm.units.mass(self._mw, from_units='kg')
-        out = pm.units.molar(out, from_units='kmol', exponent=-1)
+        out = np.multiply(self._mw, pm.units.plan(mass='kg', molar=('kmol',-1)))
         return out
 
 
@@ -949,10 +1142,7 @@ Ignores the arguments are returns the gas constant as
 unit_energy / unit_matter / unit_temperature
 """
         self._bootstrap()
-        R = pm.units.energy(pm.units.const_Ru, from_units='J')
-        R = pm.units.temperature(R, from_units='K', exponent=-1)
-        R = pm.units.matter(R, self._mw, from_units='mol',
-                                exponent=-1)
+        R = np.multiply(pm.units.const_Ru, pm.units.plan(self._mw, energy='J', temperature=('K',-1), matter=('mol',-1)))
         return R
 
 
@@ -978,9 +1168,7 @@ Returns:    Entropy     [unit_energy / unit_matter / unit_temperature]
         if p is None:
             p = 1000 * pm.units.const_Ru * d * T
         s = self._s(T)[0] - pm.units.const_Ru * np.log(p/self._pref_pa)
-        pm.units.energy(s, from_units='kJ', inplace=True)
-        pm.units.matter(s, self._mw, from_units='kmol', inplace=True, exponent=-1)
-        pm.units.temperature(s, from_units='K', inplace=True, exponent=-1)
+        np.multiply(s, pm.units.plan(self._mw, energy='kJ', matter=('kmol',-1), temperature=('K',-1)), out=s)
         return s
 
 
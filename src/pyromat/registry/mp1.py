@@ -43,8 +43,12 @@ of them.
 
 Most property pairs are supported, but several are not.  For example, e,
 s, and h must be specified with a "basic" property; T, d, p, v, or x.  
-This limitation is to prevent the costly numerical iteration that occurs
-when two "higher" properties need to be simultaneously inverted.  
+The exceptions are enthalpy or internal energy with entropy,
+    T(h=2800., s=6.5)
+    state(e=2500., s=7.)
+These require a two-dimensional iteration on temperature and density, so
+they are more costly than the other pairs.  Other combinations of e, h,
+and s are not permitted.
 
 Furthermore, since it is impossible to specify a saturated mixture with
 temperature and pressure alone, there is a special case, which permits 
@@ -250,8 +254,39 @@ id              What substance is this?
 doc             Where did it come from?
 class           What class should be used to evaluate the data?
 """
-    
-    
+
+    # The attributes that the property methods use most
+    __slots__ = ('_AOcoef0', '_AOcoef1', '_ARc', '_PScoef', '_DSLcoef', 
+            '_DSVcoef', '_TStab', '_DTPtab', '_FLtab', '_FLsat')
+
+
+    def __init__(self,*arg,**kwarg):
+        super(mp1,self).__init__(*arg,**kwarg)
+
+        # Compile the polynomial coefficient lists into numpy arrays once
+        # so the primative routines do not walk the nested lists on every
+        # call.  See _poly1_compile() and _poly2_compile().
+        self._AOcoef0 = self._poly1_compile(
+                self.data['AOgroup'].get('coef0', []))
+        self._AOcoef1 = np.array(
+                self.data['AOgroup'].get('coef1', []), 
+                dtype=float).reshape((-1,2)).T
+        self._ARc = self._ar_compile()
+        self._PScoef = self._poly1_compile(self.data['PSgroup']['coef'])
+        self._DSLcoef = self._poly1_compile(self.data['DSLgroup']['coef'])
+        self._DSVcoef = self._poly1_compile(self.data['DSVgroup']['coef'])
+        # The saturation temperature table is built by _Ts_compile() the 
+        # first time it is needed.
+        self._TStab = None
+        # The density grid used to warm-start _d() is built by 
+        # _d_compile() the first time it is needed.
+        self._DTPtab = None
+        # The tables used by _flash2() are built by _flash_compile() 
+        # the first time they are needed.
+        self._FLtab = None
+        self._FLsat = None
+
+
     def _test(self, tab, sattab, report=None, basic=False):
         """Test the MP1 class model
     _test(tab, sattab)     # Prints to stdout
@@ -571,14 +606,99 @@ Test criteria:
         return result
         
 
-    def _poly2(self,x,y,group,diff=2):    
+    def _poly2_compile(self, group):
+        """Compile a poly2 coefficient list (primative routine)
+    cgroup = _poly2_compile(group)
+
+Converts a nested poly2 coefficient list (see _poly2) into a list of
+tuples containing contiguous numpy arrays.  This is done once when the
+data are loaded so that _poly2() does not need to walk the nested list
+every time it is called.  Each tuple contains
+
+    (prex, prey, postx, posty, Ux, Uy,
+        I, J, Ix, Jy, Ixx, Jyy,
+        C, Cx, Cy, Cxx, Cxy, Cyy)
+
+Ux and Uy are arrays of the distinct integer powers of x and y needed
+by the polynomial and its derivatives.  I and J are arrays that index
+into Ux and Uy to find the exponents of each term, and C is the array 
+of coefficients.  The remaining arrays are the exponent indices and
+coefficients for the derivatives.  For example, the x-derivative of 
+    C * x**Ux[I] * y**Uy[J] 
+is
+    Cx * x**Ux[Ix] * y**Uy[J]
+where Cx = C*Ux[I] and Ux[Ix] = Ux[I]-1.  Exponents that would be 
+negative are clipped to zero, since their coefficients are already 
+zero.
+"""
+        cgroup = []
+        for coef in group:
+            prex,prey = coef[0]
+            postx,posty = coef[1]
+            terms = np.array(coef[2:], dtype=float).reshape((-1,3))
+            I = terms[:,0].astype(int)
+            J = terms[:,1].astype(int)
+            C = terms[:,2]
+            # Find the powers needed for the terms and their derivatives
+            Ux,Ix = np.unique(np.concatenate(
+                    (I, np.maximum(I-1,0), np.maximum(I-2,0))), 
+                    return_inverse=True)
+            Uy,Jy = np.unique(np.concatenate(
+                    (J, np.maximum(J-1,0), np.maximum(J-2,0))), 
+                    return_inverse=True)
+            Ix = Ix.reshape((3,-1))
+            Jy = Jy.reshape((3,-1))
+            cgroup.append((
+                    float(prex), float(prey), float(postx), float(posty),
+                    Ux.astype(float), Uy.astype(float),
+                    Ix[0], Jy[0], Ix[1], Jy[1], Ix[2], Jy[2],
+                    C, C*I, C*J, C*I*(I-1), C*I*J, C*J*(J-1)))
+        return cgroup
+
+
+    def _poly1_compile(self, group):
+        """Compile a poly1 coefficient list (primative routine)
+    cgroup = _poly1_compile(group)
+
+Converts a nested poly1 coefficient list (see _poly1) into a list of
+tuples containing contiguous numpy arrays.  This is done once when the
+data are loaded so that _poly1() does not need to walk the nested list
+every time it is called.  Each tuple contains
+
+    (pre, post, U, I, Ix, Ixx, C, Cx, Cxx)
+
+U is an array of the distinct integer powers of x needed by the 
+polynomial and its derivatives, I indexes into U to find the exponent
+of each term, and C is the array of coefficients.  The remaining arrays
+are the exponent indices and coefficients for the derivatives; see 
+_poly2_compile() for more information.
+"""
+        cgroup = []
+        for coef in group:
+            pre = coef[0]
+            post = coef[1]
+            terms = np.array(coef[2:], dtype=float).reshape((-1,2))
+            I = terms[:,0].astype(int)
+            C = terms[:,1]
+            U,Ix = np.unique(np.concatenate(
+                    (I, np.maximum(I-1,0), np.maximum(I-2,0))), 
+                    return_inverse=True)
+            Ix = Ix.reshape((3,-1))
+            cgroup.append((
+                    float(pre), float(post),
+                    U.astype(float), Ix[0], Ix[1], Ix[2],
+                    C, C*I, C*I*(I-1)))
+        return cgroup
+
+
+    def _poly2(self,x,y,group,diff=2):
         """Polynomial evaluation (primative routine)
-(p, px, py, pxx, pxy, pyy) = _poly(x,y,coef,diff=2)
+(p, px, py, pxx, pxy, pyy) = _poly(x,y,cgroup,diff=2)
 
 Evaluates a polynomial on x and y and its derivatives.
 x       x value
 y       y value
-param   coefficient list
+cgroup  compiled coefficient list (see _poly2_compile)
 diff    the highest order derivative to evaluate (0,1, or 2)
 
 Returns
@@ -600,28 +720,32 @@ A coefficient list might appear
 
 coef = [
     [
-        [prex, prey], 
+        [prex, prey],
         [postx, posty],
         [powxN, powyN, coefN],
         ...
         [powx0, powy0, coef0]
     ],
     [
-        [prex, prey], 
+        [prex, prey],
         [postx, posty],
         [powxN, powyN, coefN],
         ...
         [powx0, powy0, coef0]
     ]
 ]
-    
+
+The coefficient list is converted to arrays by _poly2_compile() when
+the data are loaded, and it is the compiled list that must be passed to
+_poly2().
+
 The pre-exponents are applied to the arguments to the polynomial, and
-the post-exponents are applied after the polynomial is evaluated, so 
+the post-exponents are applied after the polynomial is evaluated, so
 that the value returned is
     x**postx * y**posty * p(x**prex, y**prey)
 
 Starting with the third element (element 2) of the coefficient list,
-each element of coef is a three-element list defining a term in the 
+each element of coef is a three-element list defining a term in the
 polynomial; the x-exponent, the y-exponent, and the corresponding
 coefficient.  It must be sorted in descending order by the first column
 and then the second column.
@@ -632,7 +756,7 @@ corresponds to the polynomial
 p(x,y) = .5 + 1.2y + .2y**2 + 0.1xy
 
 Efficient polynomial evaluation algorithms are normally restricted to
-positive integer exponents, but many thermodynamic property models use 
+positive integer exponents, but many thermodynamic property models use
 much more interesting polynomials.  The pre- and post- exponents can be
 used to acheive a much wider range of functions.
 
@@ -645,8 +769,14 @@ The pre- and post- exponents make this equivalent to
     p(x,y) = x**(-1.5) (xx**10 + 1)
 which is equivalent to the original polynomial, except that the core of
 the evaluation algorithm only operates on positive integers.
+
+Instead of Horner's method, the distinct integer powers of x and y are 
+tabulated once, and all of the terms are summed in a single dot product
+with the coefficient array.  The derivatives re-use the same power 
+tables.  Because the terms are compiled, their order in the coefficient
+list no longer matters.
 """
-    
+
         g = 0.  # total group
         gx = 0.
         gy = 0.
@@ -654,19 +784,15 @@ the evaluation algorithm only operates on positive integers.
         gxy = 0.
         gyy = 0.
 
-        for coef in group:
-            # initialize the final polynomial and its derivatives
-            p = 0.  # total polynomial
+        for prex,prey,postx,posty,Ux,Uy,I,J,Ix,Jy,Ixx,Jyy,\
+                C,Cx,Cy,Cxx,Cxy,Cyy in group:
+            # initialize the final polynomial derivatives
             px = 0.
             py = 0.
             pxx = 0.
             pxy = 0.
             pyy = 0.
-            
-            # collect the pre- and post-exponentials
-            prex,prey = coef[0]
-            postx,posty = coef[1]
-            
+
             # Apply the pre-exponentials
             if prex!=1.:
                 x_0 = x**prex
@@ -682,7 +808,7 @@ the evaluation algorithm only operates on positive integers.
                 x_0 = x
                 x_1 = 1.
                 x_2 = 0.
-                
+
             if prey!=1.:
                 y_0 = y**prey
                 if diff>0:
@@ -698,69 +824,23 @@ the evaluation algorithm only operates on positive integers.
                 y_1 = 1.
                 y_2 = 0.
 
-            # From here, we loop over terms of the form a*(x**ii)*(y**jj)
-            # If a particular ii,jj combination is not found in the data, then
-            # its coefficient is treated as zero.
-            # What is the largest ii?
-            II = coef[2][0]
-            
-            # On which coefficient are we currently operating?
-            index = 2
-            # This is a flag that indicates the active index was used in 
-            # the last loop, so it needs to be incremented.
-            
-            for ii in range(II,-1,-1):
-                # If the current x-exponent is the same one represented in
-                # the active coefficient row, then calculate q.
-                if index<len(coef) and coef[index][0] == ii:
-                    # For this value of ii, what is the largest jj?
-                    JJ = coef[index][1]
-                    # q is a sub-polynomial on y that represents the 
-                    # variation on y of all terms that share the same
-                    # power in x.  This inner loop is much like the loop
-                    # on ii, except that it looks at both the x and y 
-                    # exponents.
-                    q = 0
-                    qy = 0
-                    qyy = 0
-                    for jj in range(JJ,-1,-1):
-                        if diff > 1:
-                            qyy = 2*qy + y_0*qyy
-                        if diff > 0:
-                            qy = q + y_0*qy
-                        # If the current y-exponent is represented in the 
-                        # active coefficient row, then fold it into the q
-                        # expansion.
-                        if index<len(coef) and coef[index][0] == ii and coef[index][1] == jj:
-                            q = coef[index][2] + y_0*q
-                            # increment the active index
-                            index += 1
-                        else:
-                            q *= y_0
-                        
-                    # Fold the current q values into the p expansion
-                    # Update the highest derivatives first since they depend
-                    # on the historical values of the lower derivatives
-                    if diff > 1:
-                        pyy = qyy + x_0 * pyy
-                        pxx = 2*px + x_0 * pxx
-                        pxy = py + x_0 * pxy
-                    if diff > 0:
-                        px = p + x_0 * px
-                        py = qy + x_0 * py
-                    p = q + x_0 * p
-                # If the current x exponent is not represented, execute a
-                # p-expansion with zero q.
-                else:
-                    if diff > 0:
-                        if diff > 1:
-                            pyy = x_0 * pyy
-                            pxx = 2*px + x_0 * pxx
-                            pxy = py + x_0 * pxy
-                        px = p + x_0 * px
-                        py = x_0 * py
-                    p = x_0 * p
-                    
+            # Tabulate the powers of x and y
+            X = np.asarray(x_0)[...,np.newaxis]**Ux
+            Y = np.asarray(y_0)[...,np.newaxis]**Uy
+            # Collect the powers used by each term
+            XI = X[...,I]
+            YJ = Y[...,J]
+            p = (XI*YJ) @ C
+            if diff>0:
+                XIx = X[...,Ix]
+                YJy = Y[...,Jy]
+                px = (XIx*YJ) @ Cx
+                py = (XI*YJy) @ Cy
+                if diff>1:
+                    pxx = (X[...,Ixx]*YJ) @ Cxx
+                    pxy = (XIx*YJy) @ Cxy
+                    pyy = (XI*Y[...,Jyy]) @ Cyy
+
             # Modify the derivatives for the pre-exponnetials
             if prex!=1.:
                 if diff>0:
@@ -770,7 +850,7 @@ the evaluation algorithm only operates on positive integers.
                         pxy = pxy*x_1*y_1
                     px *= x_1
                     py *= y_1
-                
+
             # Apply the post-exponentials
             if postx!=0:
                 f = x**postx
@@ -796,11 +876,11 @@ the evaluation algorithm only operates on positive integers.
                     py = py*f + p*fy
                     px = px*f
                 p *= f
-            
+
             # If the group has only one coefficient set, just return
             if len(group) == 1:
                 return p,px,py,pxx,pxy,pyy
-                
+
             g += p
             if diff>0:
                 gx += px
@@ -809,17 +889,17 @@ the evaluation algorithm only operates on positive integers.
                     gxx += pxx
                     gxy += pxy
                     gyy += pyy
-                    
+
         return g,gx,gy,gxx,gxy,gyy
 
 
-    def _poly1(self,x,group,diff=2):    
+    def _poly1(self,x,group,diff=2):
         """Polynomial evaluation (primative routine)
-(p, px, pxx) = _poly1(x,coef,diff=2)
+(p, px, pxx) = _poly1(x,cgroup,diff=2)
 
 Evaluates a polynomial on x and y and its derivatives.
 x       x value
-coef    coefficient list
+cgroup  compiled coefficient list (see _poly1_compile)
 diff    the highest order derivative to evaluate (0,1, or 2)
 
 Returns
@@ -838,24 +918,24 @@ an integer exponent and a coefficient: [power, coefficient] for each
 term.  They are contained in a list that represents groups of terms.
 The groups must be sorted by power from highest to lowest.
 
-Each group is lead by two elements that define a pre- and post- 
+Each group is lead by two elements that define a pre- and post-
 exponents.
     [pre, post, [powN, coefN], ... , [pow0, coef0]]
 
 This defines a polynomial of the form
     x**post * p(x**pre)
-    
+
 The powers must be integers, but no such restriciton exists on the pre-
 and post- exponents.  This permits efficient evaluaiton of polynomials
 with rational exponents.
 
 The highest level list contains a list of these groups, so that separate
-pre- and post- exponentials may be applied to certain terms of the 
+pre- and post- exponentials may be applied to certain terms of the
 polynomial.
 
 coef = [
     [
-        pre, 
+        pre,
         post,
         [
             [powN, coefN],
@@ -864,7 +944,7 @@ coef = [
         ]
     ],
     [
-        pre, 
+        pre,
         post,
         [
             [powN, coefN],
@@ -876,24 +956,24 @@ coef = [
 
 In a simple example, the polynomial,
     p(x) = 2*x**-1.5 - x**0.5
-    
+
 might be specified
 [[  0.5, -1.5, [0, 2.], [4, -1.]]]
+
+The coefficient list is converted to arrays by _poly1_compile() when
+the data are loaded, and it is the compiled list that must be passed to
+_poly1().  Because the terms are compiled, their order in the list no
+longer matters.
 """
         g = 0.
         gx = 0.
         gxx = 0.
-    
-        for coef in group:
-            # initialize the final polynomial and its derivatives
-            p = 0.  # total polynomial
+
+        for pre,post,U,I,Ix,Ixx,C,Cx,Cxx in group:
+            # initialize the final polynomial derivatives
             px = 0.
             pxx = 0.
 
-            # collect the pre- and post-exponentials
-            pre = coef[0]
-            post = coef[1]
-            
             # Apply the pre-exponentials
             if pre!=1.:
                 x_0 = x**pre
@@ -910,46 +990,21 @@ might be specified
                 x_1 = 1.
                 x_2 = 0.
 
-            # From here, we loop over terms of the form a*(x**ii)
-            # If a particular ii,jj combination is not found in the data, then
-            # its coefficient is treated as zero.
-            # What is the largest ii?
-            II = coef[2][0]
-            
-            # On which coefficient are we currently operating?
-            index = 2
-            # This is a flag that indicates the active index was used in 
-            # the last loop, so it needs to be incremented.
-            
-            for ii in range(II,-1,-1):
-                # If the current x-exponent is the same one represented in
-                # the active coefficient row, then calculate q.
-                if index<len(coef) and coef[index][0] == ii:
-                    # Fold the current coefficient into the p expansion
-                    # Update the highest derivatives first since they depend
-                    # on the historical values of the lower derivatives
-                    if diff>0:
-                        if diff > 1:
-                            pxx = 2*px + x_0 * pxx
-                        px = p + x_0 * px
-                    p = coef[index][1] + x_0 * p
-                    index += 1
-                # If the current x exponent is not represented, execute a
-                # p-expansion with zero q.
-                else:
-                    if diff > 0:
-                        if diff > 1:
-                            pxx = 2*px + x_0 * pxx
-                        px = p + x_0 * px
-                    p = x_0 * p
-                    
+            # Tabulate the powers of x and sum the terms
+            X = np.asarray(x_0)[...,np.newaxis]**U
+            p = X[...,I] @ C
+            if diff>0:
+                px = X[...,Ix] @ Cx
+                if diff>1:
+                    pxx = X[...,Ixx] @ Cxx
+
             # Modify the derivatives for the pre-exponnetials
             if pre!=1.:
                 if diff>0:
                     if diff>1:
                         pxx = pxx*x_1*x_1 + px*x_2
                     px *= x_1
-                
+
             # Apply the post-exponentials
             if post!=0:
                 f = x**post
@@ -969,10 +1024,10 @@ might be specified
                 gx += px
                 if diff>1:
                     gxx += pxx
-                    
+
         return g,gx,gxx
-    
-    
+
+
     def _iter1(self, fn, prop, y, x, Ids, xmin, xmax,
                 ep=1e-6, Nmax=20, fx_index=1, 
                 verbose=False, param={}):
@@ -1016,66 +1071,94 @@ param       A dicitonary of keyword arguments are passed directly to the
         # Ids will decrease until they are all false
         # There are some important intermediate values that will also
         # require indexable arrays
-        dx = np.zeros_like(y, dtype=float)
-        error = np.zeros_like(dx, dtype=float)
-        IooB = np.zeros_like(Ids, dtype=bool)
+        # The points under iteration are compacted into contiguous 
+        # arrays.  As points converge, they are written back to x and 
+        # removed from the working arrays, so each iteration only 
+        # indexes the points that remain.  I holds their flat indices.
+        # xf and If are flat views of x and Ids (or flat iterators if
+        # they are not contiguous) for scattering the results.
+        I = np.flatnonzero(Ids)
+        xf = x.reshape(-1) if x.flags.c_contiguous else x.flat
+        If = Ids.reshape(-1) if Ids.flags.c_contiguous else Ids.flat
+        xx = xf[I]
+        yt = np.broadcast_to(y, Ids.shape).reshape(-1)[I]
+        xa = np.broadcast_to(xmin, Ids.shape).reshape(-1)[I]
+        xb = np.broadcast_to(xmax, Ids.shape).reshape(-1)[I]
+        # Create an argument dictionary
+        arg = param.copy()
+        for k,v in param.items():
+            # For any array arguments, compact them along with x
+            if isinstance(v,np.ndarray):
+                arg[k] = np.broadcast_to(v, Ids.shape).reshape(-1)[I]
+        # Solver statistics are only recorded when a collector is active
+        probe = pm.stats.probe(self, '_iter1', fn, param, I.size)
 
         if verbose:
             print('Iterating on "' + prop + '"')
             print('Target values:')
-            print(y)
+            print(yt)
             print('Limits:')
-            print(xmin,xmax)
-            print('x', 'yvalue', 'dydx', 'dx', 'Ids')
-
+            print(xa,xb)
+            print('x', 'yvalue', 'dydx', 'dx', 'I')
 
-        # Create an argument dictionary
-        arg = param.copy()
         count = 0
-        while Ids.any():
-            # Build the new argument list
-            for k,v in param.items():
-                # For any array arguments, shrink them along with Ids
-                if isinstance(v,np.ndarray):
-                    arg[k] = v[Ids]
-            # Shrink the primary property array
-            arg[prop] = x[Ids]
+        while I.size:
             # Evaluate the funciton and isolate its derivative
+            arg[prop] = xx
             FF = fn( diff=1, **arg)
             yy = FF[0]
             yyx = FF[fx_index]
-            # note that x[Ids], yy, yyx, and all the other floating 
-            # intermediates are now in m-space; the sub-set of values
-            # still under iteration.
+            if probe:
+                probe.eval(xx.size)
             # Calculate the error, the linear change in x, and the new x
-            error[Ids] = y[Ids] - yy
-            dx[Ids] = error[Ids] / yyx
+            error = yt - yy
+            dx = error / yyx
             if verbose:
-                print(x, yy, yyx, dx, Ids)
-            x[Ids] += dx[Ids]
+                print(xx, yy, yyx, dx, I)
+            xx = xx + dx
             # An out-of-bounds index
-            #IooB = np.logical_or( x < xmin, x > xmax)
-            IooB[Ids] = np.logical_or( x[Ids] < xmin[Ids], x[Ids] > xmax[Ids])
+            IooB = np.logical_or( xx < xa, xx > xb)
             count_oob = 0
-            while IooB[Ids].any():
+            while IooB.any():
                 dx[IooB] /= 2.
-                x[IooB] -= dx[IooB]
-                IooB[Ids] = np.logical_or( x[Ids] < xmin[Ids], x[Ids] > xmax[Ids])
+                xx[IooB] -= dx[IooB]
+                IooB = np.logical_or( xx < xa, xx > xb)
                 # Prevent a while-loop-trap
                 count_oob += 1
                 if count_oob>Nmax:
+                    xf[I] = xx
+                    if probe:
+                        probe.done(count+1, I.size)
                     raise pm.utility.PMAnalysisError(
                         '_iter1() failed to produce a guess that was in-bounds')
             
             # Check the iteration convergence
-            Ids[Ids] = abs(error[Ids]) > abs(ep*y[Ids])
+            Iwork = abs(error) > abs(ep*yt)
+            if not Iwork.all():
+                # Scatter the converged points and compact the rest
+                Idone = np.logical_not(Iwork)
+                xf[I[Idone]] = xx[Idone]
+                If[I[Idone]] = False
+                I = I[Iwork]
+                xx = xx[Iwork]
+                yt = yt[Iwork]
+                xa = xa[Iwork]
+                xb = xb[Iwork]
+                for k,v in param.items():
+                    if isinstance(v,np.ndarray):
+                        arg[k] = arg[k][Iwork]
             # Prevent a while-loop-trap
             count += 1
-            if count>Nmax:                
+            if count>Nmax:
+                xf[I] = xx
                 pm.utility.print_warning(\
                     '_iter1() failed to converge for %d elements after %d attempts'%(\
-                    Ids.sum(), Nmax))
+                    I.size, Nmax))
+                if probe:
+                    probe.done(count, I.size)
                 return
+        if probe:
+            probe.done(count)
 
     
     def _hybrid1(self, fn, prop, y, x, Ids, xmin, xmax,
@@ -1147,27 +1230,24 @@ param       A dicitonary of keyword arguments are passed directly to the
         #================================#
         # Initialize intermediate arrays #
         #================================#
-        # Produce arrays of candidate guesses xa and xb are produced by 
-        # the Newton algorithm from xmin and xmax respectively.  
-        # xc is produced by bisection.
-        xa = np.zeros_like(x, dtype=float)
-        xb = np.zeros_like(x, dtype=float)
-        xc = np.zeros_like(x, dtype=float)
-        
+        # The points under iteration are compacted into contiguous 
+        # arrays.  As points converge, they are written back to x and 
+        # removed from the working arrays, so each iteration only 
+        # indexes the points that remain.  I holds their flat indices.
+        # xf and If are flat views of x and Ids (or flat iterators if
+        # they are not contiguous) for scattering the results.
+        I = np.flatnonzero(Ids)
+        xf = x.reshape(-1) if x.flags.c_contiguous else x.flat
+        If = Ids.reshape(-1) if Ids.flags.c_contiguous else Ids.flat
+        xx = xf[I]
+        yt = np.broadcast_to(y, Ids.shape).reshape(-1)[I]
         # Make local copies of xmax and xmin
-        xmax = np.array(xmax)
-        xmin = np.array(xmin)
-        
-        # The Iab, Ibc, and Ica indices are used to store comparsion
-        # truth values for sorting the candidate solutions, and Iwork
-        # is used to assign the values
-        Iab = np.zeros_like(Ids, dtype=bool)
-        Ibc = np.zeros_like(Ids, dtype=bool)
-        Ica = np.zeros_like(Ids, dtype=bool)
-        Iwork = np.zeros_like(Ids, dtype=bool)
-        Iaoob = np.zeros_like(Ids, dtype=bool) # Out-of-bounds arrays
-        Iboob = np.zeros_like(Ids, dtype=bool) # 
-        Iswap = np.zeros_like(Ids, dtype=bool) # which were swapped?
+        xmin = np.broadcast_to(xmin, Ids.shape).reshape(-1)[I]
+        xmax = np.broadcast_to(xmax, Ids.shape).reshape(-1)[I]
+        
+        # Solver statistics are only recorded when a collector is active
+        probe = pm.stats.probe(self, '_hybrid1', fn, param, I.size)
+        failed = 0
         
         if verbose:
             print("Fn: " + repr(fn.__name__))
@@ -1178,151 +1258,172 @@ param       A dicitonary of keyword arguments are passed directly to the
         
         # Build the argument list
         for k,v in param.items():
-            # For any array arguments, shrink them along with Ids
+            # For any array arguments, compact them along with x
             if isinstance(v,np.ndarray):
-                arg[k] = v[Ids]
+                arg[k] = np.broadcast_to(v, Ids.shape).reshape(-1)[I]
         # Now, we'll evalaute the funciton at the limits
         # Start at the minimum
-        arg[prop] = xmin[Ids]
+        arg[prop] = xmin
         FF = fn(diff=1, **arg)
         yy = FF[0]
         yyx = FF[fx_index]
+        if probe:
+            probe.eval(xmin.size)
         # Calculate the first candidate solution
-        xa[Ids] = xmin[Ids] + (y[Ids] - yy)/yyx
+        # Candidate guesses xa and xb are produced by the Newton 
+        # algorithm from xmin and xmax respectively.  xc is produced by 
+        # bisection.
+        xa = xmin + (yt - yy)/yyx
         # If f(xmin) > f(xmax) then the nominal slope of the curve is negative
         # That means that these boundaries will need to be updated in reverse
         # of the other boundaries.
-        Iswap[Ids] = yy >= y[Ids]
+        Iswap = yy >= yt
         
         # Now, evaluate at the maximum 
-        arg[prop] = xmax[Ids]
+        arg[prop] = xmax
         FF = fn(diff=1, **arg)
         yy = FF[0]
         yyx = FF[fx_index]
+        if probe:
+            probe.eval(xmax.size)
         # Calculate the second candidate solution
-        xb[Ids] = xmax[Ids] + (y[Ids] - yy)/yyx
+        xb = xmax + (yt - yy)/yyx
         
         # Verify that the limits bracket a solution
-        # Borrow the a out-of-bounds array to hold the result
         # This is adapted from jranalli's graceful NaN failure edit
-        Iaoob[Ids] = np.logical_not(np.logical_xor(Iswap[Ids], yy >= y[Ids]))  # Figure out which meet the condition
-        if Ids.any() and Iaoob[Ids].all():  # All points failed to bracket. Fail and raise Error.
+        Iaoob = np.logical_not(np.logical_xor(Iswap, yy >= yt))  # Figure out which meet the condition
+        if I.size and Iaoob.all():  # All points failed to bracket. Fail and raise Error.
             pm.utility.print_warning(
                 '_HYBRID1: Failure to bracket a solution. Check function '
                 'arguments to be sure they reference a valid state. This error '
                 'usually occurs if the properties are out-of-range.')
+            if probe:
+                probe.done(0, I.size)
             raise pm.utility.PMParamError(
                 '_HYBRID1: All of the target values appear to be out-of-bounds!')
-        elif Iaoob[Ids].any():  # Only some have failed to bracket
+        elif Iaoob.any():  # Only some have failed to bracket
             # Force the result to the out-of-bounds value
-            x[Iaoob] = pm.config['def_oob']
+            failed = Iaoob.sum()
+            xf[I[Iaoob]] = pm.config['def_oob']
             # Clear the corresponding downselect bits
-            Ids[Iaoob] = False
+            If[I[Iaoob]] = False
             pm.utility.print_warning(
                 '_HYBRID1: Failure to bracket a solution for input '
                 'element(s): {}. Values set to config[\'def_oob\']. Check function '
                 'arguments to be sure they reference a valid state. This error'
                 ' usually occurs if the properties are out-of-range.'
-                .format(np.flatnonzero(Iaoob)))
-            # Clear the out-of-bounds index we just used.
-            Iaoob[:] = False
-        # If none of the Iaoob values were True, there's no need to
-        # clear them
+                .format(I[Iaoob]))
+            # Remove them from the working arrays
+            Iwork = np.logical_not(Iaoob)
+            I = I[Iwork]
+            xx = xx[Iwork]
+            yt = yt[Iwork]
+            xmin = xmin[Iwork]
+            xmax = xmax[Iwork]
+            xa = xa[Iwork]
+            xb = xb[Iwork]
+            Iswap = Iswap[Iwork]
+            for k,v in param.items():
+                if isinstance(v,np.ndarray):
+                    arg[k] = arg[k][Iwork]
                 
         # Calculate the thrid candidate solution
-        xc[Ids] = 0.5*(xmin[Ids] + xmax[Ids])
+        xc = 0.5*(xmin + xmax)
         
         if verbose:
             print(" xmin  xmax  xa  xb  xc ")
         
         count = 0
-        while Ids.any():
+        while I.size:
             if count>Nmax:
-                pm.utility.print_warning(f'_HYBRID1: Failed to converge for {Ids.sum()} elements in {Nmax} iterations.')
+                xf[I] = xx
+                pm.utility.print_warning(f'_HYBRID1: Failed to converge for {I.size} elements in {Nmax} iterations.')
+                if probe:
+                    probe.done(count, failed + I.size)
                 return
             
             if verbose:
                 print(xmin, xmax, xa, xb, xc)
             
-            # Clean the worker indexes
-            Iab[:] = False
-            Ibc[:] = False
-            Ica[:] = False
-            Iwork[:] = False
-            
             # The last step has established three candidate solutions
             # Which should we select?  First, compare the three candidate
             # solutions to determine which is in the middle
-            Iab[Ids] = xa[Ids] < xb[Ids]
-            Ibc[Ids] = xb[Ids] < xc[Ids]
-            Ica[Ids] = xc[Ids] < xa[Ids]
+            Iab = xa < xb
+            Ibc = xb < xc
+            Ica = xc < xa
             
             # Now, assign all values for which xa is the next guess
-            Iwork[Ids] = Iab[Ids] == Ica[Ids]
-            x[Iwork] = xa[Iwork]
+            xx = np.where(Iab == Ica, xa, xx)
             # Now, assign all values for which xb is the next guess
-            Iwork[Ids] = Iab[Ids] == Ibc[Ids]
-            x[Iwork] = xb[Iwork]
+            xx = np.where(Iab == Ibc, xb, xx)
             # Now, assign all value for which xc is the next guess
-            Iwork[Ids] = Ibc[Ids] == Ica[Ids]
-            x[Iwork] = xc[Iwork]
+            xx = np.where(Ibc == Ica, xc, xx)
             # finally, deal with the xa and xb out-of-bounds case
             if paranoid:
                 # In paranoid mode, either xa and xb being out of bounds
                 # forces xc to be selected
-                Iwork[Ids] = np.logical_or(xa[Ids] < xmin[Ids], xa[Ids] > xmax[Ids])
-                x[Iwork] = xc[Iwork]
-                Iwork[Ids] = np.logical_or(xb[Ids] < xmin[Ids], xb[Ids] > xmax[Ids])
-                x[Iwork] = xc[Iwork]
+                Iwork = np.logical_or(
+                        np.logical_or(xa < xmin, xa > xmax),
+                        np.logical_or(xb < xmin, xb > xmax))
             else:
-                Iwork[Ids] = np.logical_or(x[Ids] < xmin[Ids], xa[Ids] > xmax[Ids])
-                x[Iwork] = xc[Iwork]
-                
-                        
-            # Build the new argument list
-            for k,v in param.items():
-                # For any array arguments, shrink them along with Ids
-                if isinstance(v,np.ndarray):
-                    arg[k] = v[Ids]
-            # Shrink the primary property array
-            arg[prop] = x[Ids]
+                Iwork = np.logical_or(xx < xmin, xa > xmax)
+            xx = np.where(Iwork, xc, xx)
+            
             # Evaluate the funciton and isolate its derivative
+            arg[prop] = xx
             FF = fn( diff=1, **arg)
             yy = FF[0]
             yyx = FF[fx_index]
+            if probe:
+                probe.eval(xx.size)
             
             # use xc as a temporary variable
             # First, calculate the size of the change in x
-            xc[Ids] = x[Ids] + (y[Ids] - yy) / yyx
+            xc = xx + (yt - yy) / yyx
             # x is now the next guess
             # xc is its next projected guess
             
             # Where is the guess?
             # Should it be stored in xmin?
             # xor with Iswap forces a swap when needed
-            Iwork[Ids] = np.logical_xor(yy <= y[Ids], Iswap[Ids])
-            xmin[Iwork] = x[Iwork]
-            xa[Iwork] = xc[Iwork]
-            # Test OOB
-            Iaoob[Iwork] = np.logical_or(xc[Iwork] <= xmin[Iwork], xc[Iwork] >= xmax[Iwork])
+            Iwork = np.logical_xor(yy <= yt, Iswap)
+            xmin = np.where(Iwork, xx, xmin)
+            xa = np.where(Iwork, xc, xa)
             # or in xmax
-            Iwork[Ids] = np.logical_not(Iwork[Ids])
-            xmax[Iwork] = x[Iwork]
-            xb[Iwork] = xc[Iwork]
-            Iboob[Iwork] = np.logical_or(xc[Iwork] <= xmin[Iwork], xc[Iwork] >= xmax[Iwork])            
+            xmax = np.where(Iwork, xmax, xx)
+            xb = np.where(Iwork, xb, xc)
             # Calculate the new bisection point
-            xc[Ids] = 0.5*(xmax[Ids] + xmin[Ids])
+            xc = 0.5*(xmax + xmin)
             
             # Check for convergence
             # if xmax-xmin is small OR
             # if the y error is small
-            Ids[Ids] = np.logical_and(\
-                    np.abs((xmax[Ids] - xmin[Ids])/x[Ids]) > ep,\
-                    np.abs((yy - y[Ids])/y[Ids]) > ep)
+            Iwork = np.logical_and(\
+                    np.abs((xmax - xmin)/xx) > ep,\
+                    np.abs((yy - yt)/yt) > ep)
+            if not Iwork.all():
+                # Scatter the converged points and compact the rest
+                Idone = np.logical_not(Iwork)
+                xf[I[Idone]] = xx[Idone]
+                If[I[Idone]] = False
+                I = I[Iwork]
+                xx = xx[Iwork]
+                yt = yt[Iwork]
+                xmin = xmin[Iwork]
+                xmax = xmax[Iwork]
+                xa = xa[Iwork]
+                xb = xb[Iwork]
+                xc = xc[Iwork]
+                Iswap = Iswap[Iwork]
+                for k,v in param.items():
+                    if isinstance(v,np.ndarray):
+                        arg[k] = arg[k][Iwork]
                         
             # Prevent a while-loop-trap
             count += 1
 
+        if probe:
+            probe.done(count, failed)
         if verbose:
             print(f"Converged for all elements in {count} iterations.")
 
@@ -1393,9 +1494,13 @@ Optional parameters (and their defaults) are:
             y[I],yt[I],yd[I] = fn(T[I],dsV[I],diff=diff)
             yy,yyt,yyd = fn(T[I],dsL[I],diff=diff)
             # Calculate the mixture properties and derivatives
+            # The saturation properties change with T along the 
+            # saturation densities, but they do not depend on the 
+            # mixture density.
             if diff:
-                yt[I] = x*yt[I] + xt*y[I] + (1-x)*yyt - xt*yy
-                yd[I] = x*yd[I] + xd*y[I] + (1-x)*yyd - xd*yy
+                yt[I] = x*(yt[I] + yd[I]*dsVt[I]) + (1-x)*(yyt + yyd*dsLt[I]) \
+                        + xt*(y[I] - yy)
+                yd[I] = xd*(y[I] - yy)
             y[I] = x*y[I] + (1-x)*yy
         # Now deal with points that are not under the dome.
         I = np.logical_not(I)
@@ -1545,7 +1650,7 @@ nondimensionalized, and the returned values are non-dimensionalzied.
         
         # Move on to the polynomial expansion
         if 'coef0' in self.data['AOgroup']:
-            p,pt,ptt = self._poly1(tt,self.data['AOgroup']['coef0'],diff)
+            p,pt,ptt = self._poly1(tt,self._AOcoef0,diff)
             A+=p
             if diff>0:
                 At += pt
@@ -1553,21 +1658,71 @@ nondimensionalized, and the returned values are non-dimensionalzied.
                     Att += ptt
         
         # Now the nested log/exp expansion
-        if 'coef1' in self.data['AOgroup']:
-            for theta,c in self.data['AOgroup']['coef1']:
-                e = np.exp(-theta*tt)
-                p = np.log(1-e)
-                A += c*p
-                if diff>0:
-                    pt = theta*e/(1.-e)
-                    At += c*pt
-                    if diff>1:
-                        ptt = -pt*(theta + pt)
-                        Att += c*ptt
+        # All of the terms are evaluated at once along a trailing axis
+        theta,c = self._AOcoef1
+        if c.size:
+            e = np.exp(-np.asarray(tt)[...,np.newaxis]*theta)
+            A += np.log(1-e) @ c
+            if diff>0:
+                pt = theta*e/(1.-e)
+                At += pt @ c
+                if diff>1:
+                    Att -= (pt*(theta + pt)) @ c
                         
         return A, At, Ad, Att, Atd, Add
 
 
+    def _ar_compile(self):
+        """Compile the residual helmholtz coefficients (primative routine)
+    arc = _ar_compile()
+
+Reads the ARgroup coefficients and returns a tuple of numpy arrays used
+by _ar() so that the nested coefficient lists are only traversed once
+when the data are loaded.
+
+    arc = (Ua, Ub, Uk, Ia, Ib, Ik, CC, coef1)
+
+The coef0 polynomials are expanded into individual terms of the form
+    c * tt**a * dd**b * exp(-dd**k)
+where a = postx + prex*i and b = posty + prey*j for each [i,j,c] term 
+in the coefficient list.  Ua, Ub, and Uk are arrays of the distinct 
+values of a, b, and k, and Ia, Ib, and Ik are integer arrays that 
+index into them for each term.  CC is an Nx6 array whose columns are
+the coefficients pre-multiplied by
+    1, a, a*(a-1), b, a*b, b*(b-1)
+so that all of the terms and their derivatives can be summed with a
+single matrix product.
+
+coef1 is the ARgroup coef1 table transposed so that each parameter is
+a row of the array.  If there is no coef1 table, its rows are empty.
+"""
+        ARgroup = self.data['ARgroup']
+        a = []
+        b = []
+        k = []
+        c = []
+        for kk,group in enumerate(ARgroup['coef0']):
+            for coef in group:
+                prex,prey = coef[0]
+                postx,posty = coef[1]
+                for ii,jj,cc in coef[2:]:
+                    a.append(postx + prex*ii)
+                    b.append(posty + prey*jj)
+                    k.append(kk)
+                    c.append(cc)
+        a = np.array(a, dtype=float)
+        b = np.array(b, dtype=float)
+        c = np.array(c, dtype=float)
+        Ua,Ia = np.unique(a, return_inverse=True)
+        Ub,Ib = np.unique(b, return_inverse=True)
+        Uk,Ik = np.unique(np.array(k, dtype=float), return_inverse=True)
+        CC = np.stack((c, c*a, c*a*(a-1.), c*b, c*a*b, c*b*(b-1.)), axis=1)
+        
+        coef1 = np.array(ARgroup.get('coef1', []), 
+                dtype=float).reshape((-1,7)).T
+        return Ua,Ub,Uk,Ia,Ib,Ik,CC,coef1
+
+
     def _ar(self, tt, dd, diff=2):
         """Dimensionless residual helmhotz free energy (primative routine)
 Each fit in the group is of the form
@@ -1575,89 +1730,83 @@ Each fit in the group is of the form
     
 when dd = d / dscale, tt = Tscale / T
     
-    A,Ad,At,Add,Adt,Att = _ar(tt, dd, order=2)
+    A,At,Ad,Att,Atd,Add = _ar(tt, dd, order=2)
 
 Returns the Helmholtz free energy and its derivatives up to diff.
 
+The polynomial and exponential (coef0) and the gaussian (coef1) terms
+are fused; they are evaluated together as arrays using the compiled 
+coefficients from _ar_compile().  The powers of tt and dd and the
+exponential terms, exp(-dd**k), are only calculated once and they are
+shared by all of the terms and their derivatives.
+
 This is a PRIMATIVE ROUTINE.  The arguments must already be 
 nondimensionalized, and the returned values are non-dimensionalzied.
 """
-        # Sparse polynomial evaluation is roughly 2x as fast as dense
-        # polynomial evaluation for the R134a polynomials.  The 
-        # explicitly defined algorithm is also roughly 2x as fast.  the
-        # p_d() algorithm for R134a evaluated in about 80us on a 4 core
-        # AMD A10-9700B R7
-
         ARgroup = self.data['ARgroup']
-
-        # First evaluate the polynomial without an exponential coefficient
-        A,At,Ad,Att,Atd,Add = self._poly2(tt,dd,ARgroup['coef0'][0],diff)
+        Ua,Ub,Uk,Ia,Ib,Ik,CC,coef1 = self._ARc
         
-        k=0
-        ddk = 1.
-        for term in ARgroup['coef0'][1:]:
-            p,pt,pd,ptt,ptd,pdd = self._poly2(tt, dd, term, diff)
-            
-            k += 1
-            ddk *= dd
-            e = np.exp(-ddk)
-            if diff>0:
-                # Calculate the derivative of exp(-dd**k) without
-                # the exponential; it will be multiplied through next.
-                ed = -k*ddk/dd
-
-                if diff>1:
-                    # Calculate the second derivative of exp(-dd**k) without
-                    # the exponential; it will be multiplied through next.
-                    edd = ed*((k-1.)/dd + ed)
-                    # Multiply the exponential into all the terms
-                    pdd = e*(p*edd + 2.*pd*ed + pdd)
-                    ptd = e*(ptd + pt*ed)
-                    ptt *= e
-                    
-                    Att += ptt
-                    Atd += ptd
-                    Add += pdd
-                    
-                pd = e*(p*ed + pd)
-                pt *= e
-                
-                At += pt
-                Ad += pd
-                
-            p *= e
-            
-            A += p
+        tt = np.asarray(tt)
+        dd = np.asarray(dd)
+        At = 0.
+        Ad = 0.
+        Att = 0.
+        Atd = 0.
+        Add = 0.
+        
+        # Tabulate the powers and exponentials shared by all terms
+        # Each has a trailing axis along the distinct exponent values
+        ttn = tt[...,np.newaxis]
+        ddn = dd[...,np.newaxis]
+        ddk = ddn**Uk
+        # The k=0 terms have no exponential
+        E = np.exp(np.where(Uk>0, -ddk, 0.))
+        T = (ttn**Ua)[...,Ia] * (ddn**Ub)[...,Ib] * E[...,Ik]
+        if diff>0:
+            # K1 is the derivative of dd**k
+            K1 = Uk*ddk/ddn
+            TK1 = T*K1[...,Ik]
+            if diff>1:
+                # K1**2 - (the second derivative of dd**k)
+                K2 = K1*(K1 - (Uk-1.)/ddn)
+                S = T @ CC
+                SK1 = TK1 @ CC[:,[0,1,3]]
+                A = S[...,0]
+                At = S[...,1] / tt
+                Ad = S[...,3] / dd - SK1[...,0]
+                Att = S[...,2] / (tt*tt)
+                Atd = (S[...,4] / dd - SK1[...,1]) / tt
+                Add = S[...,5] / (dd*dd) - 2.*SK1[...,2]/dd + \
+                        (T*K2[...,Ik]) @ CC[:,0]
+            else:
+                S = T @ CC[:,[0,1,3]]
+                A = S[...,0]
+                At = S[...,1] / tt
+                Ad = S[...,2] / dd - TK1 @ CC[:,0]
+        else:
+            A = T @ CC[:,0]
     
         # Evaluate AR1: c * dd**d * tt**t * exp(-a*(dd-ep)**2 - b*(tt-gam)**2)
-        if 'coef1' in ARgroup:
+        if coef1.size:
             #This is the original table order
             #for c,d,t,a,b,gam,ep in ARgroup['coef1']:
-            for t,d,b,a,gam,ep,c in ARgroup['coef1']:
-                ddm1 = dd-ep
-                ttm1 = tt-gam
-                e = np.exp(-a*ddm1**2 - b*ttm1**2)
-                p = c * dd**d * tt**t
-
-                if diff>0:
-                    pt = t*p/tt
-                    pd = d*p/dd
-                    et = -2*b*ttm1*e
-                    ed = -2*a*ddm1*e
-                    if diff>1:
-                        ptt = (t-1)*pt/tt
-                        pdd = (d-1)*pd/dd
-                        ptd = d*pt/dd
-                        ett = -2*b*(e + ttm1*et)
-                        edd = -2*a*(e + ddm1*ed)
-                        etd = -2*b*ttm1*ed
-                        
-                        Att += e*ptt + 2*et*pt + ett*p
-                        Atd += e*ptd + ed*pt + et*pd + etd*p
-                        Add += e*pdd + 2*ed*pd + edd*p
-                    At += e*pt + et*p
-                    Ad += e*pd + ed*p
-                A += e*p
+            t,d,b,a,gam,ep,c = coef1
+            ddm1 = ddn-ep
+            ttm1 = ttn-gam
+            p = ddn**d * ttn**t * np.exp(-a*ddm1**2 - b*ttm1**2)
+            A = A + p @ c
+            if diff>0:
+                # The log-derivatives of each term
+                Lt = t/ttn - 2.*b*ttm1
+                Ld = d/ddn - 2.*a*ddm1
+                pt = p*Lt
+                pd = p*Ld
+                At = At + pt @ c
+                Ad = Ad + pd @ c
+                if diff>1:
+                    Att = Att + (pt*Lt - p*(t/(ttn*ttn) + 2.*b)) @ c
+                    Atd = Atd + (pt*Ld) @ c
+                    Add = Add + (pd*Ld - p*(d/(ddn*ddn) + 2.*a)) @ c
         
         if 'coef2' in ARgroup:
             for a,b,m,AA,BB,CC,DD,c in ARgroup['coef2']:
@@ -1784,7 +1933,7 @@ nondimensionalized, and the returned values are non-dimensionalzied.
                             edd += temp*pd*pd 
                         else:
                             ett = ((b-1)*et*pt + b*e*ptt)/p
-                            etd = ((b-1)*et*pd + b*e*ptt)/p
+                            etd = ((b-1)*et*pd + b*e*ptd)/p
                             edd = ((b-1)*ed*pd + b*e*pdd)/p
                 
                 # p = c * dd * {[(1-tt) + A(dd-1)**m]**2 + B(dd-1)**2a}**b
@@ -1841,6 +1990,8 @@ fn is an integer indicating which property fit form to use
 3   exp(1/tt * poly(1-tt))
     coef is interpreted by poly1, the result is multiplied by 1/tt, and
     passed to np.exp()
+
+coef must be a compiled coefficient list (see _poly1_compile).
 """
         
         if fn == 0:
@@ -1882,7 +2033,7 @@ fn is an integer indicating which property fit form to use
         d,dt,dtt = self._satfit( 
                 T/Tscale,
                 self.data['DSVgroup']['fn'],
-                self.data['DSVgroup']['coef'],
+                self._DSVcoef,
                 diff)
         # Rescale 
         d *= dscale
@@ -1905,7 +2056,7 @@ fn is an integer indicating which property fit form to use
         d,dt,dtt = self._satfit( 
                 T/Tscale,
                 self.data['DSLgroup']['fn'],
-                self.data['DSLgroup']['coef'],
+                self._DSLcoef,
                 diff)
         # Rescale 
         d *= dscale
@@ -1930,7 +2081,7 @@ Presumes temperature is in Kelvin, reports pressure in Pa
         p,pt,ptt = self._satfit( 
                 T/Tscale,
                 self.data['PSgroup']['fn'],
-                self.data['PSgroup']['coef'],
+                self._PScoef,
                 diff)
         # Rescale 
         p *= pscale
@@ -1944,26 +2095,123 @@ Presumes temperature is in Kelvin, reports pressure in Pa
         
         
 
-    def _Ts(self,p):
-        """Saturated temperature from pressure (inner routine)"""
-        # Initialize the result array
-        T = np.ones_like(p, dtype=float) * \
-                0.5*(self.data['Tt'] + self.data['Tc'])
-        T,Tmin,Tmax = np.broadcast_arrays(T, self.data['Tt']*.99, self.data['Tc'])
+    def _Ts_compile(self, ep=1e-10, Nmax=24):
+        """Build the saturation temperature table (primative routine)
+    x, T, m, err = _Ts_compile(ep=1e-10, Nmax=24)
+
+The saturation temperature is tabulated as a piecewise cubic Hermite 
+spline in x = log(p) so that _Ts() can be evaluated without iteration.
+Knots are placed in temperature between 99% of the triple temperature
+(the lower limit used by the old iterative inversion) and the critical 
+temperature.  Because each knot is calculated from _ps() directly, no 
+inversion is needed to build the table;
+    x[k] = log(ps(T[k]))
+    m[k] = dT/dx = ps(T[k]) / ps_T(T[k])
+
+The table is refined by bisection until the error is less than ep*T at 
+the quarter, middle, and three-quarter points of every interval.  The 
+cubic error vanishes at the knots and is largest near the middle of
+each interval, so these points bound the error of the table.  The error
+is measured against _ps() itself;
+    dT = (log(ps(Tfit)) - x) * m
+and err is the largest fractional error |dT/T| found.  If the table has 
+not converged after Nmax refinements, a warning is printed.
+
+Returns a tuple with the knot arrays and the error bound.  It is also 
+stored in the _TStab attribute.
+"""
+        Tmin = 0.99 * self.data['Tt']
+        Tmax = self.data['Tc']
+        T = np.linspace(Tmin, Tmax, 17)
+        # Test locations in each interval
+        tt = np.array([0.25, 0.5, 0.75])
+        
+        count = 0
+        while True:
+            # The derivative of fractional exponents in the fit is not 
+            # defined at the critical point itself, so use its limit.
+            p = self._ps(T)[0]
+            pt = self._ps(np.minimum(T, Tmax*(1.-1e-9)),diff=1)[1]
+            x = np.log(p)
+            m = p / pt
+            # Evaluate the spline at the test points in every interval
+            h = np.diff(x)[:,np.newaxis]
+            Tfit = self._hermite(tt, T[:-1,np.newaxis], T[1:,np.newaxis], 
+                    m[:-1,np.newaxis]*h, m[1:,np.newaxis]*h)
+            p,pt,_ = self._ps(Tfit,diff=1)
+            error = np.abs((np.log(p) - (x[:-1,np.newaxis] + tt*h)) * p / pt / Tfit)
+            error = np.max(error, axis=1)
+            Irefine = error > ep
+            if not Irefine.any():
+                break
+            count += 1
+            if count > Nmax:
+                pm.utility.print_warning(
+                    '_Ts_compile() failed to converge for %d intervals after %d refinements'%(
+                    Irefine.sum(), Nmax))
+                break
+            # Bisect the intervals that failed
+            T = np.sort(np.concatenate((T, 0.5*(T[:-1][Irefine] + T[1:][Irefine]))))
         
+        self._TStab = (x, T, m, error.max())
+        return self._TStab
+
+
+    def _hermite(self, t, y0, y1, m0, m1):
+        """Evaluate a cubic Hermite interval (primative routine)
+    y = _hermite(t, y0, y1, m0, m1)
+
+t is the fractional position in the interval (0 to 1), y0 and y1 are the
+values at the start and end of the interval, and m0 and m1 are the 
+slopes at the start and end, already multiplied by the interval width.
+"""
+        t2 = t*t
+        t3 = t2*t
+        return (2*t3 - 3*t2 + 1)*y0 + (t3 - 2*t2 + t)*m0 + \
+                (3*t2 - 2*t3)*y1 + (t3 - t2)*m1
+
+
+    def _Ts(self,p, polish=False):
+        """Saturated temperature from pressure (inner routine)
+    Ts = _Ts(p, polish=False)
+
+Presumes pressure is in Pa, reports temperature in K
+
+The saturation temperature is interpolated from a table built by 
+_Ts_compile() the first time it is needed, so no iteration is required.
+The table's fractional error (_TStab[3]) is less than 1e-10.  When 
+polish is True, one Newton step on _ps() is applied to the result, 
+which brings it to the precision of the _ps() fit.
+
+Points outside of the triple and critical pressures are returned with
+T = (Tt + Tc)/2, and should be handled by the calling routine.
+"""
+        if self._TStab is None:
+            self._Ts_compile()
+        xk,Tk,mk,_ = self._TStab
+        
+        p = np.asarray(p, dtype=float)
+        # Initialize the result array
+        T = np.full(p.shape, 0.5*(self.data['Tt'] + self.data['Tc']))
         # Create a down-select array
         Ids = np.logical_and(
                 p >= self.data['pt'],
                 p <= self.data['pc'])
-        # Execute the iteration
-        self._iter1(
-                self._ps,           # Invert the saturation pressure
-                'T',                # Solve for temperature
-                p,                  # such that _ps(T) = p
-                T,                  # The initial T values
-                Ids,                # The down-select array
-                Tmin,               # Minimum at the triple temp.
-                Tmax)               # Maximum at the critical temp.
+        if not Ids.any():
+            return T
+        
+        # Clip pressures that are slightly beyond the range of the fit
+        x = np.clip(np.log(p[Ids]), xk[0], xk[-1])
+        k = np.clip(np.searchsorted(xk, x) - 1, 0, xk.size-2)
+        h = xk[k+1] - xk[k]
+        Ts = self._hermite((x - xk[k])/h, Tk[k], Tk[k+1], mk[k]*h, mk[k+1]*h)
+        if polish:
+            # Points at the critical temperature are not polished, since
+            # the derivative of the fit is not defined there.
+            Ipol = Ts < self.data['Tc']
+            ps,pst,_ = self._ps(Ts[Ipol],diff=1)
+            Ts[Ipol] += (p[Ids][Ipol] - ps) / pst
+        T[Ids] = Ts
         return T
 
         
@@ -1994,9 +2242,77 @@ sub-critical densities to be either purely liquid or vapor.
         return p,pt,pd
         
         
-    def _d(self,T,p,debug=False):
+    def _d_compile(self, NT=33, Np=33):
+        """Build the density warm-start grid (primative routine)
+    T0, dT, x0, dx, Z = _d_compile(NT=33, Np=33)
+
+The density is tabulated on a coarse grid that is uniform in T and in
+x = log(p) so that _d() can start its iteration from an interpolated 
+guess.  The grid spans Tlim in temperature and the triple pressure to
+the upper pressure limit.  Each node is calculated by _d() with 
+warm=False.  
+
+To keep the interpolation well behaved for both liquids and gases,
+the table stores the logarithm of the compressibility factor,
+    Z = log( d R T / p )
+so that ideal gas points are close to zero, and the guess may be 
+safely extrapolated to pressures below the triple pressure.
+
+Returns the grid origins, spacings, and the NT x Np array, Z.  They are 
+also stored in the _DTPtab attribute.
+"""
+        T = np.linspace(self.data['Tlim'][0], self.data['Tlim'][1], NT)
+        x = np.linspace(np.log(max(self.data['pt'], self.data['plim'][0])),
+                np.log(self.data['plim'][1]), Np)
+        T,x = np.meshgrid(T,x,indexing='ij')
+        p = np.exp(x)
+        d = self._d(T.ravel(), p.ravel(), warm=False).reshape(T.shape)
+        Z = np.log(d * self.data['R'] * T / p)
+        
+        self._DTPtab = (T[0,0], T[1,0]-T[0,0], x[0,0], x[0,1]-x[0,0], Z)
+        return self._DTPtab
+        
+        
+    def _d_guess(self, T, p):
+        """Interpolate a density guess from the warm-start grid (primative routine)
+    d = _d_guess(T, p)
+
+Presumes temperature in K and pressure in Pa, and returns density in 
+kg/m3.  The result is bilinear in T and log(p).  Points outside of the
+grid are clipped to its edges before they are interpolated.  Near the
+saturation curve, the guess may be poor, so it should only be used as
+a starting point for iteration.
+"""
+        if self._DTPtab is None:
+            self._d_compile()
+        T0,dT,x0,dx,Z = self._DTPtab
+        NT,Np = Z.shape
+        # Find the fractional grid indices; invalid (nan) values are
+        # sent to the first node.  Their guess will still be nan.
+        u = np.nan_to_num(np.clip((T - T0)/dT, 0., NT-1.))
+        v = np.nan_to_num(np.clip((np.log(p) - x0)/dx, 0., Np-1.))
+        i = np.minimum(u.astype(int), NT-2)
+        j = np.minimum(v.astype(int), Np-2)
+        u -= i
+        v -= j
+        z = (1.-u)*((1.-v)*Z[i,j] + v*Z[i,j+1]) + \
+                u*((1.-v)*Z[i+1,j] + v*Z[i+1,j+1])
+        return p * np.exp(z) / (self.data['R'] * T)
+        
+        
+    def _d(self,T,p,debug=False,warm=True,ep=1e-6,Nwarm=4):
         """Density iterator - calculate density from T,p (inner routine)
 T and p MUST be ndarrays
+
+    d = _d(T,p,debug=False,warm=True)
+
+When warm is True, each point starts with a guess interpolated from a
+coarse grid of densities (see _d_compile and _d_guess).  Up to Nwarm 
+Newton steps are taken from there.  A point that leaves its bracketing
+densities or that has not converged to a fractional pressure error of 
+ep is handed to the _hybrid1() iteration along with a bracket built 
+from the saturation and ideal gas bounds.  This is how all points are 
+treated when warm is False.
 """
         # Benchmarking shows that calls to _p() with fewer than 100
         # data points are all equivalently expensive; even when 
@@ -2044,30 +2360,433 @@ T and p MUST be ndarrays
             # Reduce the lower density by 1%
             da[Istate] *= 0.99
         
+        if warm:
+            # Start from the interpolated guess, forced into the bracket
+            d = np.clip(self._d_guess(T,p), da, db)
+            # Points that fail the Newton iteration are set aside in 
+            # Icold for the bracketed iteration below
+            Icold = np.zeros_like(I)
+            # Solver statistics are only recorded when a collector is 
+            # active.  Points handed to _hybrid1 count as nonconverged.
+            probe = pm.stats.probe(self, '_d', self._p, None, I.sum())
+            count = 0
+            while I.any() and count < Nwarm:
+                pp,_,pd = self._p(T[I], d[I], diff=1)
+                count += 1
+                if probe:
+                    probe.eval(pp.size)
+                # Each evaluation tightens the bracket
+                Iwork = pp < p[I]
+                da[I] = np.where(Iwork, np.maximum(da[I], d[I]), da[I])
+                db[I] = np.where(Iwork, db[I], np.minimum(db[I], d[I]))
+                # Remove the points that have converged.  Invalid (nan)
+                # points are left for _hybrid1 to report.
+                Iwork = np.logical_not(np.abs(pp - p[I]) <= ep*np.abs(p[I]))
+                I[I] = Iwork
+                if not Iwork.any():
+                    break
+                dd = d[I] + (p[I] - pp[Iwork]) / pd[Iwork]
+                # Points that leave the bracket are not moved
+                Iwork = np.logical_and(dd > da[I], dd < db[I])
+                d[I] = np.where(Iwork, dd, d[I])
+                Icold[I] = np.logical_not(Iwork)
+                I[I] = Iwork
+            # All points that have not converged are iterated cold
+            I = np.logical_or(I, Icold)
+            if probe:
+                probe.done(count, I.sum())
+            if not I.any():
+                return d
+            
         # Iteratively reduce da until all points are bracketed
-        Itest = self._p(T,da,0)[0] > p
+        Itest = I.copy()
+        Itest[I] = self._p(T[I],da[I],0)[0] > p[I]
         while Itest.any():
             da[Itest]/=2.
             Itest[Itest] = self._p(T[Itest], da[Itest],0)[0] > p[Itest]
         
         # perform the iteration
-        #self._iter1(
-        self._hybrid1(
-                self._p,
-                'd',
-                p,
-                d,
-                I,
-                da,
-                db,
-                Nmax=50,
-                fx_index = 2,
-                param={'T':T},
-                verbose=debug)
+        # If the warm start has already solved some of the points, it is
+        # not an error for all of the remaining points to be out-of-bounds
+        Iall = I.all()
+        try:
+            #self._iter1(
+            self._hybrid1(
+                    self._p,
+                    'd',
+                    p,
+                    d,
+                    I,
+                    da,
+                    db,
+                    Nmax=50,
+                    fx_index = 2,
+                    param={'T':T},
+                    verbose=debug)
+        except pm.utility.PMParamError:
+            if Iall:
+                raise
+            d[I] = pm.config['def_oob']
                 
         return d
         
         
+    def _txiter(self, T, x, fn, diff=1, debug=False):
+        """T,x iterator wrapper (primative routine)
+    _txiter(T, x, fn, diff=1, debug=False)
+
+This wrapper function evaluates a property inner routine for the
+saturated liquid-vapor mixture with temperature T and quality x.  It is
+intended to allow iteration on temperature and quality under the dome.
+
+_txiter accepts three required arguments:
+    T   Temperature numpy array in Kelvin
+    x   Quality numpy array
+    fn  Property inner routine to be evaluated (e.g. self._h or self._s)
+
+The property is calculated from the saturated liquid and vapor values,
+    y = yL + x (yV - yL)
+The quality is not limited to the range 0 to 1, so the result is 
+defined (if not meaningful) for points that are not under the dome.  
+Temperatures above the critical temperature are not permitted.
+
+Optional parameters (and their defaults) are:
+    debug (False)   
+    Has no effect.  It is included only to provide the same call signature as
+    _tpiter().
+    
+    diff (1)
+    When 0, returns no derivatives.  When 1, returns the first-order 
+    derivatives.
+
+Returns y, yT, yx
+"""
+        yT = None
+        yx = None
+        dsL,dsLt,_ = self._dsl(T,diff=diff)
+        dsV,dsVt,_ = self._dsv(T,diff=diff)
+        yL,yLt,yLd = fn(T,dsL,diff=diff)
+        yV,yVt,yVd = fn(T,dsV,diff=diff)
+        yx = yV - yL
+        y = yL + x*yx
+        if diff:
+            # Derivatives along the saturation densities
+            yLt += yLd*dsLt
+            yVt += yVd*dsVt
+            yT = yLt + x*(yVt - yLt)
+        return y, yT, yx
+        
+        
+    def _flash_compile(self, NT=65):
+        """Build the two-property flash starting tables (primative routine)
+    (T, d, e, h, s), (Ts, eL, eV, hL, hV, sL, sV) = _flash_compile(NT=65)
+
+Internal energy, enthalpy, and entropy are tabulated so that _flash2() 
+can find a starting point for its iteration.
+
+The first tuple holds single-phase nodes.  They are the T,p nodes of 
+the density warm-start grid (see _d_compile), which are spaced 
+uniformly in log(p) so that the compressed liquid is as well 
+represented as the gas.  Nodes with invalid properties are discarded.
+
+The second tuple holds the saturated liquid and vapor properties at NT
+temperatures from the triple point to just below the critical point.
+They are spaced quadratically so that they are closest together near 
+the critical point.
+
+They are also stored in the _FLtab and _FLsat attributes.  Some nodes
+lie so close to the critical point that _ar() warns of singular 
+derivatives.  Those warnings are suppressed while the tables are built
+because they say nothing about the state the user asked for.
+"""
+        with pm.config.context(warning_verbose=False):
+            if self._DTPtab is None:
+                self._d_compile()
+            T0,dT,x0,dx,Z = self._DTPtab
+            NT0,Np = Z.shape
+            T = T0 + dT*np.arange(NT0)
+            x = x0 + dx*np.arange(Np)
+            T,x = np.meshgrid(T,x,indexing='ij')
+            d = np.exp(x + Z) / (self.data['R'] * T)
+            T = T.ravel()
+            d = d.ravel()
+            e = self._e(T, d)[0]
+            h = self._h(T, d)[0]
+            s = self._s(T, d)[0]
+            I = np.isfinite(d + e + h + s)
+            self._FLtab = (T[I], d[I], e[I], h[I], s[I])
+        
+            # Cluster the saturation temperatures near the critical point
+            # where the properties change quickly
+            Ts = np.linspace(1., 0., NT)
+            Ts = self.data['Tc'] - (self.data['Tc'] - self.data['Tt'])*Ts*Ts
+            Ts[-1] = (1.-1e-4)*self.data['Tc']
+            dsL = self._dsl(Ts)[0]
+            dsV = self._dsv(Ts)[0]
+            self._FLsat = (Ts, 
+                    self._e(Ts,dsL)[0], self._e(Ts,dsV)[0],
+                    self._h(Ts,dsL)[0], self._h(Ts,dsV)[0],
+                    self._s(Ts,dsL)[0], self._s(Ts,dsV)[0])
+        return self._FLtab, self._FLsat
+        
+        
+    def _flash2(self, y, s, fn, debug=False, ep=1e-9, Nmax=40, Nchunk=4096):
+        """Calculate T,d from energy or enthalpy and entropy (inner routine)
+y and s MUST be ndarrays of the same shape
+    
+    T,d,x,I = _flash2(y, s, fn)
+    
+y is the internal energy or enthalpy (J/kg) and s is the entropy 
+(J/kg/K).  fn must be the corresponding inner routine (self._e or 
+self._h).  I is True for points that are under the dome, and x is 
+their quality.  Everywhere else, x is -1.  For points under the dome, d
+is the mixture density.
+
+The state is found by a two-dimensional Newton iteration using the
+analytical derivatives of the properties.  Single-phase points are 
+iterated in temperature and the logarithm of density, and saturated 
+points are iterated in temperature and quality (see _txiter).  The 
+residuals are scaled by R*Tc and R so that ep is a dimensionless 
+tolerance.  Steps are limited to 20% in T, a factor of e in density, 
+and 0.5 in quality.  A step that does not reduce the residual is 
+halved up to 8 times.  Temperature is limited to Tlim (or to the 
+saturation range), density to dlim, and quality to 0 to 1.  When one 
+variable is held on a limit, the other is found by least squares.
+
+Each point starts from the nearest single-phase node built by 
+_flash_compile(), or from the saturation temperature in its table with
+the quality that matches s and the smallest error in y, whichever is
+closer.  That determines which phase is tried first.  A saturated point that is pushed past the legal qualities or 
+whose residual cannot be reduced by its step, a point held on a limit 
+whose residual cannot be reduced, a single-phase solution with a density between the saturated liquid and
+vapor densities, or any other failure causes the point to be tried 
+again in the other phase.  Points that do not converge in either phase are 
+set to the def_oob value, and a warning is printed.
+
+Nchunk limits the number of points for which distances to the table 
+nodes are calculated at one time.
+"""
+        if self._FLtab is None:
+            self._flash_compile()
+        Tk,dk,ek,hk,sk = self._FLtab
+        Ts,eL,eV,hL,hV,sL,sV = self._FLsat
+        if fn == self._h:
+            yk,yL,yV = hk,hL,hV
+        else:
+            yk,yL,yV = ek,eL,eV
+        R = self.data['R']
+        Tc = self.data['Tc']
+        yscale = R*Tc
+        # Iteration limits on T and lnd or x
+        # Single-phase points are in row 0; saturated points in row 1
+        umin = np.array([self.data['Tlim'][0], self.data['Tt']])
+        umax = np.array([self.data['Tlim'][1], (1.-1e-9)*Tc])
+        vmin = np.array([np.log(1e-6 * dk.min()), 0.])
+        vmax = np.array([np.log(self.data['dlim'][1]), 1.])
+        dvmax = np.array([1., 0.5])
+        
+        y = y.reshape(-1)
+        s = s.reshape(-1)
+        T = np.full_like(y, pm.config['def_oob'], dtype=float)
+        d = np.full_like(y, pm.config['def_oob'], dtype=float)
+        x = -np.ones_like(y, dtype=float)
+        Isat = np.zeros_like(y, dtype=bool)
+        # Initial values for both phases
+        u0 = np.empty((2, y.size), dtype=float)
+        v0 = np.empty((2, y.size), dtype=float)
+        # Which phase to try first
+        phase = np.zeros_like(y, dtype=int)
+        for start in range(0, y.size, Nchunk):
+            stop = start + Nchunk
+            yy = y[start:stop,np.newaxis]
+            ss = s[start:stop,np.newaxis]
+            dist = ((yy - yk) / yscale)**2 + ((ss - sk) / R)**2
+            dist = np.nan_to_num(dist, nan=np.inf)
+            k = np.argmin(dist, axis=1)
+            dist1 = dist[np.arange(k.size), k]
+            u0[0,start:stop] = Tk[k]
+            v0[0,start:stop] = np.log(dk[k])
+            # At each saturation temperature, find the quality that
+            # matches the entropy.  The saturated starting point is the
+            # one with a legal quality and the smallest error in y.
+            xx = (ss - sL) / (sV - sL)
+            dist = ((yL + xx*(yV - yL) - yy) / yscale)**2
+            dist[np.logical_or(xx < 0., xx > 1.)] = np.inf
+            dist = np.nan_to_num(dist, nan=np.inf)
+            k = np.argmin(dist, axis=1)
+            u0[1,start:stop] = Ts[k]
+            v0[1,start:stop] = xx[np.arange(k.size), k]
+            phase[start:stop] = dist[np.arange(k.size), k] < dist1
+        
+        def resid(u, v, yw, sw, sat):
+            # Evaluate the scaled residuals and their derivatives
+            # at single-phase (sat False) and saturated (sat True) points
+            out = [np.empty_like(u) for _ in range(6)]
+            Iwork = np.logical_not(sat)
+            if Iwork.any():
+                dw = np.exp(v[Iwork])
+                f1,f1t,f1d = fn(u[Iwork], dw, diff=1)
+                f2,f2t,f2d = self._s(u[Iwork], dw, diff=1)
+                for oo,ff in zip(out, (f1-yw[Iwork], f1t, f1d*dw, 
+                        f2-sw[Iwork], f2t, f2d*dw)):
+                    oo[Iwork] = ff
+            if sat.any():
+                f1,f1t,f1x = self._txiter(u[sat], v[sat], fn)
+                f2,f2t,f2x = self._txiter(u[sat], v[sat], self._s)
+                for oo,ff in zip(out, (f1-yw[sat], f1t, f1x,
+                        f2-sw[sat], f2t, f2x)):
+                    oo[sat] = ff
+            for ii in range(3):
+                out[ii] /= yscale
+                out[ii+3] /= R
+            return out
+        
+        probe = pm.stats.probe(self, '_flash2', fn, None, y.size)
+        count = 0
+        # Points that have not been solved
+        Ipend = np.isfinite(y + s)
+        for attempt in range(2):
+            I = np.flatnonzero(Ipend)
+            sat = phase[I].astype(bool)
+            uw = u0[phase[I], I]
+            vw = v0[phase[I], I]
+            yw = y[I]
+            sw = s[I]
+            row = phase[I]
+            
+            while I.size and count < (attempt+1)*Nmax:
+                count += 1
+                r1,a,b,r2,c,e = resid(uw, vw, yw, sw, sat)
+                if probe:
+                    probe.eval(I.size)
+                # Remove the points that have converged
+                Iwork = np.logical_not(np.logical_and(
+                        np.abs(r1) <= ep, np.abs(r2) <= ep))
+                if not Iwork.all():
+                    Idone = np.logical_not(Iwork)
+                    Ipend[I[Idone]] = False
+                    T[I[Idone]] = uw[Idone]
+                    # Use x temporarily to keep the density or quality
+                    x[I[Idone]] = vw[Idone]
+                    Isat[I[Idone]] = sat[Idone]
+                    I,uw,vw,yw,sw,sat,row = I[Iwork],uw[Iwork],vw[Iwork],\
+                            yw[Iwork],sw[Iwork],sat[Iwork],row[Iwork]
+                    r1,a,b,r2,c,e = r1[Iwork],a[Iwork],b[Iwork],\
+                            r2[Iwork],c[Iwork],e[Iwork]
+                    if not I.size:
+                        break
+                # Solve the 2x2 Newton system
+                det = a*e - b*c
+                du = np.nan_to_num((b*r2 - e*r1) / det)
+                dv = np.nan_to_num((c*r1 - a*r2) / det)
+                # A variable that is on one of its limits and that would
+                # be pushed past it is held there, and the other is 
+                # found by least squares.  Saturated points that are
+                # pushed past the legal qualities are given up for this
+                # phase, as are points held on both limits.
+                Iu = np.logical_or(
+                        np.logical_and(uw <= umin[row], du < 0.),
+                        np.logical_and(uw >= umax[row], du > 0.))
+                Iv = np.logical_or(
+                        np.logical_and(vw <= vmin[row], dv < 0.),
+                        np.logical_and(vw >= vmax[row], dv > 0.))
+                Iwork = np.logical_not(np.logical_and(Iv, 
+                        np.logical_or(Iu, sat)))
+                if not Iwork.all():
+                    I,uw,vw,yw,sw,sat,row = I[Iwork],uw[Iwork],vw[Iwork],\
+                            yw[Iwork],sw[Iwork],sat[Iwork],row[Iwork]
+                    r1,a,b,r2,c,e = r1[Iwork],a[Iwork],b[Iwork],\
+                            r2[Iwork],c[Iwork],e[Iwork]
+                    du,dv,Iu,Iv = du[Iwork],dv[Iwork],Iu[Iwork],Iv[Iwork]
+                    if not I.size:
+                        break
+                du = np.where(Iu, 0., np.where(Iv, 
+                        np.nan_to_num(-(r1*a + r2*c) / (a*a + c*c)), du))
+                dv = np.where(Iv, 0., np.where(Iu, 
+                        np.nan_to_num(-(r1*b + r2*e) / (b*b + e*e)), dv))
+                # Scale the step (preserving its direction) to the limits
+                scale = np.minimum(1., np.minimum(
+                        0.2*uw / np.maximum(np.abs(du), 1e-300),
+                        dvmax[row] / np.maximum(np.abs(dv), 1e-300)))
+                du *= scale
+                dv *= scale
+                un = np.clip(uw + du, umin[row], umax[row])
+                vn = np.clip(vw + dv, vmin[row], vmax[row])
+                # Backtrack until the residual is reduced
+                norm = r1*r1 + r2*r2
+                J = np.arange(I.size)
+                for halving in range(8):
+                    q = resid(un[J], vn[J], yw[J], sw[J], sat[J])
+                    if probe:
+                        probe.eval(J.size)
+                    J = J[np.logical_not(q[0]*q[0] + q[3]*q[3] < norm[J])]
+                    if not J.size:
+                        break
+                    du[J] *= 0.5
+                    dv[J] *= 0.5
+                    un[J] = np.clip(uw[J] + du[J], umin[row[J]], umax[row[J]])
+                    vn[J] = np.clip(vw[J] + dv[J], vmin[row[J]], vmax[row[J]])
+                uw = un
+                vw = vn
+                # Points that could not reduce the residual are given up
+                # for this phase if they are saturated or held on a 
+                # limit.  Otherwise, single-phase points in the liquid 
+                # can be badly conditioned, so they are allowed to 
+                # continue with the shortened step.
+                J = J[np.logical_or(sat[J], np.logical_or(Iu[J], Iv[J]))]
+                if J.size:
+                    Iwork = np.ones(I.size, dtype=bool)
+                    Iwork[J] = False
+                    I,uw,vw,yw,sw,sat,row = I[Iwork],uw[Iwork],vw[Iwork],\
+                            yw[Iwork],sw[Iwork],sat[Iwork],row[Iwork]
+                
+                if debug:
+                    print(attempt, count, I.size)
+            
+            if attempt == 0:
+                # Single-phase solutions with densities between the 
+                # saturated liquid and vapor densities are tried again
+                # as saturated mixtures.  The saturation densities are 
+                # only fits, so a legal liquid or vapor state can fall 
+                # slightly inside them.  The single-phase result is kept
+                # in case the saturated iteration fails.
+                I = np.flatnonzero(np.logical_not(np.logical_or(Ipend, Isat)))
+                I = I[T[I] < Tc]
+                I = I[np.logical_and(x[I] < np.log(self._dsl(T[I])[0]),
+                        x[I] > np.log(self._dsv(T[I])[0]))]
+                Ipend[I] = True
+                Ifb = I
+                Tfb = T[I]
+                vfb = x[I]
+                # Try the remaining points in the other phase
+                phase[Ipend] = 1 - phase[Ipend]
+        # Restore the single-phase results that could not be found as
+        # saturated mixtures
+        Iwork = Ipend[Ifb]
+        I = Ifb[Iwork]
+        T[I] = Tfb[Iwork]
+        x[I] = vfb[Iwork]
+        Isat[I] = False
+        Ipend[I] = False
+        
+        if probe:
+            probe.done(count, Ipend.sum())
+        if Ipend.any():
+            T[Ipend] = pm.config['def_oob']
+            pm.utility.print_warning(
+                    f'_FLASH2: Failed to converge for {Ipend.sum()} elements.')
+        Iwork = np.logical_not(np.logical_or(Ipend, Isat))
+        d[Iwork] = np.exp(x[Iwork])
+        x[Iwork] = -1.
+        x[Ipend] = -1.
+        Isat[Ipend] = False
+        if Isat.any():
+            Ts = T[Isat]
+            d[Isat] = 1. / (x[Isat]/self._dsv(Ts)[0] + 
+                    (1.-x[Isat])/self._dsl(Ts)[0])
+        return T, d, x, Isat
+        
+        
     def _T(self,d,p,sat=False):
         """Temperature iterator - calculate temperature from d,p (inner routine)
 d and p MUST be ndarrays
@@ -2121,8 +2840,7 @@ inverted to calculate T
         Itest = np.logical_not(Itest)
         if Itest.any():
             # Now, identify the points in liquid, vapor, and mixed states
-            # First, we'll need the saturation temperatures... this is 
-            # a numerically expensive process since Ts() is iterative.
+            # First, we'll need the saturation temperatures.
             # Let Ta temporarily be the saturation temperature
             Ta[Itest] = self._Ts(p[Itest])
             dsL[Itest] = self._dsl(Ta[Itest], 0)[0]
@@ -2227,9 +2945,9 @@ dL and dV are the liquid and vapor densities in kg/m3
     T,d1,d2,x,I = _argparse( .. keyword arguments ..)
 
 Accepts keyword arguments:
-    e   internal energy - requires p, d, v, or x
-    h   enthalpy - requires p, d, v, or x
-    s   entropy - requires T, p, d, v, or x
+    e   internal energy - requires p, d, v, x, or s
+    h   enthalpy - requires p, d, v, x, or s
+    s   entropy - requires T, p, d, v, x, e, or h
     T   temperature
     p   pressure
     d   density
@@ -2254,7 +2972,7 @@ other conditions, x<0 and d1 == d2.
         # 2) Apply the argument rules...
         #   2.1: All arguments must be legal
         #   2.2: Only 2 arguments unless T,p,x
-        #   2.3: Only 1 inverse property
+        #   2.3: Only 1 inverse property (except e,s or h,s)
         #   2.4: d and v may not be specified together 
         # 3) Convert the arguments to arrays with dim 1 or greater
         # 4) Convert to standard units
@@ -2327,9 +3045,11 @@ other conditions, x<0 and d1 == d2.
                 prefix = ', '
             raise pm.utility.PMParamError(message)
         
-        # 2.3: Only one inverse property is allowed
+        # 2.3: Only one inverse property is allowed unless it is e or h
+        # with s
         inverse_args = inverse_args.intersection(args)
-        if len(inverse_args) > 1:
+        if len(inverse_args) > 1 and \
+                inverse_args not in ({'e','s'}, {'h','s'}):
             message = 'Properties may not be specified together:'
             prefix = ' '
             for name in inverse_args:
@@ -2373,7 +3093,7 @@ other conditions, x<0 and d1 == d2.
                 kwarg['T'][Ioob] = pm.config['def_oob']
                 pm.utility.print_warning('Some temperature values were out-of-bounds for this substance.')
         if 'p' in kwarg:
-            kwarg['p'] = pm.units.pressure(kwarg['p'], to_units='Pa')
+            kwarg['p'] = np.divide(kwarg['p'], pm.units.plan(pressure='Pa'))
             # Test for out-of-bounds
             Ioob = np.logical_or(kwarg['p'] < self.data['plim'][0], 
                     kwarg['p'] > self.data['plim'][1])
@@ -2385,12 +3105,11 @@ other conditions, x<0 and d1 == d2.
                 kwarg['p'][Ioob] = pm.config['def_oob']
                 pm.utility.print_warning('Some pressure values were out-of-bounds for this substance.')
         if 'd' in kwarg:
-            value = pm.units.volume(kwarg['d'], to_units='m3', exponent=-1)
-            kwarg['d'] = pm.units.matter(value, self.data['mw'], to_units='kg')
+            kwarg['d'] = np.divide(kwarg['d'], pm.units.plan(self.data['mw'], volume=('m3',-1), matter='kg'))
         if 'v' in kwarg:
             # Convert and replace with d at the same time
-            value = pm.units.volume(kwarg['v'], to_units='m3')
-            kwarg['d'] = 1./pm.units.matter(value, self.data['mw'], to_units='kg', exponent=-1)
+            kwarg['d'] = np.divide(pm.units.plan(self.data['mw'], volume='m3', matter=('kg',-1)),
+                    np.asarray(kwarg['v'], dtype=float))
             # Update the keywords and argument sets to reflect the
             # substitution.
             args.add('d')
@@ -2400,19 +3119,15 @@ other conditions, x<0 and d1 == d2.
             basic_args.remove('v')
         if 'h' in kwarg:
             value = kwarg['h']
-            value = pm.units.energy(value, to_units='J')
-            value = pm.units.matter(value, self.data['mw'], to_units='kg', exponent=-1)
+            value = np.divide(value, pm.units.plan(self.data['mw'], energy='J', matter=('kg',-1)))
             kwarg['h'] = value
         if 'e'  in kwarg:
             value = kwarg['e']
-            value = pm.units.energy(value, to_units='J')
-            value = pm.units.matter(value, self.data['mw'], to_units='kg', exponent=-1)
+            value = np.divide(value, pm.units.plan(self.data['mw'], energy='J', matter=('kg',-1)))
             kwarg['e'] = value
         if 's' in kwarg:
             value = kwarg['s']
-            value = pm.units.energy(value, to_units='J')
-            value = pm.units.matter(value, self.data['mw'], to_units='kg', exponent=-1)
-            value = pm.units.temperature(value, to_units='K', exponent=-1)
+            value = np.divide(value, pm.units.plan(self.data['mw'], energy='J', matter=('kg',-1), temperature=('K',-1)))
             kwarg['s'] = value
         # x is dimensionless - no need to convert anything
         if 'x' in kwarg:
@@ -2422,8 +3137,30 @@ other conditions, x<0 and d1 == d2.
 
         # 6) Case out the different combinations
         
+        # If two of the arguments require an inverse routine, they are
+        # e or h with s (see rule 2.3).  The two-property flash handles
+        # the saturated points itself.
+        if len(inverse_args) == 2:
+            invp = (inverse_args - {'s'}).pop()
+            y,s = np.broadcast_arrays(kwarg[invp], kwarg['s'])
+            T,d,x,I = self._flash2(y, s, inverse_methods[invp], debug=debug)
+            T = T.reshape(y.shape)
+            d = d.reshape(y.shape)
+            I = I.reshape(y.shape)
+            if I.any():
+                x = x.reshape(y.shape)
+                d1 = d.copy()
+                d2 = d.copy()
+                d1[I] = self._dsl(T[I])[0]
+                d2[I] = self._dsv(T[I])[0]
+            else:
+                d1 = d
+                d2 = d
+                x = np.broadcast_to(-1, T.shape)
+            return T,d1,d2,x,I
+            
         # If one of the arguments requires an inverse routine...
-        if inverse_args:
+        elif inverse_args:
             # Isolate the inverse property argument
             # Because of rule 2.3, there is only one
             invp = inverse_args.pop()
@@ -2894,6 +3631,128 @@ other conditions, x<0 and d1 == d2.
 
 
 
+    def _helmholtz(self, T, d, diff=2):
+        """Total dimensionless helmholtz free energy (inner routine)
+    tt,dd,a,at,ad,att,atd,add = _helmholtz(T,d,diff=2)
+
+This is the fused evaluation of the ideal gas (_ao) and the residual 
+(_ar) parts of the helmholtz free energy.  All of the properties are
+derived from it.  T and d are in K and kg/m3, and 
+    tt = Tscale / T
+    dd = d / dscale
+are calculated with the ARgroup scales.  The ideal gas derivatives are
+re-scaled to tt and dd if the AOgroup uses different scales.  a is the
+sum of the ideal gas and residual parts, and at, ad, att, atd, and add
+are its derivatives with respect to tt and dd, up to order diff.
+"""
+        Tscale = self.data['ARgroup']['Tscale']
+        dscale = self.data['ARgroup']['dscale']
+        tt = Tscale / T
+        dd = d / dscale
+        a,at,ad,att,atd,add = self._ar(tt,dd,diff)
+        
+        # The IG part
+        # In all of the data so far, the scales are the same
+        kt = self.data['AOgroup']['Tscale'] / Tscale
+        kd = dscale / self.data['AOgroup']['dscale']
+        if kt==1. and kd==1.:
+            ao,aot,aod,aott,aotd,aodd = self._ao(tt,dd,diff)
+        else:
+            ao,aot,aod,aott,aotd,aodd = self._ao(kt*tt,kd*dd,diff)
+        a = a + ao
+        if diff>0:
+            at = at + kt*aot
+            ad = ad + kd*aod
+            if diff>1:
+                att = att + kt*kt*aott
+                atd = atd + kt*kd*aotd
+                add = add + kd*kd*aodd
+        return tt,dd,a,at,ad,att,atd,add
+        
+        
+    def _tdprops(self, T, d, props):
+        """Properties from temperature and density (inner routine)
+    pd = _tdprops(T, d, props)
+
+props is a sequence of property names; any of p, e, h, s, cp, or cv.
+The properties are returned in a dictionary in Pa, J/kg, and J/kg/K.
+All of the requested properties are calculated from a single call to
+_helmholtz(), and second derivatives are only calculated if cp or cv
+is requested.
+
+_tdprops() does NOT handle cases where d is "under the dome."
+"""
+        R = self.data['R']
+        if 'cp' in props or 'cv' in props:
+            diff = 2
+        else:
+            diff = 1
+        tt,dd,a,at,ad,att,atd,add = self._helmholtz(T,d,diff)
+        
+        out = {}
+        for prop in props:
+            if prop == 'p':
+                out['p'] = R*T*d*dd*ad
+            elif prop == 'e':
+                out['e'] = R*T*tt*at
+            elif prop == 'h':
+                out['h'] = R*T*(tt*at + dd*ad)
+            elif prop == 's':
+                out['s'] = R*(tt*at - a)
+            elif prop == 'cv':
+                out['cv'] = -R*tt*tt*att
+            elif prop == 'cp':
+                temp = dd*(ad - tt*atd)
+                out['cp'] = R*(temp*temp/(dd*(2.*ad + dd*add)) - tt*tt*att)
+            else:
+                raise pm.utility.PMParamError(
+                        'MP1._tdprops: Unrecognized property: ' + repr(prop))
+        return out
+        
+        
+    def _props(self, T, d1, d2, x, I, props):
+        """Properties from the results of _argparse (inner routine)
+    pd = _props(T, d1, d2, x, I, props)
+
+T, d1, d2, x, and I are the values returned by _argparse().  props is
+a sequence of property names; any of p, d, e, h, s, cp, or cv.  The
+properties are returned in a dictionary in Pa, kg/m3, J/kg, and J/kg/K.
+
+The single-phase (or liquid) properties come from one call to 
+_tdprops() on d1, and the vapor properties under the dome come from a
+second call on d2.  Saturated mixture properties are then weighted by
+quality.  Pressure under the dome is calculated from the vapor density,
+cp is infinite, and cv is NaN.  See the cv() method for the isochoric
+specific heat of a saturated mixture.
+"""
+        tdprops = [prop for prop in props if prop != 'd']
+        out = self._tdprops(T, d1, tdprops)
+        if 'd' in props:
+            out['d'] = d1.copy()
+            
+        if I.any():
+            xI = x[I]
+            # Only properties that depend on the vapor need a second pass
+            vapprops = [prop for prop in tdprops if prop in ('p','e','h','s')]
+            vap = self._tdprops(T[I], d2[I], vapprops)
+            if 'p' in vap:
+                # Use d2.  In theory, p(d1) = p(d2), but the liquid is so 
+                # stiff that small numerical errors cause huge pressure 
+                # errors.
+                out['p'][I] = vap['p']
+            for prop in ('e','h','s'):
+                if prop in vap:
+                    out[prop][I] = out[prop][I]*(1.-xI) + vap[prop]*xI
+            if 'cp' in out:
+                out['cp'][I] = np.inf
+            if 'cv' in out:
+                out['cv'][I] = np.nan
+            # d is not weighted by x - v is.
+            if 'd' in out:
+                out['d'][I] = 1./((1.-xI)/d1[I] + xI/d2[I])
+        return out
+        
+        
     def _e(self,T,d,diff=0):
         """Internal energy (inner routine)
     e,eT,ed = _e(T,d,diff=0)
@@ -2901,32 +3760,14 @@ other conditions, x<0 and d1 == d2.
         eT = None
         ed = None
 
-        # The IG part        
         R = self.data['R']
-        Tscale = self.data['AOgroup']['Tscale']
-        dscale = self.data['AOgroup']['dscale']
-        tt = Tscale / T
-        dd = d / dscale
-        _,at,_,att,atd,_ = self._ao(tt,dd,diff+1)
-        
-        e = at
-        if diff>0:
-            eT = tt*tt*att
-            ed = atd/dscale
-        
-        # The residual part
-        Tscale = self.data['ARgroup']['Tscale']
         dscale = self.data['ARgroup']['dscale']
-        tt = Tscale / T
-        dd = d / dscale
-        _,at,ad,att,atd,add = self._ar(tt,dd,diff+1)
-        e += at
-        e *= R*Tscale
+        tt,dd,a,at,ad,att,atd,add = self._helmholtz(T,d,diff+1)
+        
+        e = R*T*tt*at
         if diff>0:
-            eT += tt*tt*att
-            eT *= -R
-            ed += atd/dscale
-            ed *= R*Tscale
+            eT = -R*tt*tt*att
+            ed = R*T*tt*atd/dscale
 
         return e,eT,ed
 
@@ -2938,32 +3779,14 @@ other conditions, x<0 and d1 == d2.
         hT = None
         hd = None
 
-        # The IG part        
         R = self.data['R']
-        Tscale = self.data['AOgroup']['Tscale']
-        dscale = self.data['AOgroup']['dscale']
-        tt = Tscale / T
-        dd = d / dscale
-        _,at,_,att,atd,_ = self._ao(tt,dd,diff+1)
-        
-        h = 1. + tt*at
-        if diff>0:
-            hT = 1. - tt*tt*att
-            hd = tt*atd/dscale
-        
-        # The residual part
-        Tscale = self.data['ARgroup']['Tscale']
         dscale = self.data['ARgroup']['dscale']
-        tt = Tscale / T
-        dd = d / dscale
-        _,at,ad,att,atd,add = self._ar(tt,dd,diff+1)
-        h += dd*ad + tt*at
-        h *= R*T
+        tt,dd,a,at,ad,att,atd,add = self._helmholtz(T,d,diff+1)
+        
+        h = R*T*(tt*at + dd*ad)
         if diff>0:
-            hT += dd*ad - tt*(tt*att + dd*atd)
-            hT *= R
-            hd += (ad + dd*add + tt*atd)/dscale
-            hd *= R*T
+            hT = R*(dd*ad - tt*(tt*att + dd*atd))
+            hd = R*T*(ad + dd*add + tt*atd)/dscale
 
         return h,hT,hd
 
@@ -2974,32 +3797,14 @@ other conditions, x<0 and d1 == d2.
         sT = None
         sd = None
 
-        # The IG part        
         R = self.data['R']
-        Tscale = self.data['AOgroup']['Tscale']
-        dscale = self.data['AOgroup']['dscale']
-        tt = Tscale / T
-        dd = d / dscale
-        a,at,ad,att,atd,_ = self._ao(tt,dd,diff+1)
-        
-        s = tt*at - a
-        if diff>0:
-            sT = tt*tt*att
-            sd = (tt*atd - ad)/dscale
-        
-        # The residual part
-        Tscale = self.data['ARgroup']['Tscale']
         dscale = self.data['ARgroup']['dscale']
-        tt = Tscale / T
-        dd = d / dscale
-        a,at,ad,att,atd,_ = self._ar(tt,dd,diff+1)
-        s += tt*at - a
-        s *= R
+        tt,dd,a,at,ad,att,atd,add = self._helmholtz(T,d,diff+1)
+        
+        s = R*(tt*at - a)
         if diff>0:
-            sT += tt*tt*att
-            sT *= -R/T
-            sd += (tt*atd - ad)/dscale
-            sd *= R
+            sT = -R*tt*tt*att/T
+            sd = R*(tt*atd - ad)/dscale
 
         return s,sT,sd
 
@@ -3008,35 +3813,16 @@ other conditions, x<0 and d1 == d2.
     f,ft,fd = _f(T,d,diff=0)
     
 """
-        # The IG part        
         R = self.data['R']
-        Tscale = self.data['AOgroup']['Tscale']
-        dscale = self.data['AOgroup']['dscale']
-        tt = Tscale / T
-        dd = d / dscale
-        a,at,ad,_,_,_ = self._ao(tt,dd,diff+1)
+        dscale = self.data['ARgroup']['dscale']
+        tt,dd,a,at,ad,_,_,_ = self._helmholtz(T,d,diff)
 
-        f = a
+        f = R*T*a
         ft = None
         fd = None
         if diff:
-            ft = a - tt*at
-            fd = ad/dscale
-        
-        # The residual part
-        Tscale = self.data['ARgroup']['Tscale']
-        dscale = self.data['ARgroup']['dscale']
-        tt = Tscale / T
-        dd = d / dscale
-        a,at,ad,_,_,_ = self._ar(tt,dd,diff+1)
-
-        f += a
-        f *= R*T
-        if diff:
-            ft += a - tt*at
-            ft *= R
-            fd += ad/dscale
-            fd *= R*T
+            ft = R*(a - tt*at)
+            fd = R*T*ad/dscale
             
         return f,ft,fd
         
@@ -3047,35 +3833,16 @@ other conditions, x<0 and d1 == d2.
     g,gt,gd = _g(T,d,diff=0)
     
 """
-        # The IG part        
         R = self.data['R']
-        Tscale = self.data['AOgroup']['Tscale']
-        dscale = self.data['AOgroup']['dscale']
-        tt = Tscale / T
-        dd = d / dscale
-        a,at,ad,_,atd,add = self._ao(tt,dd,diff+1)
+        dscale = self.data['ARgroup']['dscale']
+        tt,dd,a,at,ad,_,atd,add = self._helmholtz(T,d,diff+1)
         
-        g = a + 1.
+        g = R*T*(a + dd*ad)
         gt = None
         gd = None
         if diff:
-            gt = a + 1. - tt*at
-            gd = ad/dscale
-        
-        # The residual part
-        Tscale = self.data['ARgroup']['Tscale']
-        dscale = self.data['ARgroup']['dscale']
-        tt = Tscale / T
-        dd = d / dscale
-        a,at,ad,_,atd,add = self._ar(tt,dd,diff+1)
-
-        g += a + dd*ad
-        g *= R*T
-        if diff:
-            gt += a + dd*ad - tt*(at + dd*atd)
-            gt *= R
-            gd += (2*ad + dd*add)/dscale
-            gd *= R*T
+            gt = R*(a + dd*ad - tt*(at + dd*atd))
+            gd = R*T*(2*ad + dd*add)/dscale
             
         return g,gt,gd
         
@@ -3083,55 +3850,14 @@ other conditions, x<0 and d1 == d2.
         """Isobaric specific heat (inner routine)
     cp = _cp(T,d)
 """
-
-        # The IG part        
-        R = self.data['R']
-        Tscale = self.data['AOgroup']['Tscale']
-        dscale = self.data['AOgroup']['dscale']
-        tt = Tscale / T
-        dd = d / dscale
-        _,_,_,att,_,_ = self._ao(tt,dd,2)
-        
-        cp = -tt*tt*att
-        
-        # The residual part
-        Tscale = self.data['ARgroup']['Tscale']
-        dscale = self.data['ARgroup']['dscale']
-        tt = Tscale / T
-        dd = d / dscale
-        _,_,ad,att,atd,add = self._ar(tt,dd,2)
-
-        temp = 1.+dd*(ad-tt*atd)
-        cp += -tt*tt*att + temp*temp/(1.+dd*(2.*ad+dd*add))
-        cp *= R
-        return cp
+        return self._tdprops(T,d,('cp',))['cp']
         
         
     def _cv(self,T,d):
         """Isochoric specific heat (inner routine)
     cv = _cv(T,d)
 """
-
-        # The IG part        
-        R = self.data['R']
-        Tscale = self.data['AOgroup']['Tscale']
-        dscale = self.data['AOgroup']['dscale']
-        tt = Tscale / T
-        dd = d / dscale
-        _,_,_,att,_,_ = self._ao(tt,dd,2)
-        
-        cv = tt*tt*att
-        
-        # The residual part
-        Tscale = self.data['ARgroup']['Tscale']
-        dscale = self.data['ARgroup']['dscale']
-        tt = Tscale / T
-        dd = d / dscale
-        _,_,_,att,_,_ = self._ar(tt,dd,2)
-
-        cv += tt*tt*att
-        cv *= -R
-        return cv
+        return self._tdprops(T,d,('cv',))['cv']
 
 
     #               #
@@ -3181,8 +3907,7 @@ Returns the molecular weight of the substance in
     [unit_mass / unit_molar]
 """
         mw = self.data['mw']
-        mw = pm.units.mass(mw, from_units='kg')
-        mw = pm.units.molar(mw, from_units='kmol', exponent=-1)
+        mw = np.multiply(mw, pm.units.plan(mass='kg', molar=('kmol',-1)))
         return mw
     
     def R(self):
@@ -3203,9 +3928,7 @@ The value returned by R is based on the value stored in the species data,
 from which all other properties are constructed.
 """
         # R is stored in in J/kg/K
-        R = pm.units.energy(self.data['R'], from_units = 'J')
-        R = pm.units.matter(R, self.data['mw'], from_units='kg', exponent=-1)
-        R = pm.units.temperature(R, from_units='K', exponent=-1)
+        R = np.multiply(self.data['R'], pm.units.plan(self.data['mw'], energy='J', matter=('kg',-1), temperature=('K',-1)))
         return R
         
     #                               #
@@ -3303,9 +4026,7 @@ of the other.
             p = pm.config['def_p']
 
         # Replace p with an array of the correct units
-        p = pm.units.pressure(
-                np.asarray(p, dtype=float), 
-                to_units='Pa')
+        p = np.divide(np.asarray(p, dtype=float), pm.units.plan(pressure='Pa'))
         # Force p to have at least 1 dimension
         if p.ndim==0:
             p = np.reshape(p, (1,))
@@ -3335,9 +4056,7 @@ Returns the liquid (dsL) and vapor (dsV) saturation density in units
 """
         _,dL,dV = self._sat_argparse(*varg, **kwarg)
         # Get a conversion factor
-        conv = pm.units.matter(1., self.data['mw'],
-                from_units='kg')
-        conv = pm.units.volume(conv, from_units='m3', exponent=-1)
+        conv = pm.units.plan(self.data['mw'], matter='kg', volume=('m3',-1))
         dL *= conv
         dV *= conv
         return dL, dV
@@ -3375,9 +4094,7 @@ units [unit_energy / unit_matter]
         esV = self._e(T,dV,0)[0]
         
         # Get a conversion factor
-        conv = pm.units.energy(1., from_units='J')
-        conv = pm.units.matter(conv, self.data['mw'],
-                from_units='kg', exponent=-1)
+        conv = pm.units.plan(self.data['mw'], energy='J', matter=('kg',-1))
         esL *= conv
         esV *= conv
         return esL, esV
@@ -3400,9 +4117,7 @@ units [unit_energy / unit_matter]
         hsV = self._h(T,dV,0)[0]
         
         # Get a conversion factor
-        conv = pm.units.energy(1., from_units='J')
-        conv = pm.units.matter(conv, self.data['mw'],
-                from_units='kg', exponent=-1)
+        conv = pm.units.plan(self.data['mw'], energy='J', matter=('kg',-1))
         hsL *= conv
         hsV *= conv
         return hsL, hsV
@@ -3425,11 +4140,7 @@ units [unit_energy / unit_matter / unit_temperature]
         ssV = self._s(T,dV,0)[0]
         
         # Get a conversion factor
-        conv = pm.units.energy(1., from_units='J')
-        conv = pm.units.matter(conv, self.data['mw'],
-                from_units='kg', exponent=-1)
-        conv = pm.units.temperature(conv,
-                from_units='K', exponent=-1)
+        conv = pm.units.plan(self.data['mw'], energy='J', matter=('kg',-1), temperature=('K',-1))
         ssL *= conv
         ssV *= conv
         return ssL, ssV
@@ -3470,9 +4181,10 @@ Returns pressure in unit_pressure
         # that small numerical errors cause huge pressure errors
         # The problem is solved when the vapor density is used instead.
         # In all other conditions d1=d2
+        # Only the residual is needed, so this is cheaper than _props()
         p = self._p(T,d2,0)[0]
         
-        p = pm.units.pressure(p, from_units='Pa')
+        p = np.multiply(p, pm.units.plan(pressure='Pa'))
         
         if quality:
             return p,x
@@ -3511,8 +4223,7 @@ Returns density in unit_matter / unit_volume
             d1[I] += x[I]/d2[I]
             d1[I] = 1. / d1[I]
             
-        d1 = pm.units.matter(d1, self.data['mw'], from_units='kg')
-        d1 = pm.units.volume(d1, from_units='m3', exponent=-1)
+        d1 = np.multiply(d1, pm.units.plan(self.data['mw'], matter='kg', volume=('m3',-1)))
         if quality:
             return d1,x
         return d1
@@ -3619,7 +4330,7 @@ another property method or the state() method.
     # Property functions #
     #                    #
     
-    def state(self, *varg, **kwarg):
+    def state(self, *varg, props=None, **kwarg):
         """The state method calculates all available properties at once.
         
     sd = state(...)
@@ -3645,125 +4356,61 @@ return NaN for cv at saturated conditions.  This is a deliberate design
 decision to preserve the speed and simplicitly of the state() method.  
 For users who do want true constant-volume specific heat is still 
 available by calling the cv() method directly.
+
+The optional props keyword limits the calculation to a sequence of the
+above keys (and gam).  The arguments are parsed (and inverted) only 
+once, and properties that are not requested are not calculated.
+    sd = state(..., props=('h','s','d'))
 """
+        allprops = ('T','p','d','v','x','e','h','s','cp','cv','gam')
+        if props is None:
+            props = allprops
+        elif isinstance(props, str):
+            props = (props,)
+        for prop in props:
+            if prop not in allprops:
+                raise pm.utility.PMParamError(
+                        'Unrecognized state property: ' + repr(prop))
         
         # Parse the arguments
         T,d1,d2,x,I = self._argparse(*varg, **kwarg)
-        R = self.data['R']
-        
-        # Initialize the output
-        out = {}
         
-        # Start with the vapor (d2) half of the calculation
-        # In saturated cases, d2 should always be used to caluclate 
-        # pressure
-        # The IG part        
-        Tscale = self.data['AOgroup']['Tscale']
-        dscale = self.data['AOgroup']['dscale']
-        tt = Tscale / T
-        dd = d2 / dscale
-        a,at,ad,att,atd,add = self._ao(tt,dd,2)
-        
-        p = 1.
-        e = at
-        h = 1. + tt*at
-        s = tt*at - a
-        cp = -tt*tt*att
-        cv = tt*tt*att
-        
-        # The residual part
-        Tscale = self.data['ARgroup']['Tscale']
-        dscale = self.data['ARgroup']['dscale']
-        tt = Tscale / T
-        dd = d2 / dscale
-        a,at,ad,att,atd,add = self._ar(tt,dd,2)
-
-        p += dd*ad
-        p *= T*d2*R
-        e += at
-        e *= R*Tscale
-        h += dd*ad + tt*at
-        h *= R*T
-        s += tt*at - a
-        s *= R
-        temp = 1.+dd*(ad-tt*atd)
-        cp += -tt*tt*att + temp*temp/(1.+dd*(2.*ad+dd*add))
-        cp *= R
-        cv += tt*tt*att
-        cv *= -R
-        
-        # Before we go back and calculate the liquid properties,
-        # go ahead and store the vapor calculations
-        out['p'] = p
-        out['T'] = T
-        out['d'] = d1
-        out['x'] = x
-        out['e'] = e
-        out['h'] = h
-        out['s'] = s
-        out['cp'] = cp
-        out['cv'] = cv
-        
-        # Finish with the liquid (d1) half of the calculation
-        # The IG part        
-        Tscale = self.data['AOgroup']['Tscale']
-        dscale = self.data['AOgroup']['dscale']
-        tt = Tscale / T[I]
-        dd = d1[I] / dscale
-        a,at,ad,att,atd,add = self._ao(tt,dd,2)
-        
-        e = at
-        h = 1. + tt*at
-        s = tt*at - a
-        cp = -tt*tt*att
-        cv = tt*tt*att
-        
-        # The residual part
-        Tscale = self.data['ARgroup']['Tscale']
-        dscale = self.data['ARgroup']['dscale']
-        tt = Tscale / T[I]
-        dd = d1[I] / dscale
-        a,at,ad,att,atd,add = self._ar(tt,dd,2)
-
-        e += at
-        e *= R*Tscale
-        h += dd*ad + tt*at
-        h *= R*T[I]
-        s += tt*at - a
-        s *= R
-        temp = 1.+dd*(ad-tt*atd)
-        cp += -tt*tt*att + temp*temp/(1.+dd*(2.*ad+dd*add))
-        cp *= R
-        cv += tt*tt*att
-        cv *= -R
-        
-        # Finally, calculate the mixture properties with the appropriate
-        # quality.
-        out['cp'][I] = np.inf
-        out['cv'][I] = np.nan
-        out['e'][I] = out['e'][I]*(x[I]) + e*(1-x[I])
-        out['h'][I] = out['h'][I]*(x[I]) + h*(1-x[I])
-        out['s'][I] = out['s'][I]*(x[I]) + s*(1-x[I])
-        # d is not weighted by x - v is.
-        out['d'][I] = 1./((1-x[I])/d1[I] + x[I]/d2[I])
+        # Which properties need to be calculated from the EOS?
+        need = []
+        for prop in props:
+            if prop in ('p','d','e','h','s','cp','cv'):
+                need.append(prop)
+            elif prop == 'v':
+                need.append('d')
+            elif prop == 'gam':
+                need += ['cp','cv']
+        # All of the properties come from one evaluation of the 
+        # helmholtz free energy on each phase.
+        values = self._props(T,d1,d2,x,I,need)
         
         # Apply unit conversions
-        c1 = pm.units.energy(1., from_units='J')
-        c1 = pm.units.matter(c1, self.data['mw'], from_units='kg', exponent=-1)
-        out['e'] *= c1
-        out['h'] *= c1
-        c1 = pm.units.temperature(c1, from_units='K',exponent=-1)
-        out['s'] *= c1
-        out['cp'] *= c1
-        out['cv'] *= c1
-        out['gam'] = out['cp'] / out['cv']
-        out['gam'][I] = np.inf
-        out['p'] = pm.units.pressure(out['p'], from_units='Pa')
-        out['T'] = pm.units.temperature_scale(out['T'], from_units='K')
-        c1 = pm.units.volume(1., from_units='m3', exponent=-1)
-        c1 = pm.units.matter(c1, self.data['mw'], from_units='kg')
-        out['d'] *= c1
-        out['v'] = 1./out['d']
+        out = {}
+        for prop in props:
+            if prop == 'T':
+                out['T'] = pm.units.temperature_scale(T, from_units='K')
+            elif prop == 'p':
+                out['p'] = np.multiply(values['p'], pm.units.plan(pressure='Pa'))
+            elif prop == 'x':
+                out['x'] = x
+            elif prop == 'd' or prop == 'v':
+                c1 = pm.units.plan(self.data['mw'], volume=('m3',-1), matter='kg')
+                if prop == 'd':
+                    out['d'] = values['d'] * c1
+                else:
+                    out['v'] = 1./(values['d'] * c1)
+            elif prop == 'gam':
+                out['gam'] = values['cp'] / values['cv']
+                out['gam'][I] = np.inf
+            else:
+                c1 = pm.units.plan(self.data['mw'], energy='J', matter=('kg',-1))
+                if prop in ('s','cp','cv'):
+                    c1 = np.multiply(c1, pm.units.plan(temperature=('K',-1)))
+                out[prop] = values[prop] * c1
         return out
         
         
@@ -3794,14 +4441,9 @@ quality of the liquid/vapor mixture is also returned
 Returns energy in unit_energy / unit_matter
 """
         T,d1,d2,x,I = self._argparse(*varg, **kwarg)
-        e = self._e(T,d1,0)[0]
-        if I.any():
-            e[I] *= (1.-x[I])
-            e[I] += self._e(T[I],d2[I],0)[0] * x[I]
+        e = self._props(T,d1,d2,x,I,('e',))['e']
         # Convert the units back to user space
-        pm.units.energy(e, from_units='J', inplace=True)
-        pm.units.matter(e, self.data['mw'], 
-                from_units='kg', exponent=-1, inplace=True)
+        np.multiply(e, pm.units.plan(self.data['mw'], energy='J', matter=('kg',-1)), out=e)
         if quality:
             return e,x
         return e
@@ -3835,14 +4477,9 @@ quality of the liquid/vapor mixture is also returned
 Returns enthalpy as unit_energy / unit_matter
 """
         T,d1,d2,x,I = self._argparse(*varg, **kwarg)
-        h = self._h(T,d1,0)[0]
-        if I.any():
-            h[I] *= (1.-x[I])
-            h[I] += self._h(T[I],d2[I],0)[0] * x[I]
+        h = self._props(T,d1,d2,x,I,('h',))['h']
         # Convert the units back to user space
-        pm.units.energy(h, from_units='J', inplace=True)
-        pm.units.matter(h, self.data['mw'], 
-                from_units='kg', exponent=-1, inplace=True)
+        np.multiply(h, pm.units.plan(self.data['mw'], energy='J', matter=('kg',-1)), out=h)
         if quality:
             return h,x
         return h
@@ -3876,16 +4513,9 @@ Returns entropy in unit_energy / unit_matter / unit_temperature
 """
             
         T,d1,d2,x,I = self._argparse(*varg, **kwarg)
-        s = self._s(T,d1,0)[0]
-        if I.any():
-            s[I] *= (1.-x[I])
-            s[I] += self._s(T[I],d2[I],0)[0] * x[I]
+        s = self._props(T,d1,d2,x,I,('s',))['s']
         # Convert the units back to user space
-        pm.units.energy(s, from_units='J', inplace=True)
-        pm.units.matter(s, self.data['mw'], 
-                from_units='kg', exponent=-1, inplace=True)
-        pm.units.temperature(s, from_units='K', 
-                exponent=-1, inplace=True)
+        np.multiply(s, pm.units.plan(self.data['mw'], energy='J', matter=('kg',-1), temperature=('K',-1)), out=s)
         if quality:
             return s,x
         return s
@@ -3922,70 +4552,16 @@ quality of the liquid/vapor mixture is also returned
 """
             
         T,d1,d2,x,I = self._argparse(*varg, **kwarg)
+        out = self._props(T,d1,d2,x,I,('h','s','d'))
+        h = out['h']
+        s = out['s']
+        d1 = out['d']
         
-        # There is no inner hsd funciton.  
-        # We have to do this the hard way.
-        
-        # The IG part        
-        R = self.data['R']
-        Tscale = self.data['AOgroup']['Tscale']
-        dscale = self.data['AOgroup']['dscale']
-        tt = Tscale / T
-        dd = d1 / dscale
-        a,at,_,_,_,_ = self._ao(tt,dd,1)
-        
-        h = 1. + tt*at
-        s = tt*at - a
-        
-        # The residual part
-        Tscale = self.data['ARgroup']['Tscale']
-        dscale = self.data['ARgroup']['dscale']
-        tt = Tscale / T
-        dd = d1 / dscale
-        a,at,ad,_,_,_ = self._ar(tt,dd,1)
-        h += dd*ad + tt*at
-        s += tt*at - a
-
-        # If there are data under the dome
-        if I.any():
-            temp = 1-x[I]
-            h[I] *= temp
-            s[I] *= temp
-            
-            # The IG part        
-            R = self.data['R']
-            Tscale = self.data['AOgroup']['Tscale']
-            dscale = self.data['AOgroup']['dscale']
-            tt = Tscale / T[I]
-            dd = d2[I] / dscale
-            a,at,_,_,_,_ = self._ao(tt,dd,1)
-            
-            h[I] += (1. + tt*at)*x[I]
-            s[I] += (tt*at - a)*x[I]
-            
-            # The residual part
-            Tscale = self.data['ARgroup']['Tscale']
-            dscale = self.data['ARgroup']['dscale']
-            tt = Tscale / T[I]
-            dd = d2[I] / dscale
-            a,at,ad,_,_,_ = self._ar(tt,dd,1)
-            h[I] += (dd*ad + tt*at)*x[I]
-            s[I] += (tt*at - a)*x[I]
-            # Modify density
-            d1[I] = temp/d1[I] 
-            d1[I] += x[I]/d2[I]
-            d1[I] = 1./d1[I]
-            
-        s *= R
-        h *= R*T
-        
-        conv = pm.units.energy(1.,from_units='J')
-        conv = pm.units.matter(conv, self.data['mw'], from_units='kg')
+        conv = pm.units.plan(self.data['mw'], energy='J', matter='kg')
         h*=conv
-        conv = pm.units.temperature(conv, from_units='K')
+        conv = np.multiply(conv, pm.units.plan(temperature='K'))
         s*=conv
-        pm.units.matter(d1, self.data['mw'],from_units='kg',inplace=True)
-        pm.units.volume(d1, from_units='m3', exponent=-1, inplace=True)
+        np.multiply(d1, pm.units.plan(self.data['mw'], matter='kg', volume=('m3',-1)), out=d1)
         
         if quality:
             return h,s,d1,x
@@ -4024,15 +4600,9 @@ Returns specific heat in unit_energy / unit_matter / unit_temperature
 """
             
         T,d1,d2,x,I = self._argparse(*varg, **kwarg)
-        cp = self._cp(T,d1)
-        if I.any():
-            cp[I] = np.inf
+        cp = self._props(T,d1,d2,x,I,('cp',))['cp']
         # Convert the units back to user space
-        pm.units.energy(cp, from_units='J', inplace=True)
-        pm.units.matter(cp, self.data['mw'], 
-                from_units='kg', exponent=-1, inplace=True)
-        pm.units.temperature(cp, from_units='K', 
-                exponent=-1, inplace=True)
+        np.multiply(cp, pm.units.plan(self.data['mw'], energy='J', matter=('kg',-1), temperature=('K',-1)), out=cp)
         if quality:
             return cp, x
         return cp
@@ -4074,27 +4644,24 @@ Returns specific heat in unit_energy / unit_matter / unit_temperature
 """
         
         T,d1,d2,x,I = self._argparse(*varg, **kwarg)
-        cv = self._cv(T,d1)
+        cv = self._props(T,d1,d2,x,I,('cv',))['cv']
         if I.any():
+            xI = x[I]
             # How do the saturation densities change with temperature?
             _,dVT,_ = self._dsv(T[I], diff=1)
             _,dLT,_ = self._dsl(T[I], diff=1)
             # How does x change with temperature
             temp = d1[I]/d2[I]
-            xT = (dLT/d1[I]*(1-x[I]) + temp*dVT/d2[I]*x) / (temp-1)
+            xT = (dLT/d1[I]*(1-xI) + temp*dVT/d2[I]*xI) / (temp-1)
             # Grab the saturation sensitivities
             eL,eLT,eLd = self._e(T[I],d1[I],diff=1)
             eV,eVT,eVd = self._e(T[I],d2[I],diff=1)
             # Calculate the true isochoric specific heat for the
             # two-phase mixture
-            cv[I] = (eLT+eLd*dLT)*(1-x) + (eVT+eVd*dVT)*x + (eV-eL)*xT
+            cv[I] = (eLT+eLd*dLT)*(1-xI) + (eVT+eVd*dVT)*xI + (eV-eL)*xT
             
         # Convert the units back to user space
-        pm.units.energy(cv, from_units='J', inplace=True)
-        pm.units.matter(cv, self.data['mw'], 
-                from_units='kg', exponent=-1, inplace=True)
-        pm.units.temperature(cv, from_units='K', 
-                exponent=-1, inplace=True)
+        np.multiply(cv, pm.units.plan(self.data['mw'], energy='J', matter=('kg',-1), temperature=('K',-1)), out=cv)
         if quality:
             return cv, x
         return cv
@@ -4128,14 +4695,13 @@ Returns specific heat ratio, which is dimensionless
 """
             
         T,d1,d2,x,I = self._argparse(*varg, **kwarg)
-        cv = self._cv(T,d1)
-        cp = self._cp(T,d1)
-        if I.any():
-            cp[I] = np.inf
+        out = self._props(T,d1,d2,x,I,('cp','cv'))
+        gam = out['cp'] / out['cv']
+        gam[I] = np.inf
         
         if quality:
-            return cp/cv, x
-        return cp/cv
+            return gam, x
+        return gam
 
 
     def T_s(self, s, p=None, d=None, quality=False, debug=False):
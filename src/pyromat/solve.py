@@ -390,6 +390,14 @@ that are not exposed through the initializer.
         arg_iter = _vectorize_args(y,args)
         # initialize the result
         done = np.zeros((len(arg_iter),))
+        # Solver statistics are only recorded when a collector is active
+        probe = None
+        if pyro.stats.enabled():
+            fn = self._f or self._fdf
+            probe = pyro.stats.probe(getattr(fn, '__self__', None), 
+                    'solve1n', fn, None, len(arg_iter))
+        iterations = 0
+        failed = 0
         
         for thisy,thisarg in arg_iter:
             # Establish the limits
@@ -423,6 +431,9 @@ that are not exposed through the initializer.
                 # Make an initial call to the function
                 thisarg[self.param] = x
                 f,df = self._fdf(**thisarg)
+                iterations += 1
+                if probe:
+                    probe.eval(1)
                 error = f - thisy
                 if self._verbose:
                     if count%10==0:
@@ -457,12 +468,18 @@ that are not exposed through the initializer.
                     # enforce the limits
                     if limits is not None:
                         x = max(min(x,limits[1]), limits[0])
+            else:
+                failed += 1
             if count>=self.max_iter:
+                if probe:
+                    probe.done(iterations, failed)
                 raise pyro.utility.PMAnalysisError(
                     "The solution failed to converge " + repr(self))
 
+        if probe:
+            probe.done(iterations, failed)
         if len(arg_iter) == 1:
-            done = np.float(done)
+            done = float(done[0])
         return done
 
 
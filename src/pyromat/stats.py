@@ -0,0 +1,233 @@
+"""PYroMat solver statistics module
+
+The numerical inversion routines (like _iter1() and _hybrid1()) are
+usually the most expensive parts of a property calculation.  This module
+provides an opt-in way to see what they are doing.  When a collector is
+active, each call to an instrumented solver is recorded with the number
+of points it was given, the number of iterations and inner routine
+evaluations it required, the wall time it took, and the number of points
+that failed to converge.
+
+    >>> import pyromat as pm
+    >>> with pm.stats.collect() as stats:
+    ...     T = pm.get('mp.H2O').T(p=1., h=2000.)
+    ...
+    >>> stats.report()
+
+Collectors may be nested.  Every active collector receives every record.
+Collectors may also be started and stopped explicitly;
+    >>> stats = pm.stats.collect()
+    >>> stats.start()
+    >>> ...
+    >>> stats.stop()
+
+When no collector is active, the solvers skip all of their record
+keeping, so there is no cost to leaving the instrumentation in place.
+
+Solvers that are called by other solvers (like the _d() calls made
+while _hybrid1() iterates on _tpiter()) are recorded separately, and 
+their time is also included in the time of the solver that called them.
+
+** Records **
+Each record is a dictionary with the keys
+    class       The PYroMat class name (e.g. 'mp1')
+    id          The substance id string (e.g. 'mp.H2O')
+    solver      The solver routine (e.g. '_hybrid1')
+    target      The inner routine being inverted (e.g. '_tpiter(_h)')
+    size        The number of points passed to the solver
+    iterations  The number of iterations taken
+    evaluations The number of calls to the inner routine
+    points      The total number of points evaluated by those calls
+    nonconverged    The number of points that did not converge
+    time        The wall time in seconds
+"""
+
+import time
+import pyromat as pm
+
+
+# The collectors that are currently active
+_active = []
+
+# The numerical record fields that are totaled by summary()
+_totals = ('size', 'iterations', 'evaluations', 'points',
+        'nonconverged', 'time')
+
+
+class PMStats:
+    """A collector for solver statistics
+    stats = PMStats()
+        or
+    stats = pm.stats.collect()
+
+The collector only receives records while it is active.  It can be used
+as a context manager, or it can be started and stopped explicitly with
+start() and stop().  The records are kept in the "records" list until
+clear() is called.
+
+    summary()   Returns totals grouped by class, id, solver, and target
+    report()    Prints the summary as a table
+"""
+    def __init__(self):
+        self.records = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *arg):
+        self.stop()
+
+    def __repr__(self):
+        return '<PMStats with {:d} records>'.format(len(self.records))
+
+    def start(self):
+        """Begin receiving records from the solvers"""
+        if self not in _active:
+            _active.append(self)
+
+    def stop(self):
+        """Stop receiving records from the solvers"""
+        if self in _active:
+            _active.remove(self)
+
+    def clear(self):
+        """Discard all records"""
+        self.records = []
+
+    def summary(self, by=('class', 'id', 'solver', 'target')):
+        """Total the records in groups
+    sdict = summary(by=('class', 'id', 'solver', 'target'))
+
+Returns a dictionary.  Its keys are tuples with the values of the
+record keys listed in "by".  Its values are dictionaries with the
+totals of each of the numerical record fields and the number of
+solver "calls" in that group.
+"""
+        out = {}
+        for rec in self.records:
+            key = tuple(rec[kk] for kk in by)
+            total = out.get(key)
+            if total is None:
+                total = {'calls':0}
+                for kk in _totals:
+                    total[kk] = 0
+                out[key] = total
+            total['calls'] += 1
+            for kk in _totals:
+                total[kk] += rec[kk]
+        return out
+
+    def report(self, target=None):
+        """Print a table summarizing the records
+    report(target=None)
+
+The table is grouped by class, substance, solver, and target routine,
+and it is sorted so that the groups with the longest total wall time
+are first.  Evaluations per point (eval/pt) is the total number of
+points evaluated by the inner routine divided by the number of points
+given to the solver.
+
+If the target keyword is set to a file stream, the output will be sent
+there instead of standard out.
+"""
+        if target is None:
+            target = pm.utility.sys.stdout
+
+        sdict = self.summary()
+        if not sdict:
+            target.write('No solver statistics were recorded.\n')
+            return
+
+        idlen = max(4, max(len(key[1]) for key in sdict))
+        tlen = max(6, max(len(key[2]) + len(key[3]) + 1 for key in sdict))
+        fmt = ' {:<5s} {:<' + str(idlen) + 's} {:<' + str(tlen) + \
+                's} {:>6s} {:>9s} {:>6s} {:>7s} {:>7s} {:>10s}\n'
+        head = fmt.format('class', 'id', 'solver', 'calls', 'points',
+                'iter', 'eval/pt', 'failed', 'time (ms)')
+        target.write(head)
+        target.write('-'*len(head) + '\n')
+        for key,total in sorted(sdict.items(),
+                key=lambda item: -item[1]['time']):
+            evalpt = total['points'] / max(total['size'], 1)
+            target.write(fmt.format(
+                key[0], key[1], key[2] + ':' + key[3],
+                str(total['calls']), str(total['size']),
+                str(total['iterations']), '{:.2f}'.format(evalpt),
+                str(total['nonconverged']),
+                '{:.3f}'.format(1e3*total['time'])))
+
+
+class _probe:
+    """Record keeping for a single call to a solver
+
+Probes are created by the probe() function; see its documentation.
+"""
+    def __init__(self, obj, solver, target, size):
+        self.record = {
+            'class':type(obj).__name__ if obj is not None else '',
+            'id':obj.data['id'] if hasattr(obj, 'data') else '',
+            'solver':solver,
+            'target':target,
+            'size':int(size),
+            'iterations':0,
+            'evaluations':0,
+            'points':0,
+            'nonconverged':0,
+            'time':0.}
+        self.tstart = time.perf_counter()
+
+    def eval(self, points):
+        """Count one evaluation of the inner routine on N points"""
+        self.record['evaluations'] += 1
+        self.record['points'] += int(points)
+
+    def done(self, iterations, nonconverged=0):
+        """Finish the record and pass it to the active collectors"""
+        self.record['time'] = time.perf_counter() - self.tstart
+        self.record['iterations'] = int(iterations)
+        self.record['nonconverged'] = int(nonconverged)
+        for stats in _active:
+            stats.records.append(self.record)
+
+
+def collect():
+    """Create a solver statistics collector
+    stats = collect()
+
+The collector is not active until it is started, either by using it as
+a context manager or by calling its start() method.  See PMStats.
+"""
+    return PMStats()
+
+
+def enabled():
+    """Returns True when any collector is active"""
+    return bool(_active)
+
+
+def probe(obj, solver, fn, param, size):
+    """Start a record for a call to a solver (for use by the solvers)
+    p = probe(obj, solver, fn, param, size)
+
+obj     The PYroMat class instance that owns the solver, or None if
+        the solver is not bound to one (e.g. solve1n with a function)
+solver  The name of the solver routine (e.g. '_hybrid1')
+fn      The inner routine being inverted
+param   The dictionary of parameters passed to fn.  If it contains a
+        routine under 'fn' (like _tpiter does), its name is included in
+        the target label.
+size    The number of points passed to the solver
+
+When no collector is active, returns None, and the solver should skip
+its record keeping.  Otherwise, the solver should call p.eval(N) after
+each evaluation of fn on N points, and p.done(iterations, nonconverged)
+before it returns or raises an error.
+"""
+    if not _active:
+        return None
+    target = getattr(fn, '__name__', repr(fn))
+    if param and 'fn' in param:
+        target += '(' + getattr(param['fn'], '__name__',
+                repr(param['fn'])) + ')'
+    return _probe(obj, solver, target, size)
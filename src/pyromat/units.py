@@ -22,6 +22,8 @@ matter()                Converts between molar and mass
 temperature_scale()     Converts between the temperature scales
 gauge_to_abs()          Converts pressures between absolute and gauge
 abs_to_gauge()
+plan()                  Cached scale factors for converting to the 
+                        configured units (see its documentation)
 
 To alter the standards by which units are defined, call the setup()
 function.
@@ -55,6 +57,15 @@ import pyromat as pyro
 import sys
 
 
+# The scale factors calculated by plan() and the revision they were 
+# calculated for.  The revision is the configuration revision and the 
+# number of times the conversions have been changed (_plan_epoch).
+# Configuration contexts keep their own plans (see PMConfig.context()).
+_plans = {}
+_plan_revision = None
+_plan_epoch = 0
+
+
 class Conversion:
     """CONVERSION CLASS
 The unit conversion class simulates a function that converts a value of 
@@ -160,6 +171,9 @@ new system of units.
         return self.table.__getitem__(item)
 
     def __setitem__(self,item,value):
+        # Changing a conversion invalidates the plans
+        global _plan_epoch
+        _plan_epoch += 1
         return self.table.__setitem__(item,value)
 
 
@@ -239,6 +253,9 @@ const_dhg = dhg
 To change the standard conditions, call this function, and all 
 unit conversion routines will be updated.
 """
+    # The old plans were built from the old constants
+    global _plan_epoch
+    _plan_epoch += 1
     # Set up the exports as globals
     global const_h, const_k, const_Na, const_Nc, const_Ru, const_Tstd, \
             const_pstd, const_dstd, const_g, const_dh2o, const_dhg, const_q,\
@@ -578,6 +595,84 @@ If the from_units or the to_units values are not specified, the pyromat
     return np.multiply(value, conv)
 
 
+def plan(mw=None, **terms):
+    """Scale factor from a set of units to the configured units
+factor = plan(mw=None, energy='kJ', matter=('kmol',-1), ...)
+
+Each keyword names one of the unit conversions (e.g. energy, pressure,
+temperature, volume, or matter), and its value is either the unit that
+a quantity is expressed in or a tuple with the unit and its exponent.  
+The returned factor converts values from those units to the units in 
+the PYroMat configuration.  For example, an entropy in kJ/kmol/K is
+converted by
+    s *= plan(mw, energy='kJ', matter=('kmol',-1), temperature=('K',-1))
+and a value in the configured units is converted back by dividing by
+the same factor.  The molecular weight, mw, is required for matter.
+Temperature is treated as a relative temperature; use 
+temperature_scale() for values on a temperature scale.
+
+Property methods call plan() every time they return a value, so the 
+factors are cached by their arguments.  Reading the cache costs a 
+single dictionary lookup instead of a configuration lookup and a 
+conversion for each unit.  The molecular weight is not part of the 
+cache key, so mw may be a scalar or an array (e.g. one value for each
+species in a batch).  The cache is discarded whenever a
+configuration parameter is written (see PMConfig.revision), when a
+conversion table is changed, or when setup() is called.  Inside of a 
+configuration context (see PMConfig.context()), the factors are cached
+separately for that context.
+"""
+    global _plan_revision
+    revision = (pyro.config.revision, _plan_epoch)
+    state = pyro.utility._config_context.get()
+    if state is None:
+        plans = _plans
+        if revision != _plan_revision:
+            plans.clear()
+            _plan_revision = revision
+    else:
+        plans = state.plans
+        if revision != state.plan_revision:
+            plans.clear()
+            state.plan_revision = revision
+    key = tuple(terms.items())
+    value = plans.get(key)
+    if value is None:
+        # The factor is calculated for a unit molecular weight, and q 
+        # is the power of mw that it must be scaled by.  This way, the 
+        # plan for a property is shared by all substances and mw may be
+        # an array.
+        factor = 1.
+        q = 0
+        for name,units in terms.items():
+            exponent = None
+            if not isinstance(units, str):
+                units,exponent = units
+            if name == 'matter':
+                target = pyro.config['unit_matter']
+                e = exponent if exponent else 1
+                if units in mass and target in molar:
+                    q -= e
+                elif units in molar and target in mass:
+                    q += e
+                factor = matter(factor, 1., from_units=units, exponent=exponent)
+            else:
+                factor = globals()[name](factor, from_units=units, exponent=exponent)
+        value = (float(factor), q)
+        plans[key] = value
+    factor,q = value
+    if q == 0:
+        return factor
+    elif mw is None:
+        raise pyro.utility.PMParamError(
+                'The molecular weight is required to convert matter units.')
+    elif q == 1:
+        return factor * mw
+    elif q == -1:
+        return factor / mw
+    return factor * np.power(mw, q)
+
+
 def show():
     """Print a summary of all unit conversions available"""
     for name,conv in pyro.units.__dict__.items():
@@ -17,6 +17,9 @@ import numpy as np
 import os
 import traceback as tb
 import time
+import contextvars
+import threading
+import tracemalloc
 # point back to the root package
 import pyromat as pm
 
@@ -58,6 +61,15 @@ class PMAnalysisError(Error):
     pass
 
 
+# The configuration overrides that are active in the current thread or
+# asyncio task (see PMConfig.context()).  The value is a _PMContextState
+# instance or None.
+_config_context = contextvars.ContextVar('pyromat_config_context', default=None)
+
+# The active startup profiler (see PMProfile) or None
+_profile = None
+
+
 class PMConfigEntry:
     """PYroMat Configuration Entry
 
@@ -183,9 +195,24 @@ values:
 
     for key in config:
         print(key, config[key])
+
+The revision attribute is an integer that is incremented every time a
+parameter is written.  Code that caches values derived from the 
+configuration (like the unit conversion plans in pm.units) can compare
+it against the revision they were built with.
+
+Parameters may also be overridden temporarily in only the current 
+thread or asyncio task with the context() method,
+
+    with config.context(unit_pressure='Pa', def_T=500.):
+        ...
+
+See PMConfig.context() for more information.
         
 """
     def __init__(self, load=True):
+        # Incremented whenever a parameter is written
+        self.revision = 0
         # detect the package installation directory
         install_dir = os.path.dirname( pm.__file__ )
         install_dir = os.path.abspath(install_dir)
@@ -199,12 +226,17 @@ values:
         # directories
         data_dir = os.path.join( install_dir, 'data')
         reg_dir = os.path.join( install_dir, 'registry')
+        # Cache bundles for the data directories (see dat.load())
+        cache_dir = os.path.join( 
+                os.environ.get('XDG_CACHE_HOME', os.path.join('~', '.cache')),
+                'pyromat')
 
         self.entries = {
             'install_dir': PMConfigEntry(default=install_dir, write=False, etype=str),
             'version' : PMConfigEntry(default=pm.__version__, write=False, etype=str),
             'config_file' : PMConfigEntry(default=default_config, append=True, etype=str),
             'config_verbose' : PMConfigEntry(default=False, etype=bool),
+            'startup_profile' : PMConfigEntry(default=False, etype=bool),
             'warning_verbose' : PMConfigEntry(default=True, etype=bool),
             'error_verbose' : PMConfigEntry(default=True, etype=bool),
             'dat_dir' : PMConfigEntry(default=data_dir, append=True, etype=str),
@@ -212,13 +244,19 @@ values:
             'dat_overwrite' : PMConfigEntry(default=True, etype=bool),
             'dat_exist_fatal' : PMConfigEntry(default=False, etype=bool),
             'dat_recursive' : PMConfigEntry(default=True, etype=bool),
+            'dat_lazy' : PMConfigEntry(default=True, etype=bool),
+            'dat_cache' : PMConfigEntry(default=False, etype=bool),
+            'dat_cache_dir' : PMConfigEntry(default=cache_dir, etype=str),
+            'dat_compact' : PMConfigEntry(default=False, etype=bool),
             'reg_dir' : PMConfigEntry(default=reg_dir, append=True, etype=str),
             'reg_verbose' : PMConfigEntry(default=True, etype=bool),
             'reg_overwrite' : PMConfigEntry(default=True, etype=bool),
             'reg_exist_fatal' : PMConfigEntry(default=False, etype=bool),
+            'reg_lazy' : PMConfigEntry(default=True, etype=bool),
             'def_T' : PMConfigEntry(default=298.15, etype=float),
             'def_p' : PMConfigEntry(default=1.01325, etype=float),
             'def_oob' : PMConfigEntry(default=np.nan, etype=float),
+            'mix_cache_size' : PMConfigEntry(default=32, etype=int),
             'unit_force' : PMConfigEntry(default='N', etype=str),
             'unit_energy' : PMConfigEntry(default='kJ', etype=str),
             'unit_temperature' : PMConfigEntry(default='K', etype=str),
@@ -283,8 +321,9 @@ Checks for unrecognized parameters and illegal values.
             lead += '   '
 
             temp_config = {}
-            with open(filename,'r') as ff:
-                exec(ff.read(),{},temp_config)
+            with profile('config', filename):
+                with open(filename,'r') as ff:
+                    exec(ff.read(),{},temp_config)
             # In Python 2.7, the code below used to work
             # Use exec() for 3.4 compatibility
             # Also, allowing access to globals() is a security problem.
@@ -352,16 +391,20 @@ This function is equivalent to
 pmconfig.entries[item].apply_default()
 """
         if item is None:
-            for item, entry in self.entries.iteritems():
+            for item, entry in self.entries.items():
                 entry.restore_default()
         else:
             self.entries[item].restore_default()
+        self.revision += 1
 
 
     def __getitem__(self, item):
         """Return the configuration value for an item
     value = config[item]
 """
+        state = _config_context.get()
+        if state is not None and item in state.values:
+            return state.values[item]
         if item not in self.entries:
             raise PMParamError('%s is not a PYroMat configuration parameter'%repr(item))
         return self.entries[item].value
@@ -375,6 +418,7 @@ pmconfig.entries[item].apply_default()
             raise PMParamError('%s is not a PYroMat configuration parameter'%repr(item))
         try:
             self.entries[item].write(value)
+            self.revision += 1
         except:
             print_error('Failed to write to configuration parameter, %s'%repr(item))
             tb.print_exception(*sys.exc_info())
@@ -382,12 +426,302 @@ pmconfig.entries[item].apply_default()
     def __contains__(self,item):
         return self.entries.__contains__(item)
 
+    def context(self, **kwarg):
+        """Override configuration parameters in the current context
+    with pmconfig.context(unit_pressure='Pa', def_T=500.):
+        ...
+
+Within the with block, reading the parameters given as keywords returns
+their override values instead of the global values.  The overrides are 
+stored in a contextvars.ContextVar, so they are only visible to the 
+thread or asyncio task that entered the block (and to tasks it creates
+while inside it).  Other threads and tasks continue to see the global
+configuration, so properties may be calculated in different units 
+concurrently without locking.  Contexts may be nested; the inner 
+context inherits the overrides of the outer one.
+
+Writing to the configuration inside the block still changes the global
+value, but a parameter that is overridden continues to read as its 
+override until the block exits.
+
+Only writable parameters that are not lists (like config_file) may be
+overridden.  Values are converted to the parameter's type, and invalid 
+parameters or values raise a PMParamError immediately.
+"""
+        values = {}
+        for item,value in kwarg.items():
+            if item not in self.entries:
+                raise PMParamError('%s is not a PYroMat configuration parameter'%repr(item))
+            entry = self.entries[item]
+            if not entry.write_allowed or entry.append:
+                raise PMParamError('%s cannot be overridden in a context'%repr(item))
+            if entry.etype:
+                try:
+                    value = entry.etype(value)
+                except:
+                    raise PMParamError('Expected %s, but got %s'%(repr(entry.etype), repr(value)))
+            values[item] = value
+        return PMConfigContext(values)
+
     def __iter__(self):
         return self.entries.__iter__()
 
 
 
 
+class _PMContextState:
+    """The configuration overrides of an active context
+
+state.values    A dictionary of the overridden parameters and their values
+state.plans     A cache for pm.units.plan() that belongs to this context
+state.plan_revision     The revision that the plans were calculated for
+"""
+    def __init__(self, values):
+        self.values = values
+        self.plans = {}
+        self.plan_revision = None
+
+
+class PMConfigContext:
+    """PYroMat Configuration Context
+
+This is the context manager returned by PMConfig.context().  On entry, 
+its overrides are merged with those of any context that is already 
+active, and on exit, the previous overrides are restored.  The same 
+instance may be entered more than once, and by more than one thread or
+task at a time.  The tokens that restore the previous overrides are
+kept in a ContextVar that belongs to the instance, so each thread or 
+task only ever resets the tokens that it created.
+"""
+    def __init__(self, values):
+        self.values = values
+        self._tokens = contextvars.ContextVar('pyromat_config_tokens', default=())
+
+    def __repr__(self):
+        return 'PMConfigContext(' + repr(self.values) + ')'
+
+    def __enter__(self):
+        outer = _config_context.get()
+        if outer is None:
+            values = self.values
+        else:
+            values = outer.values.copy()
+            values.update(self.values)
+        token = _config_context.set(_PMContextState(values))
+        self._tokens.set(self._tokens.get() + (token,))
+        return self
+
+    def __exit__(self, *exc):
+        tokens = self._tokens.get()
+        if not tokens:
+            raise PMParamError('The configuration context was not entered in this thread or task.')
+        _config_context.reset(tokens[-1])
+        self._tokens.set(tokens[:-1])
+        return False
+
+
+class PMProfile:
+    """PYroMat Startup Profile
+
+When profiling is enabled, pm.startup_profile is a PMProfile instance 
+that records the time and memory spent loading PYroMat.  Profiling is 
+enabled by setting the PYROMAT_PROFILE environment variable to anything
+other than '', '0', 'false', or 'no' before PYroMat is imported, or by 
+setting the 'startup_profile' configuration parameter in a config file.
+The environment variable also captures the configuration files, which 
+are read before the parameter is known.  Otherwise, the 'utility' phase
+includes the configuration.
+
+Each timed step is a dictionary in the records list with entries
+kind    'import', 'phase', 'config', 'dir', 'file', or 'class'
+name    The phase name, file, directory, or substance ID string
+depth   The number of records that enclose this one
+start   The start time in seconds after the profile began
+time    The elapsed time in seconds
+memory  The net memory allocated in bytes (None if not traced)
+Class records also have a 'class' entry with the name of the data class.
+
+The phases of the import are 'utility', 'config', 'modules', 'regload',
+and 'load', and a single 'import' record encloses them all.  Because 
+data are loaded lazily by default, substances that are requested after
+the import continue to add 'class' records until stop() is called.
+
+    >>> pm.startup_profile.total('phase', 'regload')
+    >>> pm.startup_profile.summary('class')
+    >>> print(pm.startup_profile)
+
+Memory is measured with the tracemalloc module, which slows the load
+considerably, so times measured with memory=False are more accurate.
+"""
+    def __init__(self, start=None, memory=True):
+        self.records = []
+        self.memory = memory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._tracing = False
+        now = time.perf_counter()
+        self.t0 = now if start is None else start
+        # The 'import' record stays open until finish() is called, and 
+        # the 'utility' phase accounts for the time before the profile
+        # was created.
+        self._import = self.record('import', 'pyromat')
+        self._import.__enter__()
+        self._import.entry['start'] = 0.
+        self._import.t0 = self.t0
+        if start is not None:
+            self.records.append({'kind':'phase', 'name':'utility', 'depth':1,
+                    'start':0., 'time':now - start, 'memory':None})
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        self._import.mem0 = tracemalloc.get_traced_memory()[0] \
+                if tracemalloc.is_tracing() else None
+
+    def __repr__(self):
+        return self.report()
+
+    def record(self, kind, name, **kwarg):
+        """Return a context manager that adds a record
+    with profile.record('phase', 'load'):
+        ...
+"""
+        return _PMProfileRecord(self, kind, name, kwarg)
+
+    def finish(self):
+        """Close the 'import' record (called at the end of the import)"""
+        if self._import is not None:
+            self._import.__exit__(None, None, None)
+            self._import = None
+
+    def stop(self):
+        """Stop recording and stop tracing memory if the profile started it"""
+        global _profile
+        self.finish()
+        if _profile is self:
+            _profile = None
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def select(self, kind=None, name=None):
+        """Return the records of a kind and/or name"""
+        return [rr for rr in self.records if 
+                (kind is None or rr['kind'] == kind) and 
+                (name is None or rr['name'] == name)]
+
+    def total(self, kind=None, name=None):
+        """Return the total time spent on the records of a kind and/or name
+    
+Nested records of the same kind are only counted once.
+"""
+        out = 0.
+        for rr in self.select(kind, name):
+            if not rr.get('nested'):
+                out += rr['time']
+        return out
+
+    def summary(self, key='kind'):
+        """Summarize the records grouped by one of their entries
+    summary = profile.summary('kind')
+        or
+    summary = profile.summary('class')
+
+Returns a dictionary keyed by the values of that entry.  Each value is 
+a dictionary with the 'count', total 'time', and total 'memory' of the
+records with that value.  Records without the entry are ignored, and 
+nested records of the same kind are only counted once.
+"""
+        out = {}
+        for rr in self.records:
+            if key not in rr or rr.get('nested'):
+                continue
+            this = out.setdefault(rr[key], {'count':0, 'time':0., 'memory':0})
+            this['count'] += 1
+            this['time'] += rr['time']
+            if rr['memory'] is None or this['memory'] is None:
+                this['memory'] = None
+            else:
+                this['memory'] += rr['memory']
+        return out
+
+    def report(self):
+        """Return a printable table of the phases, directories, files, and
+a summary by data class"""
+        out = 'PYroMat startup profile\n'
+        fmt = '%10.2f ms %10s  %s\n'
+        for rr in self.records:
+            if rr['kind'] == 'class':
+                continue
+            memory = '' if rr['memory'] is None else '%.1f kB'%(rr['memory']/1024.)
+            out += fmt%(1000*rr['time'], memory, 
+                    '  '*rr['depth'] + rr['kind'] + ': ' + rr['name'])
+        for pmclass,this in sorted(self.summary('class').items()):
+            memory = '' if this['memory'] is None else '%.1f kB'%(this['memory']/1024.)
+            out += fmt%(1000*this['time'], memory, 
+                    'class: ' + pmclass + ' (' + str(this['count']) + ' instances)')
+        return out
+
+
+class _PMProfileRecord:
+    """Context manager that times one PMProfile record (inner class)"""
+    def __init__(self, profile, kind, name, info):
+        self.profile = profile
+        self.kind = kind
+        self.name = name
+        self.info = info
+
+    def __enter__(self):
+        profile = self.profile
+        stack = profile._local.__dict__.setdefault('stack', [])
+        self.entry = {'kind':self.kind, 'name':self.name, 'depth':len(stack)}
+        self.entry.update(self.info)
+        # Recursive steps (e.g. sub-directories) are marked as nested so
+        # their time is not counted twice in the totals.
+        for parent in stack:
+            if parent['kind'] == self.kind:
+                self.entry['nested'] = True
+                break
+        stack.append(self.entry)
+        with profile._lock:
+            profile.records.append(self.entry)
+        self.mem0 = tracemalloc.get_traced_memory()[0] \
+                if tracemalloc.is_tracing() else None
+        self.t0 = time.perf_counter()
+        self.entry['start'] = self.t0 - profile.t0
+        return self.entry
+
+    def __exit__(self, *exc):
+        self.entry['time'] = time.perf_counter() - self.t0
+        if self.mem0 is not None and tracemalloc.is_tracing():
+            self.entry['memory'] = tracemalloc.get_traced_memory()[0] - self.mem0
+        else:
+            self.entry['memory'] = None
+        self.profile._local.stack.pop()
+        return False
+
+
+class _PMNoRecord:
+    """Context manager used by profile() when profiling is disabled"""
+    def __enter__(self):
+        return None
+    def __exit__(self, *exc):
+        return False
+
+_no_record = _PMNoRecord()
+
+
+def profile(kind, name, **kwarg):
+    """Time a step in the startup profile if profiling is enabled
+    with profile('dir', directory):
+        ...
+
+See PMProfile for more information.
+"""
+    if _profile is None:
+        return _no_record
+    return _profile.record(kind, name, **kwarg)
+
+
 def get_config( param, dtype=None, verbose=True ):
     """**DEPRECIATED**
 This is only left for reverse compatibility.  The present implementation
@@ -0,0 +1,44 @@
+"""Benchmarks for the ig and ig2 property routines
+
+These are not tests; pytest does not collect them.  Run them directly
+    python bench_ig.py
+to print a table of the time needed by _cp(), _h(), _s(), and h() for
+a few substances of each class.
+
+The temperatures are spread uniformly over all of each substance's
+temperature segments, and the best of several repetitions is reported.
+"""
+
+import pyromat as pm
+import numpy as np
+import time
+
+
+def best(fn, *varg, repeat=5, **kwarg):
+    """Return the shortest time of repeat calls in ms"""
+    tbest = np.inf
+    for count in range(repeat):
+        tstart = time.perf_counter()
+        fn(*varg, **kwarg)
+        tbest = min(tbest, time.perf_counter() - tstart)
+    return 1e3*tbest
+
+
+def bench_props(N=1000000, seed=0,
+        species=('ig.ClH', 'ig.HZr', 'ig.CoF2', 'ig.N2', 'ig.CO2', 'ig.H2O')):
+    """Benchmark _cp(), _h(), _s(), and h() on N temperatures"""
+    rng = np.random.default_rng(seed)
+    print('%-10s %6s %4s %10s %10s %10s %10s' % (
+        'substance', 'class', 'seg', '_cp (ms)', '_h (ms)', '_s (ms)', 'h (ms)'))
+    for sid in species:
+        igobj = pm.get(sid)
+        Tlim = igobj.data['Tlim']
+        T = rng.uniform(Tlim[0], Tlim[-1], N)
+        print('%-10s %6s %4d %10.1f %10.1f %10.1f %10.1f' % (
+            sid, igobj.data['class'], len(Tlim)-1, best(igobj._cp, T),
+            best(igobj._h, T), best(igobj._s, T), best(igobj.h, T=T)))
+
+
+if __name__ == '__main__':
+    pm.config['warning_verbose'] = False
+    bench_props()
@@ -0,0 +1,68 @@
+"""Benchmarks for the mp1 numerical inversion routines
+
+These are not tests; pytest does not collect them.  Run them directly
+    python bench_mp1.py
+to print a table of timing and iteration counts for each multi-phase
+substance.
+
+The density inversion, _d(), is benchmarked with and without the
+warm-start density grid.  The number of calls to _p() and the total
+number of points evaluated by those calls are reported.  The grid is
+built before timing begins, so its one-time cost is reported
+separately.
+"""
+
+import pyromat as pm
+import numpy as np
+import time
+
+
+class PCounter:
+    """Wrap a mp1 instance's _p() method to count its evaluations"""
+    def __init__(self, mp1obj):
+        self.mp1obj = mp1obj
+        self.fn = mp1obj._p
+        self.calls = 0
+        self.points = 0
+
+    def __call__(self, T, d, diff=0):
+        self.calls += 1
+        self.points += np.size(T)
+        return self.fn(T, d, diff)
+
+    def __enter__(self):
+        self.mp1obj._p = self
+        return self
+
+    def __exit__(self, *arg):
+        del self.mp1obj._p
+
+
+def bench_d(N=2000, seed=0):
+    """Benchmark mp1._d() with and without the warm-start grid"""
+    rng = np.random.default_rng(seed)
+    print('%-14s %6s %10s %8s %10s %10s' % (
+        'substance', 'warm', 'time (ms)', 'calls', 'points', 'per point'))
+    for mp1obj in pm.search(collection='mp'):
+        data = mp1obj.data
+        T = rng.uniform(data['Tlim'][0], data['Tlim'][1], N)
+        p = np.exp(rng.uniform(np.log(data['pt']),
+                               np.log(data['plim'][1]), N))
+
+        tstart = time.time()
+        mp1obj._d_compile()
+        tgrid = time.time() - tstart
+
+        for warm in (False, True):
+            with PCounter(mp1obj) as pc:
+                tstart = time.time()
+                mp1obj._d(T, p, warm=warm)
+                t = time.time() - tstart
+            print('%-14s %6s %10.2f %8d %10d %10.2f' % (
+                data['id'], warm, 1e3*t, pc.calls, pc.points, pc.points/N))
+        print('%-14s %6s %10.2f' % ('', 'grid', 1e3*tgrid))
+
+
+if __name__ == '__main__':
+    pm.config['warning_verbose'] = False
+    bench_d()
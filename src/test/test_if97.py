@@ -0,0 +1,358 @@
+import pyromat as pm
+import numpy as np
+import json
+import os
+from pytest import approx, raises
+import pytest
+
+# The IF-97 steam data are no longer distributed with PYroMat (steam
+# moved to the mp1 class), so the coefficients are kept with the tests.
+IF97_DATA = os.path.join(os.path.dirname(__file__), 'if97_H2O.hpd')
+
+# Verification values from the IAPWS IF-97 release, Tables 5, 15, and 42
+# T (K), p (MPa), v (m3/kg), h (kJ/kg), u (kJ/kg), s (kJ/kg/K), cp (kJ/kg/K)
+REF_TP = {
+    1: [(300., 3., 0.100215168e-2, 0.115331273e3, 0.112324818e3, 0.392294792, 0.417301218e1),
+        (300., 80., 0.971180894e-3, 0.184142828e3, 0.106448356e3, 0.368563852, 0.401008987e1),
+        (500., 3., 0.120241800e-2, 0.975542239e3, 0.971934985e3, 0.258041912e1, 0.465580682e1)],
+    2: [(300., 0.0035, 0.394913866e2, 0.254991145e4, 0.241169160e4, 0.852238967e1, 0.191300162e1),
+        (700., 0.0035, 0.923015898e2, 0.333568375e4, 0.301262819e4, 0.101749996e2, 0.208141274e1),
+        (700., 30., 0.542946619e-2, 0.263149474e4, 0.246861076e4, 0.517540298e1, 0.103505092e2)],
+    5: [(1500., 0.5, 0.138455090e1, 0.521976855e4, 0.452749310e4, 0.965408875e1, 0.261609445e1),
+        (1500., 30., 0.230761299e-1, 0.516723514e4, 0.447495124e4, 0.772970133e1, 0.272724317e1),
+        (2000., 30., 0.311385219e-1, 0.657122604e4, 0.563707038e4, 0.853640523e1, 0.288569882e1)]}
+
+# Region 3 verification values, Table 33
+# T (K), d (kg/m3), p (MPa), h (kJ/kg), u (kJ/kg), s (kJ/kg/K), cp (kJ/kg/K)
+REF_TD = [
+    (650., 500., 0.255837018e2, 0.186343019e4, 0.181226279e4, 0.405427273e1, 0.138935717e2),
+    (650., 200., 0.222930643e2, 0.237512401e4, 0.226365868e4, 0.485438792e1, 0.446579342e2),
+    (750., 500., 0.783095639e2, 0.225868845e4, 0.210206932e4, 0.446971906e1, 0.634165359e1)]
+
+# Saturation verification values, Tables 35 and 36
+# T (K), p (MPa)
+REF_PS = [(300., 0.353658941e-2), (500., 0.263889776e1), (600., 0.123443146e2)]
+REF_TS = [(0.372755919e3, 0.1), (0.453035632e3, 1.), (0.584149488e3, 10.)]
+
+
+# Region 3 subregion boundary verification values from the supplementary
+# release on v(T,p) in region 3 (SR5-05)
+# boundary, p (MPa), T (K)
+REF_T3B = [('ab', 40., 693.0341408), ('cd', 25., 649.3659208),
+    ('ef', 40., 713.9593992), ('gh', 23., 649.8873759),
+    ('ij', 23., 651.5778091), ('jk', 23., 655.8338344),
+    ('mn', 22.8, 649.6054133), ('op', 22.8, 650.0106943),
+    ('qu', 22., 645.6355027), ('rx', 22., 648.2622754),
+    ('uv', 22.3, 647.7996121), ('wx', 22.3, 648.2049480)]
+
+# Region 3 backward equation verification values, SR5-05
+# subregion, T (K), p (MPa), v (m3/kg)
+REF_V3 = [
+    ('a', 630., 50., 0.001470853100), ('a', 670., 80., 0.001503831359),
+    ('b', 710., 50., 0.002204728587), ('b', 750., 80., 0.001973692940),
+    ('c', 630., 20., 0.001761696406), ('c', 650., 30., 0.001819560617),
+    ('d', 656., 26., 0.002245587720), ('d', 670., 30., 0.002506897702),
+    ('e', 661., 26., 0.002970225962), ('e', 675., 30., 0.003004627086),
+    ('f', 671., 26., 0.005019029401), ('f', 690., 30., 0.004656470142),
+    ('g', 649., 23.6, 0.002163198378), ('g', 650., 24., 0.002166044161),
+    ('h', 652., 23.6, 0.002651081407), ('h', 654., 24., 0.002967802335),
+    ('i', 653., 23.6, 0.003273916816), ('i', 655., 24., 0.003550329864),
+    ('j', 655., 23.5, 0.004545001142), ('j', 660., 24., 0.005100267704),
+    ('k', 660., 23., 0.006109525997), ('k', 670., 24., 0.006427325645),
+    ('l', 646., 22.6, 0.002117860851), ('l', 646., 23., 0.002062374674),
+    ('m', 648.6, 22.6, 0.002533063780), ('m', 649.3, 22.8, 0.002572971781),
+    ('n', 649., 22.6, 0.002923432711), ('n', 649.7, 22.8, 0.002913311494),
+    ('o', 649.1, 22.6, 0.003131208996), ('o', 649.9, 22.8, 0.003221160278),
+    ('p', 649.4, 22.6, 0.003715596186), ('p', 650.2, 22.8, 0.003664754790),
+    ('q', 640., 21.1, 0.001970999272), ('q', 643., 21.8, 0.002043919161),
+    ('r', 644., 21.1, 0.005251009921), ('r', 648., 21.8, 0.005256844741),
+    ('s', 635., 19.1, 0.001932829079), ('s', 638., 20., 0.001985387227),
+    ('t', 626., 17., 0.008483262001), ('t', 640., 20., 0.006227528101),
+    ('u', 644.6, 21.5, 0.002268366647), ('u', 646.1, 22., 0.002296350553),
+    ('v', 648.6, 22.5, 0.002832373260), ('v', 647.9, 22.3, 0.002811424405),
+    ('w', 647.5, 22.15, 0.003694032281), ('w', 648.1, 22.3, 0.003622226305),
+    ('x', 648., 22.11, 0.004528072649), ('x', 649., 22.3, 0.004556905799),
+    ('y', 646.84, 22., 0.002698354719), ('y', 647.05, 22.064, 0.002717655648),
+    ('z', 646.89, 22., 0.003798732962), ('z', 647.15, 22.064, 0.003701940009)]
+
+
+@pytest.fixture(scope='module')
+def steam():
+    with open(IF97_DATA, 'r') as ff:
+        data = json.load(ff)
+    data['fromfile'] = IF97_DATA
+    return pm.reg.registry['if97'](data)
+
+
+class TestRefs:
+
+    @pytest.mark.parametrize('region', (1, 2, 5))
+    def test_gibbs_regions(self, steam, region):
+        for T,p,v,h,u,s,cp in REF_TP[region]:
+            p *= 10.    # MPa to bar
+            assert steam._region(np.array([T]), np.array([p]))[0] == region
+            assert steam.d(T=T, p=p) == approx(1./v, rel=1e-8)
+            assert steam.h(T=T, p=p) == approx(h, rel=1e-8)
+            assert steam.e(T=T, p=p) == approx(u, rel=1e-8)
+            assert steam.s(T=T, p=p) == approx(s, rel=1e-8)
+            assert steam.cp(T=T, p=p) == approx(cp, rel=1e-8)
+
+    def test_region3(self, steam):
+        # The reference pressures are only given to 9 digits, and the
+        # properties near the critical point are sensitive to them.
+        for T,d,p,h,u,s,cp in REF_TD:
+            p *= 10.
+            assert steam._region(np.array([T]), np.array([p]))[0] == 3
+            assert steam.d(T=T, p=p) == approx(d, rel=1e-7)
+            assert steam.h(T=T, p=p) == approx(h, rel=1e-7)
+            assert steam.e(T=T, p=p) == approx(u, rel=1e-7)
+            assert steam.s(T=T, p=p) == approx(s, rel=1e-7)
+            assert steam.cp(T=T, p=p) == approx(cp, rel=1e-6)
+
+    def test_arrays(self, steam):
+        # All of the reference points at once
+        ref = REF_TP[1] + REF_TP[2] + REF_TP[5]
+        T = np.array([rr[0] for rr in ref])
+        p = 10.*np.array([rr[1] for rr in ref])
+        h,s,d = steam.hsd(T=T, p=p)
+        assert d == approx(1./np.array([rr[2] for rr in ref]), rel=1e-8)
+        assert h == approx(np.array([rr[3] for rr in ref]), rel=1e-8)
+        assert s == approx(np.array([rr[5] for rr in ref]), rel=1e-8)
+
+    def test_ps(self, steam):
+        for T,p in REF_PS:
+            assert steam.ps(T=T) == approx(10.*p, rel=1e-8)
+
+    def test_Ts(self, steam):
+        for T,p in REF_TS:
+            assert steam.Ts(p=10.*p) == approx(T, rel=1e-8)
+
+    def test_sat(self, steam):
+        T = np.linspace(280., 620., 18)
+        p = steam.ps(T=T)
+        assert steam.Ts(p=p) == approx(T, rel=1e-6)
+        # The saturated liquid and vapor are the region 1 and 2 values
+        hL,hV = steam.hs(T=T)
+        assert hL == approx(steam.h(T=T, x=0.), rel=1e-10)
+        assert hV == approx(steam.h(T=T, x=1.), rel=1e-10)
+        dL,dV = steam.ds(p=p)
+        assert dL == approx(steam.d(T=T, p=p*1.0001), rel=1e-3)
+        assert dV == approx(steam.d(T=T, p=p*0.9999), rel=1e-3)
+        # Mixtures are linear in specific volume
+        v = 0.5/dL + 0.5/dV
+        assert steam.d(T=T, x=0.5) == approx(1./v, rel=1e-10)
+
+
+def p3(steam, T, F):
+    """Pressure (bar) from the region 3 values returned by _f3()"""
+    n,t,f,fx = F[:4]
+    return n*n*fx * steam.data['dc'] * steam.data['R'] * T / 1e2
+
+
+class TestRegion3:
+
+    @pytest.fixture
+    def refs(self):
+        sub = np.array([rr[0] for rr in REF_V3])
+        T = np.array([rr[1] for rr in REF_V3])
+        p = 10.*np.array([rr[2] for rr in REF_V3])
+        v = np.array([rr[3] for rr in REF_V3])
+        return sub, T, p, v
+
+    @pytest.mark.parametrize('key,p,T', REF_T3B)
+    def test_t3b(self, steam, key, p, T):
+        assert steam._t3b(key, 10.*p) == approx(T, rel=1e-9)
+
+    def test_v3sub(self, steam, refs):
+        sub,T,p,v = refs
+        assert (steam._region(T, p) == 3).all()
+        assert list(steam._v3sub(T, p)) == list(sub)
+
+    def test_v3(self, steam, refs):
+        sub,T,p,v = refs
+        assert steam._v3(T, p) == approx(v, rel=1e-9)
+        # The backward values are used without polish
+        F = steam._f3(T, p, polish=False)
+        assert F[0] == approx(1./(v*steam.data['dc']), rel=1e-9)
+
+    def test_d(self, steam, refs):
+        sub,T,p,v = refs
+        d = steam.d(T=T, p=p)
+        # The polished density must reproduce the pressure
+        assert p3(steam, T, steam._f3(T, p)) == approx(p, rel=1e-12)
+        # The backward equations are consistent with the fundamental
+        # equation to about 1e-5 except in subregions 3u-3z, very close 
+        # to the critical point, where the isotherms are nearly flat.
+        I = sub < 'u'
+        assert d[I] == approx(1./v[I], rel=1e-5)
+        assert d[~I] == approx(1./v[~I], rel=2e-2)
+
+    def test_near_critical(self, steam):
+        # At the critical point, dp/dd vanishes with its second
+        # derivative, so the density is only determined to about the
+        # cube root of the precision of the pressure.
+        assert steam.d(T=647.096, p=220.64) == approx(322., rel=1e-4)
+        # Points around the critical point
+        T = np.array([647.1, 647.2, 647.5, 648., 650., 
+                      647.096, 646., 647., 647.05])
+        p = np.array([220.64, 221., 221.5, 222., 223., 
+                      225., 215., 220.5, 220.6])
+        assert (steam._region(T, p) == 3).all()
+        d = steam.d(T=T, p=p)
+        assert np.isfinite(d).all()
+        assert p3(steam, T, steam._f3(T, p)) == approx(p, rel=1e-10)
+        assert d == approx(1./steam._v3(T, p), rel=2e-2)
+        for index in range(T.size):
+            assert d[index] == approx(steam.d(T=T[index], p=p[index]), rel=1e-12)
+
+    @pytest.mark.parametrize('p', (220.7, 221.5, 223., 230.))
+    def test_isobar(self, steam, p):
+        # Above the critical pressure, the density must fall steadily
+        # with temperature across all of the subregion boundaries
+        T = np.linspace(640., 660., 401)
+        d = steam.d(T=T, p=p)
+        assert (np.diff(d) < 0.).all()
+
+
+class TestArrays:
+
+    @pytest.fixture
+    def mixed(self):
+        # T (K), p (bar) in regions 1, 2, 3, 5 and near their boundaries
+        T = np.array([
+                [300., 500., 620., 630., 650.],
+                [700., 700., 750., 1073., 1074.],
+                [1500., 2000., 400., 640., 900.]])
+        p = np.array([
+                [30., 800., 200., 200., 255.],
+                [300., 320., 783., 50., 50.],
+                [5., 300., 0.1, 210., 1000.]])
+        return T, p
+
+    def test_regions(self, steam, mixed):
+        T,p = mixed
+        r = steam._region(T.ravel(), p.ravel()).reshape(T.shape)
+        # Make sure the points do span the regions
+        assert set(r.ravel()) == {1, 2, 3, 5}
+
+    @pytest.mark.parametrize('prop', ('h', 'd', 's', 'e', 'cp', 'cv', 'gam'))
+    def test_elementwise(self, steam, mixed, prop):
+        # Arrays spanning several regions must give the same values as
+        # the individual points
+        T,p = mixed
+        fn = getattr(steam, prop)
+        result = fn(T=T, p=p)
+        assert result.shape == T.shape
+        for index in np.ndindex(T.shape):
+            assert result[index] == approx(fn(T=T[index], p=p[index]), rel=1e-12)
+
+    @pytest.mark.parametrize('prop', ('h', 'd', 's', 'e', 'cp', 'cv'))
+    def test_shape(self, steam, prop):
+        fn = getattr(steam, prop)
+        assert np.shape(fn(T=500., p=30.)) == ()
+        assert np.shape(fn(T=[500.], p=30.)) == (1,)
+        assert np.shape(fn(T=[[500., 900.]], p=[[30.],[300.]])) == (2,2)
+        assert np.shape(fn(T=[300., 400., 500.], x=0.5)) == (3,)
+        assert np.shape(fn(p=[[1., 10.]], x=1.)) == (1,2)
+
+    def test_hsd_shape(self, steam, mixed):
+        T,p = mixed
+        for value in steam.hsd(T=T, p=p):
+            assert value.shape == T.shape
+        for value in steam.hsd(T=500., p=30.):
+            assert np.shape(value) == ()
+
+    def test_oob(self, steam):
+        with raises(pm.utility.PMParamError):
+            steam.h(T=[300., 5000.], p=1.)
+
+
+class TestInverse:
+
+    @pytest.fixture
+    def states(self):
+        # T (K), p (bar) that straddle the region boundaries
+        # 623.15K between 1 and 3, B23 between 2 and 3, 1073.15K
+        # between 2 and 5, and the saturation line between 1 and 2.
+        T = np.array([300., 450., 620., 626., 640., 700., 700.,
+                      800., 860., 1070., 1076., 1500.])
+        p = np.array([30., 9.9, 200., 200., 300., 300., 320.,
+                      900., 900., 50., 50., 5.])
+        return T, p
+
+    def test_T_h(self, steam, states):
+        T,p = states
+        h = steam.h(T=T, p=p)
+        # The IF-97 backward equations are accurate to 25mK in region 1
+        assert steam.T_h(h, p=p) == approx(T, abs=0.025)
+
+    def test_T_s(self, steam, states):
+        T,p = states
+        s = steam.s(T=T, p=p)
+        assert steam.T_s(s, p=p) == approx(T, abs=0.025)
+
+    def test_T_h_sat(self, steam):
+        # Inside the dome, T_h returns the saturation temperature and the
+        # quality
+        p = np.array([0.1, 1., 10., 100.])
+        x = np.array([0.1, 0.4, 0.7, 0.9])
+        h = steam.h(p=p, x=x)
+        s = steam.s(p=p, x=x)
+        T,xx = steam.T_h(h, p=p, quality=True)
+        assert T == approx(steam.Ts(p=p), rel=1e-10)
+        assert xx == approx(x, abs=1e-8)
+        T,xx = steam.T_s(s, p=p, quality=True)
+        assert T == approx(steam.Ts(p=p), rel=1e-10)
+        assert xx == approx(x, abs=1e-8)
+
+
+class TestStateProps:
+
+    @pytest.fixture
+    def states(self):
+        # Regions 1, 2, 3, 5
+        T = np.array([300., 700., 650., 1500.])
+        p = np.array([30., 0.035, 255.837018, 5.])
+        return T, p
+
+    @pytest.mark.parametrize('props', (('h',), ('T','p','x'), ('s','d','cv'), ('gam','v','e','cp')))
+    def test_props(self, steam, states, props):
+        # Only the requested properties are returned, and they must be 
+        # the same as the full state
+        T,p = states
+        for arg in ({'T':T, 'p':p}, {'T':T[:2], 'x':0.5}, {'p':p[:2], 'x':0.2}):
+            full = steam.state(**arg)
+            part = steam.state(props=props, **arg)
+            assert set(part.keys()) == set(props)
+            for prop in props:
+                assert part[prop] == approx(full[prop], rel=1e-12)
+
+    def test_props_values(self, steam, states):
+        T,p = states
+        sd = steam.state(T=T, p=p)
+        assert set(sd.keys()) == {'T','p','d','v','x','e','h','s','cp','cv','gam'}
+        for prop in ('d','e','h','s','cp','cv','gam'):
+            assert sd[prop] == approx(getattr(steam, prop)(T=T, p=p), rel=1e-12)
+        assert sd['v'] == approx(1./sd['d'], rel=1e-12)
+        assert list(steam.state(T=T, p=p, props='s').keys()) == ['s']
+
+    def test_props_illegal(self, steam, states):
+        T,p = states
+        with raises(pm.utility.PMParamError):
+            steam.state(T=T, p=p, props=('h','q'))
+        with raises(pm.utility.PMParamError):
+            steam.state(T=T, p=p, props='hs')
+
+    def test_props_cheap(self, steam, states, monkeypatch):
+        # T, p, and x do not need any of the regions to be evaluated, so
+        # the region 3 density iteration must not run.
+        T,p = states
+        def fail(*varg, **kwarg):
+            raise AssertionError('_f3() should not be called')
+        monkeypatch.setattr(steam, '_f3', fail)
+        sd = steam.state(T=T, p=p, props=('T','p','x'))
+        assert sd['T'] == approx(T)
+        assert sd['p'] == approx(p)
+        assert sd['x'] == approx(-np.ones(T.shape))
+        with raises(AssertionError):
+            steam.state(T=T, p=p, props=('T','d'))
@@ -105,6 +105,397 @@ class TestGeneral:
     def test_Y(self, gas, expect):
         assert pm.get(gas).Y() == approx(expect)
 
+    def test_coef(self):
+        # The searchsorted segment lookup must agree with _crange(),
+        # including at the segment boundaries
+        igobj = pm.get('ig.O2')
+        Tlim = np.array(igobj.data['Tlim'])
+        T = np.concatenate((np.linspace(Tlim[0], Tlim[-1], 101), 
+                Tlim, Tlim[1:-1] - 1e-6, [Tlim[0] - 1., Tlim[-1] + 1.]))
+        C,I = igobj._coef(T)
+        # Only the last two are out-of-bounds
+        assert I[:-2].all() and not I[-2:].any()
+        T = T[I]
+        for index in range(len(Tlim)-1):
+            J = igobj._crange(T, index)
+            expect = np.array(igobj.data['C'][index])[:,np.newaxis]
+            assert C[:,J] == approx(np.broadcast_to(expect, C[:,J].shape))
+
+    def test_segments(self):
+        # Every in-bounds temperature must be in exactly one segment, and
+        # the segments must agree with _crange()
+        igobj = pm.get('ig.BH3O3')
+        Tlim = np.array(igobj.data['Tlim'])
+        T = np.concatenate((np.linspace(Tlim[0], Tlim[-1], 101), 
+                Tlim, Tlim[1:-1] - 1e-6, [Tlim[0] - 1., Tlim[-1] + 1.]))
+        count = np.zeros(T.shape, dtype=int)
+        for C,I in igobj._segments(T):
+            index = [ii for ii,cc in enumerate(igobj.data['C']) if (cc == C).all()]
+            assert len(index) == 1
+            assert (I == igobj._crange(T, index[0])).all()
+            count[I] += 1
+        assert (count[:-2] == 1).all() and (count[-2:] == 0).all()
+        # Temperatures in one segment are not indexed
+        T = np.linspace(Tlim[1], Tlim[2], 11)
+        segments = list(igobj._segments(T))
+        assert len(segments) == 1
+        assert segments[0][1] is Ellipsis
+        assert segments[0][0] == approx(igobj.data['C'][1])
+
+    @pytest.mark.parametrize('sub', ('ig.air', 'ig.f5', 'ig.h35'))
+    def test_mix_coef(self, sub):
+        # The merged mixture polynomial must agree with the weighted sum
+        # of the constituents' properties
+        mix = pm.get(sub)
+        mix._bootstrap()
+        T = np.concatenate((np.linspace(mix._Tlim[0], mix._Tlim[1], 101), 
+                mix._Tseg))
+        cp = 0.
+        h = 0.
+        s = 0.
+        for ss,x in mix._x.items():
+            spec = pm.get(ss)
+            cp += x*spec._cp(T)
+            h += x*spec._h(T)[0]
+            s += x*spec._s(T)[0]
+        assert mix._cp(T) == approx(cp, rel=1e-10)
+        assert mix._h(T)[0] == approx(h, rel=1e-10, abs=1e-6)
+        assert mix._s(T)[0] == approx(s, rel=1e-10)
+
+    @pytest.mark.parametrize('sub', ('ig.N2', 'ig.BH3O3', 'ig.air', 'ig.f5'))
+    @pytest.mark.parametrize('prop', ('h', 'e', 's'))
+    def test_Tinv(self, sub, prop):
+        # The inverse table and its Newton step must recover temperature
+        # everywhere, including at the segment boundaries and limits
+        igobj = pm.get(sub)
+        if hasattr(igobj, '_bootstrap'):
+            igobj._bootstrap()
+        Tseg = igobj._Tseg
+        T = np.concatenate((np.linspace(Tseg[0], Tseg[-1], 1001), Tseg))
+        fn = getattr(igobj, '_' + prop)
+        assert igobj._Tinv(prop, fn(T)[0]) == approx(T, rel=1e-10)
+        # The table alone is within its tolerance at the midpoints
+        Ya,Ta,Da,Yb,Tb,Db = igobj._invtab[prop]
+        Tm = 0.5*(Ta + Tb)
+        yy,yyT = fn(Tm, diff=True)[:2]
+        t = (yy - Ya) / (Yb - Ya)
+        hy = Yb - Ya
+        Tt = (1.+2.*t)*(1.-t)**2*Ta + t*(1.-t)**2*hy*Da + \
+                t*t*(3.-2.*t)*Tb + t*t*(t-1.)*hy*Db
+        assert Tt == approx(Tm, rel=1e-6)
+        # Values beyond the limits are out of bounds
+        T = igobj._Tinv(prop, fn(Tseg[[0,-1]])[0] + [-1., 1.])
+        assert T[0] < Tseg[0] and T[1] > Tseg[-1]
+
+
+class TestStateProps:
+
+    @pytest.fixture
+    def states(self):
+        T = np.linspace(400., 1500., 5)
+        p = np.linspace(1., 20., 5)
+        return T, p
+
+    @pytest.mark.parametrize('sub', ('ig.O2', 'ig.BH3O3', 'ig.air'), ids=('oxygen-ig2', 'boric acid-ig', 'air-ig'))
+    @pytest.mark.parametrize('props', (('h',), ('T','p'), ('s','d','cv'), ('gam','v','e','cp')))
+    def test_props(self, sub, props, states):
+        # Only the requested properties are returned, and they must be 
+        # the same as the full state
+        igobj = pm.get(sub)
+        T,p = states
+        h = igobj.h(T=T, p=p)
+        for arg in ({'T':T, 'p':p}, {'h':h, 'p':p}):
+            full = igobj.state(**arg)
+            part = igobj.state(props=props, **arg)
+            assert set(part.keys()) == set(props)
+            for prop in props:
+                assert part[prop] == approx(full[prop], rel=1e-12)
+
+    @pytest.mark.parametrize('sub', ('ig.O2', 'ig.BH3O3', 'ig.air'), ids=('oxygen-ig2', 'boric acid-ig', 'air-ig'))
+    def test_props_str(self, sub, states):
+        igobj = pm.get(sub)
+        T,p = states
+        sd = igobj.state(T=T, p=p, props='s')
+        assert list(sd.keys()) == ['s']
+        assert sd['s'] == approx(igobj.s(T=T, p=p))
+        assert set(igobj.state(T=T, p=p).keys()) == \
+                {'T','p','d','v','e','h','s','cp','cv','gam'}
+
+    @pytest.mark.parametrize('sub', ('ig.O2', 'ig.BH3O3', 'ig.air'), ids=('oxygen-ig2', 'boric acid-ig', 'air-ig'))
+    def test_props_illegal(self, sub, states):
+        igobj = pm.get(sub)
+        T,p = states
+        with raises(pm.utility.PMParamError):
+            igobj.state(T=T, p=p, props=('h','x'))
+        with raises(pm.utility.PMParamError):
+            igobj.state(T=T, p=p, props='hs')
+
+    @pytest.mark.parametrize('sub', ('ig.O2', 'ig.BH3O3', 'ig.air'), ids=('oxygen-ig2', 'boric acid-ig', 'air-ig'))
+    def test_props_solvers(self, sub, states):
+        igobj = pm.get(sub)
+        T,p = states
+        h = igobj.h(T=T, p=p)
+        # No inversion is needed for T,p properties
+        with pm.stats.collect() as stats:
+            igobj.state(T=T, p=p, props=('T','p','d','v','h','cp'))
+        assert stats.records == []
+        # Inverse arguments are only inverted once, no matter how many
+        # properties are requested
+        for props in (('T',), ('T','p','h','s','gam'), None):
+            with pm.stats.collect() as stats:
+                igobj.state(h=h, p=p, props=props)
+            assert [(rr['solver'], rr['target']) for rr in stats.records] == \
+                    [('_Tinv', '_h')]
+
+
+class TestVarMix:
+    @pytest.fixture
+    def air(self):
+        air = pm.get('ig.air')
+        air._bootstrap()
+        return air
+
+    @pytest.fixture
+    def mix(self, air):
+        return pm.mixture.PMVarMix(list(air._x))
+
+    def test_fixed(self, air, mix):
+        # A constant composition must reproduce igmix
+        X = [air._x[ss] for ss in mix.species]
+        Y = [air._y[ss] for ss in mix.species]
+        T = np.linspace(300., 3000., 11)
+        assert mix.h(T, X=X) == approx(air.h(T=T))
+        assert mix.e(T, Y=Y) == approx(air.e(T=T))
+        assert mix.cp(T, X=X) == approx(air.cp(T=T))
+        assert mix.cv(T, X=X) == approx(air.cv(T=T))
+        assert mix.gam(T, X=X) == approx(air.gam(T=T))
+        assert mix.s(T, 3., X=X) == approx(air.s(T=T, p=3.))
+        assert mix.mw(X=X) == approx(air.mw())
+        assert mix.R(Y=Y) == approx(air.R())
+
+    def test_vector(self, mix):
+        # Each row of the composition is a pure species
+        N = len(mix.species)
+        X = np.eye(N)
+        T = np.linspace(300., 3000., N)
+        h = mix.h(T, X=X)
+        for ii,ss in enumerate(mix.species):
+            assert h[ii] == approx(pm.get(ss).h(T=T[ii]))
+        assert mix.s(T, 2., X=X) == approx(
+                [pm.get(ss).s(T=T[ii], p=2.)[0] for ii,ss in enumerate(mix.species)])
+        assert mix.T(h=h, X=X) == approx(T)
+        assert mix.T(e=mix.e(T, X=X), X=X) == approx(T)
+
+    def test_broadcast(self, mix):
+        X = np.random.default_rng(0).random((3, 1, len(mix.species)))
+        T = np.linspace(300., 3000., 4)
+        h = mix.h(T, X=X)
+        assert h.shape == (3,4)
+        assert mix.T(h=h, X=X) == approx(np.broadcast_to(T, (3,4)))
+
+    def test_mixing(self, mix):
+        X = np.full(len(mix.species), 1.)
+        ds = mix.s(1000., X=X, mixing=True) - mix.s(1000., X=X)
+        expect = pm.units.const_Ru * np.log(len(mix.species)) / mix.mw(X=X)
+        assert ds == approx(expect)
+
+    def test_errors(self, mix):
+        N = len(mix.species)
+        with raises(pm.utility.PMParamError):
+            mix.h(300.)
+        with raises(pm.utility.PMParamError):
+            mix.h(300., X=np.ones(N), Y=np.ones(N))
+        with raises(pm.utility.PMParamError):
+            mix.h(300., X=np.ones(N+1))
+        with raises(pm.utility.PMParamError):
+            mix.h(300., X=-np.ones(N))
+        with raises(pm.utility.PMParamError):
+            mix.T(X=np.ones(N))
+        with raises(pm.utility.PMParamError):
+            pm.mixture.PMVarMix(['ig.N2', 'mp.H2O'])
+
+
+class TestMix:
+    @pytest.fixture
+    def contents(self):
+        return pm.get('ig.air').data['contents']
+
+    def test_air(self, contents):
+        # A runtime mixture must match the one loaded from its file
+        air = pm.get('ig.air')
+        mix = pm.mix(contents)
+        T = np.linspace(300., 3000., 11)
+        assert mix.h(T=T) == approx(air.h(T=T))
+        assert mix.s(T=T, p=3.) == approx(air.s(T=T, p=3.))
+        assert mix.mw() == approx(air.mw())
+        assert mix.X() == approx(air.X())
+        assert mix.Tlim() == approx(air.Tlim())
+
+    def test_bymass(self):
+        mix = pm.mix({'ig.N2':0.7, 'ig.O2':0.3}, bymass=True)
+        assert mix.Y() == approx({'ig.N2':0.7, 'ig.O2':0.3})
+
+    def test_cache(self, contents):
+        mix = pm.mix(contents)
+        # Order and scale do not matter
+        reverse = {ss:2*contents[ss] for ss in reversed(list(contents))}
+        assert pm.mix(reverse) is mix
+        assert pm.mix(contents, bymass=True) is not mix
+        pm.mixture.clear_cache()
+        assert pm.mix(contents) is not mix
+
+    def test_cache_size(self):
+        size = pm.config['mix_cache_size']
+        try:
+            pm.config['mix_cache_size'] = 2
+            first = pm.mix({'ig.N2':1., 'ig.O2':1.})
+            for qty in (2., 3.):
+                pm.mix({'ig.N2':1., 'ig.O2':qty})
+            assert len(pm.mixture._cache) == 2
+            assert pm.mix({'ig.N2':1., 'ig.O2':1.}) is not first
+        finally:
+            pm.config['mix_cache_size'] = size
+
+    @pytest.mark.parametrize('contents', 
+            ({}, {'mp.H2O':1.}, {'ig.N2':-1.}, {'ig.N2':0.}, {'ig.XX':1.}))
+    def test_errors(self, contents):
+        with raises(pm.utility.PMParamError):
+            pm.mix(contents)
+
+
+class TestBatch:
+    # Species with different temperature limits and both classes
+    species = ['ig.N2', 'ig.H2O', 'ig.Al+', 'ig.Al2', 'ig.C10H21', 'ig.CH4']
+
+    @pytest.mark.parametrize('prop', ('cp', 'cv', 'gam', 'h', 'e', 's', 'g'))
+    def test_props(self, prop):
+        # Each row must match the species' own property
+        batch = pm.batch(self.species)
+        T = np.concatenate((np.unique(batch.Tlim()), 
+                np.linspace(200., 6000., 51)))
+        if prop in ('s', 'g'):
+            out = getattr(batch, prop)(T, 3.)
+        else:
+            out = getattr(batch, prop)(T)
+        assert out.shape == (len(self.species), T.size)
+        for row,ss in zip(out, self.species):
+            sub = pm.get(ss)
+            Tmin,Tmax = sub.Tlim()
+            I = np.logical_and(T >= Tmin, T <= Tmax)
+            if prop == 'g':
+                ref = sub.h(T=T[I]) - T[I]*sub.s(T=T[I], p=3.)
+            elif prop == 's':
+                ref = sub.s(T=T[I], p=3.)
+            else:
+                ref = getattr(sub, prop)(T=T[I])
+            assert row[I] == approx(ref, rel=1e-12, abs=1e-9)
+            assert np.isnan(row[~I]).all()
+
+    def test_shape(self):
+        batch = pm.batch(self.species)
+        assert batch.h(300.).shape == (len(self.species),)
+        assert batch.s(np.ones((2,3))*500., [1., 2., 3.]).shape == \
+                (len(self.species), 2, 3)
+        assert batch.mw() == approx([pm.get(ss).mw() for ss in self.species])
+
+    def test_errors(self):
+        with raises(pm.utility.PMParamError):
+            pm.batch([])
+        with raises(pm.utility.PMParamError):
+            pm.batch(['ig.N2', 'mp.H2O'])
+        with raises(pm.utility.PMParamError):
+            pm.batch(self.species).h(T=1e5)
+
+
+class TestEquilibrium:
+    species = ['ig.N2', 'ig.O2', 'ig.H2', 'ig.H2O', 'ig.HO', 'ig.H', 
+            'ig.O', 'ig.NO', 'ig.Ar']
+    # Stoichiometric hydrogen and air
+    X0 = [0.78, 0.21, 0.42, 0., 0., 0., 0., 0., 0.01]
+
+    @pytest.fixture
+    def eq(self):
+        return pm.equilibrium.PMEquilibrium(self.species)
+
+    def test_elements(self, eq):
+        assert eq.elements == ('Ar', 'H', 'N', 'O')
+        T = np.linspace(1000., 3000., 21)
+        X = eq.Tp(T=T, p=1.01325, X0=self.X0)
+        # The products conserve the atoms per unit mass of the reactants
+        mw = np.array([pm.get(ss).mw() for ss in self.species])
+        b0 = np.dot(eq._A, self.X0) / np.dot(self.X0, mw)
+        b = np.dot(X, eq._A.T) / np.dot(X, mw)[:,np.newaxis]
+        assert b == approx(np.broadcast_to(b0, b.shape), rel=1e-8)
+
+    def test_Kp(self, eq):
+        # N2 + O2 <=> 2NO
+        T = np.linspace(1000., 3000., 21)
+        X = eq.Tp(T=T, p=3., X0=self.X0)
+        batch = pm.batch(['ig.N2', 'ig.O2', 'ig.NO'])
+        g = batch._g(T, np.full_like(T, 1e5))
+        Kp = np.exp(-(2*g[2] - g[0] - g[1]) / (pm.units.const_Ru*T))
+        assert X[:,7]**2 / (X[:,0]*X[:,1]) == approx(Kp, rel=1e-6)
+
+    def test_hp(self, eq):
+        T,X = eq.hp(p=1.01325, X0=self.X0, T0=298.15)
+        # The adiabatic flame temperature of hydrogen and air
+        assert T[0] == approx(2380., abs=10.)
+        # The products have the enthalpy of the reactants per unit mass
+        mix = eq._mix
+        assert mix.h(T=T, X=X) == approx(mix.h(T=298.15, X=self.X0), abs=1e-6)
+
+    def test_hp_given(self, eq):
+        h = eq._mix.h(T=298.15, X=self.X0)
+        T,_ = eq.hp(p=1.01325, X0=self.X0, T0=298.15)
+        assert eq.hp(h=h, p=1.01325, X0=self.X0)[0] == approx(T)
+
+    def test_warm(self, eq):
+        # A sweep in composition gives the same result with a warm start
+        phi = np.linspace(0.5, 1.5, 41)
+        X0 = np.broadcast_to(self.X0, (phi.size, len(self.X0))).copy()
+        X0[:,2] *= phi
+        T1,X1 = eq.hp(p=1.01325, X0=X0, T0=298.15)
+        T2,X2 = eq.hp(p=1.01325, X0=X0, T0=298.15, warm=False)
+        assert T1 == approx(T2, rel=1e-8)
+        assert X1 == approx(X2, rel=1e-6, abs=1e-12)
+
+    def test_warm_Tp(self):
+        # A temperature sweep of methane and air gives the same result 
+        # with a warm start, including the minor species
+        species = ['ig.CH4', 'ig.O2', 'ig.N2', 'ig.CO2', 'ig.H2O', 'ig.CO',
+                'ig.H2', 'ig.HO', 'ig.H', 'ig.O', 'ig.NO']
+        X0 = [1., 2., 7.52, 0., 0., 0., 0., 0., 0., 0., 0.]
+        eq = pm.equilibrium.PMEquilibrium(species)
+        for T in (np.linspace(500., 1000., 2), np.linspace(500., 3500., 31)):
+            X1 = eq.Tp(T=T, p=1.01325, X0=X0)
+            X2 = eq.Tp(T=T, p=1.01325, X0=X0, warm=False)
+            assert X1 == approx(X2, rel=1e-5, abs=1e-8)
+        # 2CO + O2 <=> 2CO2 wherever CO and O2 are not traces
+        I = np.logical_and(X1[:,1] > 1e-6, X1[:,5] > 1e-6)
+        assert np.count_nonzero(I) > 10
+        batch = pm.batch(['ig.CO', 'ig.O2', 'ig.CO2'])
+        g = batch._g(T[I], np.full(np.count_nonzero(I), 1e5))
+        Kp = np.exp(-(2*g[2] - 2*g[0] - g[1]) / (pm.units.const_Ru*T[I]))
+        Kp *= 1.01325
+        assert X1[I,3]**2 / (X1[I,5]**2 * X1[I,1]) == approx(Kp, rel=1e-5)
+
+    def test_absent(self, eq):
+        # Without hydrogen, hydrogen species are excluded
+        X = eq.Tp(T=2000., X0=[0.79, 0.21, 0., 0., 0., 0., 0., 0., 0.])
+        assert (X[0,2:6] == 0.).all()
+        assert X[0].sum() == approx(1.)
+
+    def test_errors(self, eq):
+        with raises(pm.utility.PMParamError):
+            eq.Tp(T=1e5, X0=self.X0)
+        with raises(pm.utility.PMParamError):
+            # Ions cannot be neutralized, so no product can hold oxygen
+            pm.equilibrium.PMEquilibrium(['ig.N2', 'ig.O2+']).Tp(
+                    T=1500., X0=[0.5, 0.5])
+        with raises(pm.utility.PMParamError):
+            pm.equilibrium.PMEquilibrium(['ig.N2', 'mp.H2O'])
+
+
 def complete_props_theory(propdict, subid):
     """
     Fill in some properties based on theoretical Ideal Gas values
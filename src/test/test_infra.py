@@ -0,0 +1,292 @@
+import pyromat as pm
+import pyromat.solve
+import numpy as np
+import json, os, sys, pickle, subprocess
+from pytest import approx, raises
+import pytest
+
+
+class TestData:
+    def test_lazy_load(self, tmp_path):
+        n2 = pm.get('ig.N2')
+        temp = n2.data.copy()
+        del temp['fromfile']
+        temp['id'] = 'ig.N2lazy'
+        with open(tmp_path / 'N2lazy.hpd', 'w') as ff:
+            json.dump(temp, ff, indent=2, sort_keys=True)
+        # Files without indentation are loaded immediately
+        temp['id'] = 'ig.N2eager'
+        with open(tmp_path / 'N2eager.hpd', 'w') as ff:
+            json.dump(temp, ff)
+        try:
+            pm.dat.load(str(tmp_path), verbose=False, lazy=True, cache=False)
+            assert pm.dat.data.index['ig.N2lazy'] == str(tmp_path / 'N2lazy.hpd')
+            assert 'ig.N2eager' not in pm.dat.data.index
+            assert 'ig.N2lazy' in pm.dat.data
+            assert 'ig.N2lazy' in pm.dat.data.ids()
+            # The first request parses the file
+            lazy = pm.get('ig.N2lazy')
+            assert 'ig.N2lazy' not in pm.dat.data.index
+            assert pm.get('ig.N2lazy') is lazy
+            assert lazy.h(T=500.) == approx(n2.h(T=500.))
+            assert lazy.data['fromfile'] == str(tmp_path / 'N2lazy.hpd')
+            # The collection is searched without loading anything else
+            pm.dat.load(str(tmp_path), verbose=False, lazy=True, cache=False)
+            assert pm.search(collection='ig.N2lazy') == {pm.get('ig.N2lazy')}
+        finally:
+            del pm.dat.data['ig.N2lazy']
+            del pm.dat.data['ig.N2eager']
+        assert 'ig.N2lazy' not in pm.dat.data
+
+    def test_cache(self, tmp_path):
+        datdir = tmp_path / 'data'
+        cachedir = tmp_path / 'cache'
+        datdir.mkdir()
+        temp = pm.get('ig.N2').data.copy()
+        del temp['fromfile']
+        temp['id'] = 'ig.N2cache'
+        with open(datdir / 'N2cache.hpd', 'w') as ff:
+            json.dump(temp, ff, indent=2)
+        try:
+            with pm.config.context(dat_cache_dir=str(cachedir)):
+                for lazy in [True, False]:
+                    pm.dat.load(str(datdir), verbose=False, lazy=lazy, cache=True)
+                    assert len(os.listdir(cachedir)) == 1
+                    assert pm.get('ig.N2cache').data['Tref'] == temp['Tref']
+                    assert pm.get('ig.N2cache').data['fromfile'] == str(datdir / 'N2cache.hpd')
+                # Changing the file must rebuild the bundle
+                temp['Tref'] = 300.
+                with open(datdir / 'N2cache.hpd', 'w') as ff:
+                    json.dump(temp, ff, indent=2)
+                os.utime(datdir / 'N2cache.hpd', ns=(0, 0))
+                pm.dat.load(str(datdir), verbose=False, cache=True)
+                assert pm.get('ig.N2cache').data['Tref'] == 300.
+                assert pm.dat.build_cache(str(datdir)) == []
+            # An unusable cache directory falls back to reading the files
+            with pm.config.context(dat_cache_dir=str(datdir / 'N2cache.hpd')):
+                assert pm.dat.build_cache(str(datdir)) == [str(datdir)]
+                pm.dat.load(str(datdir), verbose=False, cache=True)
+                assert pm.get('ig.N2cache').data['Tref'] == 300.
+        finally:
+            del pm.dat.data['ig.N2cache']
+
+    def test_cache_safety(self, tmp_path, capsys):
+        datdir = tmp_path / 'data'
+        cachedir = tmp_path / 'cache'
+        datdir.mkdir()
+        temp = pm.get('ig.N2').data.copy()
+        del temp['fromfile']
+        temp['id'] = 'ig.N2safe'
+        with open(datdir / 'N2safe.hpd', 'w') as ff:
+            json.dump(temp, ff, indent=2)
+        with open(datdir / 'broken.hpd', 'w') as ff:
+            ff.write('{"id": ')
+        # The cache is opt-in
+        assert pm.config['dat_cache'] is False
+        try:
+            with pm.config.context(dat_cache_dir=str(cachedir)):
+                pm.dat.load(str(datdir), verbose=False, cache=True)
+                bundle = str(cachedir / os.listdir(cachedir)[0])
+                capsys.readouterr()
+                # Files that failed to parse are reported from the cache too
+                pm.dat.load(str(datdir), verbose=False, cache=True)
+                assert 'broken.hpd' in capsys.readouterr().out
+                assert pm.get('ig.N2safe').data['id'] == 'ig.N2safe'
+                with open(bundle, 'rb') as ff:
+                    magic = ff.readline()
+                assert magic.startswith(b'PYroMat data cache ')
+                # Corrupt bundles, bundles from other versions, and bundles
+                # that others can write are all rebuilt
+                for damage in ['truncate', 'magic', 'mode']:
+                    if damage == 'truncate':
+                        with open(bundle, 'r+b') as ff:
+                            ff.truncate(len(magic) + 10)
+                    elif damage == 'magic':
+                        with open(bundle, 'r+b') as ff:
+                            ff.write(b'X')
+                    elif hasattr(os, 'getuid'):
+                        os.chmod(bundle, 0o666)
+                    os.utime(bundle, ns=(0, 0))
+                    del pm.dat.data['ig.N2safe']
+                    pm.dat.load(str(datdir), verbose=False, cache=True)
+                    assert pm.get('ig.N2safe').data['id'] == 'ig.N2safe'
+                    assert os.stat(bundle).st_mtime_ns != 0
+                    assert os.stat(bundle).st_mode & 0o022 == 0
+        finally:
+            del pm.dat.data['ig.N2safe']
+
+    def test_compact(self, tmp_path):
+        alh = pm.get('ig.AlH')
+        sub = pm.reg.registry['ig'](alh.data.copy())
+        sub.compact()
+        assert isinstance(sub.data, pm.reg.PMCompactData)
+        # Coefficients are packed, and the table is left in the file
+        assert isinstance(sub.data['C'], np.ndarray)
+        assert not sub.data['C'].flags.writeable
+        assert sub.data.lazy == {'TAB'}
+        assert 'TAB' in sub.data and 'TAB' in list(sub.data)
+        assert sub.data['doc'] is sys.intern(alh.data['doc'])
+        assert sub.h(T=[300., 1500.]) == approx(alh.h(T=[300., 1500.]))
+        assert sub.data['TAB'] == alh.data['TAB']
+        assert not sub.data.lazy
+        # Copies and comparisons use lists
+        assert sub.data == alh.data
+        assert isinstance(sub.data.copy()['C'], list)
+        json.dumps(sub.data.copy())
+        assert pickle.loads(pickle.dumps(sub)).data == alh.data
+        
+        # The configuration compacts new instances
+        temp = pm.get('ig.N2').data.copy()
+        temp['id'] = 'ig.N2compact'
+        datdir = tmp_path / 'data'
+        datdir.mkdir()
+        with open(datdir / 'N2compact.hpd', 'w') as ff:
+            json.dump(temp, ff, indent=2)
+        try:
+            with pm.config.context(dat_compact=True, 
+                    dat_cache_dir=str(tmp_path / 'cache')):
+                for cache in [False, True, True]:
+                    pm.dat.load(str(datdir), verbose=False, cache=cache)
+                    assert str(datdir / 'N2compact.hpd') not in pm.dat.data._pending
+                    n2 = pm.get('ig.N2compact')
+                    assert isinstance(n2.data, pm.reg.PMCompactData)
+                    assert n2.h() == approx(pm.get('ig.N2').h())
+        finally:
+            del pm.dat.data['ig.N2compact']
+
+class TestRegistry:
+    def test_registry(self):
+        # Use a separate registry so the loaded classes are not replaced
+        saved = {k:v for k,v in sys.modules.items() if k.startswith('pyromat.registry.')}
+        try:
+            reg = pm.reg.PMRegistry()
+            regdir = os.path.join(pm.config['install_dir'], 'registry')
+            reg.pending = [(name, os.path.join(regdir, name + '.py')) for name in ('ig', 'ig2', 'mp1')]
+            # Only the file named for the class is imported
+            assert 'ig2' in reg
+            assert list(dict.keys(reg)) == ['ig2']
+            assert [pp[0] for pp in reg.pending] == ['ig', 'mp1']
+            assert reg['ig2'].__module__ == 'pyromat.registry.ig2'
+            assert sys.modules['pyromat.registry.ig2'].ig2 is reg['ig2']
+            # Unknown classes import everything before failing
+            assert reg.get('bogus') is None
+            assert sorted(reg) == ['ig', 'ig2', 'mp1']
+            assert not reg.pending
+        finally:
+            sys.modules.update(saved)
+        # Registry classes belong to modules, so instances can be pickled
+        n2 = pm.get('ig.N2')
+        assert pickle.loads(pickle.dumps(n2)).h(T=500.) == approx(n2.h(T=500.))
+
+    def test_pickle_process(self):
+        # Unpickling in a new process imports the registry module before
+        # the lazy registry does.  The registry must use that module, so
+        # the unpickled instance is of the registry class.
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.path.dirname(os.path.dirname(pm.__file__))
+        code = ('import pickle, sys\n'
+                'import pyromat as pm\n'
+                'n2 = pickle.loads(sys.stdin.buffer.read())\n'
+                'print(type(n2) is pm.reg.registry["ig2"])\n'
+                'print(type(pm.get("ig.N2")) is type(n2))\n'
+                'print(bool(abs(pm.mix({"ig.N2":1.}).h() - n2.h()) < 1e-6))\n')
+        out = subprocess.run([sys.executable, '-c', code], env=env, 
+                input=pickle.dumps(pm.get('ig.N2')), capture_output=True, 
+                check=True).stdout.decode().split()
+        assert out == ['True', 'True', 'True']
+
+class TestSearch:
+    @pytest.mark.parametrize('query', [
+        {'name':'h2o'}, {'name':'ox'}, {'atoms':{'C':None}},
+        {'atoms':{'H':2, 'O':1}}, {'atoms':{'H':1, 'O':None}},
+        {'collection':'ig.N'}, {'pmclass':'igmix'},
+        {'cas':'7732-18-5'}, {'inchi':'InChI=1S/H2O/h1H2'},
+        {'collection':'mp', 'atoms':{'H':None, 'O':None}}])
+    def test_search(self, query):
+        # The indexes must agree with a test of every substance
+        args = {k:query.get(k) for k in 
+                ('name', 'atoms', 'collection', 'pmclass', 'cas', 'inchi')}
+        expect = {sub for sub in pm.dat.data.values() if pm._match(sub, **args)}
+        args['contains'] = args.pop('atoms')
+        assert expect
+        assert pm.search(**args) == expect
+        assert pm.search(members=pm.search(collection='ig'), **args) == \
+                {sub for sub in expect if sub.data['id'].startswith('ig')}
+
+    def test_search_update(self):
+        n2 = pm.get('ig.N2')
+        assert pm.search(name='N2index') == set()
+        temp = n2.data.copy()
+        temp['id'] = 'ig.N2index'
+        pm.dat.new(temp)
+        try:
+            assert pm.search(name='N2index') == {pm.get('ig.N2index')}
+            assert pm.get('ig.N2index') in pm.search(contains={'N':2})
+        finally:
+            del pm.dat.data['ig.N2index']
+        assert pm.search(name='N2index') == set()
+        assert n2 in pm.search(contains={'N':2})
+
+class TestProfile:
+    def test_startup_profile(self, tmp_path):
+        # Profiling is opt-in
+        assert pm.startup_profile is None or pm.config['startup_profile'] \
+                or os.environ.get('PYROMAT_PROFILE')
+        env = dict(os.environ, PYROMAT_PROFILE='1')
+        env['PYTHONPATH'] = os.path.dirname(os.path.dirname(pm.__file__))
+        code = ('import pyromat as pm\n'
+                'pm.get("ig.N2")\n'
+                'prof = pm.startup_profile\n'
+                'print(sorted(rr["name"] for rr in prof.select("phase")))\n'
+                'print(prof.summary("class")["ig2"]["count"])\n'
+                'print(prof.total("phase") <= prof.total("import"))\n'
+                'print(prof.select("import")[0]["memory"] > 0)\n')
+        out = subprocess.run([sys.executable, '-c', code], env=env, 
+                capture_output=True, text=True, check=True).stdout.split('\n')
+        assert out[0] == repr(['config', 'load', 'modules', 'regload', 'utility'])
+        assert out[1:4] == ['1', 'True', 'True']
+        
+        # Records are only kept while a profile is active
+        n2 = pm.get('ig.N2')
+        temp = n2.data.copy()
+        temp['id'] = 'ig.N2profile'
+        with open(tmp_path / 'N2profile.hpd', 'w') as ff:
+            json.dump(temp, ff)
+        prof = pm.utility.PMProfile(memory=False)
+        pm.utility._profile = prof
+        try:
+            pm.dat.load(str(tmp_path), verbose=False, lazy=False, cache=False)
+        finally:
+            prof.stop()
+            del pm.dat.data['ig.N2profile']
+        assert pm.utility._profile is None
+        assert prof.records[0]['time'] > 0.
+        assert [rr['kind'] for rr in prof.records] == ['import', 'dir', 'class']
+        assert prof.records[1]['depth'] == 1
+        assert prof.records[2]['depth'] == 2
+        assert prof.records[2]['class'] == 'ig2'
+        assert prof.records[2]['memory'] is None
+        assert prof.summary('class') == {'ig2':{'count':1, 
+                'time':prof.records[2]['time'], 'memory':None}}
+
+
+class TestSolve:
+    def test_solve1n(self):
+        # A plain function and a function and derivative, with and without
+        # an active statistics collector
+        def f(x):
+            return x**3
+        def fdf(x):
+            return x**3, 3*x**2
+        solvers = [pm.solve.solve1n('x', f=f, param_init=1.),
+                pm.solve.solve1n('x', fdf=fdf, param_init=1., prop_name='y')]
+        for solver in solvers:
+            assert solver(8.) == approx(2., rel=1e-6)
+            assert solver([1., 27.]) == approx([1., 3.], rel=1e-6)
+            with pm.stats.collect() as stats:
+                assert solver(8.) == approx(2., rel=1e-6)
+            assert len(stats.records) == 1
+            assert stats.records[0]['class'] == ''
+            assert stats.records[0]['size'] == 1
+            assert stats.records[0]['iterations'] > 0
+        assert stats.records[0]['target'] == 'fdf'
@@ -2,6 +2,7 @@ import pyromat as pm
 import numpy as np
 from pytest import approx, raises
 import pytest
+import contextlib
 
 
 class TestInputErrors:
@@ -48,9 +49,9 @@ class TestInputErrors:
 
     def test_invarg_toomany(self, subst):
         with raises(pm.utility.PMParamError):
-            subst.T(h=300, s=5)
+            subst.T(h=300, e=300)
         with raises(pm.utility.PMParamError):
-            subst.T(e=300, s=5)
+            subst.T(h=300, e=300, s=5)
 
     def test_d_v_collision(self, subst):
         with raises(pm.utility.PMParamError):
@@ -192,6 +193,55 @@ class TestGeneral:
         gam, x = pm.get(sub).gam(quality=True)
         assert gam == approx(expect)
 
+    @pytest.mark.parametrize('sub', ('mp.H2O', 'mp.C2H2F4'), ids=('water', 'r134a'))
+    def test_d_warm(self, sub):
+        # The warm-started density must agree with the bracketed iteration
+        mp1obj = pm.get(sub)
+        T = np.linspace(mp1obj.data['Tlim'][0], mp1obj.data['Tlim'][1], 23)
+        p = np.logspace(np.log10(mp1obj.data['pt']), 
+                        np.log10(mp1obj.data['plim'][1]), 19)
+        T,p = [a.ravel() for a in np.meshgrid(T, p)]
+        assert mp1obj._d(T, p) == approx(mp1obj._d(T, p, warm=False), rel=1e-5)
+
+
+    def test_flash_compile_quiet(self, capsys):
+        # Building the flash tables must not print warnings about the
+        # near-critical nodes to a user who asked for an ordinary state
+        mp1obj = pm.get('mp.H2O')
+        mp1obj._FLtab = None
+        mp1obj._FLsat = None
+        mp1obj._DTPtab = None
+        capsys.readouterr()
+        assert mp1obj.T(h=2800., s=6.5) == approx(471.365, abs=1e-2)
+        assert 'WARN' not in capsys.readouterr().out
+        assert pm.config['warning_verbose']
+
+
+    @pytest.mark.parametrize('sub', ('mp.H2O', 'mp.C2H2F4'), ids=('water', 'r134a'))
+    def test_flash2(self, sub):
+        # h,s and e,s must invert T,p states in and out of the dome
+        mp1obj = pm.get(sub)
+        Tt, Tc = mp1obj.data['Tt'], mp1obj.data['Tc']
+        T = np.linspace(Tt + 10., mp1obj.data['Tlim'][1], 7)
+        p = np.logspace(0., 2.5, 5)
+        T,p = [a.ravel() for a in np.meshgrid(T, p)]
+        h,s,e = mp1obj.h(T=T, p=p), mp1obj.s(T=T, p=p), mp1obj.e(T=T, p=p)
+        # Pressure is poorly conditioned in the liquid, so test density
+        d = mp1obj.d(T=T, p=p)
+        assert mp1obj.T(h=h, s=s) == approx(T, rel=1e-6)
+        assert mp1obj.d(h=h, s=s) == approx(d, rel=1e-5)
+        assert mp1obj.T(e=e, s=s) == approx(T, rel=1e-6)
+        assert mp1obj.d(e=e, s=s) == approx(d, rel=1e-5)
+        # Saturated mixtures
+        T = np.linspace(Tt + 10., 0.95*Tc, 6)
+        x = np.linspace(0.1, 0.9, 5)
+        T,x = [a.ravel() for a in np.meshgrid(T, x)]
+        h,s = mp1obj.h(T=T, x=x), mp1obj.s(T=T, x=x)
+        TT,xx = mp1obj.T(h=h, s=s, quality=True)
+        assert TT == approx(T, rel=1e-6)
+        assert xx == approx(x, abs=1e-6)
+        assert mp1obj.T(e=mp1obj.e(T=T, x=x), s=s) == approx(T, rel=1e-6)
+
 
 class TestSat:
 
@@ -230,6 +280,15 @@ class TestSat:
         assert water.Ts(p=np.tile(ref_sat_p['p'], 3)) == approx(
             np.tile(ref_sat_p['T'], 3), rel=1e-5, abs=1e-2)
 
+    @pytest.mark.parametrize('sub', ('mp.H2O', 'mp.C2H2F4', 'mp.CO2'))
+    def test_Ts_ps_inverse(self, sub):
+        # The tabulated saturation temperature must invert _ps()
+        mp1obj = pm.get(sub)
+        T = np.linspace(mp1obj.data['Tt'], mp1obj.data['Tc'], 1001)[:-1]
+        p = mp1obj._ps(T)[0]
+        assert mp1obj._Ts(p) == approx(T, rel=1e-10)
+        assert mp1obj._Ts(p, polish=True) == approx(T, rel=1e-14)
+
     def test_ref_sat_p_ds(self, water, ref_sat_p):
         assert water.ds(p=ref_sat_p['p']) == approx(ref_sat_p['d'], rel=1e-5, abs=1e-2)
         assert water.ds(p=np.tile(ref_sat_p['p'], 3))[0] == approx(
@@ -674,24 +733,26 @@ class TestRefs:
         else:
             assert fn(T=ref['T'], x=ref['x']) == approx(ref[param], rel=1e-5, abs=1e-2)
 
-    # Always Unsupported Cases
-    def test_dv(self, param, refdat):
+    def test_hs(self, param, refdat):
         sub, ref = refdat['sub'], refdat['data']
         fn = getattr(sub, param)
-        with raises(pm.utility.PMParamError):
-            assert fn(d=ref['d'], v=ref['v'])
+        assert fn(h=ref['h'], s=ref['s']) == approx(ref[param], rel=1e-5, abs=1e-2)
 
-    def test_hs(self, param, refdat):
+    def test_es(self, param, refdat):
         sub, ref = refdat['sub'], refdat['data']
         fn = getattr(sub, param)
-        with raises(pm.utility.PMParamError):
-            assert fn(h=ref['h'], s=ref['s'])
+        if (np.array(ref['d']) > sub.data['dc']).any():
+            # e changes by only p*dv at constant s, so the rounded 
+            # reference values do not resolve a compressed liquid state
+            pytest.skip('e,s are poorly conditioned in the liquid')
+        assert fn(e=ref['e'], s=ref['s']) == approx(ref[param], rel=1e-5, abs=1e-2)
 
-    def test_es(self, param, refdat):
+    # Always Unsupported Cases
+    def test_dv(self, param, refdat):
         sub, ref = refdat['sub'], refdat['data']
         fn = getattr(sub, param)
         with raises(pm.utility.PMParamError):
-            assert fn(e=ref['e'], s=ref['s'])
+            assert fn(d=ref['d'], v=ref['v'])
 
     def test_he(self, param, refdat):
         sub, ref = refdat['sub'], refdat['data']
@@ -839,3 +900,348 @@ class TestState:
         sub, ref = refdat['sub'], refdat['data']
         state = sub.state(v=ref['v'], e=ref['e'])
         assert state[prop] == approx(ref[prop], rel=1e-5, abs=1e-2)
+
+
+class TestStats:
+
+    @pytest.fixture
+    def water(self):
+        return pm.get('mp.H2O')
+
+    def test_collect(self, water):
+        h = np.linspace(500., 3000., 10)
+        with pm.stats.collect() as stats:
+            water.T(p=1., h=h)
+        assert not pm.stats.enabled()
+        summary = stats.summary(by=('id', 'solver', 'target'))
+        total = summary[('mp.H2O', '_hybrid1', '_tpiter(_h)')]
+        assert total['calls'] >= 1
+        assert total['iterations'] > 0
+        assert total['evaluations'] >= total['iterations']
+        assert total['nonconverged'] == 0
+        # Nothing is recorded once the collector is stopped
+        nrec = len(stats.records)
+        water.T(p=1., h=h)
+        assert len(stats.records) == nrec
+
+    def test_nested(self, water):
+        with pm.stats.collect() as outer:
+            with pm.stats.collect() as inner:
+                water.d(T=np.linspace(300., 600., 5), p=10.)
+            water.d(T=np.linspace(300., 600., 5), p=10.)
+        assert len(outer.records) == 2*len(inner.records) > 0
+
+
+MP1_SUBST = ('mp.H2O', 'mp.CO2', 'mp.N2', 'mp.O2', 'mp.CH4', 'mp.C2H2F4', 
+        'mp.C3H2F4_1')
+
+
+def _poly1_terms(x, group):
+    """Term-by-term evaluation of an uncompiled poly1 coefficient list"""
+    p = px = pxx = 0.
+    for coef in group:
+        pre, post = coef[0], coef[1]
+        for ii, cc in coef[2:]:
+            a = post + pre*ii
+            p = p + cc * x**a
+            px = px + cc * a * x**(a-1)
+            pxx = pxx + cc * a * (a-1) * x**(a-2)
+    return p, px, pxx
+
+
+def _poly2_terms(x, y, group):
+    """Term-by-term evaluation of an uncompiled poly2 coefficient list"""
+    p = px = py = pxx = pxy = pyy = 0.
+    for coef in group:
+        (prex, prey), (postx, posty) = coef[0], coef[1]
+        for ii, jj, cc in coef[2:]:
+            a = postx + prex*ii
+            b = posty + prey*jj
+            p = p + cc * x**a * y**b
+            px = px + cc * a * x**(a-1) * y**b
+            py = py + cc * b * x**a * y**(b-1)
+            pxx = pxx + cc * a * (a-1) * x**(a-2) * y**b
+            pxy = pxy + cc * a * b * x**(a-1) * y**(b-1)
+            pyy = pyy + cc * b * (b-1) * x**a * y**(b-2)
+    return p, px, py, pxx, pxy, pyy
+
+
+@contextlib.contextmanager
+def _ar_only(mp1obj, term):
+    """Temporarily restrict _ar() to one type of term
+    term is 'poly', 'exp', 'gauss', or 'nonanalytic'
+"""
+    ARgroup = mp1obj.data['ARgroup']
+    arc = mp1obj._ARc
+    Ua,Ub,Uk,Ia,Ib,Ik,CC,coef1 = arc
+    # Select the coef0 terms with and without the exp(-dd**k) factor
+    if term == 'poly':
+        I = Uk[Ik] == 0
+    elif term == 'exp':
+        I = Uk[Ik] > 0
+    else:
+        I = np.zeros(Ik.shape, dtype=bool)
+    if term != 'gauss':
+        coef1 = coef1[:,:0]
+    mp1obj._ARc = (Ua,Ub,Uk,Ia[I],Ib[I],Ik[I],CC[I],coef1)
+    coef2 = ARgroup.pop('coef2', None)
+    if term == 'nonanalytic' and coef2 is not None:
+        ARgroup['coef2'] = coef2
+    try:
+        yield
+    finally:
+        mp1obj._ARc = arc
+        if coef2 is not None:
+            ARgroup['coef2'] = coef2
+
+
+def _check_fd(fn, tt, dd, h=1e-6):
+    """Compare the analytic derivatives of fn(tt,dd,diff=2) with central
+differences.  fn must return (a,at,ad,att,atd,add)
+"""
+    a,at,ad,att,atd,add = fn(tt, dd, diff=2)
+    ht = h*tt
+    hd = h*dd
+    tp = fn(tt+ht, dd, diff=1)
+    tm = fn(tt-ht, dd, diff=1)
+    dp = fn(tt, dd+hd, diff=1)
+    dm = fn(tt, dd-hd, diff=1)
+    # The first derivatives are differenced from the values, and the 
+    # second derivatives are differenced from the first derivatives
+    for result, expect in [
+            (at, (tp[0]-tm[0])/(2*ht)),
+            (ad, (dp[0]-dm[0])/(2*hd)),
+            (att, (tp[1]-tm[1])/(2*ht)),
+            (atd, (tp[2]-tm[2])/(2*ht)),
+            (atd, (dp[1]-dm[1])/(2*hd)),
+            (add, (dp[2]-dm[2])/(2*hd))]:
+        assert result == approx(expect, rel=1e-6, abs=1e-6*np.abs(expect).max())
+
+
+class TestPrimitive:
+    """Checks of the mp1 primative routines against direct evaluation"""
+
+    @pytest.mark.parametrize('sub', MP1_SUBST)
+    @pytest.mark.parametrize('group', ('PSgroup', 'DSLgroup', 'DSVgroup', 'AOgroup'))
+    def test_poly1_compiled(self, sub, group):
+        # The compiled poly1 coefficients must reproduce the data
+        mp1obj = pm.get(sub)
+        if group == 'AOgroup':
+            coef = mp1obj.data[group]['coef0']
+            cgroup = mp1obj._AOcoef0
+            x = np.linspace(0.2, 5., 11)
+        else:
+            coef = mp1obj.data[group]['coef']
+            cgroup = getattr(mp1obj, '_' + group[:-5] + 'coef')
+            x = np.linspace(0.02, 0.98, 11)
+        # The compiled list is the one held by the instance
+        for this, that in zip(cgroup, mp1obj._poly1_compile(coef)):
+            for aa, bb in zip(this, that):
+                assert np.array_equal(aa, bb)
+        for diff in (0, 1, 2):
+            result = mp1obj._poly1(x, cgroup, diff=diff)
+            expect = _poly1_terms(x, coef)
+            for rr, ee in zip(result[:diff+1], expect):
+                assert rr == approx(ee, rel=1e-8, abs=1e-12*np.abs(ee).max())
+        # Scalars stay scalars
+        assert np.shape(mp1obj._poly1(x[3], cgroup)[0]) == ()
+        assert mp1obj._poly1(x[3], cgroup)[0] == approx(_poly1_terms(x[3], coef)[0], rel=1e-10)
+
+    @pytest.mark.parametrize('sub', MP1_SUBST)
+    def test_poly2_compiled(self, sub):
+        # Each group of residual coefficients must evaluate the same way
+        # when it is compiled
+        mp1obj = pm.get(sub)
+        tt,dd = [a.ravel() for a in np.meshgrid(
+                np.linspace(0.3, 3., 7), np.linspace(0.05, 3., 9))]
+        for coef in mp1obj.data['ARgroup']['coef0']:
+            cgroup = mp1obj._poly2_compile(coef)
+            expect = _poly2_terms(tt, dd, coef)
+            for diff in (0, 1, 2):
+                result = mp1obj._poly2(tt, dd, cgroup, diff=diff)
+                nn = (1, 3, 6)[diff]
+                for rr, ee in zip(result[:nn], expect):
+                    assert rr == approx(ee, rel=1e-8, abs=1e-12*np.abs(ee).max())
+
+    @pytest.mark.parametrize('sub', MP1_SUBST)
+    def test_ar_compiled(self, sub):
+        # The coef0 terms fused by _ar_compile() must match the sum of 
+        # exp(-dd**k) * pk(tt,dd) evaluated term-by-term
+        mp1obj = pm.get(sub)
+        ARgroup = mp1obj.data['ARgroup']
+        tt,dd = [a.ravel() for a in np.meshgrid(
+                np.linspace(0.3, 3., 7), np.linspace(0.05, 3., 9))]
+        A = At = Att = 0.
+        for k, coef in enumerate(ARgroup['coef0']):
+            p,pt,pd,ptt,ptd,pdd = _poly2_terms(tt, dd, coef)
+            E = np.exp(-dd**k) if k else 1.
+            A = A + E*p
+            At = At + E*pt
+            Att = Att + E*ptt
+        # Remove the coef1 and coef2 terms, which are not compiled
+        Ua,Ub,Uk,Ia,Ib,Ik,CC,coef1 = mp1obj._ARc
+        mp1obj._ARc = (Ua,Ub,Uk,Ia,Ib,Ik,CC,coef1[:,:0])
+        coef2 = ARgroup.pop('coef2', None)
+        try:
+            a,at,ad,att,atd,add = mp1obj._ar(tt, dd, diff=2)
+        finally:
+            mp1obj._ARc = (Ua,Ub,Uk,Ia,Ib,Ik,CC,coef1)
+            if coef2 is not None:
+                ARgroup['coef2'] = coef2
+        assert a == approx(A, rel=1e-10, abs=1e-12*np.abs(A).max())
+        assert at == approx(At, rel=1e-10, abs=1e-12*np.abs(At).max())
+        assert att == approx(Att, rel=1e-10, abs=1e-12*np.abs(Att).max())
+
+    # Only H2O and CO2 have nonanalytic (coef2) terms, and O2 and R134a 
+    # have no gaussian (coef1) terms.
+    @pytest.mark.parametrize('sub,term', 
+            [(sub, 'poly') for sub in MP1_SUBST] + 
+            [(sub, 'exp') for sub in MP1_SUBST] + 
+            [(sub, 'gauss') for sub in MP1_SUBST 
+                if sub not in ('mp.O2', 'mp.C2H2F4')] + 
+            [(sub, 'nonanalytic') for sub in ('mp.H2O', 'mp.CO2')])
+    def test_ar_derivatives(self, sub, term):
+        # The analytic derivatives of each type of term must match 
+        # central differences
+        mp1obj = pm.get(sub)
+        # Stay away from the critical point (tt=dd=1), where the 
+        # nonanalytic terms are singular
+        tt,dd = [a.ravel() for a in np.meshgrid(
+                np.linspace(0.45, 2.95, 6), np.linspace(0.05, 2.95, 7))]
+        with _ar_only(mp1obj, term):
+            a = mp1obj._ar(tt, dd, diff=0)[0]
+            assert np.abs(a).max() > 0
+            _check_fd(mp1obj._ar, tt, dd)
+
+    @pytest.mark.parametrize('sub', MP1_SUBST)
+    def test_ao_derivatives(self, sub):
+        mp1obj = pm.get(sub)
+        tt,dd = [a.ravel() for a in np.meshgrid(
+                np.linspace(0.45, 2.95, 6), np.linspace(0.05, 2.95, 7))]
+        _check_fd(mp1obj._ao, tt, dd)
+
+    @pytest.mark.parametrize('sub', MP1_SUBST)
+    def test_helmholtz_derivatives(self, sub):
+        # The fused evaluation must agree with the separate parts
+        mp1obj = pm.get(sub)
+        Tscale = mp1obj.data['ARgroup']['Tscale']
+        dscale = mp1obj.data['ARgroup']['dscale']
+        tt,dd = [a.ravel() for a in np.meshgrid(
+                np.linspace(0.45, 2.95, 6), np.linspace(0.05, 2.95, 7))]
+        def fn(tt, dd, diff=2):
+            return mp1obj._helmholtz(Tscale/tt, dd*dscale, diff=diff)[2:]
+        _check_fd(fn, tt, dd)
+        result = fn(tt, dd)
+        ar = mp1obj._ar(tt, dd)
+        ao = mp1obj._ao(tt, dd)
+        for rr, aa, bb in zip(result, ar, ao):
+            assert rr == approx(aa + bb, rel=1e-12, abs=1e-12)
+
+    @pytest.mark.parametrize('solver,Nmax', [('_iter1', 8), ('_hybrid1', 18)])
+    def test_solver_batch(self, solver, Nmax):
+        # A batch with points that converge at different iterations, 
+        # points that do not converge, NaN targets and parameters, and 
+        # a point that is not selected must give the same result as 
+        # solving each point on its own.
+        mp1obj = pm.get('mp.H2O')
+        fn = getattr(mp1obj, solver)
+        def invfn(x, a, diff=0):
+            return np.arctan(x) + a*x, 1./(1. + x*x) + a
+        a = np.array([1., 0.5, 0.1, 0.01, 0., 1., np.nan, 0.2, 0.])
+        y = np.array([3., 1., 0.5, 1.2, 1.4, np.nan, 1., -2., 0.])
+        x0 = np.array([0., 5., -5., 9., 9., 0., 0., 2., 9.])
+        I0 = np.array([True]*8 + [False])
+        xmin = np.full(y.shape, -10.)
+        xmax = np.full(y.shape, 10.)
+        inputs = (a, y, xmin, xmax)
+        saved = [v.copy() for v in inputs]
+        
+        x = x0.copy()
+        I = I0.copy()
+        with pm.stats.collect() as stats:
+            fn(invfn, 'x', y, x, I, xmin, xmax, ep=1e-12, Nmax=Nmax, 
+                    param={'a':a})
+        # Some of the points must converge and some must not
+        assert 0 < stats.records[0]['nonconverged'] < I0.sum()
+        for v, s in zip(inputs, saved):
+            assert np.array_equal(v, s, equal_nan=True)
+        
+        for k in range(y.size):
+            xk = x0[k:k+1].copy()
+            Ik = I0[k:k+1].copy()
+            try:
+                fn(invfn, 'x', y[k:k+1], xk, Ik, xmin[k:k+1], xmax[k:k+1], 
+                        ep=1e-12, Nmax=Nmax, param={'a':a[k:k+1]})
+            except pm.utility.PMParamError:
+                # _hybrid1 raises when a lone point can't be bracketed
+                xk[:] = pm.config['def_oob']
+                Ik[:] = False
+            assert np.array_equal(x[k], xk[0], equal_nan=True)
+            assert I[k] == Ik[0]
+
+
+class TestStateProps:
+
+    @pytest.fixture
+    def states(self):
+        # Liquid, vapor, and supercritical states
+        T = np.array([300., 400., 500., 700., 900.])
+        p = np.array([1., 1., 100., 200., 500.])
+        return T, p
+
+    @pytest.mark.parametrize('sub', ('mp.H2O', 'mp.C2H2F4'), ids=('water', 'r134a'))
+    @pytest.mark.parametrize('props', (('h',), ('T','p','x'), ('s','d','cv'), ('gam','v','e','cp')))
+    def test_props(self, sub, props):
+        # Only the requested properties are returned, and they must be 
+        # the same as the full state
+        mp1obj = pm.get(sub)
+        Tt = mp1obj.triple()[0]
+        Tc,pc = mp1obj.critical()
+        T = np.linspace(Tt + 10., 1.2*Tc, 5)
+        p = np.linspace(1., 2.*pc, 5)
+        Ts = np.linspace(Tt + 10., 0.95*Tc, 5)
+        h = mp1obj.h(T=T, p=p)
+        for arg in ({'T':T, 'p':p}, {'h':h, 'p':p}, {'T':Ts, 'x':0.5}):
+            full = mp1obj.state(**arg)
+            part = mp1obj.state(props=props, **arg)
+            assert set(part.keys()) == set(props)
+            # The helmholtz sums depend on the derivatives requested, so
+            # the liquid pressure (a small difference of large terms) 
+            # can differ by rounding error.
+            for prop in props:
+                assert part[prop] == approx(full[prop], rel=1e-9, nan_ok=True)
+
+    def test_props_str(self, states):
+        water = pm.get('mp.H2O')
+        T,p = states
+        sd = water.state(T=T, p=p, props='s')
+        assert list(sd.keys()) == ['s']
+        assert sd['s'] == approx(water.s(T=T, p=p))
+        assert set(water.state(T=T, p=p).keys()) == \
+                {'T','p','d','v','x','e','h','s','cp','cv','gam'}
+
+    def test_props_illegal(self, states):
+        water = pm.get('mp.H2O')
+        T,p = states
+        with raises(pm.utility.PMParamError):
+            water.state(T=T, p=p, props=('h','q'))
+        with raises(pm.utility.PMParamError):
+            water.state(T=T, p=p, props='hs')
+
+    def test_props_solvers(self, states):
+        water = pm.get('mp.H2O')
+        T,p = states
+        d = water.d(T=T, p=p)
+        # Nothing needs to be inverted from T and d
+        with pm.stats.collect() as stats:
+            water.state(T=T, d=d, props=('T','d','v','x','p','h'))
+        assert stats.records == []
+        # The density is only found once from T and p (while parsing 
+        # the arguments), no matter which properties are requested.
+        with pm.stats.collect() as stats:
+            water.d(T=T, p=p)
+        expect = [(rr['solver'], rr['target']) for rr in stats.records]
+        for props in (('T',), ('T','p','h','s','gam'), None):
+            with pm.stats.collect() as stats:
+                water.state(T=T, p=p, props=props)
+            assert [(rr['solver'], rr['target']) for rr in stats.records] == expect
@@ -324,3 +324,139 @@ def test_matter_exponent():
 
 
 
+
+
+def test_plan():
+    mymw = 28.
+    # Plans must agree with the chained conversions
+    conv = pm.units.energy(1., from_units='kJ')
+    conv = pm.units.matter(conv, mymw, from_units='kmol', exponent=-1)
+    conv = pm.units.temperature(conv, from_units='K', exponent=-1)
+    assert pm.units.plan(mymw, energy='kJ', matter=('kmol',-1), temperature=('K',-1)) == approx(conv)
+    assert pm.units.plan(pressure='Pa') == approx(pm.units.pressure(1., from_units='Pa'))
+    # The molecular weight may be an array
+    mws = np.array([2., 28., 44.])
+    conv = pm.units.matter(1., mws, from_units='kmol', exponent=-1)
+    assert pm.units.plan(mws, matter=('kmol',-1)) == approx(conv)
+
+
+def test_plan_config():
+    unit_energy = pm.config['unit_energy']
+    unit_matter = pm.config['unit_matter']
+    try:
+        pm.config['unit_energy'] = 'kJ'
+        pm.config['unit_matter'] = 'kg'
+        assert pm.units.plan(44., energy='J', matter=('kmol',-1)) == approx(1e-3/44.)
+        # Changing the configuration must invalidate the cached plans
+        pm.config['unit_energy'] = 'J'
+        pm.config['unit_matter'] = 'kmol'
+        assert pm.units.plan(44., energy='J', matter=('kmol',-1)) == approx(1.)
+        # So must changing a conversion
+        pm.units.energy['J2'] = 0.5
+        assert pm.units.plan(energy='J2') == approx(0.5)
+        pm.units.energy['J2'] = 0.25
+        assert pm.units.plan(energy='J2') == approx(0.25)
+    finally:
+        del pm.units.energy.table['J2']
+        pm.config['unit_energy'] = unit_energy
+        pm.config['unit_matter'] = unit_matter
+
+
+def test_config_context():
+    unit_pressure = pm.config['unit_pressure']
+    n2 = pm.get('ig.N2')
+    p = n2.p(T=300., d=1.)
+    with pm.config.context(unit_pressure='Pa', def_T=500.):
+        assert pm.config['unit_pressure'] == 'Pa'
+        assert pm.config['def_T'] == 500.
+        assert pm.units.pressure(1., from_units='Pa') == approx(1.)
+        assert n2.p(T=300., d=1.) == approx(pm.units.pressure(p, from_units=unit_pressure, to_units='Pa'))
+        # Contexts nest, and the inner one inherits the outer overrides
+        with pm.config.context(unit_pressure='kPa'):
+            assert pm.config['unit_pressure'] == 'kPa'
+            assert pm.config['def_T'] == 500.
+        assert pm.config['unit_pressure'] == 'Pa'
+    assert pm.config['unit_pressure'] == unit_pressure
+    assert n2.p(T=300., d=1.) == approx(p)
+    # Bad parameters are rejected immediately
+    with pytest.raises(pm.utility.PMParamError):
+        pm.config.context(unit_bogus='Pa')
+    with pytest.raises(pm.utility.PMParamError):
+        pm.config.context(version='0.0')
+    with pytest.raises(pm.utility.PMParamError):
+        pm.config.context(def_T='hot')
+
+
+def test_config_context_threads():
+    import threading
+    import asyncio
+    n2 = pm.get('ig.N2')
+    units = ['Pa', 'kPa', 'bar', 'psi', 'atm', 'MPa']
+    expect = {u:pm.units.pressure(n2.p(T=300., d=1.), to_units=u) for u in units}
+    barrier = threading.Barrier(len(units))
+    results = {}
+    def work(u):
+        with pm.config.context(unit_pressure=u):
+            barrier.wait()
+            results[u] = [n2.p(T=300., d=1.)[0] for k in range(50)]
+    threads = [threading.Thread(target=work, args=(u,)) for u in units]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for u in units:
+        assert results[u] == approx([expect[u][0]]*50)
+
+    async def task(u):
+        with pm.config.context(unit_pressure=u):
+            await asyncio.sleep(0)
+            return n2.p(T=300., d=1.)[0]
+    async def main():
+        return await asyncio.gather(*[task(u) for u in units])
+    for u,value in zip(units, asyncio.run(main())):
+        assert value == approx(expect[u][0])
+
+
+def test_config_context_shared():
+    import threading
+    import asyncio
+    # One context object entered by several threads and tasks at once
+    n2 = pm.get('ig.N2')
+    expect = pm.units.pressure(n2.p(T=300., d=1.), to_units='Pa')[0]
+    default = n2.p(T=300., d=1.)[0]
+    ctx = pm.config.context(unit_pressure='Pa')
+    barrier = threading.Barrier(6)
+    results = []
+    errors = []
+    def work():
+        try:
+            with ctx:
+                barrier.wait()
+                with ctx:
+                    results.append(n2.p(T=300., d=1.)[0])
+                barrier.wait()
+                results.append(n2.p(T=300., d=1.)[0])
+            results.append(pm.config['unit_pressure'])
+        except Exception as err:
+            errors.append(err)
+    threads = [threading.Thread(target=work) for k in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert sorted(map(str, results)) == sorted(map(str, [expect]*12 + ['bar']*6))
+
+    async def task(delay):
+        with ctx:
+            await asyncio.sleep(delay)
+            inner = n2.p(T=300., d=1.)[0]
+        return inner, n2.p(T=300., d=1.)[0]
+    async def main():
+        return await asyncio.gather(*[task(0.001*(k%3)) for k in range(6)])
+    for inner,outer in asyncio.run(main()):
+        assert inner == approx(expect)
+        assert outer == approx(default)
+    # Exiting a context that was not entered is an error
+    with pytest.raises(pm.utility.PMParamError):
+        ctx.__exit__(None, None, None)